@@ -0,0 +1,226 @@
+"""app.api.compression
+
+Negotiated response compression (brotli or gzip).
+
+Per-frame JSON compresses very well (repeated keys, similar numbers), so the
+session and recording responses shrink several-fold on the wire.
+:class:`CompressionMiddleware` picks the encoding from ``Accept-Encoding``:
+
+- ``br`` when the client accepts it and the ``brotli`` package is installed
+  (imported on first use, not at import time);
+- ``gzip`` otherwise (stdlib ``zlib``);
+- no compression when the client accepts neither, the body is smaller than
+  ``COMPRESSION_MIN_BYTES`` (default 1024), the content type is not text/JSON,
+  or the response already has a ``Content-Encoding``.
+
+On equal ``q`` values brotli wins. A complete body is compressed in one go and
+gets a new ``Content-Length``; a streamed body is compressed chunk by chunk
+and flushed after each chunk, so streaming clients still see every chunk as it
+is produced. Compressed responses carry ``Vary: Accept-Encoding``.
+``COMPRESSION_ENABLED=0`` turns the middleware into a pass-through.
+"""
+
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.services import settings
+
+DEFAULT_MIN_BYTES = 1024
+# Fastest settings: on per-frame JSON they already shrink the body to ~30 %
+# (brotli ~27 %); higher levels save a few percent more at 3-6x the CPU time,
+# which is taken from the worker serving inference
+# (``python -m benchmarks encoding``).
+GZIP_LEVEL = 1
+BROTLI_QUALITY = 1
+
+_COMPRESSIBLE_PREFIXES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+_brotli_available: Optional[bool] = None
+
+
+def brotli_available() -> bool:
+    global _brotli_available
+    if _brotli_available is None:
+        try:
+            import brotli  # noqa: F401
+        except ImportError:
+            _brotli_available = False
+        else:
+            _brotli_available = True
+    return _brotli_available
+
+
+def enabled() -> bool:
+    return settings.env_flag("COMPRESSION_ENABLED")
+
+
+def configured_min_bytes() -> int:
+    return settings.env_int("COMPRESSION_MIN_BYTES", DEFAULT_MIN_BYTES, minimum=0)
+
+
+def _qualities(accept_encoding: str) -> Dict[str, float]:
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, *params = [p.strip() for p in item.split(";")]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[token.lower()] = q
+    return qualities
+
+
+def negotiate(accept_encoding: Optional[str], brotli_ok: bool = True) -> Optional[str]:
+    """``"br"``, ``"gzip"`` or None for an ``Accept-Encoding`` header value."""
+    if not accept_encoding:
+        return None
+    qualities = _qualities(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip") if brotli_ok else ("gzip",):
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class GzipCompressor:
+    def __init__(self):
+        self._z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        out = self._z.compress(data)
+        return out + self._z.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class BrotliCompressor:
+    def __init__(self):
+        import brotli
+
+        self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        out = self._c.process(data)
+        return out + self._c.flush() if flush else out
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+COMPRESSORS = {"gzip": GzipCompressor, "br": BrotliCompressor}
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """One-shot compression of ``data`` with ``encoding`` (``"br"``/``"gzip"``)."""
+    compressor = COMPRESSORS[encoding]()
+    return compressor.compress(data, flush=False) + compressor.finish()
+
+
+def _compressible(status: int, headers: MutableHeaders) -> bool:
+    if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+        return False
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return media_type.startswith(_COMPRESSIBLE_PREFIXES) or media_type.endswith("+json")
+
+
+class _CompressingSend:
+    """``send`` wrapper that holds the response start until the first body chunk."""
+
+    def __init__(self, send, encoding: str, min_bytes: int):
+        self._send = send
+        self._encoding = encoding
+        self._min_bytes = min_bytes
+        self._start: Optional[dict] = None
+        self._compressor = None
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if not _compressible(start["status"], headers) or (
+                not more_body and len(body) < self._min_bytes
+            ):
+                await self._send(start)
+                await self._send(message)
+                return
+
+            compressor = COMPRESSORS[self._encoding]()
+            headers["Content-Encoding"] = self._encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                self._compressor = compressor
+                body = compressor.compress(body)
+            else:
+                body = compressor.compress(body, flush=False) + compressor.finish()
+                headers["Content-Length"] = str(len(body))
+            await self._send({**start, "headers": headers.raw})
+            await self._send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+            return
+
+        if self._compressor is None:
+            await self._send(message)
+            return
+        body = self._compressor.compress(body) if body else b""
+        if not more_body:
+            body += self._compressor.finish()
+            self._compressor = None
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware: brotli/gzip the response body when the client accepts it."""
+
+    def __init__(self, app, min_bytes: Optional[int] = None):
+        self.app = app
+        self.min_bytes = min_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for key, value in scope.get("headers") or ():
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate(accept_encoding, brotli_available())
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        min_bytes = configured_min_bytes() if self.min_bytes is None else self.min_bytes
+        await self.app(scope, receive, _CompressingSend(send, encoding, min_bytes))
@@ -0,0 +1,75 @@
+"""app.api.dependencies
+
+FastAPI dependencies shared by the versioned routers.
+"""
+
+from typing import Optional
+
+import anyio
+from fastapi import Header, HTTPException, Request, Response
+
+from app.services import deadline, profiling
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def request_profiler(request: Request, response: Response):
+    """Profile this request when it carries the profiling token.
+
+    The token is only read from the ``X-Profile`` header: query strings end up
+    in access and proxy logs. Without it (or with profiling disabled) a no-op
+    context manager is returned. Use as::
+
+        def endpoint(..., profile=Depends(request_profiler)):
+            with profile:
+                ...
+
+    The stored profile's id is returned in the ``X-Profile-Id`` header.
+    """
+    flag = request.headers.get(PROFILE_HEADER)
+    if not flag or not profiling.enabled():
+        return profiling.NO_PROFILE
+    if not profiling.is_authorized(flag):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+    profile = profiling.RequestProfile(route=request.url.path)
+    response.headers[PROFILE_ID_HEADER] = profile.id
+    return profile
+
+
+def require_profiling_token(x_profile: Optional[str] = Header(None)) -> None:
+    """Guard for the profile download endpoints (404 while profiling is disabled)."""
+    if not profiling.enabled():
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiling.is_authorized(x_profile):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+async def request_deadline(request: Request) -> deadline.Deadline:
+    """Deadline + disconnect probe for a long-running (sync) endpoint.
+
+    Async on purpose: it runs on the event loop as soon as the request is
+    routed, so time spent waiting for a worker thread — and, before routing,
+    in the scheduler queue — counts against the ``X-Request-Timeout`` /
+    ``REQUEST_DEADLINE_S`` budget. The probe is called
+    from the endpoint's worker thread and hops back to the loop to poll
+    :meth:`Request.is_disconnected`.
+    """
+    try:
+        timeout_s = deadline.resolve_timeout_s(
+            request.headers.get(deadline.TIMEOUT_HEADER)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if timeout_s is not None:
+        # Time spent in the scheduler queue (app.services.scheduler) counts too.
+        timeout_s -= getattr(request.state, "scheduler_wait_s", 0.0)
+
+    def is_disconnected() -> bool:
+        try:
+            return anyio.from_thread.run(request.is_disconnected)
+        except RuntimeError:  # not called from an anyio worker thread
+            return False
+
+    return deadline.Deadline(timeout_s, is_disconnected)
@@ -0,0 +1,43 @@
+"""app.api.http_cache
+
+Conditional-GET helpers for polled, slowly changing JSON endpoints.
+
+``cached_json`` adds a weak ``ETag`` (hash of the canonical JSON body) and a
+``Cache-Control`` header, and answers ``304 Not Modified`` when the client's
+``If-None-Match`` matches, so pollers re-download nothing while the payload is
+unchanged.
+"""
+
+import hashlib
+import json
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+
+def etag_for(payload) -> str:
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return 'W/"' + hashlib.sha256(body.encode()).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" match.
+    bare = etag[2:]
+    return any(
+        tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(",")
+    )
+
+
+def cached_json(request: Request, payload, max_age: int) -> Response:
+    """Return ``payload`` as JSON with ETag/Cache-Control (or a bare 304)."""
+    etag = etag_for(payload)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=payload, headers=headers)
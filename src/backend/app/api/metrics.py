@@ -0,0 +1,19 @@
+"""app.api.metrics
+
+Prometheus scrape endpoint.
+
+Like ``/health`` it lives outside the versioned API so scrapers and platform
+probes do not depend on API versioning.
+"""
+
+from fastapi import APIRouter, Response
+
+from app.services import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["metrics"], include_in_schema=False)
+def prometheus_metrics():
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
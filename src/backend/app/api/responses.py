@@ -0,0 +1,54 @@
+"""app.api.responses
+
+Fast JSON encoding for the large-payload endpoints.
+
+``/squat/analyze-session``, ``/squat/classify-batch`` and
+``/z-predictor/predict-recording`` answer with one or more values per frame;
+for a long session that is megabytes of JSON. Going through the default path
+(pydantic model per frame → ``jsonable_encoder`` → ``json.dumps``) costs more
+than some of the inference. These endpoints keep their ``response_model`` for
+the OpenAPI schema but return a :class:`FastJSONResponse` built from plain
+dicts and numpy arrays:
+
+- numpy arrays are written by orjson directly from the buffer (no
+  ``ndarray.tolist()``, no Python float per value); NaN/inf become ``null``;
+- numpy scalars and pydantic models are accepted too, so callers need not
+  convert them first.
+
+Transfer size is handled separately by
+:class:`app.api.compression.CompressionMiddleware`. Timings and sizes:
+``python -m benchmarks encoding``.
+"""
+
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    # Called by orjson only for values it cannot write natively.
+    if isinstance(obj, np.ndarray):
+        # Non-contiguous or unsupported dtype (e.g. object, float16).
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` the way :class:`FastJSONResponse` does."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson response that also accepts any numpy array and pydantic models."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
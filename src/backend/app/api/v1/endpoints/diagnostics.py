@@ -0,0 +1,73 @@
+"""app.api.v1.endpoints.diagnostics
+
+Operational diagnostics endpoints.
+
+Read-only views of how this worker process is configured. They never touch
+MLflow, so they are safe to call while models are still loading.
+
+The ``/diagnostics/profiles`` routes serve request profiles captured with the
+profiling token (``PROFILING_TOKEN``) and require the same token in the
+``X-Profile`` header.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies import require_profiling_token
+from app.services import (
+    model_preload,
+    profiling,
+    scheduler,
+    serving_topology,
+    shadow,
+)
+
+router = APIRouter()
+
+
+@router.get("/diagnostics/topology")
+def diagnostics_topology():
+    """Return the effective worker / torch thread / executor settings."""
+    return serving_topology.effective_settings()
+
+
+@router.get("/diagnostics/models")
+def diagnostics_models():
+    """Return the preload summary and which model families this worker holds."""
+    return model_preload.status()
+
+
+@router.get("/diagnostics/shadow")
+def diagnostics_shadow():
+    """Return shadow-mode settings and this worker's champion/challenger deltas."""
+    return shadow.status()
+
+
+@router.get("/diagnostics/scheduler")
+def diagnostics_scheduler():
+    """Return this worker's priority classes: slot share, queue depth, waits."""
+    return scheduler.status()
+
+
+@router.get("/diagnostics/profiles", dependencies=[Depends(require_profiling_token)])
+def diagnostics_profiles():
+    """List stored request profiles, newest first."""
+    return profiling.list_profiles()
+
+
+@router.get(
+    "/diagnostics/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_profiling_token)],
+)
+def diagnostics_profile(profile_id: str):
+    """Collapsed stacks for one profile (flamegraph.pl / speedscope input)."""
+    collapsed = profiling.read_profile(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(
+        collapsed,
+        headers={
+            "Content-Disposition": f'attachment; filename="{profile_id}.collapsed"'
+        },
+    )
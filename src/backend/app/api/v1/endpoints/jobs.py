@@ -0,0 +1,153 @@
+"""app.api.v1.endpoints.jobs
+
+Asynchronous session analysis (v1).
+
+``POST /jobs/analyze-session`` takes the same body as ``/squat/analyze-session``
+and answers at once with a job id (202); the pipeline runs in a background
+thread (:mod:`app.services.jobs`). Submitting the same payload again returns
+the existing job (200, ``deduplicated=true``) instead of analyzing it twice.
+
+Clients then poll ``GET /jobs/{id}`` or follow ``GET /jobs/{id}/events``
+(server-sent events, one per state change) and fetch the
+``SessionAnalysisResponse`` from ``GET /jobs/{id}/result``.
+``DELETE /jobs/{id}`` cancels a queued or running job.
+"""
+
+import asyncio
+import logging
+
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.api.responses import dumps
+from app.schemas.jobs import JobStatus
+from app.schemas.squat import SessionAnalysisRequest, SessionAnalysisResponse
+from app.services import jobs, session_analysis_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+ANALYZE_SESSION = "analyze-session"
+# Seconds between store reads while streaming job events.
+EVENTS_POLL_S = 0.5
+
+
+def _status(job: jobs.Job, deduplicated: bool = False) -> JobStatus:
+    return JobStatus(**job.as_dict(), deduplicated=deduplicated)
+
+
+def _get_job(job_id: str) -> jobs.Job:
+    job = jobs.current().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+
+@router.post(
+    "/jobs/analyze-session",
+    response_model=JobStatus,
+    status_code=202,
+    responses={200: {"model": JobStatus, "description": "Existing job (duplicate)"}},
+)
+def submit_analyze_session(req: SessionAnalysisRequest, response: Response):
+    """Queue a full session analysis; returns the job (``Location``: its status URL).
+
+    503 with ``Retry-After`` when this worker already has ``JOBS_MAX_PENDING``
+    jobs queued or running.
+    """
+    frames = [[kp.model_dump() for kp in frame] for frame in req.frames]
+    norm_frames = (
+        [[kp.model_dump() for kp in frame] for frame in req.norm_frames]
+        if req.norm_frames
+        else None
+    )
+    key = jobs.request_key(ANALYZE_SESSION, req.model_dump(mode="json"))
+    # The job keeps only the keypoint dicts, not the request model.
+    fps, include_frames = req.fps, req.include_frames
+
+    def run(progress, deadline) -> bytes:
+        return dumps(
+            session_analysis_service.session_response(
+                frames,
+                norm_frames=norm_frames,
+                fps=fps,
+                include_frames=include_frames,
+                deadline=deadline,
+                progress=progress,
+            )
+        )
+
+    try:
+        job, created = jobs.current().submit(ANALYZE_SESSION, key, run)
+    except jobs.QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy: too many jobs in progress, retry later",
+            headers={"Retry-After": "5"},
+        )
+    if not created:
+        response.status_code = 200
+    response.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return _status(job, deduplicated=not created)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str):
+    """Current status, stage and progress of a job."""
+    return _status(_get_job(job_id))
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=SessionAnalysisResponse,
+    responses={409: {"description": "The job has not finished successfully"}},
+)
+def get_job_result(job_id: str):
+    """The finished job's response; 409 while it is queued/running or if it failed."""
+    job = _get_job(job_id)
+    body = jobs.current().store.result(job_id) if job.status == "done" else None
+    if body is None:
+        detail = f"Job is {job.status}"
+        if job.error:
+            detail += f": {job.error}"
+        raise HTTPException(status_code=409, detail=detail)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Server-sent events: the job status on every change, until it finishes."""
+    store = jobs.current().store
+    job = await run_in_threadpool(store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+
+    async def events():
+        last = None
+        current = job
+        while current is not None:
+            state = current.as_dict()
+            if state != last:
+                yield b"data: " + orjson.dumps(state) + b"\n\n"
+                last = state
+            if current.status in jobs.FINISHED:
+                return
+            await asyncio.sleep(EVENTS_POLL_S)
+            current = await run_in_threadpool(store.get, job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str):
+    """Cancel a queued or running job; finished jobs are returned unchanged."""
+    job = jobs.current().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return _status(job)
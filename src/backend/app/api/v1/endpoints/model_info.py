@@ -5,11 +5,16 @@ Model metadata endpoints.
 These routes expose provenance information (model URI, run_id, and
 expected feature count) for different model variants (latest/champion).
 They are intentionally read-only and should avoid heavy model calls where possible.
+
+The UI polls these routes, so run metadata comes from the shared TTL cache in
+app.services.mlflow_metadata and responses carry ETag/Cache-Control headers
+(a matching If-None-Match gets a 304).
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
-from mlflow.tracking import MlflowClient
+from fastapi import APIRouter, HTTPException, Request
+from app.api.http_cache import cached_json
+from app.services import mlflow_metadata
 from app.services.model_service import get_model, expected_feature_count
 from app.services import weaklink_model_service
 from app.services import z_model_service
@@ -19,79 +24,85 @@ logger = logging.getLogger(__name__)
 # Router for model provenance/metadata endpoints (used by UI and debugging tools).
 router = APIRouter()
 
+# Browser/proxy cache lifetime of model-info responses (seconds).
+MAX_AGE_S = 60
+
 
 @router.get("/model-info/start-stop")
-def model_info_start_stop():
+def model_info_start_stop(request: Request):
     """Return MAE_Total_Average for the champion Start_Stop_Predictor_ModelV2."""
     try:
         _, _, run_id, _, _ = start_stop_model_service.get_model("champion")
         mae = start_stop_model_service.get_mae_total_average("champion")
-        return {"run_id": run_id, "mae_total_average": mae}
+        payload = {"run_id": run_id, "mae_total_average": mae}
+        return cached_json(request, payload, MAX_AGE_S)
     except Exception as e:
         logger.exception("Failed to fetch start/stop model metrics")
         raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
 
 
 @router.get("/model-info/z-metrics")
-def model_info_z_metrics():
+def model_info_z_metrics(request: Request):
     """Return Mean_F1 (and MAE if present) for the champion z-predictor from DagsHub/MLflow."""
     try:
         _, _, run_id = z_model_service.get_model("champion")
         if not run_id:
-            return {"run_id": None, "mean_f1": None, "mae": None}
-        client = MlflowClient()
-        run = client.get_run(run_id)
-        m = run.data.metrics
-        return {
+            payload = {"run_id": None, "mean_f1": None, "mae": None}
+            return cached_json(request, payload, MAX_AGE_S)
+        m = mlflow_metadata.run_metrics(run_id)
+        payload = {
             "run_id": run_id,
             "mean_f1": m.get("Mean_F1"),
             "mae": m.get("MAE"),
         }
+        return cached_json(request, payload, MAX_AGE_S)
     except Exception as e:
         logger.exception("Failed to fetch z-predictor metrics")
         raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
 
 
 @router.get("/model-info/latest")
-def model_info_latest():
+def model_info_latest(request: Request):
     """Return metadata for the most recently registered primary model."""
     try:
         if (result := get_model("latest")) is not None:
             _model, uri, run_id = result
-            return {
+            payload = {
                 "variant": "latest",
                 "model_uri": uri,
                 "run_id": run_id,
                 "expected_features": expected_feature_count("latest"),
             }
+            return cached_json(request, payload, MAX_AGE_S)
     except Exception as e:
         logger.exception("Failed to load primary latest model info")
         raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
 
 
 @router.get("/model-info/champion")
-def model_info_champion():
+def model_info_champion(request: Request):
     """Return metadata for the champion/best primary model."""
     try:
         if (result := get_model("champion")) is not None:
             _model, uri, run_id = result
-            return {
+            payload = {
                 "variant": "champion",
                 "model_uri": uri,
                 "run_id": run_id,
                 "expected_features": expected_feature_count("champion"),
             }
+            return cached_json(request, payload, MAX_AGE_S)
     except Exception as e:
         logger.exception("Failed to load primary champion model info")
         raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
 
 
 @router.get("/model-info/weakest-link/latest")
-def model_info_weakest_link_latest():
+def model_info_weakest_link_latest(request: Request):
     """Return metadata for the most recently registered weakest-link model."""
     try:
         _model, uri, run_id = weaklink_model_service.get_model("latest")
-        return {
+        payload = {
             "variant": "latest",
             "model_uri": uri,
             "run_id": run_id,
@@ -99,17 +110,18 @@ def model_info_weakest_link_latest():
                 "latest"
             ),
         }
+        return cached_json(request, payload, MAX_AGE_S)
     except Exception as e:
         logger.exception("Failed to load weakest-link latest model info")
         raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
 
 
 @router.get("/model-info/weakest-link/champion")
-def model_info_weakest_link_champion():
+def model_info_weakest_link_champion(request: Request):
     """Return metadata for the champion/best weakest-link model."""
     try:
         _model, uri, run_id = weaklink_model_service.get_model("champion")
-        return {
+        payload = {
             "variant": "champion",
             "model_uri": uri,
             "run_id": run_id,
@@ -117,6 +129,7 @@ def model_info_weakest_link_champion():
                 "champion"
             ),
         }
+        return cached_json(request, payload, MAX_AGE_S)
     except Exception as e:
         logger.exception("Failed to load weakest-link champion model info")
         raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
@@ -6,12 +6,18 @@ These routes are HTTP wrappers around the model service layer:
 - validate/parse request schema
 - call the service (`predict_one`)
 - translate service exceptions into HTTP responses
+
+Champion requests may additionally be replayed on the latest model in the
+background (shadow mode, see app.services.shadow); the response never waits
+for it.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
+from app.api.dependencies import request_profiler
 from app.schemas.prediction import PredictRequest, PredictResponse
+from app.services import shadow
 from app.services.model_service import predict_one
 
 # Module-level logger + router used by the v1 API aggregator.
@@ -21,24 +27,26 @@ router = APIRouter()
 
 @router.post("/predict/champion", response_model=PredictResponse)
 # Predict using champion registered model
-def predict_champion(req: PredictRequest):
-    try:
-        if (result := predict_one(req.features, "champion")) is not None:
-            pred, uri, run_id = result
-            return PredictResponse(prediction=pred, model_uri=uri, run_id=run_id)
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
-    except Exception as e:
-        logger.exception("Prediction failed")
-        raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
+def predict_champion(req: PredictRequest, profile=Depends(request_profiler)):
+    with profile:
+        return _predict(req, "champion")
 
 
 @router.post("/predict/latest", response_model=PredictResponse)
 # Predict using champion latest model
-def predict_latest(req: PredictRequest):
+def predict_latest(req: PredictRequest, profile=Depends(request_profiler)):
+    with profile:
+        return _predict(req, "latest")
+
+
+def _predict(req: PredictRequest, variant: str):
     try:
-        if (result := predict_one(req.features, "latest")) is not None:
+        if (result := predict_one(req.features, variant)) is not None:
             pred, uri, run_id = result
+            if variant == "champion":
+                shadow.submit(
+                    "predict", pred, lambda: predict_one(req.features, "latest")[0]
+                )
             return PredictResponse(prediction=pred, model_uri=uri, run_id=run_id)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
@@ -4,25 +4,75 @@ Squat analysis endpoint (v1).
 
 Accepts 3-D joint coordinates from the React frontend, runs the full
 Start/Stop → MediaPipe Z → GoodBad → Scoring pipeline, and returns per-frame results.
+
+``/squat/classify-batch`` is the model-free path: rule-based depth
+classification of every frame of a recording in one vectorized pass.
+
+``/squat/analyze-session/stream`` runs the same pipeline on an NDJSON upload
+(one frame per line) that is parsed into a float32 buffer as it arrives
+(:mod:`app.services.frame_buffer`), so a long session is never held as JSON
+text or Python objects. Chunks are parsed on worker threads (at most
+:data:`PARSE_THREADS` per process) so the event loop keeps serving other
+requests, and the bulk scheduler slot is only taken once the upload is
+complete: a slow uploader does not block other bulk work.
+
+All of them return per-frame payloads, so they answer with
+:class:`app.api.responses.FastJSONResponse` built from plain dicts and numpy
+arrays; the pydantic response models only document the schema.
 """
 
 import logging
+from collections import Counter
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
 
+from app.api.dependencies import request_deadline, request_profiler
+from app.api.responses import FastJSONResponse
 from app.schemas.squat import (
-    FrameAnalysisResult,
     SessionAnalysisRequest,
     SessionAnalysisResponse,
+    SquatBatchRequest,
+    SquatBatchResponse,
 )
-from app.services import session_analysis_service
+from app.services import (
+    frame_buffer,
+    metrics,
+    scheduler,
+    session_analysis_service,
+    squat_service,
+)
+from app.services.deadline import Deadline, RequestCancelled
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Threads parsing uploaded chunks; separate from the sync-endpoint executor so
+# an upload never waits for a running inference.
+PARSE_THREADS = 2
+_parse_limiter: Optional[anyio.CapacityLimiter] = None
+
 
-@router.post("/squat/analyze-session", response_model=SessionAnalysisResponse)
-def squat_analyze_session(req: SessionAnalysisRequest):
+def _parse_threads() -> anyio.CapacityLimiter:
+    global _parse_limiter
+    if _parse_limiter is None:
+        _parse_limiter = anyio.CapacityLimiter(PARSE_THREADS)
+    return _parse_limiter
+
+
+@router.post(
+    "/squat/analyze-session",
+    response_model=SessionAnalysisResponse,
+    response_class=FastJSONResponse,
+)
+def squat_analyze_session(
+    req: SessionAnalysisRequest,
+    profile=Depends(request_profiler),
+    deadline: Deadline = Depends(request_deadline),
+):
     """Full pipeline: Cut (start/stop) → MediaPipe Z → GoodBad → Scoring → Results.
 
     All frames are sent at once. The backend runs Start_Stop_Predictor_ModelV2,
@@ -30,28 +80,148 @@ def squat_analyze_session(req: SessionAnalysisRequest):
     form quality for each continuous exercise segment.
 
     Non-exercise frames are returned with ``start_stop=0`` and
-    ``good_bad_score=None``.
+    ``good_bad_score=None``. ``reps`` summarizes each exercise segment (depth,
+    descent/ascent, time under tension, asymmetry); with ``include_frames=false``
+    only that summary is returned.
+
+    ``X-Request-Timeout`` (seconds, capped by ``REQUEST_DEADLINE_S``) bounds
+    the work: once it passes, no further stage or segment is started and the
+    results so far are returned with ``partial=true``. If the client
+    disconnects, the remaining work is abandoned (logged as status 499).
+
+    Send the profiling token in ``X-Profile`` to capture a sampling profile of
+    this call (see ``/diagnostics/profiles``).
     """
-    try:
+    with profile:
         frames = [[kp.model_dump() for kp in frame] for frame in req.frames]
         norm_frames = (
             [[kp.model_dump() for kp in frame] for frame in req.norm_frames]
             if req.norm_frames
             else None
         )
-        frame_results, timings = session_analysis_service.analyze_session(
-            frames, norm_frames=norm_frames
+        return _analyze_session(
+            frames, norm_frames, req.fps, req.include_frames, deadline
         )
-        results = [
-            FrameAnalysisResult(
-                start_stop=fr.start_stop,
-                predicted_z=fr.predicted_z,
-                good_bad_score=fr.good_bad_score,
-                squat_score=fr.squat_score,
-            )
-            for fr in frame_results
-        ]
-        return SessionAnalysisResponse(results=results, timings=timings)
+
+
+@router.post(
+    "/squat/analyze-session/stream",
+    response_model=SessionAnalysisResponse,
+    response_class=FastJSONResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+    responses={413: {"description": "More than UPLOAD_MAX_FRAMES frames"}},
+)
+async def squat_analyze_session_stream(
+    request: Request,
+    fps: float = Query(session_analysis_service.DEFAULT_FPS, gt=0),
+    include_frames: bool = True,
+    profile=Depends(request_profiler),
+    deadline: Deadline = Depends(request_deadline),
+):
+    """``/squat/analyze-session`` for an NDJSON upload, one frame per line.
+
+    A line is a keypoint array (an item of ``frames``) or
+    ``{"frame": [...], "norm_frame": [...]}`` with ``norm_frame`` on every
+    line; ``fps`` and ``include_frames`` are query parameters. Send the body
+    chunked (``Transfer-Encoding: chunked``): frames are parsed into a float32
+    buffer while the upload is in progress and the pipeline starts as soon as
+    the body is complete. Returns 422 for a malformed line and 413 above
+    ``UPLOAD_MAX_FRAMES`` frames. Deadline, cancellation and profiling work as
+    for ``/squat/analyze-session``; the upload time counts against the deadline.
+    The request waits for a bulk scheduler slot only after the upload (503 +
+    ``Retry-After`` when that queue is full).
+    """
+    parser = frame_buffer.NdjsonSessionParser()
+    try:
+        async for chunk in request.stream():
+            await anyio.to_thread.run_sync(parser.feed, chunk, limiter=_parse_threads())
+        parser.close()
+    except frame_buffer.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ClientDisconnect:
+        metrics.observe_abandoned("disconnected")
+        raise HTTPException(status_code=499, detail="Client closed request")
+
+    frames = parser.frames.points()
+    norm_frames = (
+        parser.norm_frames.points() if parser.norm_frames is not None else None
+    )
+
+    def run() -> FastJSONResponse:
+        with profile:
+            return _analyze_session(frames, norm_frames, fps, include_frames, deadline)
+
+    try:
+        async with scheduler.admitted(
+            "bulk", request.headers.get(scheduler.PRIORITY_HEADER)
+        ):
+            return await run_in_threadpool(run)
+    except scheduler.QueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy: the {e} request queue is full, retry later",
+            headers={"Retry-After": "1"},
+        )
+
+
+def _analyze_session(
+    frames: session_analysis_service.Frames,
+    norm_frames: Optional[session_analysis_service.Frames],
+    fps: float,
+    include_frames: bool,
+    deadline: Deadline,
+) -> FastJSONResponse:
+    try:
+        payload = session_analysis_service.session_response(
+            frames,
+            norm_frames=norm_frames,
+            fps=fps,
+            include_frames=include_frames,
+            deadline=deadline,
+        )
+        if deadline.exceeded:
+            metrics.observe_abandoned("deadline")
+        return FastJSONResponse(payload)
+    except RequestCancelled as exc:
+        metrics.observe_abandoned("disconnected")
+        logger.info("Client disconnected; session analysis abandoned before %s", exc)
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as exc:
         logger.exception("Session analysis failed")
         raise HTTPException(status_code=503, detail=str(exc))
+
+
+@router.post(
+    "/squat/classify-batch",
+    response_model=SquatBatchResponse,
+    response_class=FastJSONResponse,
+)
+def squat_classify_batch(req: SquatBatchRequest):
+    """Rule-based depth classification (Deep / Shallow / Invalid) for every frame.
+
+    Knee angles for all frames are computed with numpy in one pass; no model is
+    loaded. Returns 422 if ``frames`` is not ``(n_frames, len(joint_names), 3)``
+    or a required joint is missing from ``joint_names``.
+    """
+    try:
+        labels, left, right, confidences = squat_service.classify_squat_batch(
+            req.frames, req.joint_names
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return FastJSONResponse(
+        {
+            "classifications": labels,
+            "left_knee_angles": left,
+            "right_knee_angles": right,
+            "confidences": confidences,
+            "counts": dict(Counter(labels)),
+        }
+    )
@@ -6,6 +6,8 @@ These routes are HTTP wrappers around `weaklink_model_service.predict_one`:
 - validate/parse request schema
 - call the service (variant = "champion" | "latest")
 - convert service exceptions into HTTP responses
+
+Champion requests may be shadowed on the latest model (app.services.shadow).
 """
 
 import logging
@@ -13,6 +15,7 @@ from fastapi import APIRouter, HTTPException
 
 from app.schemas.prediction import PredictRequest
 from app.schemas.weakest_link import WeakestLinkResponse
+from app.services import shadow
 from app.services.weaklink_model_service import predict_one
 
 # Module-level logger + router used by the v1 API aggregator.
@@ -25,6 +28,9 @@ def weakest_link_champion(req: PredictRequest):
     """Predict weakest-link outcome using the champion/best weakest-link model."""
     try:
         pred, uri, run_id = predict_one(req.features, "champion")
+        shadow.submit(
+            "weakest_link", pred, lambda: predict_one(req.features, "latest")[0]
+        )
         return WeakestLinkResponse(prediction=pred, model_uri=uri, run_id=run_id)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
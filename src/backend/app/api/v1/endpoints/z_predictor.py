@@ -1,19 +1,31 @@
 """app.api.v1.endpoints.z_predictor
 
 Z-predictor endpoints (v1).
+
+Champion requests may be shadowed on the latest model (app.services.shadow).
+``/z-predictor/predict-recording`` returns its ``(n_frames, n_joints)`` array
+through :class:`app.api.responses.FastJSONResponse`.
 """
 
 import logging
 
 from fastapi import APIRouter, HTTPException
 
+from app.api.responses import FastJSONResponse
 from app.schemas.prediction import (
     PredictRequest,
     PredictResponse,
+    ZRecordingPredictResponse,
+    ZRecordingRequest,
     ZSequencePredictResponse,
     ZSequenceRequest,
 )
-from app.services.z_model_service import predict_one, predict_sequence
+from app.services import shadow
+from app.services.z_model_service import (
+    predict_one,
+    predict_recording,
+    predict_sequence,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -23,6 +35,9 @@ router = APIRouter()
 def z_predictor_champion(req: PredictRequest):
     try:
         pred, uri, run_id = predict_one(req.features, "champion")
+        shadow.submit(
+            "z_predictor", pred, lambda: predict_one(req.features, "latest")[0]
+        )
         return PredictResponse(prediction=pred, model_uri=uri, run_id=run_id)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
@@ -36,6 +51,9 @@ def z_predictor_predict_sequence(req: ZSequenceRequest):
     """Predict z for all squat joints from a 30-frame (x, y) sequence."""
     try:
         preds, uri, run_id = predict_sequence(req.sequence, "champion")
+        shadow.submit(
+            "z_predictor", preds, lambda: predict_sequence(req.sequence, "latest")[0]
+        )
         return ZSequencePredictResponse(predictions=preds, model_uri=uri, run_id=run_id)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
@@ -44,6 +62,36 @@ def z_predictor_predict_sequence(req: ZSequenceRequest):
         raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
 
 
+@router.post(
+    "/z-predictor/predict-recording",
+    response_model=ZRecordingPredictResponse,
+    response_class=FastJSONResponse,
+)
+def z_predictor_predict_recording(req: ZRecordingRequest):
+    """Predict z for every frame of a recording in batched sliding windows."""
+    try:
+        z, uri, run_id = predict_recording(req.frames, "champion", window=req.window)
+        shadow.submit(
+            "z_predictor",
+            z,
+            lambda: predict_recording(req.frames, "latest", window=req.window)[0],
+        )
+        return FastJSONResponse(
+            {
+                "predictions": z,
+                "n_frames": len(z),
+                "window": req.window,
+                "model_uri": uri,
+                "run_id": run_id,
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.exception("Z-predictor recording prediction failed")
+        raise HTTPException(status_code=503, detail=f"{type(e).__name__}: {e}")
+
+
 @router.post("/z-predictor/latest", response_model=PredictResponse)
 def z_predictor_latest(req: PredictRequest):
     try:
@@ -13,6 +13,8 @@ from app.api.v1.endpoints.model_info import router as model_info_router
 from app.api.v1.endpoints.weakest_link import router as weakest_link_router
 from app.api.v1.endpoints.squat import router as squat_router
 from app.api.v1.endpoints.z_predictor import router as z_predictor_router
+from app.api.v1.endpoints.diagnostics import router as diagnostics_router
+from app.api.v1.endpoints.jobs import router as jobs_router
 
 # Versioned router for all v1 endpoints.
 router = APIRouter()
@@ -23,3 +25,5 @@ router.include_router(model_info_router, tags=["model-info"])
 router.include_router(weakest_link_router, tags=["weakest-link"])
 router.include_router(z_predictor_router, tags=["z-predictor"])
 router.include_router(squat_router, tags=["squat"])
+router.include_router(diagnostics_router, tags=["diagnostics"])
+router.include_router(jobs_router, tags=["jobs"])
@@ -12,15 +12,21 @@ Notes:
 """
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.compression import CompressionMiddleware
 from app.api.health import router as health_router
+from app.api.metrics import router as metrics_router
 from app.api.v1.router import router as v1_router
 from app.api.v2.router import router as v2_router
+from app.services import scheduler, serving_topology
+from app.services.metrics import PrometheusMiddleware
+from app.services.scheduler import SchedulerMiddleware
 
 # ---------------------------------------------------------------------------
 # Environment loading
@@ -51,7 +57,19 @@ if not env_loaded:
 # ---------------------------------------------------------------------------
 # App wiring
 # ---------------------------------------------------------------------------
-app = FastAPI(title="4dt907 Backend API")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Runs once per worker process: pin torch threads and the sync-endpoint
+    # executor to this worker's share of the CPU budget, then split the
+    # executor between the request priority classes.
+    serving_topology.apply_topology()
+    scheduler.configure()
+    yield
+
+
+app = FastAPI(title="4dt907 Backend API", lifespan=lifespan)
 
 # Origins allowed to call the API from a browser.
 ALLOWED_ORIGINS = [
@@ -78,6 +96,10 @@ if os.getenv("PRODUCTION_URL"):
 
 HOST_PORT = int(os.getenv("BACKEND_PORT", "8080"))
 
+# Middleware added first runs innermost: the scheduler's 503s still get CORS
+# headers and are counted by the Prometheus middleware; compression sees the
+# final headers and body.
+app.add_middleware(SchedulerMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
@@ -85,6 +107,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(PrometheusMiddleware)
 
 
 @app.get("/")
@@ -101,6 +125,7 @@ def root():
 
 # Routers
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(v1_router, prefix="/api/v1")
 
 # Keep v2 versioning available
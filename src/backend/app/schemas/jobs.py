@@ -0,0 +1,28 @@
+"""app.schemas.jobs
+
+Pydantic schemas for the asynchronous job endpoints.
+"""
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class JobStatus(BaseModel):
+    """State of an asynchronous job.
+
+    ``progress`` is the fraction of the work done (0–1) and ``stage`` the
+    pipeline stage running now. ``deduplicated`` is true when a submission
+    matched an existing job instead of creating one. Timestamps are UTC ISO 8601.
+    """
+
+    job_id: str
+    kind: str
+    status: Literal["queued", "running", "done", "failed", "cancelled"]
+    stage: Optional[str] = None
+    progress: float = 0.0
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    deduplicated: bool = False
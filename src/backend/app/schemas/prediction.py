@@ -6,7 +6,7 @@ These models define the request/response contract for the primary model API.
 Keep them stable to avoid breaking clients (frontend, scripts, etc.).
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 
@@ -49,3 +49,29 @@ class ZSequencePredictResponse(BaseModel):
     predictions: List[float]
     model_uri: str
     run_id: Optional[str] = None
+
+
+class ZRecordingRequest(BaseModel):
+    """Request for z prediction over a whole recording.
+
+    frames: 2-D list of shape (n_frames, n_joints * 2), same column layout as
+    ``ZSequenceRequest.sequence``. One z row is returned per frame, predicted
+    from the ``window`` frames ending at it (earlier frames are padded with
+    the first frame).
+    """
+
+    frames: List[List[float]]
+    window: int = Field(30, ge=1, le=300)
+
+
+class ZRecordingPredictResponse(BaseModel):
+    """Response from recording z prediction.
+
+    predictions: (n_frames, n_joints) z values, canonical joint order per row.
+    """
+
+    predictions: List[List[float]]
+    n_frames: int
+    window: int
+    model_uri: str
+    run_id: Optional[str] = None
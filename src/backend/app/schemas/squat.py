@@ -5,7 +5,7 @@ Pydantic schemas for the squat analysis endpoints.
 
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Keypoint3D(BaseModel):
@@ -19,10 +19,16 @@ class Keypoint3D(BaseModel):
 
 
 class SessionAnalysisRequest(BaseModel):
-    """All frames from a recorded session sent at once for the full pipeline."""
+    """All frames from a recorded session sent at once for the full pipeline.
+
+    ``fps`` is the capture rate used for the per-rep durations. Set
+    ``include_frames`` to false to receive only the per-rep summary.
+    """
 
     frames: List[List[Keypoint3D]]
     norm_frames: Optional[List[List[Keypoint3D]]] = None
+    fps: float = Field(30.0, gt=0)
+    include_frames: bool = True
 
 
 class FrameAnalysisResult(BaseModel):
@@ -34,8 +40,59 @@ class FrameAnalysisResult(BaseModel):
     squat_score: Optional[float] = None
 
 
+class RepSummary(BaseModel):
+    """Kinematics of one exercise segment (rep); angles in degrees, times in s."""
+
+    rep: int
+    start_frame: int
+    end_frame: int
+    bottom_frame: Optional[int] = None
+    min_knee_angle: Optional[float] = None
+    min_left_knee_angle: Optional[float] = None
+    min_right_knee_angle: Optional[float] = None
+    descent_s: Optional[float] = None
+    ascent_s: Optional[float] = None
+    time_under_tension_s: float
+    mean_asymmetry: Optional[float] = None
+    max_asymmetry: Optional[float] = None
+    good_bad_score: Optional[float] = None
+    squat_score: Optional[float] = None
+
+
 class SessionAnalysisResponse(BaseModel):
-    """Response from the session analysis pipeline."""
+    """Response from the session analysis pipeline.
+
+    ``results`` is empty when the request set ``include_frames`` to false.
+    ``partial`` is true when the request deadline passed before the pipeline
+    finished; ``deadline_stage`` is the first stage that was skipped
+    (``start_stop``: no frames were analyzed, ``segments``: later exercise
+    segments are unscored).
+    """
 
     results: List[FrameAnalysisResult]
     timings: Optional[Dict[str, float]] = None
+    reps: List[RepSummary] = []
+    rep_count: int = 0
+    partial: bool = False
+    deadline_stage: Optional[str] = None
+
+
+class SquatBatchRequest(BaseModel):
+    """A whole recording as an ``(n_frames, joints, 3)`` array of x, y, z.
+
+    ``joint_names`` names the joints along the second axis; when omitted it is
+    left_hip, left_knee, left_ankle, right_hip, right_knee, right_ankle.
+    """
+
+    frames: List[List[List[float]]]
+    joint_names: Optional[List[str]] = None
+
+
+class SquatBatchResponse(BaseModel):
+    """Per-frame squat depth classification, one entry per input frame."""
+
+    classifications: List[str]
+    left_knee_angles: List[float]
+    right_knee_angles: List[float]
+    confidences: List[Optional[float]]
+    counts: Dict[str, int]
@@ -0,0 +1,92 @@
+"""app.server
+
+Production launcher for the backend.
+
+Starts the app with the worker count from :mod:`app.services.serving_topology`
+so the process count, per-worker torch threads and executor size are always
+derived from the same CPU budget. Use ``python -m app.main`` for local
+development with hot reload instead.
+
+Two modes:
+- plain: ``uvicorn`` spawns the workers and each worker loads its own models
+  lazily on first request.
+- preload (``PRELOAD_MODELS``, default on when running more than one worker):
+  a gunicorn master imports the app, loads every configured model once,
+  freezes the GC heap and forks ``UvicornWorker`` processes that share the
+  weights copy-on-write and never download models themselves.
+"""
+
+import os
+import tempfile
+
+import uvicorn
+
+from app.services import settings
+from app.services.serving_topology import ServingTopology, resolve_topology
+
+
+def _preload_enabled(topology: ServingTopology) -> bool:
+    return settings.env_flag("PRELOAD_MODELS", default=topology.workers > 1)
+
+
+def _ensure_metrics_dir(topology: ServingTopology) -> None:
+    # prometheus_client picks multiprocess mode at import time, so this must run
+    # before app.main is imported by the master or any worker.
+    if topology.workers > 1 and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def _mark_worker_dead(_server, worker) -> None:
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def _run_preforked(topology: ServingTopology, port: int) -> None:
+    # gunicorn is POSIX-only, so it is only imported on the code path that needs it.
+    from gunicorn.app.base import BaseApplication
+
+    class _PreforkApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"0.0.0.0:{port}")
+            self.cfg.set("workers", topology.workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("preload_app", True)
+            self.cfg.set("child_exit", _mark_worker_dead)
+
+        def load(self):
+            from app.main import app
+            from app.services import model_preload
+
+            model_preload.preload_models()
+            model_preload.freeze_heap()
+            return app
+
+    _PreforkApplication().run()
+
+
+def main() -> None:
+    topology = resolve_topology()
+    # Render injects PORT; Docker/compose use BACKEND_PORT.
+    port = int(os.getenv("PORT") or os.getenv("BACKEND_PORT", "8080"))
+
+    # Child workers read these before importing torch, so the oversubscription
+    # guard is in place even before the startup hook runs.
+    os.environ.setdefault("OMP_NUM_THREADS", str(topology.torch_threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(topology.torch_threads))
+    _ensure_metrics_dir(topology)
+
+    if _preload_enabled(topology):
+        _run_preforked(topology, port)
+        return
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=topology.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
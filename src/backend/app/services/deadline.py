@@ -0,0 +1,98 @@
+"""app.services.deadline
+
+Cooperative per-request deadline and client-disconnect cancellation.
+
+A long ``analyze-session`` call runs start/stop and then GoodBad + scoring for
+every exercise segment. Python cannot interrupt a model call, so the pipeline
+checks a :class:`Deadline` *between* stages and segments instead::
+
+    deadline = Deadline(timeout_s=5.0, is_disconnected=probe)
+    if not deadline.check("start_stop"):   # raises RequestCancelled on disconnect
+        return partial_results
+    ...
+
+- the client disconnected → :class:`RequestCancelled` is raised and the rest of
+  the work is abandoned (nobody is left to read the response);
+- the deadline passed → :meth:`Deadline.check` returns False, the caller stops
+  and returns what it has; :attr:`Deadline.exceeded_at` names the first stage
+  that was skipped.
+
+The timeout comes from the ``X-Request-Timeout`` header (seconds), capped by
+``REQUEST_DEADLINE_S`` (also the default when the header is absent; unset =
+no deadline). The clock starts when the request is accepted, so time spent
+queued for a worker thread counts.
+"""
+
+from time import monotonic
+from typing import Callable, Optional
+
+from app.services import settings
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+class RequestCancelled(Exception):
+    """The client went away; the work in progress is no longer needed."""
+
+
+def configured_timeout_s() -> Optional[float]:
+    """``REQUEST_DEADLINE_S`` in seconds, or None when unset/invalid/<= 0."""
+    return settings.env_float("REQUEST_DEADLINE_S", None)
+
+
+def resolve_timeout_s(header_value: Optional[str]) -> Optional[float]:
+    """Effective timeout: the header value, capped by ``REQUEST_DEADLINE_S``.
+
+    Raises ``ValueError`` for a header that is not a positive number.
+    """
+    configured = configured_timeout_s()
+    if header_value is None or not header_value.strip():
+        return configured
+    requested = float(header_value)
+    if not requested > 0:
+        raise ValueError(f"{TIMEOUT_HEADER} must be a positive number of seconds")
+    return requested if configured is None else min(requested, configured)
+
+
+class Deadline:
+    """Time budget plus disconnect probe, checked between units of work."""
+
+    __slots__ = ("_clock", "_expires_at", "_is_disconnected", "exceeded_at")
+
+    def __init__(
+        self,
+        timeout_s: Optional[float] = None,
+        is_disconnected: Optional[Callable[[], bool]] = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self._clock = clock
+        self._expires_at = None if timeout_s is None else clock() + timeout_s
+        self._is_disconnected = is_disconnected
+        self.exceeded_at: Optional[str] = None
+
+    def remaining_s(self) -> Optional[float]:
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - self._clock())
+
+    def check(self, stage: str) -> bool:
+        """True if ``stage`` may run; False once the deadline has passed.
+
+        Raises :class:`RequestCancelled` if the client has disconnected.
+        """
+        if self._is_disconnected is not None and self._is_disconnected():
+            raise RequestCancelled(stage)
+        if self.exceeded_at is not None:
+            return False
+        if self._expires_at is not None and self._clock() >= self._expires_at:
+            self.exceeded_at = stage
+            return False
+        return True
+
+    @property
+    def exceeded(self) -> bool:
+        return self.exceeded_at is not None
+
+
+# Shared no-op instance: no time limit, never cancelled.
+NO_DEADLINE = Deadline()
@@ -0,0 +1,155 @@
+"""app.services.frame_buffer
+
+Incremental parsing of streamed session uploads.
+
+A long session posted as one JSON document is buffered whole, parsed into
+Python objects and validated into one pydantic model per keypoint before the
+pipeline starts, so peak memory is several times the payload. The streaming
+upload (``/squat/analyze-session/stream``) sends the frames as NDJSON instead,
+one frame per line, and :class:`NdjsonSessionParser` writes every line into a
+:class:`FrameBuffer` as its bytes arrive:
+
+- a frame is stored as ``(13, 3)`` float32 xyz in
+  :data:`app.services.pose_features.CANONICAL_JOINTS` order (NaN for a
+  missing joint, other joint names are ignored) — the layout the start/stop
+  features and the segment tensors are read from. Only this parsing overlaps
+  with the upload; feature building and inference start once the body is
+  complete;
+- the buffer is preallocated and doubles when full, so memory stays
+  proportional to the numeric data (156 bytes per frame) instead of the JSON
+  text.
+
+Each line is either a keypoint array (``[{"name", "x", "y", "z"}, ...]``, the
+``frames`` items of ``SessionAnalysisRequest``) or an object
+``{"frame": [...], "norm_frame": [...]}``; ``norm_frame`` must be given on
+every line or on none. Malformed lines raise ``ValueError`` naming the line;
+more than ``UPLOAD_MAX_FRAMES`` frames (default 108000, one hour at 30 fps) or
+a line longer than :data:`MAX_LINE_BYTES` raise :class:`UploadTooLarge`.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import orjson
+
+from app.services import pose_features, settings
+
+DEFAULT_MAX_FRAMES = 108_000
+# One frame of 33 MediaPipe keypoints is ~3 KB of JSON.
+MAX_LINE_BYTES = 1 << 20
+_INITIAL_CAPACITY = 1024
+_N_JOINTS = len(pose_features.CANONICAL_JOINTS)
+_INDEX = {name: i for i, name in enumerate(pose_features.CANONICAL_JOINTS)}
+
+
+class UploadTooLarge(ValueError):
+    """The upload exceeds the frame limit or the maximum line length."""
+
+
+def configured_max_frames() -> int:
+    return settings.env_int("UPLOAD_MAX_FRAMES", DEFAULT_MAX_FRAMES)
+
+
+class FrameBuffer:
+    """Growing ``(n_frames, 13, 3)`` float32 keypoint buffer."""
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._data = np.full((max(1, capacity), _N_JOINTS, 3), np.nan, np.float32)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def append(self, keypoints: List[dict]) -> None:
+        """Store one frame of keypoint dicts; raises ``ValueError`` when malformed."""
+        if not isinstance(keypoints, list):
+            raise ValueError("a frame must be an array of keypoints")
+        if self._n == len(self._data):
+            grown = np.full((2 * self._n, _N_JOINTS, 3), np.nan, np.float32)
+            grown[: self._n] = self._data
+            self._data = grown
+        row = self._data[self._n]
+        for kp in keypoints:
+            try:
+                j = _INDEX.get(kp["name"])
+                xyz = (float(kp["x"]), float(kp["y"]), float(kp["z"]))
+            except (KeyError, TypeError, ValueError):
+                row[:] = np.nan
+                raise ValueError(
+                    "a keypoint must be an object with name, x, y and z"
+                ) from None
+            if j is not None:
+                row[j] = xyz
+        self._n += 1
+
+    def points(self) -> np.ndarray:
+        """View of the stored frames (valid until the next :meth:`append`)."""
+        return self._data[: self._n]
+
+
+class NdjsonSessionParser:
+    """Feed raw NDJSON chunks with :meth:`feed`, then call :meth:`close`."""
+
+    def __init__(self, max_frames: Optional[int] = None):
+        self.max_frames = configured_max_frames() if max_frames is None else max_frames
+        self.frames = FrameBuffer()
+        self.norm_frames: Optional[FrameBuffer] = None
+        self._with_norm: Optional[bool] = None
+        self._pending = bytearray()
+        self._line = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self._pending += chunk
+        start = 0
+        while True:
+            end = self._pending.find(b"\n", start)
+            if end < 0:
+                break
+            self._parse_line(bytes(self._pending[start:end]))
+            start = end + 1
+        del self._pending[:start]
+        if len(self._pending) > MAX_LINE_BYTES:
+            raise UploadTooLarge(
+                f"line {self._line + 1}: longer than {MAX_LINE_BYTES} bytes"
+            )
+
+    def close(self) -> None:
+        """Parse a final line without a trailing newline."""
+        if self._pending:
+            self._parse_line(bytes(self._pending))
+            self._pending.clear()
+
+    def _parse_line(self, line: bytes) -> None:
+        self._line += 1
+        if not line.strip():
+            return
+        if len(self.frames) >= self.max_frames:
+            raise UploadTooLarge(f"more than {self.max_frames} frames")
+        try:
+            value = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            raise ValueError(f"line {self._line}: invalid JSON ({exc})") from None
+
+        norm = None
+        if isinstance(value, dict):
+            frame, norm = value.get("frame"), value.get("norm_frame")
+        else:
+            frame = value
+        with_norm = norm is not None
+        if self._with_norm is None:
+            self._with_norm = with_norm
+            self.norm_frames = FrameBuffer() if with_norm else None
+        elif with_norm != self._with_norm:
+            raise ValueError(
+                f"line {self._line}: norm_frame must be given on every line or none"
+            )
+        try:
+            self.frames.append(frame)
+            if self.norm_frames is not None:
+                self.norm_frames.append(norm)
+        except ValueError as exc:
+            raise ValueError(f"line {self._line}: {exc}") from None
@@ -26,29 +26,29 @@ Feature engineering (matches a13-mlflow.ipynb exactly):
 Feature order MUST match the CSV column order from the training data
 (kinect_good_vs_bad_not_preprocessed_A13_mediapipe) which preserves the
 original Kinect joint output order after joint-name remapping.
+
+The features are computed by the shared kernel in
+:mod:`app.services.pose_features` (``_LAYOUT`` below); ``predict_session``
+also accepts a :class:`~app.services.pose_features.Segment` so the scoring
+model can reuse the same segment geometry.
 """
 
 import logging
 import os
 import tempfile
 import threading
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
-import mlflow
 import numpy as np
-from mlflow.exceptions import RestException
-from mlflow.tracking import MlflowClient
+
+from app.services import metrics, mlflow_metadata, model_registry, pose_features
+from app.services.lazy_imports import MlflowClient, mlflow
 
 _log = logging.getLogger(__name__)
 _lock = threading.Lock()
 # cache: uri → (pyfunc_model, uri_used, run_id, c_frames, n_features, scaler_or_None)
 _cache: Dict[str, Tuple] = {}
 
-_initial_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-if _initial_tracking_uri:
-    mlflow.set_tracking_uri(_initial_tracking_uri)
-    mlflow.set_registry_uri(_initial_tracking_uri)
-
 _DEFAULT_C_FRAMES = 10
 _DEFAULT_N_FEATURES = 61
 
@@ -74,40 +74,8 @@ _JOINT_NAMES: List[str] = [
     "right_ankle",
 ]
 
-# Canonical feature column names in training order (mirrors FEAT_COLS).
-_FEAT_COLS: List[str] = [
-    f"{joint}_3d_{axis}" for joint in _JOINT_NAMES for axis in ["x", "y", "z"]
-]
-
-# 16 joint-pair distances (normalised by shoulder width).
-_KEY_DIST_PAIRS: List[Tuple[str, str]] = [
-    ("left_shoulder", "right_shoulder"),
-    ("left_elbow", "right_elbow"),
-    ("left_wrist", "right_wrist"),
-    ("left_hip", "right_hip"),
-    ("left_knee", "right_knee"),
-    ("left_ankle", "right_ankle"),
-    ("left_shoulder", "left_elbow"),
-    ("left_elbow", "left_wrist"),
-    ("right_shoulder", "right_elbow"),
-    ("right_elbow", "right_wrist"),
-    ("left_hip", "left_knee"),
-    ("left_knee", "left_ankle"),
-    ("right_hip", "right_knee"),
-    ("right_knee", "right_ankle"),
-    ("left_shoulder", "left_hip"),
-    ("right_shoulder", "right_hip"),
-]
-
-# 6 joint-angle triples (a, vertex, b) — angle measured at vertex.
-_KEY_ANGLE_TRIPLES: List[Tuple[str, str, str]] = [
-    ("left_shoulder", "left_elbow", "left_wrist"),
-    ("right_shoulder", "right_elbow", "right_wrist"),
-    ("left_hip", "left_knee", "left_ankle"),
-    ("right_hip", "right_knee", "right_ankle"),
-    ("left_elbow", "left_shoulder", "left_hip"),
-    ("right_elbow", "right_shoulder", "right_hip"),
-]
+# Kinect order, coordinates as received (image-normalised x, y and z).
+_LAYOUT = pose_features.FeatureLayout(tuple(_JOINT_NAMES), (1.0, 1.0, 1.0))
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -151,32 +119,13 @@ def _parse_models_alias_uri(uri: str) -> Tuple[str, str]:
 
 
 def _resolve_alias_to_version_uri(model_name: str, alias: str) -> str:
-    client = MlflowClient()
-    versions = sorted(
-        client.search_model_versions(f"name='{model_name}'"),
-        key=lambda mv: int(mv.version),
-    )
-    if not versions:
-        raise RuntimeError(f"No versions found for model '{model_name}'")
-    latest = versions[-1]
-    second_latest = versions[-2] if len(versions) >= 2 else latest
-    a = alias.lower().strip()
-    if a in {"prod", "production"}:
-        prod = [
-            mv
-            for mv in versions
-            if (getattr(mv, "current_stage", "") or "").lower() == "production"
-        ]
-        chosen = prod[-1] if prod else latest
-    elif a in {"backup"}:
-        chosen = second_latest
-    else:
-        chosen = latest
-    return f"models:/{model_name}/{chosen.version}"
+    return model_registry.fallback_alias_uri(model_name, alias, MlflowClient)
 
 
 def _load_model_with_alias_fallback(uri: str):
     """Load via mlflow.pyfunc (works with mlflow-skinny)."""
+    from mlflow.exceptions import RestException
+
     try:
         return mlflow.pyfunc.load_model(uri), uri
     except RestException as e:
@@ -188,43 +137,14 @@ def _load_model_with_alias_fallback(uri: str):
 
 
 def _fetch_run_id(uri: str) -> Optional[str]:
-    if not uri:
-        return None
-    if uri.startswith("runs:/"):
-        tail = uri[len("runs:/") :]
-        return tail.split("/", 1)[0] if tail else None
-    client = MlflowClient()
-    if _is_models_alias_uri(uri):
-        name, alias = _parse_models_alias_uri(uri)
-        try:
-            mv = client.get_model_version_by_alias(name, alias)
-            return getattr(mv, "run_id", None)
-        except Exception:
-            resolved = _resolve_alias_to_version_uri(name, alias)
-            return _fetch_run_id(resolved)
-    if uri.startswith("models:/"):
-        tail = uri[len("models:/") :]
-        parts = tail.split("/", 2)
-        if len(parts) < 2:
-            return None
-        name = parts[0].strip()
-        selector = parts[1].strip()
-        if selector.isdigit():
-            mv = client.get_model_version(name, selector)
-            return getattr(mv, "run_id", None)
-        latest = client.get_latest_versions(name, stages=[selector])
-        if latest:
-            return getattr(max(latest, key=lambda mv: int(mv.version)), "run_id", None)
-    return None
+    return model_registry.run_id_for_uri(uri, MlflowClient)
 
 
 def _fetch_run_params(run_id: Optional[str]) -> Tuple[int, int]:
     if not run_id:
         return _DEFAULT_C_FRAMES, _DEFAULT_N_FEATURES
     try:
-        client = MlflowClient()
-        run = client.get_run(run_id)
-        params = run.data.params
+        params = mlflow_metadata.run_params(run_id)
         c_frames = int(params.get("c_frames", _DEFAULT_C_FRAMES))
         n_features = int(params.get("n_features", _DEFAULT_N_FEATURES))
         return c_frames, n_features
@@ -265,10 +185,12 @@ def get_model(variant: str = "champion"):
         if direct_uri in _cache:
             return _cache[direct_uri]
 
-        model, uri_used = _load_model_with_alias_fallback(direct_uri)
-        run_id = _fetch_run_id(uri_used)
-        c_frames, n_features = _fetch_run_params(run_id)
-        scaler = _fetch_scaler(run_id)
+        with metrics.model_load_timer("goodbad") as load:
+            model, uri_used = _load_model_with_alias_fallback(direct_uri)
+            load["uri"] = uri_used
+            run_id = _fetch_run_id(uri_used)
+            c_frames, n_features = _fetch_run_params(run_id)
+            scaler = _fetch_scaler(run_id)
 
         _log.info(
             "GoodBad model loaded: uri=%s  c_frames=%d  n_features=%d  scaler=%s",
@@ -281,87 +203,13 @@ def get_model(variant: str = "champion"):
         return model, uri_used, run_id, c_frames, n_features, scaler
 
 
-# ──────────────────────────────────────────────────────────────────────────────
-# Feature engineering — exact replica of add_dist_angle_features() from
-# a13-mlflow.ipynb, using name-based column lookup to be order-independent
-# for the distance/angle extras.
-# ──────────────────────────────────────────────────────────────────────────────
-
-
-def _pos(base_arr: np.ndarray, joint: str) -> np.ndarray:
-    """Return (n_frames, 3) xyz slice for a joint, using _FEAT_COLS index lookup."""
-    idxs = [_FEAT_COLS.index(f"{joint}_3d_{ax}") for ax in ["x", "y", "z"]]
-    return base_arr[:, idxs]
-
-
-def _build_base_features(kp3d: List[Dict]) -> List[float]:
-    """39 floats: 13 joints × (x, y, z) in _JOINT_NAMES / _FEAT_COLS order."""
-    kp_map = {kp["name"]: kp for kp in kp3d}
-    feats: List[float] = []
-    for name in _JOINT_NAMES:
-        kp = kp_map.get(name)
-        feats.append(float(kp["x"]) if kp else 0.0)
-        feats.append(float(kp["y"]) if kp else 0.0)
-        feats.append(float(kp["z"]) if kp else 0.0)
-    return feats
-
-
-def _add_dist_angle_features(base_arr: np.ndarray) -> np.ndarray:
-    """Add 16 distance + 6 angle features to a (n_frames, 39) array.
-
-    Matches add_dist_angle_features() from a13-mlflow.ipynb exactly:
-    - Distances are normalised by the MEAN shoulder width across the clip.
-    - Angle features are cosines computed per frame.
-    - Uses _pos() name-lookup so feature order matches training.
-
-    Returns (n_frames, 61) float32 array.
-    """
-    # Body scale: mean shoulder width across ALL frames in the clip.
-    ls = _pos(base_arr, "left_shoulder")
-    rs = _pos(base_arr, "right_shoulder")
-    scale = float(np.linalg.norm(rs - ls, axis=1).mean()) + 1e-8
-
-    extras: List[np.ndarray] = []
-
-    for j1, j2 in _KEY_DIST_PAIRS:
-        p1 = _pos(base_arr, j1)
-        p2 = _pos(base_arr, j2)
-        d = np.linalg.norm(p2 - p1, axis=1, keepdims=True) / scale
-        extras.append(d)
-
-    for ja, jv, jb in _KEY_ANGLE_TRIPLES:
-        pa = _pos(base_arr, ja)
-        pv = _pos(base_arr, jv)
-        pb = _pos(base_arr, jb)
-        va = pa - pv
-        vb = pb - pv
-        cos_val = np.sum(va * vb, axis=1) / (
-            np.linalg.norm(va, axis=1) * np.linalg.norm(vb, axis=1) + 1e-8
-        )
-        extras.append(cos_val.reshape(-1, 1))
-
-    return np.hstack([base_arr] + extras).astype(np.float32)
-
-
-def _resample_to_fixed(arr: np.ndarray, target: int) -> np.ndarray:
-    """Sample `target` equidistant rows from arr (matches to_fixed_length in notebook)."""
-    n = len(arr)
-    if n == target:
-        return arr
-    if n < target:
-        pad = np.zeros((target - n, arr.shape[1]), dtype="float32")
-        return np.vstack([arr, pad])
-    idx = np.round(np.linspace(0, n - 1, target)).astype(int)
-    return arr[idx]
-
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Public inference API
 # ──────────────────────────────────────────────────────────────────────────────
 
 
 def predict_session(
-    exercise_frames: List[List[Dict]],
+    exercise_frames: Union[List[List[Dict]], pose_features.Segment],
     variant: str = "champion",
 ) -> Optional[float]:
     """Score a single squat repetition.
@@ -374,6 +222,7 @@ def predict_session(
         ``y``, ``z``.  Must be image-normalised coordinates (x, y ∈ [0, 1])
         the coordinate system used in training(kinect_good_vs_bad_not_preprocessed_A13_mediapipe).
         Passing world-space (hip-centred) coords will produce all-Bad predictions.
+        May also be a prebuilt :class:`pose_features.Segment` of such frames.
     variant:
         Model variant (``"champion"`` / ``"prod"`` or ``"dev"``).
 
@@ -384,34 +233,27 @@ def predict_session(
         ~1.0 = Good form, ~0.0 = Bad form.
         Returns None on any error so the caller can hide the result.
     """
-    if not exercise_frames:
+    if not len(exercise_frames):
         return 0.5
 
     try:
         model, _, _, c_frames, n_features, scaler = get_model(variant)
 
-        # 1. Build base (39) features for ALL exercise frames first.
-        #    Enrichment before resampling matches the training notebook order,
-        #    so shoulder-width scale is computed from the full segment.
-        base = np.array(
-            [_build_base_features(f) for f in exercise_frames], dtype=np.float32
-        )  # (n_frames, 39)
-
-        # 2. Enrich with distance + angle features → (n_frames, 61).
-        enriched = _add_dist_angle_features(base)
+        # 1-3. 39 base + 16 distance + 6 angle features at c_frames equidistant
+        #      frames → (c_frames, 61). The shoulder-width scale is computed
+        #      from the full segment, as in the training notebook.
+        segment = pose_features.as_segment(exercise_frames)
+        fixed = segment.model_input(_LAYOUT, c_frames)
 
         _log.info(
             "GoodBad features: n_frames=%d shape=%s mean=%.4f min=%.4f max=%.4f",
-            len(exercise_frames),
-            enriched.shape,
-            float(enriched.mean()),
-            float(enriched.min()),
-            float(enriched.max()),
+            len(segment),
+            fixed.shape,
+            float(fixed.mean()),
+            float(fixed.min()),
+            float(fixed.max()),
         )
 
-        # 3. Resample to exactly c_frames equidistant frames → (c_frames, 61).
-        fixed = _resample_to_fixed(enriched, c_frames)
-
         # 4. Optional scaler (applied flat, same as training: reshape→transform→reshape).
         if scaler is not None:
             flat = fixed.reshape(1, -1)  # (1, c_frames * n_features)
@@ -428,7 +270,7 @@ def predict_session(
             "GoodBad logit=%.4f → score=%.4f (frames=%d → resampled to %d)",
             logit,
             score,
-            len(exercise_frames),
+            len(segment),
             c_frames,
         )
         return score
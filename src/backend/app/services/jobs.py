@@ -0,0 +1,418 @@
+"""app.services.jobs
+
+Asynchronous, idempotent jobs for work that outlives a request.
+
+A session of several minutes takes longer to analyze than the Render/Vercel
+request timeouts allow, so ``POST /api/v1/jobs/analyze-session`` only
+registers a job and returns its id. A small thread pool in the worker process
+that accepted the job runs it and stores the encoded response in a SQLite
+database shared by all workers of the container::
+
+    job, created = jobs.current().submit("analyze-session", key, run)
+    jobs.current().store.get(job.id)        # status, stage, progress
+    jobs.current().store.result(job.id)     # encoded response once "done"
+
+- Idempotent: ``key`` identifies the request (:func:`request_key` hashes the
+  canonical payload). Submitting a key that belongs to a queued, running or
+  finished job returns that job; failed and cancelled jobs are replaced.
+- ``run(progress, deadline)`` receives a ``progress(stage, fraction)``
+  callback and a :class:`~app.services.deadline.Deadline` whose disconnect
+  probe fires once the job is cancelled, so a cancellation takes effect
+  before the next pipeline stage or segment.
+- While it runs, a job holds a slot of the request scheduler's ``bulk`` class
+  (:func:`app.services.scheduler.admitted_from_thread`), so jobs share the
+  bulk share with the synchronous bulk endpoints instead of competing with
+  interactive requests; ``JOBS_WORKERS`` only bounds how many wait for one.
+- A job whose worker process exited before finishing is reported as failed.
+- Finished jobs and their results are deleted after ``JOBS_TTL_S``.
+
+Settings: ``JOBS_DIR`` (default ``<tmp>/4dt907-jobs``), ``JOBS_WORKERS``
+(threads per worker process, default 1), ``JOBS_MAX_PENDING`` (queued +
+running jobs per worker process, default 16; more raises :class:`QueueFull`),
+``JOBS_TTL_S`` (default 86400).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import orjson
+
+from app.services import metrics, scheduler, settings
+from app.services.deadline import Deadline, RequestCancelled
+
+_log = logging.getLogger(__name__)
+
+_DEFAULT_WORKERS = 1
+_DEFAULT_MAX_PENDING = 16
+_DEFAULT_TTL_S = 86400.0
+# Scheduler class whose slots the job threads take.
+SCHEDULER_CLASS = "bulk"
+
+ACTIVE = ("queued", "running")
+FINISHED = ("done", "failed", "cancelled")
+
+# run(progress, deadline) -> encoded result
+JobFn = Callable[[Callable[[str, float], None], Deadline], bytes]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    pid INTEGER NOT NULL,
+    owner TEXT NOT NULL,
+    result BLOB
+)
+"""
+_COLUMNS = (
+    "id, kind, key, status, stage, progress, created_at, started_at, "
+    "finished_at, error, pid, owner"
+)
+# Identifies this process even if a later process reuses its pid. Renewed in
+# every forked child: gunicorn imports this module in the master (preload), so
+# the workers would otherwise share the master's value.
+_OWNER = uuid.uuid4().hex
+
+
+def _new_owner_after_fork() -> None:
+    global _OWNER
+    _OWNER = uuid.uuid4().hex
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_new_owner_after_fork)
+
+
+class QueueFull(Exception):
+    """This worker already has ``JOBS_MAX_PENDING`` jobs queued or running."""
+
+
+def jobs_dir() -> str:
+    return os.getenv("JOBS_DIR") or os.path.join(tempfile.gettempdir(), "4dt907-jobs")
+
+
+def ttl_s() -> float:
+    return settings.env_float("JOBS_TTL_S", _DEFAULT_TTL_S)
+
+
+def request_key(kind: str, payload) -> str:
+    """Dedupe key of a JSON-serializable request: kind + hash of its canonical form."""
+    body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return kind + ":" + hashlib.sha256(body).hexdigest()
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+class Job(NamedTuple):
+    id: str
+    kind: str
+    key: str
+    status: str
+    stage: Optional[str]
+    progress: float
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    error: Optional[str]
+    pid: int
+    owner: str
+
+    def as_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "error": self.error,
+        }
+
+
+class JobStore:
+    """Job rows and results in one SQLite file, safe across threads and processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.execute(_SCHEMA)
+                        conn.commit()
+                    self._ready = True
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _fail_if_orphaned(self, conn, job: Job) -> Job:
+        if job.status not in ACTIVE or job.owner == _OWNER:
+            return job
+        if job.pid != os.getpid() and _pid_alive(job.pid):
+            return job
+        now = time.time()
+        error = "Worker process exited before the job finished"
+        conn.execute(
+            "UPDATE jobs SET status='failed', error=?, finished_at=? "
+            "WHERE id=? AND status IN ('queued', 'running')",
+            (error, now, job.id),
+        )
+        return job._replace(status="failed", error=error, finished_at=now)
+
+    def _select(self, conn, where: str, arg: str) -> Optional[Job]:
+        row = conn.execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE {where} = ?", (arg,)
+        ).fetchone()
+        return self._fail_if_orphaned(conn, Job(*row)) if row else None
+
+    def create(self, kind: str, key: str) -> Tuple[Job, bool]:
+        """The job for ``key``: the existing reusable one, or a new queued job.
+
+        Returns ``(job, created)``.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = self._select(conn, "key", key)
+                if job is not None and job.status not in ("failed", "cancelled"):
+                    conn.execute("COMMIT")
+                    return job, False
+                if job is not None:
+                    conn.execute("DELETE FROM jobs WHERE id = ?", (job.id,))
+                job = Job(
+                    id=uuid.uuid4().hex,
+                    kind=kind,
+                    key=key,
+                    status="queued",
+                    stage=None,
+                    progress=0.0,
+                    created_at=time.time(),
+                    started_at=None,
+                    finished_at=None,
+                    error=None,
+                    pid=os.getpid(),
+                    owner=_OWNER,
+                )
+                marks = ",".join("?" * len(job))
+                conn.execute(f"INSERT INTO jobs ({_COLUMNS}) VALUES ({marks})", job)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with closing(self._connect()) as conn:
+            return self._select(conn, "id", job_id)
+
+    def find(self, key: str) -> Optional[Job]:
+        with closing(self._connect()) as conn:
+            return self._select(conn, "key", key)
+
+    def status(self, job_id: str) -> Optional[str]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,))
+            row = row.fetchone()
+        return row[0] if row else None
+
+    def update(self, job_id: str, when_status: Tuple[str, ...], **fields) -> bool:
+        """Set ``fields`` if the job's status is in ``when_status``; True if it was."""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        marks = ",".join("?" * len(when_status))
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status IN ({marks})",
+                (*fields.values(), job_id, *when_status),
+            )
+        return cursor.rowcount > 0
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT result FROM jobs WHERE id = ? AND status = 'done'", (job_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def prune(self, older_than_s: float) -> int:
+        """Delete jobs that finished more than ``older_than_s`` seconds ago."""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - older_than_s,),
+            )
+        return cursor.rowcount
+
+
+class JobRunner:
+    """Per-process thread pool running jobs registered in a :class:`JobStore`."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = _DEFAULT_WORKERS,
+        max_pending: int = _DEFAULT_MAX_PENDING,
+        ttl_s: float = _DEFAULT_TTL_S,
+    ):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, kind: str, key: str, run: JobFn) -> Tuple[Job, bool]:
+        """Register ``run`` under ``key`` (or return the job already registered).
+
+        Returns ``(job, created)``; raises :class:`QueueFull` when a new job is
+        needed but this worker has ``max_pending`` jobs queued or running.
+        """
+        self.store.prune(self.ttl_s)
+        existing = self.store.find(key)
+        if existing is not None and existing.status not in ("failed", "cancelled"):
+            metrics.observe_job(kind, "deduplicated")
+            return existing, False
+        with self._lock:
+            if self._pending >= self.max_pending:
+                metrics.observe_job(kind, "rejected")
+                raise QueueFull(kind)
+            job, created = self.store.create(kind, key)
+            if not created:
+                metrics.observe_job(kind, "deduplicated")
+                return job, False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="job"
+                )
+            self._pending += 1
+        metrics.observe_job(kind, "created")
+        self._executor.submit(self._run, job, run)
+        return job, True
+
+    def _run(self, job: Job, run: JobFn) -> None:
+        try:
+            self._execute(job, run)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _execute(self, job: Job, run: JobFn) -> None:
+        start = time.time()
+        if not self.store.update(
+            job.id, ("queued",), status="running", started_at=start
+        ):
+            return  # cancelled while queued
+
+        def progress(stage: str, fraction: float) -> None:
+            self.store.update(
+                job.id, ("running",), stage=stage, progress=round(fraction, 3)
+            )
+
+        def cancelled() -> bool:
+            return self.store.status(job.id) == "cancelled"
+
+        deadline = Deadline(is_disconnected=cancelled)
+        try:
+            with scheduler.admitted_from_thread(SCHEDULER_CLASS, stop=cancelled):
+                body = run(progress, deadline)
+        except RequestCancelled as exc:
+            _log.info("Job %s cancelled before %s", job.id, exc)
+            return
+        except Exception as exc:
+            _log.exception("Job %s (%s) failed", job.id, job.kind)
+            self.store.update(
+                job.id,
+                ("running",),
+                status="failed",
+                error=f"{type(exc).__name__}: {exc}",
+                finished_at=time.time(),
+            )
+            metrics.observe_job(job.kind, "failed", time.time() - start)
+            return
+        self.store.update(
+            job.id,
+            ("running",),
+            status="done",
+            stage=None,
+            progress=1.0,
+            finished_at=time.time(),
+            result=body,
+        )
+        metrics.observe_job(job.kind, "done", time.time() - start)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; returns its state (None if unknown)."""
+        if self.store.update(
+            job_id, ACTIVE, status="cancelled", finished_at=time.time()
+        ):
+            job = self.store.get(job_id)
+            if job is not None:  # None if pruned since the update
+                metrics.observe_job(job.kind, "cancelled")
+            return job
+        return self.store.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def configure() -> JobRunner:
+    """(Re)build this worker's job runner from the environment."""
+    global _runner
+    with _runner_lock:
+        _runner = JobRunner(
+            JobStore(os.path.join(jobs_dir(), "jobs.sqlite3")),
+            workers=settings.env_int("JOBS_WORKERS", _DEFAULT_WORKERS),
+            max_pending=settings.env_int("JOBS_MAX_PENDING", _DEFAULT_MAX_PENDING),
+            ttl_s=ttl_s(),
+        )
+    return _runner
+
+
+def current() -> JobRunner:
+    return _runner or configure()
@@ -0,0 +1,104 @@
+"""app.services.lazy_imports
+
+Deferred imports for the heavy ML dependencies.
+
+``import mlflow`` alone costs well over a second (it pulls in pandas, pyarrow
+and the tracking client), and loading a model pulls in torch. Processes that
+only answer ``/health`` — or a cold start on Render/Vercel — should not pay
+for that, so the services bind these names to proxies that import the real
+module on first attribute access (i.e. the first model load or registry call)::
+
+    from app.services.lazy_imports import MlflowClient, mlflow
+
+    mlflow.pyfunc.load_model(uri)   # imports mlflow here, once
+    MlflowClient()                  # imports mlflow.tracking here, once
+
+The proxies are ordinary module attributes, so tests can still monkeypatch
+``service.mlflow.<attr>`` or ``service.MlflowClient``. Exception classes cannot
+be proxied (``except`` needs the real class); import those inside the function
+that catches them.
+
+When mlflow is first imported, the tracking/registry URI is taken from
+``MLFLOW_TRACKING_URI`` (what the services used to do at import time). Torch
+thread settings are not applied here: mlflow does not need torch, and
+:mod:`app.services.serving_topology` applies them when torch itself is
+imported.
+"""
+
+import importlib
+import os
+import threading
+import types
+from typing import Callable, Optional
+
+_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports ``name`` on first attribute access."""
+
+    def __init__(self, name: str, on_import: Optional[Callable] = None):
+        super().__init__(name)
+        self._lazy_module = None
+        self._lazy_on_import = on_import
+
+    def _lazy_load(self):
+        if self._lazy_module is None:
+            with _lock:
+                if self._lazy_module is None:
+                    module = importlib.import_module(self.__name__)
+                    if self._lazy_on_import is not None:
+                        self._lazy_on_import(module)
+                    self._lazy_module = module
+        return self._lazy_module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._lazy_load(), attr)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+class LazyAttr:
+    """Proxy for ``module.attr`` (typically a class) resolved on first use."""
+
+    def __init__(self, module: LazyModule, attr: str):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = getattr(self._module._lazy_load(), self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str):
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module.__name__}.{self._attr}>"
+
+
+def is_loaded(proxy: LazyModule) -> bool:
+    return proxy._lazy_module is not None
+
+
+def _configure_mlflow(module) -> None:
+    tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+    if tracking_uri:
+        module.set_tracking_uri(tracking_uri)
+        module.set_registry_uri(tracking_uri)
+
+
+mlflow = LazyModule("mlflow", on_import=_configure_mlflow)
+_mlflow_tracking = LazyModule(
+    "mlflow.tracking", on_import=lambda _m: mlflow._lazy_load()
+)
+MlflowClient = LazyAttr(_mlflow_tracking, "MlflowClient")
@@ -0,0 +1,362 @@
+"""app.services.metrics
+
+Prometheus metrics for the HTTP layer and the inference pipeline.
+
+Everything here is a plain counter/histogram update (no I/O, no locks held
+across requests), so it is cheap enough to leave on in production.
+
+Model-driven series carry ``model_family`` (see
+:data:`app.services.model_preload.MODEL_FAMILIES`) and ``model_version``, the
+resolved registry version of the model that actually served the work.
+
+Multi-worker deployments must set ``PROMETHEUS_MULTIPROC_DIR`` (``app.server``
+does this automatically) so ``/metrics`` aggregates every worker.
+"""
+
+import os
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and the model that served it.",
+    ["method", "route", "status", "model_family", "model_version"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "session_pipeline_stage_seconds",
+    "analyze_session latency per pipeline stage.",
+    ["stage", "model_family", "model_version"],
+    buckets=_LATENCY_BUCKETS,
+)
+SESSION_FRAMES = Histogram(
+    "session_frames_per_request",
+    "Frames received per analyze_session request.",
+    ["model_family", "model_version"],
+    buckets=(30, 100, 300, 1000, 3000, 10000, 30000, 100000),
+)
+SESSION_SEGMENTS = Histogram(
+    "session_segments_per_request",
+    "Exercise segments detected per analyze_session request.",
+    ["model_family", "model_version"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+SESSION_ABANDONED = Counter(
+    "session_requests_abandoned_total",
+    "analyze_session requests stopped early, by reason (deadline, disconnected).",
+    ["reason"],
+)
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "scheduler_queue_depth",
+    "Requests waiting for an inference slot, by priority class.",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+SCHEDULER_IN_FLIGHT = Gauge(
+    "scheduler_in_flight",
+    "Requests holding an inference slot, by priority class.",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+SCHEDULER_WAIT_SECONDS = Histogram(
+    "scheduler_wait_seconds",
+    "Time a request waited for an inference slot, by priority class.",
+    ["priority"],
+    buckets=(0.0005,) + _LATENCY_BUCKETS,
+)
+SCHEDULER_REJECTED = Counter(
+    "scheduler_rejected_total",
+    "Requests rejected because their priority class queue was full.",
+    ["priority"],
+)
+JOBS = Counter(
+    "jobs_total",
+    "Asynchronous jobs by kind and outcome (created, deduplicated, rejected, done, "
+    "failed, cancelled).",
+    ["kind", "outcome"],
+)
+JOB_SECONDS = Histogram(
+    "job_duration_seconds",
+    "Run time of finished asynchronous jobs, by kind.",
+    ["kind"],
+    buckets=_LATENCY_BUCKETS + (60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+MODEL_LOAD_SECONDS = Histogram(
+    "model_load_duration_seconds",
+    "Time to load a model (download + deserialize) into the process cache.",
+    ["model_family", "model_version"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+MODEL_LOAD_FAILURES = Counter(
+    "model_load_failures_total",
+    "Model loads that raised.",
+    ["model_family"],
+)
+SHADOW_COMPARISONS = Counter(
+    "shadow_comparisons_total",
+    "Champion requests replayed on the challenger, by outcome.",
+    ["model_family", "outcome"],
+)
+SHADOW_ABS_DELTA = Histogram(
+    "shadow_prediction_abs_delta",
+    "Mean |challenger - champion| output delta per shadowed request.",
+    ["model_family"],
+    buckets=(0.0, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# analyze_session timing key → model family that does the work.
+# Stages without a model are reported under the "pipeline" family.
+_STAGE_FAMILIES: Dict[str, str] = {
+    "start_stop_ms": "start_stop",
+    "smooth_ms": "start_stop",
+    "goodbad_ms": "goodbad",
+    "scoring_ms": "scoring",
+}
+_NO_MODEL = "none"
+
+# Inference route template → (model family, variant) serving it. Analysis
+# routes are labelled with the start/stop model, which every session runs.
+ROUTE_MODELS: Dict[str, Tuple[str, str]] = {
+    "/api/v1/predict/champion": ("predict", "champion"),
+    "/api/v1/predict/latest": ("predict", "latest"),
+    "/api/v1/weakest-link/champion": ("weakest_link", "champion"),
+    "/api/v1/weakest-link/latest": ("weakest_link", "latest"),
+    "/api/v1/z-predictor/champion": ("z_predictor", "champion"),
+    "/api/v1/z-predictor/latest": ("z_predictor", "latest"),
+    "/api/v1/z-predictor/predict-sequence": ("z_predictor", "champion"),
+    "/api/v1/z-predictor/predict-recording": ("z_predictor", "champion"),
+    "/api/v1/squat/analyze-session": ("start_stop", "champion"),
+    "/api/v1/squat/analyze-session/stream": ("start_stop", "champion"),
+}
+
+# models:/Name@alias URI → registry version it resolved to when it was loaded.
+_alias_versions: Dict[str, str] = {}
+
+
+def model_version(uri: Optional[str]) -> str:
+    """Short, low-cardinality version label for a model URI.
+
+    ``models:/Name/3`` → ``"3"``, ``models:/Name@prod`` → the version the alias
+    pointed to when the model was loaded (the alias itself if that is not
+    known), ``runs:/<run_id>/model`` → ``"run-<first 8 chars>"``.
+    """
+    if not uri:
+        return "unknown"
+    if uri.startswith("models:/"):
+        head = uri[len("models:/") :]
+        if "@" in head.split("/", 1)[0]:
+            if uri in _alias_versions:
+                return _alias_versions[uri]
+            return head.split("@", 1)[1].split("/", 1)[0] or "unknown"
+        parts = head.split("/")
+        return parts[1] if len(parts) > 1 and parts[1] else "unknown"
+    if uri.startswith("runs:/"):
+        run_id = uri[len("runs:/") :].split("/", 1)[0]
+        return f"run-{run_id[:8]}" if run_id else "unknown"
+    return "unknown"
+
+
+def loaded_model_version(family: str, variant: str = "champion") -> str:
+    """Version label of the cached model for (family, variant), without loading it."""
+    from app.services.model_preload import MODEL_FAMILIES
+
+    service = MODEL_FAMILIES.get(family)
+    if service is None:
+        return "unknown"
+    direct_uri = service._direct_uri_for_variant(variant)
+    entry = service._cache.get(direct_uri) if direct_uri else None
+    return model_version(entry[1]) if entry else "unknown"
+
+
+def _route_model(route: str) -> Tuple[str, str]:
+    """``(model_family, model_version)`` labels for a request to ``route``."""
+    served = ROUTE_MODELS.get(route)
+    if served is None:
+        return _NO_MODEL, _NO_MODEL
+    family, variant = served
+    return family, loaded_model_version(family, variant)
+
+
+def _remember_alias_version(uri: Optional[str]) -> None:
+    """Record the version behind a just-loaded ``models:/Name@alias`` URI."""
+    if not uri or not uri.startswith("models:/"):
+        return
+    head = uri[len("models:/") :].split("/", 1)[0]
+    if "@" not in head:
+        return
+    name, alias = [part.strip() for part in head.split("@", 1)]
+    try:
+        from app.services import model_registry
+
+        # The load resolved the run id through the same (cached) snapshot.
+        info = model_registry.snapshot(name).resolve_alias(alias)
+    except Exception:
+        _alias_versions.pop(uri, None)
+        return
+    _alias_versions[uri] = str(info.version)
+
+
+def observe_model_load(family: str, uri_used: Optional[str], seconds: float) -> None:
+    _remember_alias_version(uri_used)
+    MODEL_LOAD_SECONDS.labels(family, model_version(uri_used)).observe(seconds)
+
+
+def observe_model_load_failure(family: str) -> None:
+    MODEL_LOAD_FAILURES.labels(family).inc()
+
+
+def observe_shadow_outcome(family: str, outcome: str) -> None:
+    SHADOW_COMPARISONS.labels(family, outcome).inc()
+
+
+def observe_shadow_delta(family: str, delta) -> None:
+    SHADOW_COMPARISONS.labels(family, "compared").inc()
+    if len(delta):
+        SHADOW_ABS_DELTA.labels(family).observe(float(abs(delta).mean()))
+
+
+@contextmanager
+def model_load_timer(family: str):
+    """Time a cache-miss load; set ``record["uri"]`` to the URI actually loaded."""
+    record: Dict[str, Optional[str]] = {"uri": None}
+    start = perf_counter()
+    try:
+        yield record
+    except Exception:
+        observe_model_load_failure(family)
+        raise
+    observe_model_load(family, record["uri"], perf_counter() - start)
+
+
+def observe_session(
+    timings: Dict[str, float], n_frames: int, n_segments: int
+) -> None:
+    """Record one analyze_session call from its ``timings`` dict (ms values)."""
+    versions: Dict[str, str] = {}
+
+    def _version(family: str) -> str:
+        if family not in versions:
+            versions[family] = loaded_model_version(family)
+        return versions[family]
+
+    for key, ms in timings.items():
+        if not key.endswith("_ms"):
+            continue
+        family = _STAGE_FAMILIES.get(key)
+        stage = key[: -len("_ms")]
+        if family is None:
+            PIPELINE_STAGE_SECONDS.labels(stage, "pipeline", _NO_MODEL).observe(
+                ms / 1000.0
+            )
+        else:
+            PIPELINE_STAGE_SECONDS.labels(stage, family, _version(family)).observe(
+                ms / 1000.0
+            )
+
+    ss_version = _version("start_stop")
+    SESSION_FRAMES.labels("start_stop", ss_version).observe(n_frames)
+    SESSION_SEGMENTS.labels("start_stop", ss_version).observe(n_segments)
+
+
+def observe_abandoned(reason: str) -> None:
+    """Count one analyze_session request cut short (``deadline``/``disconnected``)."""
+    SESSION_ABANDONED.labels(reason).inc()
+
+
+def set_scheduler_state(priority: str, waiting: int, in_flight: int) -> None:
+    SCHEDULER_QUEUE_DEPTH.labels(priority).set(waiting)
+    SCHEDULER_IN_FLIGHT.labels(priority).set(in_flight)
+
+
+def observe_scheduler_wait(priority: str, seconds: float) -> None:
+    SCHEDULER_WAIT_SECONDS.labels(priority).observe(seconds)
+
+
+def observe_scheduler_rejected(priority: str) -> None:
+    SCHEDULER_REJECTED.labels(priority).inc()
+
+
+def observe_job(kind: str, outcome: str, seconds: Optional[float] = None) -> None:
+    JOBS.labels(kind, outcome).inc()
+    if seconds is not None:
+        JOB_SECONDS.labels(kind).observe(seconds)
+
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware: request latency per route template + in-flight gauge.
+
+    Uses the matched route template (``/api/v1/predict/{variant}`` style) as the
+    label so raw paths can never blow up label cardinality. Inference routes
+    (:data:`ROUTE_MODELS`) also carry the family and the version of the model
+    that is loaded once the request is done; other routes get ``"none"``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            elapsed = perf_counter() - start
+            route = getattr(scope.get("route"), "path", "unmatched")
+            family, version = _route_model(route)
+            HTTP_REQUEST_SECONDS.labels(
+                scope.get("method", ""), route, str(status["code"]), family, version
+            ).observe(elapsed)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Serialize the current metrics in the Prometheus text format."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
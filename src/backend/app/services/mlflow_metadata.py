@@ -0,0 +1,170 @@
+"""app.services.mlflow_metadata
+
+Process-wide TTL cache for MLflow run metadata and registry snapshots.
+
+The model-info endpoints are polled by the UI and used to call
+``MlflowClient().get_run`` (a remote DagsHub round trip) on every request.
+Everything that reads run params/metrics now goes through this cache, as do
+the registry snapshots of :mod:`app.services.model_registry`::
+
+    params = mlflow_metadata.run_params(run_id)
+    metrics = mlflow_metadata.run_metrics(run_id)
+    value = mlflow_metadata.cached(key, loader)
+
+Semantics (stale-while-revalidate):
+
+- fresh entry (younger than ``MLFLOW_METADATA_TTL_S``, default 300 s) —
+  returned as is;
+- stale entry — returned as is, and a refresh is queued on a background
+  thread (one in flight per key), so requests never wait on the registry;
+- missing entry — fetched synchronously (first use only; loading a model
+  already warms its run).
+
+Loader errors are never cached: a failed first fetch propagates to the
+caller, a failed background refresh keeps serving the old value and retries
+after ``_RETRY_S``.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, NamedTuple, Optional
+
+from app.services import settings
+from app.services.lazy_imports import MlflowClient
+
+_log = logging.getLogger(__name__)
+
+_DEFAULT_TTL_S = 300.0
+_RETRY_S = 30.0
+_REFRESH_THREADS = 2
+
+
+def ttl_s() -> float:
+    return settings.env_float("MLFLOW_METADATA_TTL_S", _DEFAULT_TTL_S, inclusive=True)
+
+
+class _Entry(NamedTuple):
+    value: object
+    expires_at: float
+
+
+class TTLCache:
+    """Thread-safe stale-while-revalidate cache keyed by hashable keys."""
+
+    def __init__(self, ttl: Optional[Callable[[], float]] = None):
+        self._ttl = ttl or ttl_s
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._refreshing: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, key: Hashable, loader: Callable[[], object]) -> object:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at <= now and key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._submit(key, loader)
+                return entry.value
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic() + self._ttl())
+        return value
+
+    def _submit(self, key: Hashable, loader: Callable[[], object]) -> None:
+        # Called with self._lock held.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=_REFRESH_THREADS, thread_name_prefix="mlflow-metadata"
+            )
+        self._executor.submit(self._refresh, key, loader)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], object]) -> None:
+        try:
+            value = loader()
+            expires_at = time.monotonic() + self._ttl()
+        except Exception as e:
+            _log.warning("Background refresh of %r failed: %s", key, e)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries[key] = entry._replace(
+                        expires_at=time.monotonic() + min(self._ttl(), _RETRY_S)
+                    )
+                self._refreshing.discard(key)
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value, expires_at)
+            self._refreshing.discard(key)
+
+    def wait_for_refreshes(self, timeout: float = 5.0) -> None:
+        """Block until queued refreshes finish (tests and shutdown)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._refreshing:
+                    return
+            time.sleep(0.005)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+
+    def _reset_after_fork(self) -> None:
+        # Worker threads do not survive fork (preload mode forks workers from
+        # a master that may already have used the cache).
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = None
+
+
+_cache = TTLCache()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_cache._reset_after_fork)
+
+
+def cached(key: Hashable, loader: Callable[[], object]) -> object:
+    """Return ``loader()`` through the shared cache under ``key``."""
+    return _cache.get(key, loader)
+
+
+class RunData(NamedTuple):
+    params: Dict[str, str]
+    metrics: Dict[str, float]
+
+
+def _load_run(run_id: str) -> RunData:
+    run = MlflowClient().get_run(run_id)
+    return RunData(dict(run.data.params), dict(run.data.metrics))
+
+
+def run_data(run_id: str) -> RunData:
+    """Params and latest metrics of an MLflow run (cached)."""
+    return _cache.get(("run", run_id), lambda: _load_run(run_id))
+
+
+def run_params(run_id: str) -> Dict[str, str]:
+    return run_data(run_id).params
+
+
+def run_metrics(run_id: str) -> Dict[str, float]:
+    return run_data(run_id).metrics
+
+
+def invalidate(key: Hashable) -> None:
+    """Drop ``key`` so the next lookup fetches synchronously."""
+    _cache.invalidate(key)
+
+
+def clear() -> None:
+    _cache.clear()
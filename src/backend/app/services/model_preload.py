@@ -0,0 +1,94 @@
+"""app.services.model_preload
+
+Preload every configured model into the per-service caches.
+
+Used by the prefork launcher (``app.server``): the master process loads all
+models once, freezes the GC heap and then forks the workers. Workers inherit
+the populated caches copy-on-write, so N workers share one copy of the weights
+and never hit MLflow at startup.
+
+Families are keyed by the names used in logs, metrics and diagnostics.
+"""
+
+import gc
+import logging
+import os
+from time import perf_counter
+from typing import Dict
+
+from app.services import (
+    goodbad_model_service,
+    model_service,
+    scoring_model_service,
+    start_stop_model_service,
+    weaklink_model_service,
+    z_model_service,
+)
+
+_log = logging.getLogger(__name__)
+
+MODEL_FAMILIES = {
+    "predict": model_service,
+    "weakest_link": weaklink_model_service,
+    "z_predictor": z_model_service,
+    "start_stop": start_stop_model_service,
+    "goodbad": goodbad_model_service,
+    "scoring": scoring_model_service,
+}
+
+# Variants served by the HTTP endpoints (backup is only used by scripts).
+PRELOAD_VARIANTS = ("champion", "latest")
+
+_status: Dict[str, object] = {"preloaded": False, "preload_pid": None, "models": {}}
+
+
+def preload_models() -> Dict[str, Dict[str, dict]]:
+    """Load every configured (family, variant) pair; never raises.
+
+    Returns ``{family: {variant: {"uri", "load_ms" | "error"}}}``.
+    Unconfigured variants are skipped.
+    """
+    summary: Dict[str, Dict[str, dict]] = {}
+    for family, service in MODEL_FAMILIES.items():
+        for variant in PRELOAD_VARIANTS:
+            uri = service._direct_uri_for_variant(variant)
+            if not uri:
+                continue
+            entry: dict = {"uri": uri}
+            t = perf_counter()
+            try:
+                service.get_model(variant)
+                entry["load_ms"] = round((perf_counter() - t) * 1000, 1)
+            except Exception as exc:
+                # A missing model must not keep the other families from loading;
+                # the worker will retry lazily on first request.
+                entry["error"] = f"{type(exc).__name__}: {exc}"
+                _log.error("Preload failed for %s/%s: %s", family, variant, exc)
+            summary.setdefault(family, {})[variant] = entry
+
+    _status.update(preloaded=True, preload_pid=os.getpid(), models=summary)
+    _log.info(
+        "Preloaded %d model(s) in pid %d",
+        sum(1 for v in summary.values() for e in v.values() if "error" not in e),
+        os.getpid(),
+    )
+    return summary
+
+
+def freeze_heap() -> None:
+    """Move every live object to the permanent GC generation before fork.
+
+    Without this the first GC pass in each worker touches the refcount/GC
+    headers of every preloaded object and un-shares their pages.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def status() -> dict:
+    """Preload summary plus which families are resident in *this* process."""
+    resident = {
+        family: bool(getattr(service, "_cache", None))
+        for family, service in MODEL_FAMILIES.items()
+    }
+    return {**_status, "pid": os.getpid(), "resident": resident}
@@ -0,0 +1,203 @@
+"""app.services.model_registry
+
+In-process snapshot of the MLflow model registry.
+
+Every service used to resolve ``models:/...`` URIs with its own remote calls:
+``get_model_version_by_alias``, then (on DagsHub, which rejects aliases) a
+``search_model_versions`` + sort of all versions, and for ``_fetch_run_id``
+often the same search again. With N model families × M variants that is N×M
+searches per cold start and more on every cache miss.
+
+Instead, the versions (with their run_id, stage and aliases) of each
+registered model are fetched with a single ``search_model_versions`` call and
+kept as a :class:`ModelSnapshot` in the shared TTL cache of
+:mod:`app.services.mlflow_metadata`. Snapshots refresh per model in the
+background once stale, and a version number that is not in the snapshot yet
+(registered after it was taken) triggers one synchronous re-fetch of that
+model only.
+
+Alias semantics (same as the per-service resolvers this replaces):
+
+- a real registry alias wins: taken from the search results when the server
+  reports aliases there, otherwise from one ``get_model_version_by_alias``
+  call whose answer is kept in the snapshot;
+- when the alias lookup fails the conventions apply, as they did in the
+  per-service resolvers. A rejection (``INVALID_PARAMETER_VALUE``: DagsHub, or
+  no such alias) is kept in the snapshot; any other error is logged and the
+  lookup is retried on the next call:
+  - ``prod``/``production``: newest version in the Production stage, else newest;
+  - ``backup``: second-newest version (newest if there is only one);
+  - ``dev``/``latest`` and anything else: newest version.
+
+The functions take the caller's ``MlflowClient`` factory so each service keeps
+talking to the registry through its own (patchable) module attribute.
+"""
+
+import logging
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from app.services import mlflow_metadata
+from app.services.lazy_imports import MlflowClient
+
+_log = logging.getLogger(__name__)
+
+
+class VersionInfo(NamedTuple):
+    version: int
+    run_id: Optional[str]
+    stage: str
+    aliases: Tuple[str, ...]
+
+
+class ModelSnapshot(NamedTuple):
+    name: str
+    versions: Tuple[VersionInfo, ...]  # ascending by version
+    # Aliases reported by the search, plus every alias resolved since.
+    by_alias: Dict[str, VersionInfo]
+
+    def version(self, number: int) -> Optional[VersionInfo]:
+        for info in self.versions:
+            if info.version == number:
+                return info
+        return None
+
+    def latest_in_stage(self, stage: str) -> Optional[VersionInfo]:
+        s = stage.lower()
+        matching = [info for info in self.versions if info.stage.lower() == s]
+        return matching[-1] if matching else None
+
+    def fallback_for_alias(self, alias: str) -> VersionInfo:
+        """Pick a version for ``alias`` by convention (no registry alias)."""
+        if not self.versions:
+            raise RuntimeError(f"No versions found for model '{self.name}'")
+        latest = self.versions[-1]
+        a = alias.lower().strip()
+        if a in {"prod", "production"}:
+            return self.latest_in_stage("production") or latest
+        if a == "backup":
+            return self.versions[-2] if len(self.versions) >= 2 else latest
+        return latest
+
+    def resolve_alias(
+        self, alias: str, client_factory: Callable = MlflowClient
+    ) -> VersionInfo:
+        """Version behind ``alias``; asks the registry once if the search had no alias."""
+        info = self.by_alias.get(alias)
+        if info is None:
+            try:
+                mv = client_factory().get_model_version_by_alias(self.name, alias)
+            except Exception as e:
+                if "INVALID_PARAMETER_VALUE" not in str(e):
+                    _log.warning(
+                        "Alias lookup %s@%s failed (%s); using the naming convention",
+                        self.name,
+                        alias,
+                        e,
+                    )
+                    return self.fallback_for_alias(alias)
+                info = self.fallback_for_alias(alias)
+            else:
+                info = _version_info(mv)
+            self.by_alias[alias] = info
+        return info
+
+
+def _version_info(mv) -> VersionInfo:
+    return VersionInfo(
+        version=int(mv.version),
+        run_id=getattr(mv, "run_id", None),
+        stage=getattr(mv, "current_stage", "") or "",
+        aliases=tuple(getattr(mv, "aliases", None) or ()),
+    )
+
+
+def _load_snapshot(name: str, client_factory: Callable) -> ModelSnapshot:
+    versions = tuple(
+        sorted(
+            (
+                _version_info(mv)
+                for mv in client_factory().search_model_versions(f"name='{name}'")
+            ),
+            key=lambda info: info.version,
+        )
+    )
+    by_alias = {alias: info for info in versions for alias in info.aliases}
+    return ModelSnapshot(name, versions, by_alias)
+
+
+def snapshot(name: str, client_factory: Callable = MlflowClient) -> ModelSnapshot:
+    """Versions and aliases of registered model ``name`` (cached)."""
+    return mlflow_metadata.cached(
+        ("registry", name), lambda: _load_snapshot(name, client_factory)
+    )
+
+
+def _refetch(name: str, client_factory: Callable) -> ModelSnapshot:
+    mlflow_metadata.invalidate(("registry", name))
+    return snapshot(name, client_factory)
+
+
+def fallback_alias_uri(
+    name: str, alias: str, client_factory: Callable = MlflowClient
+) -> str:
+    """Concrete ``models:/Name/<version>`` URI for ``Name@alias``.
+
+    For callers whose ``@alias`` load was rejected: no alias lookup is made,
+    only aliases already known to the snapshot beat the conventions.
+    """
+    snap = snapshot(name, client_factory)
+    info = snap.by_alias.get(alias) or snap.fallback_for_alias(alias)
+    return f"models:/{name}/{info.version}"
+
+
+def _split_models_uri(uri: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """``models:/Name@alias`` → (name, alias, None); ``models:/Name/sel`` → (name, None, sel)."""
+    tail = uri[len("models:/") :]
+    head = tail.split("/", 1)[0]
+    if "@" in head:
+        name, alias = [part.strip() for part in head.split("@", 1)]
+        return name, alias, None
+    parts = [p.strip() for p in tail.split("/", 2)]
+    return parts[0], None, (parts[1] if len(parts) >= 2 else None)
+
+
+def run_id_for_uri(
+    uri: Optional[str],
+    client_factory: Callable = MlflowClient,
+    latest_if_no_stage_match: bool = False,
+) -> Optional[str]:
+    """Resolve the MLflow run_id behind a ``runs:/`` or ``models:/`` URI.
+
+    ``models:/Name/<stage>`` resolves to the newest version in that stage; with
+    ``latest_if_no_stage_match`` an empty stage falls back to the newest version.
+    """
+    if not uri:
+        return None
+    if uri.startswith("runs:/"):
+        tail = uri[len("runs:/") :]
+        return tail.split("/", 1)[0] if tail else None
+    if not uri.startswith("models:/"):
+        return None
+
+    name, alias, selector = _split_models_uri(uri)
+    if not name or (alias is None and not selector):
+        return None
+    if alias is not None:
+        if not alias:
+            return None
+        return (
+            snapshot(name, client_factory).resolve_alias(alias, client_factory).run_id
+        )
+
+    if selector.isdigit():
+        number = int(selector)
+        info = snapshot(name, client_factory).version(number)
+        if info is None:
+            info = _refetch(name, client_factory).version(number)
+        return info.run_id if info else None
+
+    snap = snapshot(name, client_factory)
+    info = snap.latest_in_stage(selector)
+    if info is None and latest_if_no_stage_match and snap.versions:
+        info = snap.versions[-1]
+    return info.run_id if info else None
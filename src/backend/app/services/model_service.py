@@ -16,10 +16,10 @@ import os
 import threading
 from typing import Dict, Optional, Tuple
 
-import mlflow
 import numpy as np
-from mlflow.tracking import MlflowClient
-from mlflow.exceptions import RestException
+
+from app.services import metrics, model_registry
+from app.services.lazy_imports import MlflowClient, mlflow
 
 # Thread-safe, process-local model cache:
 # key = model URI, value = (loaded_model, uri_used, run_id)
@@ -49,39 +49,9 @@ def _parse_runs_uri(uri: str) -> Optional[str]:
 
 def _parse_models_uri(uri: str) -> Optional[str]:
     """Resolve a run_id for a `models:/...` URI (version, stage, or alias)."""
-    client = MlflowClient()
-    tail = uri[len("models:/") :]
-    head = tail.split("/", 1)[0]
-
-    if "@" in head:
-        name, alias = [part.strip() for part in head.split("@", 1)]
-        if not name or not alias:
-            return None
-        try:
-            mv = client.get_model_version_by_alias(name, alias)
-            return getattr(mv, "run_id", None)
-        except Exception:
-            return _fetch_run_id(_resolve_alias_to_version_uri(name, alias))
-
-    parts = [p.strip() for p in tail.split("/", 2)]
-    if len(parts) < 2:
-        return None
-
-    name, selector = parts[0], parts[1]
-
-    if selector.isdigit():
-        mv = client.get_model_version(name, selector)
-        return getattr(mv, "run_id", None)
-
-    versions = client.get_latest_versions(
-        name, stages=[selector]
-    ) or client.search_model_versions(f"name='{name}'")
-
-    if not versions:
-        return None
-
-    chosen = max(versions, key=lambda mv: int(mv.version))
-    return getattr(chosen, "run_id", None)
+    return model_registry.run_id_for_uri(
+        uri, MlflowClient, latest_if_no_stage_match=True
+    )
 
 
 def _clean_uri(value: Optional[str]) -> Optional[str]:
@@ -92,13 +62,10 @@ def _clean_uri(value: Optional[str]) -> Optional[str]:
 
 
 # ---------------------------------------------------------------------------
-# MLflow initialization (import-time)
+# MLflow initialization
 # ---------------------------------------------------------------------------
-# If MLFLOW_TRACKING_URI is set, configure both tracking + registry URIs once.
-_initial_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-if _initial_tracking_uri:
-    mlflow.set_tracking_uri(_initial_tracking_uri)
-    mlflow.set_registry_uri(_initial_tracking_uri)
+# mlflow is imported on first use (app.services.lazy_imports), which also
+# configures both tracking + registry URIs from MLFLOW_TRACKING_URI once.
 
 
 # * Expected "entry point"
@@ -153,34 +120,7 @@ def _resolve_alias_to_version_uri(model_name: str, alias: str) -> str:
     - dev/latest: latest version overall
     - backup: second-latest version overall (or latest if only one exists)
     """
-    client = MlflowClient()
-    versions = client.search_model_versions(f"name='{model_name}'")
-    if not versions:
-        raise RuntimeError(f"No versions found for model '{model_name}'")
-
-    versions_sorted = sorted(versions, key=lambda mv: int(mv.version))
-    latest = versions_sorted[-1]
-    second_latest = versions_sorted[-2] if len(versions_sorted) >= 2 else latest
-
-    a = alias.lower().strip()
-
-    if a in {"prod", "production"}:
-        prod_candidates = [
-            mv
-            for mv in versions_sorted
-            if (getattr(mv, "current_stage", "") or "").lower() == "production"
-        ]
-        chosen = prod_candidates[-1] if prod_candidates else latest
-        return f"models:/{model_name}/{chosen.version}"
-
-    if a in {"dev", "latest"}:
-        return f"models:/{model_name}/{latest.version}"
-
-    if a in {"backup"}:
-        return f"models:/{model_name}/{second_latest.version}"
-
-    # Unknown alias -> safest default
-    return f"models:/{model_name}/{latest.version}"
+    return model_registry.fallback_alias_uri(model_name, alias, MlflowClient)
 
 
 def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
@@ -189,6 +129,8 @@ def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
     If `uri` is `models:/Name@alias` and the registry does not support alias lookup,
     we resolve the alias to a concrete version URI and load that instead.
     """
+    from mlflow.exceptions import RestException
+
     try:
         model = mlflow.pyfunc.load_model(uri)
         return model, uri
@@ -204,6 +146,8 @@ def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
 
 def get_model(variant: str = "champion") -> Optional[Tuple[object, str, Optional[str]]]:
     """Load (and cache) the model for a given variant."""
+    from mlflow.exceptions import RestException
+
     _init_mlflow()
     try:
         direct_uri = _direct_uri_for_variant(variant)
@@ -214,8 +158,10 @@ def get_model(variant: str = "champion") -> Optional[Tuple[object, str, Optional
                     model, uri_used, _run_id = _cache[cache_key]
                     return model, uri_used, _run_id
 
-                model, uri_used = _load_model_with_alias_fallback(direct_uri)
-                run_id = _fetch_run_id(uri_used)
+                with metrics.model_load_timer("predict") as load:
+                    model, uri_used = _load_model_with_alias_fallback(direct_uri)
+                    load["uri"] = uri_used
+                    run_id = _fetch_run_id(uri_used)
                 _cache[cache_key] = (model, uri_used, run_id)
                 return model, uri_used, run_id
     except RestException:
@@ -0,0 +1,182 @@
+"""app.services.pose_features
+
+Shared segment feature kernel for the GoodBad and scoring models.
+
+Both models take ``(c_frames, 61)`` inputs built from one exercise segment:
+39 joint coordinates, 16 joint-pair distances normalised by the mean shoulder
+width of the segment and 6 joint-angle cosines, with ``c_frames`` rows sampled
+equidistantly (zero-padded when the segment is shorter). They differ only in
+the joint column order and the axis convention of the coordinates:
+
+- GoodBad: Kinect SDK joint order, ``(x, y, z)`` as received;
+- scoring: A11 CSV joint order, ``(-x, -y, 0)``.
+
+A sign flip changes neither a distance nor a cosine and a zeroed axis simply
+drops out of both, so the segment is gathered once in the canonical joint
+order — only the rows that get sampled — and each model's input is a column
+permutation plus a per-axis sign/mask of it (:class:`FeatureLayout`), with the
+distances, cosines and shoulder-width scale from :mod:`app.services.pose_geometry`
+(the zeroed axis passed as a 0 axis weight)::
+
+    segment = pose_features.Segment.from_frames(frames)
+    x_goodbad = segment.model_input(goodbad_layout, c_frames)
+    x_scoring = segment.model_input(scoring_layout, c_frames)  # reuses geometry
+"""
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.services import pose_geometry
+
+# Canonical joint order of a session tensor (start/stop and z-predictor order).
+CANONICAL_JOINTS: Tuple[str, ...] = (
+    "nose",
+    "left_shoulder",
+    "left_elbow",
+    "right_shoulder",
+    "right_elbow",
+    "left_wrist",
+    "right_wrist",
+    "left_hip",
+    "right_hip",
+    "left_knee",
+    "right_knee",
+    "left_ankle",
+    "right_ankle",
+)
+_INDEX: Dict[str, int] = {name: i for i, name in enumerate(CANONICAL_JOINTS)}
+
+# 16 joint-pair distances (normalised by shoulder width).
+DIST_PAIRS: Tuple[Tuple[str, str], ...] = (
+    ("left_shoulder", "right_shoulder"),
+    ("left_elbow", "right_elbow"),
+    ("left_wrist", "right_wrist"),
+    ("left_hip", "right_hip"),
+    ("left_knee", "right_knee"),
+    ("left_ankle", "right_ankle"),
+    ("left_shoulder", "left_elbow"),
+    ("left_elbow", "left_wrist"),
+    ("right_shoulder", "right_elbow"),
+    ("right_elbow", "right_wrist"),
+    ("left_hip", "left_knee"),
+    ("left_knee", "left_ankle"),
+    ("right_hip", "right_knee"),
+    ("right_knee", "right_ankle"),
+    ("left_shoulder", "left_hip"),
+    ("right_shoulder", "right_hip"),
+)
+
+# 6 joint-angle triples (a, vertex, b) — angle measured at vertex.
+ANGLE_TRIPLES: Tuple[Tuple[str, str, str], ...] = (
+    ("left_shoulder", "left_elbow", "left_wrist"),
+    ("right_shoulder", "right_elbow", "right_wrist"),
+    ("left_hip", "left_knee", "left_ankle"),
+    ("right_hip", "right_knee", "right_ankle"),
+    ("left_elbow", "left_shoulder", "left_hip"),
+    ("right_elbow", "right_shoulder", "right_hip"),
+)
+
+N_FEATURES = len(CANONICAL_JOINTS) * 3 + len(DIST_PAIRS) + len(ANGLE_TRIPLES)
+
+_PAIR_A = np.array([_INDEX[a] for a, _ in DIST_PAIRS])
+_PAIR_B = np.array([_INDEX[b] for _, b in DIST_PAIRS])
+_ANGLE_A = np.array([_INDEX[a] for a, _, _ in ANGLE_TRIPLES])
+_ANGLE_V = np.array([_INDEX[v] for _, v, _ in ANGLE_TRIPLES])
+_ANGLE_B = np.array([_INDEX[b] for _, _, b in ANGLE_TRIPLES])
+_LEFT_SHOULDER = _INDEX["left_shoulder"]
+_RIGHT_SHOULDER = _INDEX["right_shoulder"]
+
+
+class FeatureLayout(NamedTuple):
+    """Joint column order and per-axis sign (0 = axis zeroed) of a model input."""
+
+    joints: Tuple[str, ...]
+    axis_sign: Tuple[float, float, float] = (1.0, 1.0, 1.0)
+
+    @property
+    def permutation(self) -> np.ndarray:
+        return np.array([_INDEX[name] for name in self.joints])
+
+    @property
+    def axis_weights(self) -> np.ndarray:
+        """1 for every axis that enters distances/angles, 0 for zeroed axes."""
+        return (np.asarray(self.axis_sign, dtype=np.float32) != 0).astype(np.float32)
+
+
+def session_tensor(frames: Union[Sequence[List[Dict]], np.ndarray]) -> np.ndarray:
+    """``(n_frames, 13, 3)`` float32 xyz in :data:`CANONICAL_JOINTS` order.
+
+    Missing joints are 0; for repeated names the last keypoint wins. An
+    ``(n_frames, 13, 3)`` array (e.g. a streamed upload,
+    :mod:`app.services.frame_buffer`) is taken as is, NaN (missing) → 0.
+    """
+    if isinstance(frames, np.ndarray):
+        return np.nan_to_num(frames.astype(np.float32), copy=False, nan=0.0)
+    out = np.zeros((len(frames), len(CANONICAL_JOINTS), 3), dtype=np.float32)
+    for f, kp3d in enumerate(frames):
+        for kp in kp3d:
+            j = _INDEX.get(kp["name"])
+            if j is not None:
+                out[f, j] = (float(kp["x"]), float(kp["y"]), float(kp.get("z", 0.0)))
+    return out
+
+
+def resample_rows(n: int, target: int) -> np.ndarray:
+    """Rows sampled by ``to_fixed_length``: all if ``n <= target``, else equidistant."""
+    if n <= target:
+        return np.arange(n)
+    return np.round(np.linspace(0, n - 1, target)).astype(int)
+
+
+class Segment:
+    """One exercise segment; sampled rows are shared across :meth:`model_input` calls."""
+
+    def __init__(self, tensor: np.ndarray):
+        self.tensor = np.asarray(tensor, dtype=np.float32)
+        self._geometry: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[List[Dict]]) -> "Segment":
+        return cls(session_tensor(frames))
+
+    def __len__(self) -> int:
+        return len(self.tensor)
+
+    def _sampled(self, rows: np.ndarray) -> np.ndarray:
+        key = tuple(rows.tolist())
+        points = self._geometry.get(key)
+        if points is None:
+            points = self._geometry[key] = np.ascontiguousarray(self.tensor[rows])
+        return points
+
+    def features(self, layout: FeatureLayout, rows: np.ndarray) -> np.ndarray:
+        """``(len(rows), 61)`` float32 features of the given rows."""
+        w = layout.axis_weights
+        t = self._sampled(rows)
+
+        # Scale: mean shoulder width over ALL frames of the segment.
+        scale = pose_geometry.shoulder_width_scale(
+            self.tensor, _LEFT_SHOULDER, _RIGHT_SHOULDER, w
+        )
+        dist = pose_geometry.pair_distances(t, _PAIR_A, _PAIR_B, w) / scale
+        cos = pose_geometry.vertex_cosines(t, _ANGLE_A, _ANGLE_V, _ANGLE_B, w)
+
+        sign = np.asarray(layout.axis_sign, dtype=np.float32)
+        base = t[:, layout.permutation] * sign
+        base[..., sign == 0] = 0.0
+        return np.hstack([base.reshape(len(rows), -1), dist, cos]).astype(np.float32)
+
+    def model_input(self, layout: FeatureLayout, c_frames: int) -> np.ndarray:
+        """``(c_frames, 61)`` model input: sampled rows, zero-padded if short."""
+        rows = resample_rows(len(self), c_frames)
+        out = self.features(layout, rows)
+        if len(out) < c_frames:
+            pad = np.zeros((c_frames - len(out), out.shape[1]), dtype=np.float32)
+            out = np.vstack([out, pad])
+        return out
+
+
+def as_segment(frames: Union[Segment, Sequence[List[Dict]]]) -> Segment:
+    """Pass a :class:`Segment` through; build one from keypoint frames otherwise."""
+    return frames if isinstance(frames, Segment) else Segment.from_frames(frames)
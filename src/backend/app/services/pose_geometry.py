@@ -0,0 +1,285 @@
+"""app.services.pose_geometry
+
+Batch geometric primitives over ``(n_frames, n_joints, n_axes)`` pose arrays.
+
+The squat classifier (knee angles) and the GoodBad/scoring feature kernel
+(:mod:`app.services.pose_features`) reduce to the same few operations (the data
+scripts keep a numpy copy of the two they use in ``src/scripts/pose_geometry.py``):
+
+- :func:`pair_distances` — per-frame distance between joint pairs;
+- :func:`vertex_cosines` / :func:`vertex_angles` — cosine / angle at a vertex
+  joint between the vectors to two other joints;
+- :func:`shoulder_width_scale` — mean left/right shoulder distance, the
+  normalisation scale of the model features;
+- :func:`hip_center` — shift every frame so the hip midpoint is the origin.
+
+Joints are addressed by index along axis 1; distances and angles optionally
+take per-axis weights (0 drops an axis, e.g. the scoring model's zeroed z).
+
+Two backends compute the same results:
+
+- ``"numpy"``: vectorized numpy; always available;
+- ``"jit"``: fused per-frame loops compiled with numba (``pip install numba``),
+  which skip the ``(n_frames, n_pairs, n_axes)`` temporaries numpy needs.
+
+numba is optional and imported on first use, not at import time (it costs
+about as much as mlflow). The default backend is ``"jit"`` when numba is
+installed and ``POSE_GEOMETRY_JIT`` is not ``0``/``false``, ``"numpy"``
+otherwise; every function also accepts ``backend=`` explicitly. Without numba,
+``backend="jit"`` runs the same loops as plain Python — correct but slow, only
+meant for tests. Timings: ``python -m benchmarks geometry``.
+"""
+
+import math
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from app.services import settings
+
+BACKENDS = ("numpy", "jit")
+
+_lock = threading.Lock()
+_jit_kernels: Optional[Dict[str, object]] = None
+_numba_available: Optional[bool] = None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Loop kernels (numba-compiled when available)
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _pair_distances_loop(points, first, second, weights, out):
+    for f in range(points.shape[0]):
+        for p in range(first.shape[0]):
+            i, j = first[p], second[p]
+            s = 0.0
+            for k in range(points.shape[2]):
+                d = points[f, j, k] - points[f, i, k]
+                s += d * d * weights[k]
+            out[f, p] = math.sqrt(s)
+
+
+def _vertex_cosines_loop(points, a, vertex, b, weights, eps, degenerate, out):
+    # degenerate < -1: cosine = dot / (|u||v| + eps) (model features);
+    # otherwise exact cosine clamped to [-1, 1], ``degenerate`` for zero vectors.
+    for f in range(points.shape[0]):
+        for t in range(vertex.shape[0]):
+            ia, iv, ib = a[t], vertex[t], b[t]
+            dot = 0.0
+            nu = 0.0
+            nv = 0.0
+            for k in range(points.shape[2]):
+                u = points[f, ia, k] - points[f, iv, k]
+                v = points[f, ib, k] - points[f, iv, k]
+                w = weights[k]
+                dot += u * v * w
+                nu += u * u * w
+                nv += v * v * w
+            nu = math.sqrt(nu)
+            nv = math.sqrt(nv)
+            if degenerate < -1.0:
+                out[f, t] = dot / (nu * nv + eps)
+            elif nu == 0.0 or nv == 0.0:
+                out[f, t] = degenerate
+            else:
+                c = dot / (nu * nv)
+                if c > 1.0:
+                    c = 1.0
+                elif c < -1.0:
+                    c = -1.0
+                out[f, t] = c
+
+
+def _hip_center_loop(points, left, right, out):
+    for f in range(points.shape[0]):
+        for k in range(points.shape[2]):
+            mid = (points[f, left, k] + points[f, right, k]) / 2.0
+            for j in range(points.shape[1]):
+                out[f, j, k] = points[f, j, k] - mid
+
+
+_LOOPS = {
+    "pair_distances": _pair_distances_loop,
+    "vertex_cosines": _vertex_cosines_loop,
+    "hip_center": _hip_center_loop,
+}
+
+
+def numba_available() -> bool:
+    global _numba_available
+    if _numba_available is None:
+        try:
+            import numba  # noqa: F401
+        except ImportError:
+            _numba_available = False
+        else:
+            _numba_available = True
+    return _numba_available
+
+
+def default_backend() -> str:
+    if not settings.env_flag("POSE_GEOMETRY_JIT"):
+        return "numpy"
+    return "jit" if numba_available() else "numpy"
+
+
+def _kernels() -> Dict[str, object]:
+    """Loop kernels, numba-compiled (lazily, on first call) when available."""
+    global _jit_kernels
+    if _jit_kernels is None:
+        with _lock:
+            if _jit_kernels is None:
+                if numba_available():
+                    import numba
+
+                    jit = numba.njit(nogil=True, cache=True)
+                    _jit_kernels = {name: jit(fn) for name, fn in _LOOPS.items()}
+                else:
+                    _jit_kernels = dict(_LOOPS)
+    return _jit_kernels
+
+
+def _resolve(backend: Optional[str]) -> str:
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+    return backend
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _points(points) -> np.ndarray:
+    arr = np.asarray(points)
+    if not np.issubdtype(arr.dtype, np.floating):
+        arr = arr.astype(np.float64)
+    if arr.ndim != 3:
+        raise ValueError(
+            f"Expected (n_frames, n_joints, n_axes) points, got {arr.shape}"
+        )
+    return np.ascontiguousarray(arr)
+
+
+def _index(idx) -> np.ndarray:
+    return np.ascontiguousarray(np.atleast_1d(np.asarray(idx, dtype=np.intp)))
+
+
+def _weights(axis_weights, points: np.ndarray) -> np.ndarray:
+    if axis_weights is None:
+        return np.ones(points.shape[2], dtype=points.dtype)
+    return np.ascontiguousarray(np.asarray(axis_weights, dtype=points.dtype))
+
+
+def pair_distances(
+    points,
+    first: Sequence[int],
+    second: Sequence[int],
+    axis_weights: Optional[Sequence[float]] = None,
+    backend: Optional[str] = None,
+) -> np.ndarray:
+    """``(n_frames, n_pairs)`` distance between joints ``first[p]`` and ``second[p]``.
+
+    With *axis_weights* the distance is ``sqrt(sum_k w_k * d_k**2)``. NaN
+    coordinates give NaN distances.
+    """
+    pts = _points(points)
+    i, j = _index(first), _index(second)
+    w = _weights(axis_weights, pts)
+    if _resolve(backend) == "jit":
+        out = np.empty((len(pts), len(i)), dtype=pts.dtype)
+        _kernels()["pair_distances"](pts, i, j, w, out)
+        return out
+    diff = pts[:, j] - pts[:, i]
+    return np.sqrt((diff * diff * w).sum(axis=2))
+
+
+def _cosines(points, a, vertex, b, axis_weights, eps, degenerate, backend):
+    pts = _points(points)
+    ia, iv, ib = _index(a), _index(vertex), _index(b)
+    w = _weights(axis_weights, pts)
+    if _resolve(backend) == "jit":
+        out = np.empty((len(pts), len(iv)), dtype=pts.dtype)
+        _kernels()["vertex_cosines"](pts, ia, iv, ib, w, eps, degenerate, out)
+        return out
+    u = pts[:, ia] - pts[:, iv]
+    v = pts[:, ib] - pts[:, iv]
+    dot = (u * v * w).sum(axis=2)
+    nu = np.sqrt((u * u * w).sum(axis=2))
+    nv = np.sqrt((v * v * w).sum(axis=2))
+    if degenerate < -1.0:
+        return dot / (nu * nv + eps)
+    zero = (nu == 0) | (nv == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos = np.clip(dot / (nu * nv), -1.0, 1.0)
+    return np.where(zero, degenerate, cos).astype(pts.dtype, copy=False)
+
+
+def vertex_cosines(
+    points,
+    a: Sequence[int],
+    vertex: Sequence[int],
+    b: Sequence[int],
+    axis_weights: Optional[Sequence[float]] = None,
+    eps: float = 1e-8,
+    backend: Optional[str] = None,
+) -> np.ndarray:
+    """``(n_frames, n_triples)`` cosine of the angle ``a[t]``–``vertex[t]``–``b[t]``.
+
+    Computed as ``dot / (|u| |v| + eps)`` (the model feature definition), so a
+    zero-length vector gives 0 rather than NaN.
+    """
+    return _cosines(points, a, vertex, b, axis_weights, eps, -2.0, backend)
+
+
+def vertex_angles(
+    points,
+    a: Sequence[int],
+    vertex: Sequence[int],
+    b: Sequence[int],
+    axis_weights: Optional[Sequence[float]] = None,
+    backend: Optional[str] = None,
+) -> np.ndarray:
+    """``(n_frames, n_triples)`` angle at ``vertex[t]`` in degrees (0–180).
+
+    A zero-length vector (coincident joints) gives 180°, i.e. a straight limb.
+    """
+    cos = _cosines(points, a, vertex, b, axis_weights, 0.0, -1.0, backend)
+    return np.degrees(np.arccos(cos))
+
+
+def shoulder_width_scale(
+    points,
+    left_shoulder: int,
+    right_shoulder: int,
+    axis_weights: Optional[Sequence[float]] = None,
+    eps: float = 1e-8,
+    backend: Optional[str] = None,
+) -> float:
+    """Mean left/right shoulder distance over all frames, plus *eps*."""
+    width = pair_distances(
+        points, [left_shoulder], [right_shoulder], axis_weights, backend
+    )
+    return float(width.mean()) + eps
+
+
+def hip_center(
+    points,
+    left_hip: int,
+    right_hip: int,
+    backend: Optional[str] = None,
+) -> np.ndarray:
+    """Copy of *points* shifted so the hip midpoint is the origin of every frame.
+
+    Works for any number of axes (``n_axes`` may be 1 to centre one coordinate).
+    """
+    pts = _points(points)
+    if _resolve(backend) == "jit":
+        out = np.empty_like(pts)
+        _kernels()["hip_center"](pts, int(left_hip), int(right_hip), out)
+        return out
+    mid = (pts[:, left_hip] + pts[:, right_hip]) / 2.0
+    return pts - mid[:, None, :]
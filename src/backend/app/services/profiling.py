@@ -0,0 +1,231 @@
+"""app.services.profiling
+
+On-demand sampling profiler for single requests.
+
+Disabled unless ``PROFILING_TOKEN`` is set. A request that carries the token
+(see :mod:`app.api.dependencies`) runs its handler inside a
+:class:`RequestProfile`: a background thread samples *only that handler's
+thread* every ``PROFILING_INTERVAL_MS`` (default 5 ms) via
+``sys._current_frames()`` and aggregates the stacks. Other requests pay
+nothing beyond the header lookup.
+
+Profiles are written to ``PROFILING_DIR`` (default ``<tmp>/4dt907-profiles``,
+shared by all workers of a container) as
+
+- ``<id>.collapsed`` — collapsed stacks (``root;…;leaf count``), the input
+  format of ``flamegraph.pl`` and https://www.speedscope.app
+- ``<id>.json``      — metadata (route, duration, sample count, …)
+
+Only the newest ``PROFILING_KEEP`` (default 50) profiles are kept.
+"""
+
+import hmac
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from app.services import settings
+
+_DEFAULT_INTERVAL_MS = 5.0
+_DEFAULT_KEEP = 50
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{16}$")
+
+
+def _token() -> Optional[str]:
+    return (os.getenv("PROFILING_TOKEN") or "").strip() or None
+
+
+def enabled() -> bool:
+    return _token() is not None
+
+
+def is_authorized(value: Optional[str]) -> bool:
+    """Constant-time check of a client-supplied token."""
+    token = _token()
+    if not token or not value:
+        return False
+    return hmac.compare_digest(value.strip().encode(), token.encode())
+
+
+def profile_dir() -> str:
+    return os.getenv("PROFILING_DIR") or os.path.join(
+        tempfile.gettempdir(), "4dt907-profiles"
+    )
+
+
+def _interval_s() -> float:
+    ms = settings.env_float("PROFILING_INTERVAL_MS", _DEFAULT_INTERVAL_MS)
+    return max(ms, 0.5) / 1000.0
+
+
+def _keep() -> int:
+    return settings.env_int("PROFILING_KEEP", _DEFAULT_KEEP)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for marker in ("site-packages" + os.sep, os.sep + "app" + os.sep):
+        idx = filename.rfind(marker)
+        if idx >= 0:
+            filename = filename[idx + len(marker) :]
+            if marker.endswith("app" + os.sep):
+                filename = "app/" + filename
+            break
+    else:
+        filename = os.path.basename(filename)
+    # ';' separates frames in the collapsed format.
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _collapse(frame) -> str:
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval_s: float):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def to_collapsed(stacks: Dict[str, int]) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+class RequestProfile:
+    """Context manager: profile the calling thread and store the result."""
+
+    def __init__(self, route: str, directory: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:16]
+        self.route = route
+        self.directory = directory or profile_dir()
+        self.interval_s = _interval_s()
+        self.meta: Dict = {}
+        self._sampler: Optional[StackSampler] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "RequestProfile":
+        self._start = perf_counter()
+        self._sampler = StackSampler(threading.get_ident(), self.interval_s).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        stacks = self._sampler.stop()
+        duration_ms = (perf_counter() - self._start) * 1000
+        self.meta = {
+            "id": self.id,
+            "route": self.route,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "duration_ms": round(duration_ms, 1),
+            "interval_ms": round(self.interval_s * 1000, 2),
+            "samples": sum(stacks.values()),
+            "pid": os.getpid(),
+            "error": exc_type.__name__ if exc_type else None,
+        }
+        self._write(stacks)
+        return False
+
+    def _write(self, stacks: Dict[str, int]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.id)
+        with open(base + ".collapsed", "w") as f:
+            f.write(to_collapsed(stacks))
+        with open(base + ".json", "w") as f:
+            json.dump(self.meta, f)
+        _prune(self.directory, _keep())
+
+
+class _NoProfile:
+    """Stand-in used when the request did not ask for profiling."""
+
+    id = None
+
+    def __enter__(self) -> "_NoProfile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NO_PROFILE = _NoProfile()
+
+
+def _prune(directory: str, keep: int) -> None:
+    metas = sorted(
+        (
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.endswith(".json")
+        ),
+        key=os.path.getmtime,
+    )
+    for meta_path in metas[:-keep]:
+        base = meta_path[: -len(".json")]
+        for path in (meta_path, base + ".collapsed"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def list_profiles() -> List[Dict]:
+    """Metadata of stored profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    out: List[Dict] = []
+    for name in os.listdir(directory):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                out.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(out, key=lambda m: m.get("created_at", ""), reverse=True)
+
+
+def read_profile(profile_id: str) -> Optional[str]:
+    """Collapsed stacks for ``profile_id``, or None if unknown."""
+    if not _PROFILE_ID_RE.match(profile_id or ""):
+        return None
+    path = os.path.join(profile_dir(), profile_id + ".collapsed")
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
@@ -0,0 +1,437 @@
+"""app.services.scheduler
+
+Priority-aware admission in front of the inference endpoints.
+
+Interactive UI calls (``/predict/*``, ``/weakest-link/*``, ``/z-predictor/*``)
+and bulk jobs (``/squat/analyze-session``, ``/squat/classify-batch``,
+``/z-predictor/predict-recording``) all end up in the same sync-endpoint
+threadpool, so one pipeline posting sessions can push UI latency up to the
+length of a session analysis. :class:`SchedulerMiddleware` puts a lane per
+priority class in front of the app:
+
+- every class owns a weighted share of the worker's inference slots
+  (``SCHEDULER_SLOTS``, default ``INFERENCE_EXECUTOR_THREADS``); a class never
+  uses more than its share, so bulk work cannot occupy the slots interactive
+  requests need;
+- requests beyond a class's share wait FIFO in a bounded queue; when that is
+  full the request is rejected with 503 + ``Retry-After`` instead of queueing
+  without limit.
+
+The class comes from the ``X-Priority`` header when it names a configured
+class, otherwise from the route (:data:`ROUTE_CLASSES`, longest prefix wins).
+Routes not listed there (health, metrics, diagnostics, model-info) bypass the
+scheduler. Routes mapped to None are admitted by their handler through
+:func:`admitted` instead, e.g. the streaming upload, which must not hold a
+slot while the client is still sending. Classes are configured as
+``name:weight:max_queue``::
+
+    SCHEDULER_CLASSES=interactive:3:128,bulk:1:32   # the default
+
+Queue depth, in-flight requests, queue wait and rejections per class are
+exported as ``scheduler_*`` Prometheus series and served per worker by
+``GET /api/v1/diagnostics/scheduler``. The time a request spent queued is put
+in ``request.state.scheduler_wait_s`` (the request deadline counts it).
+``SCHEDULER_ENABLED=0`` turns the middleware into a pass-through.
+
+All state is per worker process and only touched from its event loop.
+Threads outside the request path (the background jobs of
+:mod:`app.services.jobs`) take slots with :func:`admitted_from_thread`, which
+hands the lane operations to that loop.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from time import perf_counter
+from typing import (
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from app.services import metrics, settings
+from app.services.deadline import RequestCancelled
+
+_log = logging.getLogger(__name__)
+
+PRIORITY_HEADER = "x-priority"
+DEFAULT_CLASSES = "interactive:3:128,bulk:1:32"
+# Seconds between cancellation checks / full-queue retries of a thread waiting
+# in :func:`admitted_from_thread`.
+THREAD_POLL_S = 1.0
+
+# Path prefix → priority class; the longest matching prefix wins. None: the
+# handler takes the slot itself (:func:`admitted`) once the body is read.
+ROUTE_CLASSES: Dict[str, Optional[str]] = {
+    "/api/v1/predict/": "interactive",
+    "/api/v1/weakest-link/": "interactive",
+    "/api/v1/z-predictor/": "interactive",
+    "/api/v1/z-predictor/predict-recording": "bulk",
+    "/api/v1/squat/analyze-session": "bulk",
+    "/api/v1/squat/analyze-session/stream": None,
+    "/api/v1/squat/classify-batch": "bulk",
+}
+
+
+class QueueFull(Exception):
+    """The class's bounded queue is full; the request is rejected."""
+
+
+class PriorityClass(NamedTuple):
+    name: str
+    weight: float
+    max_queue: int
+
+
+def parse_classes(raw: str) -> List[PriorityClass]:
+    """Parse ``name:weight:max_queue[,...]``; raises ``ValueError`` when malformed."""
+    classes: List[PriorityClass] = []
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        parts = [p.strip() for p in item.split(":")]
+        if len(parts) != 3 or not parts[0]:
+            raise ValueError(f"Expected name:weight:max_queue, got {item!r}")
+        name, weight, max_queue = parts[0], float(parts[1]), int(parts[2])
+        if weight <= 0 or max_queue < 0:
+            raise ValueError(f"Weight must be > 0 and max_queue >= 0 in {item!r}")
+        classes.append(PriorityClass(name, weight, max_queue))
+    if not classes:
+        raise ValueError("No priority classes configured")
+    return classes
+
+
+def configured_classes() -> List[PriorityClass]:
+    raw = os.getenv("SCHEDULER_CLASSES") or DEFAULT_CLASSES
+    try:
+        return parse_classes(raw)
+    except ValueError as exc:
+        _log.warning("Ignoring SCHEDULER_CLASSES=%r (%s)", raw, exc)
+        return parse_classes(DEFAULT_CLASSES)
+
+
+def configured_slots() -> int:
+    slots = settings.env_int("SCHEDULER_SLOTS", None)
+    if slots is not None:
+        return slots
+    from app.services import serving_topology
+
+    return serving_topology.effective_settings()["executor_threads"]
+
+
+def enabled() -> bool:
+    return settings.env_flag("SCHEDULER_ENABLED")
+
+
+def weighted_limits(classes: List[PriorityClass], slots: int) -> Dict[str, int]:
+    """Slots per class: the weighted share of ``slots``, at least 1."""
+    total = sum(c.weight for c in classes)
+    return {c.name: max(1, int(slots * c.weight / total)) for c in classes}
+
+
+class Lane:
+    """Concurrency limit + bounded FIFO queue for one priority class."""
+
+    def __init__(self, spec: PriorityClass, limit: int):
+        self.spec = spec
+        self.limit = limit
+        self.in_flight = 0
+        self.rejected = 0
+        self.admitted = 0
+        self.wait_s_total = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """Take a slot, waiting in FIFO order; returns the seconds spent queued.
+
+        Raises :class:`QueueFull` when ``max_queue`` requests are already waiting.
+        """
+        start = perf_counter()
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+        else:
+            if len(self._waiters) >= self.spec.max_queue:
+                self.rejected += 1
+                metrics.observe_scheduler_rejected(self.spec.name)
+                raise QueueFull(self.spec.name)
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._report()
+            try:
+                await waiter  # release() hands its slot over
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release()
+                else:
+                    self._waiters.remove(waiter)
+                    self._report()
+                raise
+        waited = perf_counter() - start
+        self.admitted += 1
+        self.wait_s_total += waited
+        metrics.observe_scheduler_wait(self.spec.name, waited)
+        self._report()
+        return waited
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # slot passes to the waiter
+                self._report()
+                return
+        self.in_flight -= 1
+        self._report()
+
+    def _report(self) -> None:
+        metrics.set_scheduler_state(self.spec.name, self.waiting, self.in_flight)
+
+    def stats(self) -> Dict:
+        return {
+            "weight": self.spec.weight,
+            "limit": self.limit,
+            "max_queue": self.spec.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "mean_wait_ms": (
+                round(self.wait_s_total / self.admitted * 1000, 3)
+                if self.admitted
+                else None
+            ),
+        }
+
+
+class Scheduler:
+    def __init__(self, classes: List[PriorityClass], slots: int):
+        limits = weighted_limits(classes, slots)
+        self.slots = slots
+        self.lanes: Dict[str, Lane] = {c.name: Lane(c, limits[c.name]) for c in classes}
+        # The worker's event loop, which owns the lanes.
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def classify(self, path: str, priority: Optional[str]) -> Optional[str]:
+        """Priority class of a request, or None when the route is not scheduled."""
+        matches = [prefix for prefix in ROUTE_CLASSES if path.startswith(prefix)]
+        if not matches:
+            return None
+        route_class = ROUTE_CLASSES[max(matches, key=len)]
+        if route_class is None:
+            return None
+        return self.class_for(priority, route_class)
+
+    def class_for(self, priority: Optional[str], route_class: str) -> str:
+        """``priority`` if it names a class, else ``route_class`` (or the first class)."""
+        if priority and priority.strip().lower() in self.lanes:
+            return priority.strip().lower()
+        # A class missing from SCHEDULER_CLASSES falls back to the first one.
+        return route_class if route_class in self.lanes else next(iter(self.lanes))
+
+    def stats(self) -> Dict:
+        return {
+            "slots": self.slots,
+            "classes": {name: lane.stats() for name, lane in self.lanes.items()},
+        }
+
+
+_scheduler: Optional[Scheduler] = None
+
+
+def configure() -> Scheduler:
+    """(Re)build this worker's scheduler from the environment.
+
+    Call after :func:`app.services.serving_topology.apply_topology` so the
+    default slot count is the applied executor size.
+    """
+    global _scheduler
+    _scheduler = Scheduler(configured_classes(), configured_slots())
+    try:
+        _scheduler.loop = asyncio.get_running_loop()
+    except RuntimeError:
+        pass  # set by the middleware on its first request
+    _log.info(
+        "Request scheduler: slots=%d %s",
+        _scheduler.slots,
+        ", ".join(
+            f"{name}={lane.limit} (queue {lane.spec.max_queue})"
+            for name, lane in _scheduler.lanes.items()
+        ),
+    )
+    return _scheduler
+
+
+def current() -> Scheduler:
+    return _scheduler or configure()
+
+
+def status() -> Dict:
+    return {"enabled": enabled(), "pid": os.getpid(), **current().stats()}
+
+
+@asynccontextmanager
+async def admitted(
+    route_class: str, priority: Optional[str] = None
+) -> AsyncIterator[float]:
+    """Hold a slot of the request's class inside a handler; yields the seconds queued.
+
+    For routes mapped to None in :data:`ROUTE_CLASSES`. Raises
+    :class:`QueueFull` when the class's queue is full; a no-op while the
+    scheduler is disabled.
+    """
+    if not enabled():
+        yield 0.0
+        return
+    scheduler = current()
+    lane = scheduler.lanes[scheduler.class_for(priority, route_class)]
+    waited = await lane.acquire()
+    try:
+        yield waited
+    finally:
+        lane.release()
+
+
+def _no_stop() -> bool:
+    return False
+
+
+class _ThreadAdmission:
+    """One :meth:`Lane.acquire` run on the loop on behalf of a thread."""
+
+    def __init__(self, lane: Lane):
+        self.lane = lane
+        self.task: Optional[asyncio.Task] = None
+        self.abandoned = False
+
+    async def acquire(self) -> float:
+        if self.abandoned:
+            raise asyncio.CancelledError
+        self.task = asyncio.current_task()
+        return await self.lane.acquire()
+
+    def abandon(self) -> None:
+        """Runs on the loop: drop the wait, or the slot if it was already granted."""
+        self.abandoned = True
+        task = self.task
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            self.lane.release()
+
+
+@contextmanager
+def admitted_from_thread(
+    route_class: str, stop: Callable[[], bool] = _no_stop
+) -> Iterator[float]:
+    """:func:`admitted` for a thread outside the event loop; yields the seconds queued.
+
+    The thread waits in the class's queue like a request would; while that
+    queue is full it retries every :data:`THREAD_POLL_S` instead of failing.
+    ``stop()`` is polled while waiting and raises
+    :class:`~app.services.deadline.RequestCancelled` once it returns True.
+    A no-op while the scheduler is disabled or no event loop is serving yet.
+    """
+    scheduler = current()
+    loop = scheduler.loop
+    if not enabled() or loop is None or not loop.is_running():
+        yield 0.0
+        return
+    lane = scheduler.lanes[scheduler.class_for(None, route_class)]
+    start = perf_counter()
+    while True:
+        if stop():
+            raise RequestCancelled("scheduler")
+        admission = _ThreadAdmission(lane)
+        future = asyncio.run_coroutine_threadsafe(admission.acquire(), loop)
+        try:
+            while True:
+                try:
+                    future.result(timeout=THREAD_POLL_S)
+                    break
+                except concurrent.futures.TimeoutError:
+                    if stop():
+                        loop.call_soon_threadsafe(admission.abandon)
+                        raise RequestCancelled("scheduler") from None
+        except QueueFull:
+            time.sleep(THREAD_POLL_S)
+            continue
+        break
+    try:
+        yield perf_counter() - start
+    finally:
+        try:
+            loop.call_soon_threadsafe(lane.release)
+        except RuntimeError:
+            pass  # the loop closed (shutdown); its lanes went with it
+
+
+async def _reject(send, name: str) -> None:
+    body = (
+        b'{"detail":"Server busy: the '
+        + name.encode()
+        + b' request queue is full, retry later"}'
+    )
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"1"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class SchedulerMiddleware:
+    """Pure ASGI middleware: admit scheduled routes through their class lane."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+
+        scheduler = current()
+        if scheduler.loop is None:
+            scheduler.loop = asyncio.get_running_loop()
+        priority = None
+        for key, value in scope.get("headers") or ():
+            if key == PRIORITY_HEADER.encode():
+                priority = value.decode("latin-1")
+                break
+        name = scheduler.classify(scope.get("path", ""), priority)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        lane = scheduler.lanes[name]
+        try:
+            waited = await lane.acquire()
+        except QueueFull:
+            await _reject(send, name)
+            return
+        try:
+            scope.setdefault("state", {})["scheduler_wait_s"] = waited
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
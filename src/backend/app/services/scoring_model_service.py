@@ -5,30 +5,27 @@ Model loading + prediction utilities for squat scoring.
 Produces a squat score in the range [0, 4], where:
   0.0 → good form
   4.0 → bad form
+
+Input features (61 per frame) come from the shared kernel in
+:mod:`app.services.pose_features`, in A15 joint order with the axis
+convention of ``_LAYOUT``.
 """
 
 import logging
 import os
 import threading
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
-import mlflow
 import numpy as np
-from mlflow.exceptions import RestException
-from mlflow.tracking import MlflowClient
 
-from app.services import goodbad_model_service
+from app.services import metrics, mlflow_metadata, model_registry, pose_features
+from app.services.lazy_imports import MlflowClient, mlflow
 
 _log = logging.getLogger(__name__)
 _lock = threading.Lock()
 # cache: uri → (pyfunc_model, uri_used, run_id, c_frames, n_features, scaler_or_None)
 _cache: Dict[str, Tuple] = {}
 
-_initial_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-if _initial_tracking_uri:
-    mlflow.set_tracking_uri(_initial_tracking_uri)
-    mlflow.set_registry_uri(_initial_tracking_uri)
-
 _DEFAULT_C_FRAMES = 10
 _DEFAULT_N_FEATURES = 61
 
@@ -50,52 +47,14 @@ _A15_JOINTS: List[str] = [
     "left_ankle",
     "right_ankle",
 ]
-_A15_FEAT_COLS: List[str] = [
-    f"{j}_3d_{ax}" for j in _A15_JOINTS for ax in ["x", "y", "z"]
-]
-
 
-def _a15_build_base(kp3d: List[Dict]) -> List[float]:
-    # MediaPipe JS world_landmarks vs A11 training CSV (Kinect/MediaPipe Python) differences:
-    #   x: JS uses camera frame (person's left = positive x);
-    # training uses body frame (left = negative x). Negate x.
-    #   y: JS uses y-down; training uses y-up. Negate y.
-    #   z: JS z is camera-depth (large, −0.3 to −0.5);
-    # training z is body-forward (tiny, ~0.005–0.06). Zero out z.
-    kp_map = {kp["name"]: kp for kp in kp3d}
-    feats: List[float] = []
-    for name in _A15_JOINTS:
-        kp = kp_map.get(name)
-        feats.append(-float(kp["x"]) if kp else 0.0)
-        feats.append(-float(kp["y"]) if kp else 0.0)
-        feats.append(0.0)
-    return feats
-
-
-def _a15_pos(arr: np.ndarray, joint: str) -> np.ndarray:
-    idxs = [_A15_FEAT_COLS.index(f"{joint}_3d_{ax}") for ax in ["x", "y", "z"]]
-    return arr[:, idxs]
-
-
-def _a15_add_features(base_arr: np.ndarray) -> np.ndarray:
-    """16 distance + 6 angle features using A15 column-order index lookup."""
-    ls = _a15_pos(base_arr, "left_shoulder")
-    rs = _a15_pos(base_arr, "right_shoulder")
-    scale = float(np.linalg.norm(rs - ls, axis=1).mean()) + 1e-8
-    extras: List[np.ndarray] = []
-    for j1, j2 in goodbad_model_service._KEY_DIST_PAIRS:
-        p1, p2 = _a15_pos(base_arr, j1), _a15_pos(base_arr, j2)
-        extras.append(np.linalg.norm(p2 - p1, axis=1, keepdims=True) / scale)
-    for ja, jv, jb in goodbad_model_service._KEY_ANGLE_TRIPLES:
-        pa = _a15_pos(base_arr, ja)
-        pv = _a15_pos(base_arr, jv)
-        pb = _a15_pos(base_arr, jb)
-        va, vb = pa - pv, pb - pv
-        cos = np.sum(va * vb, axis=1) / (
-            np.linalg.norm(va, axis=1) * np.linalg.norm(vb, axis=1) + 1e-8
-        )
-        extras.append(cos.reshape(-1, 1))
-    return np.hstack([base_arr] + extras).astype(np.float32)
+# MediaPipe JS world_landmarks vs A11 training CSV (Kinect/MediaPipe Python) differences:
+#   x: JS uses camera frame (person's left = positive x);
+# training uses body frame (left = negative x). Negate x.
+#   y: JS uses y-down; training uses y-up. Negate y.
+#   z: JS z is camera-depth (large, −0.3 to −0.5);
+# training z is body-forward (tiny, ~0.005–0.06). Zero out z.
+_LAYOUT = pose_features.FeatureLayout(tuple(_A15_JOINTS), (-1.0, -1.0, 0.0))
 
 
 def _clean_uri(value: Optional[str]) -> Optional[str]:
@@ -134,31 +93,12 @@ def _parse_models_alias_uri(uri: str) -> Tuple[str, str]:
 
 
 def _resolve_alias_to_version_uri(model_name: str, alias: str) -> str:
-    client = MlflowClient()
-    versions = sorted(
-        client.search_model_versions(f"name='{model_name}'"),
-        key=lambda mv: int(mv.version),
-    )
-    if not versions:
-        raise RuntimeError(f"No versions found for model '{model_name}'")
-    latest = versions[-1]
-    second_latest = versions[-2] if len(versions) >= 2 else latest
-    a = alias.lower().strip()
-    if a in {"prod", "production"}:
-        prod = [
-            mv
-            for mv in versions
-            if (getattr(mv, "current_stage", "") or "").lower() == "production"
-        ]
-        chosen = prod[-1] if prod else latest
-    elif a in {"backup"}:
-        chosen = second_latest
-    else:
-        chosen = latest
-    return f"models:/{model_name}/{chosen.version}"
+    return model_registry.fallback_alias_uri(model_name, alias, MlflowClient)
 
 
 def _load_model_with_alias_fallback(uri: str):
+    from mlflow.exceptions import RestException
+
     try:
         return mlflow.pyfunc.load_model(uri), uri
     except RestException as e:
@@ -170,43 +110,14 @@ def _load_model_with_alias_fallback(uri: str):
 
 
 def _fetch_run_id(uri: str) -> Optional[str]:
-    if not uri:
-        return None
-    if uri.startswith("runs:/"):
-        tail = uri[len("runs:/") :]
-        return tail.split("/", 1)[0] if tail else None
-    client = MlflowClient()
-    if _is_models_alias_uri(uri):
-        name, alias = _parse_models_alias_uri(uri)
-        try:
-            mv = client.get_model_version_by_alias(name, alias)
-            return getattr(mv, "run_id", None)
-        except Exception:
-            resolved = _resolve_alias_to_version_uri(name, alias)
-            return _fetch_run_id(resolved)
-    if uri.startswith("models:/"):
-        tail = uri[len("models:/") :]
-        parts = tail.split("/", 2)
-        if len(parts) < 2:
-            return None
-        name = parts[0].strip()
-        selector = parts[1].strip()
-        if selector.isdigit():
-            mv = client.get_model_version(name, selector)
-            return getattr(mv, "run_id", None)
-        latest = client.get_latest_versions(name, stages=[selector])
-        if latest:
-            return getattr(max(latest, key=lambda mv: int(mv.version)), "run_id", None)
-    return None
+    return model_registry.run_id_for_uri(uri, MlflowClient)
 
 
 def _fetch_run_params(run_id: Optional[str]) -> Tuple[int, int]:
     if not run_id:
         return _DEFAULT_C_FRAMES, _DEFAULT_N_FEATURES
     try:
-        client = MlflowClient()
-        run = client.get_run(run_id)
-        params = run.data.params
+        params = mlflow_metadata.run_params(run_id)
         c_frames = int(params.get("c_frames", _DEFAULT_C_FRAMES))
         n_features = int(params.get("n_features", _DEFAULT_N_FEATURES))
         return c_frames, n_features
@@ -247,32 +158,34 @@ def get_model(variant: str = "champion"):
         if direct_uri in _cache:
             return _cache[direct_uri]
 
-        model, uri_used = _load_model_with_alias_fallback(direct_uri)
-        run_id = _fetch_run_id(uri_used)
-        c_frames, n_features = _fetch_run_params(run_id)
-        scaler = _fetch_scaler(run_id)
+        with metrics.model_load_timer("scoring") as load:
+            model, uri_used = _load_model_with_alias_fallback(direct_uri)
+            load["uri"] = uri_used
+            run_id = _fetch_run_id(uri_used)
+            c_frames, n_features = _fetch_run_params(run_id)
+            scaler = _fetch_scaler(run_id)
 
         _cache[direct_uri] = (model, uri_used, run_id, c_frames, n_features, scaler)
         return model, uri_used, run_id, c_frames, n_features, scaler
 
 
 def predict_session(
-    exercise_frames: List[List[Dict]],
+    exercise_frames: Union[List[List[Dict]], pose_features.Segment],
     variant: str = "champion",
 ) -> Optional[float]:
-    """Score a single squat repetition on a 0..4 scale."""
-    if not exercise_frames:
+    """Score a single squat repetition on a 0..4 scale.
+
+    ``exercise_frames`` are world-space keypoint frames, or a prebuilt
+    :class:`pose_features.Segment` of them.
+    """
+    if not len(exercise_frames):
         return None
 
     try:
         model, _, _, c_frames, n_features, scaler = get_model(variant)
 
-        base = np.array(
-            [_a15_build_base(f) for f in exercise_frames],
-            dtype=np.float32,
-        )
-        enriched = _a15_add_features(base)
-        fixed = goodbad_model_service._resample_to_fixed(enriched, c_frames)
+        segment = pose_features.as_segment(exercise_frames)
+        fixed = segment.model_input(_LAYOUT, c_frames)
 
         if scaler is not None:
             flat = fixed.reshape(1, -1)
@@ -284,7 +197,7 @@ def predict_session(
         score = float(
             np.clip(float(np.asarray(raw, dtype=np.float32).flatten()[0]), 0.0, 4.0)
         )
-        _log.info("Scoring: %d frames → %.3f", len(exercise_frames), score)
+        _log.info("Scoring: %d frames → %.3f", len(segment), score)
         return score
 
     except Exception as exc:
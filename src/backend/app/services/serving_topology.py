@@ -0,0 +1,255 @@
+"""app.services.serving_topology
+
+Serving-topology configuration: worker processes, torch thread pools and the
+inference executor, sized together so multi-worker deployments do not
+oversubscribe the CPU.
+
+Every knob can be set explicitly through env vars; anything left unset is
+derived from the CPU budget of the container (cgroup v2 ``cpu.max`` / cgroup v1
+``cpu.cfs_quota_us``), falling back to the scheduler affinity mask.
+
+Env vars:
+- ``WEB_CONCURRENCY``        number of uvicorn worker processes
+- ``TORCH_NUM_THREADS``      intra-op threads per worker (``torch.set_num_threads``)
+- ``TORCH_INTEROP_THREADS``  inter-op threads per worker
+- ``INFERENCE_EXECUTOR_THREADS`` threadpool size for sync endpoints per worker
+
+torch is not imported just to configure it: if it is not loaded yet when the
+topology is applied, the thread settings are applied right after torch's own
+first import, whichever code path triggers it (usually the first model load).
+Registry-only mlflow calls and non-torch models never import it.
+"""
+
+import importlib.abc
+import importlib.util
+import logging
+import math
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.services import settings
+
+_log = logging.getLogger(__name__)
+
+# Every worker holds a full copy of every model, so auto-detection stops here
+# even on large hosts; set WEB_CONCURRENCY to go beyond it.
+_MAX_DEFAULT_WORKERS = 4
+
+# The executor also serves light sync routes (/health, model-info), so keep a
+# floor even when a worker only gets a single torch thread.
+_MIN_EXECUTOR_THREADS = 4
+
+_CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+class ServingTopology(NamedTuple):
+    cpu_budget: float
+    cpu_source: str
+    workers: int
+    torch_threads: int
+    torch_interop_threads: int
+    executor_threads: int
+
+
+_lock = threading.Lock()
+_applied: Optional[ServingTopology] = None
+# Topology whose torch thread settings still have to be applied.
+_deferred_torch: Optional[ServingTopology] = None
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_cpu_quota(root: Path = _CGROUP_ROOT) -> Optional[float]:
+    """Return the container CPU quota in cores, or None when unlimited/unknown."""
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    cpu_max = _read_text(root / "cpu.max")
+    if cpu_max:
+        parts = cpu_max.split()
+        if len(parts) == 2 and parts[0] != "max":
+            try:
+                return int(parts[0]) / int(parts[1])
+            except (ValueError, ZeroDivisionError):
+                return None
+        return None
+
+    # cgroup v1: quota of -1 means unlimited
+    quota = _read_text(root / "cpu" / "cpu.cfs_quota_us")
+    period = _read_text(root / "cpu" / "cpu.cfs_period_us")
+    if quota and period:
+        try:
+            q, p = int(quota), int(period)
+        except ValueError:
+            return None
+        if q > 0 and p > 0:
+            return q / p
+    return None
+
+
+def _affinity_cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def detect_cpu_budget(root: Path = _CGROUP_ROOT) -> tuple[float, str]:
+    """Return (cores, source) where source is ``"cgroup"`` or ``"affinity"``."""
+    host_cpus = _affinity_cpu_count()
+    quota = _cgroup_cpu_quota(root)
+    if quota is not None:
+        return min(quota, float(host_cpus)), "cgroup"
+    return float(host_cpus), "affinity"
+
+
+def resolve_topology(root: Path = _CGROUP_ROOT) -> ServingTopology:
+    """Combine env overrides with auto-detected defaults."""
+    cpu_budget, cpu_source = detect_cpu_budget(root)
+    cores = max(1, math.floor(cpu_budget))
+
+    workers = settings.env_int("WEB_CONCURRENCY", min(cores, _MAX_DEFAULT_WORKERS))
+    torch_threads = settings.env_int("TORCH_NUM_THREADS", max(1, cores // workers))
+    interop_threads = settings.env_int("TORCH_INTEROP_THREADS", 1)
+    executor_threads = settings.env_int(
+        "INFERENCE_EXECUTOR_THREADS", max(_MIN_EXECUTOR_THREADS, 2 * torch_threads)
+    )
+
+    return ServingTopology(
+        cpu_budget=round(cpu_budget, 2),
+        cpu_source=cpu_source,
+        workers=workers,
+        torch_threads=torch_threads,
+        torch_interop_threads=interop_threads,
+        executor_threads=executor_threads,
+    )
+
+
+def _apply_torch_threads(topology: ServingTopology) -> None:
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(topology.torch_threads)
+    try:
+        # Only settable once per process, before any inter-op work has started.
+        torch.set_num_interop_threads(topology.torch_interop_threads)
+    except RuntimeError as exc:
+        _log.warning("Could not set torch inter-op threads: %s", exc)
+
+
+def _apply_thread_env(topology: ServingTopology) -> None:
+    # OpenMP/MKL read these when torch/numpy first initialise their pools.
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(name, str(topology.torch_threads))
+
+
+def _apply_executor_limit(topology: ServingTopology) -> None:
+    """Resize the anyio threadpool FastAPI uses for sync endpoints."""
+    from anyio import to_thread
+
+    to_thread.current_default_thread_limiter().total_tokens = topology.executor_threads
+
+
+class _TorchImportHook(importlib.abc.MetaPathFinder):
+    """One-shot ``sys.meta_path`` hook: apply deferred settings after ``import torch``."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != "torch":
+            return None
+        _remove_torch_hook()
+        spec = importlib.util.find_spec("torch")
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def exec_and_apply(module):
+            exec_module(module)
+            apply_deferred_torch_threads()
+
+        spec.loader.exec_module = exec_and_apply
+        return spec
+
+
+_torch_hook = _TorchImportHook()
+
+
+def _install_torch_hook() -> None:
+    if _torch_hook not in sys.meta_path:
+        sys.meta_path.insert(0, _torch_hook)
+
+
+def _remove_torch_hook() -> None:
+    try:
+        sys.meta_path.remove(_torch_hook)
+    except ValueError:
+        pass
+
+
+def apply_topology() -> ServingTopology:
+    """Apply the topology to this worker process (idempotent).
+
+    Must run inside the event loop (e.g. a startup hook) so the executor
+    limiter belongs to the running loop.
+    """
+    global _applied, _deferred_torch
+    with _lock:
+        topology = resolve_topology()
+        _apply_thread_env(topology)
+        if "torch" in sys.modules:
+            _apply_torch_threads(topology)
+        else:
+            _deferred_torch = topology
+            _install_torch_hook()
+        _apply_executor_limit(topology)
+        _applied = topology
+    _log.info(
+        "Serving topology: cpus=%.2f (%s) workers=%d torch_threads=%d "
+        "interop=%d executor=%d",
+        topology.cpu_budget,
+        topology.cpu_source,
+        topology.workers,
+        topology.torch_threads,
+        topology.torch_interop_threads,
+        topology.executor_threads,
+    )
+    return topology
+
+
+def apply_deferred_torch_threads() -> None:
+    """Apply torch thread settings postponed by :func:`apply_topology`.
+
+    Never imports torch: does nothing until torch has been imported.
+    """
+    global _deferred_torch
+    if "torch" not in sys.modules:
+        return
+    with _lock:
+        topology, _deferred_torch = _deferred_torch, None
+        if topology is not None:
+            _apply_torch_threads(topology)
+
+
+def effective_settings() -> dict:
+    """Return the settings this worker is actually running with."""
+    topology = _applied or resolve_topology()
+    settings = topology._asdict()
+    settings["applied"] = _applied is not None
+    settings["pid"] = os.getpid()
+
+    # Report, but never trigger, the torch import.
+    torch = sys.modules.get("torch")
+    if torch is None:
+        settings["torch_runtime"] = None
+    else:
+        settings["torch_runtime"] = {
+            "num_threads": torch.get_num_threads(),
+            "num_interop_threads": torch.get_num_interop_threads(),
+        }
+    return settings
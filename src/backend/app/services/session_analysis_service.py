@@ -10,18 +10,67 @@ Pipeline per session (all frames at once):
 5. Run GoodBad_ClassifierV2 on each continuous exercise segment → quality score [0,1].
 6. Run squat scoring model on each continuous exercise segment → score [0,4].
 7. Return per-frame results.
+
+Pass a :class:`app.services.deadline.Deadline` to stop early: it is checked
+before start/stop and before each segment's GoodBad + scoring. A disconnected
+client raises :class:`~app.services.deadline.RequestCancelled`; a passed
+deadline returns the frames processed so far (no frames if start/stop never
+ran, unscored segments otherwise) with ``deadline.exceeded_at`` set.
+
+An optional ``progress(stage, fraction)`` callback is told when start/stop
+starts and after every scored segment (``fraction`` in [0, 1], a rough share
+of the runtime); the asynchronous jobs (:mod:`app.services.jobs`) report it to
+polling clients. :func:`session_response` wraps the pipeline and the rep
+summary into the ``SessionAnalysisResponse`` shape used by both
+``/squat/analyze-session`` and the jobs.
+
+``frames``/``norm_frames`` are lists of keypoint dicts per frame or, for a
+streamed upload, ``(n_frames, 13, 3)`` arrays in
+:data:`app.services.pose_features.CANONICAL_JOINTS` order with NaN for a
+missing joint (:mod:`app.services.frame_buffer`); both give the same results.
+
+Steps 5 and 6 share one :class:`app.services.pose_features.Segment` per
+exercise segment when both models read the same keypoints, so the segment's
+distance/angle geometry is computed once for both.
+
+``summarize_reps`` condenses the per-frame results into one kinematics summary
+per exercise segment (rep): knee-angle depth, descent/ascent durations,
+time under tension and left/right asymmetry, computed for all frames at once
+with :func:`app.services.squat_service.knee_angles_batch`.
 """
 
 import logging as _logging
 from time import perf_counter
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
 
+from app.services import squat_service
 from app.services import start_stop_model_service
 from app.services import goodbad_model_service
 from app.services import scoring_model_service
+from app.services import deadline as deadline_mod
+from app.services import metrics
+from app.services import pose_features
 
 _log = _logging.getLogger(__name__)
 
+# Keypoint dicts per frame, or an (n_frames, 13, 3) array (NaN = missing joint).
+Frames = Union[List[List[Dict]], np.ndarray]
+
+# progress(stage, fraction): fraction of the pipeline done, in [0, 1].
+Progress = Callable[[str, float], None]
+
+# Rough runtime shares used for progress: start/stop up to 10 %, segments up
+# to 95 %, the rep summary the rest.
+_SEGMENTS_START = 0.1
+_SUMMARY_START = 0.95
+
+
+def _no_progress(_stage: str, _fraction: float) -> None:
+    pass
+
+
 _MODEL_JOINT_NAMES: List[str] = [
     "nose",
     "left_shoulder",
@@ -51,8 +100,22 @@ def _build_features(kp3d: List[Dict]) -> List[float]:
     return feats
 
 
-def _collect_frame_z_values(frames: List[List[Dict]]) -> List[Dict[str, float]]:
+def _feature_batch(frames: Frames):
+    """Start/stop input: one 39-float vector per frame."""
+    if isinstance(frames, np.ndarray):
+        return pose_features.session_tensor(frames).reshape(len(frames), -1)
+    return [_build_features(f) for f in frames]
+
+
+def _has_frames(frames: Optional[Frames]) -> bool:
+    return frames is not None and len(frames) > 0
+
+
+def _collect_frame_z_values(frames: Frames) -> List[Dict[str, float]]:
     """Collect z for all model joints from MediaPipe frames."""
+    if isinstance(frames, np.ndarray):
+        z = pose_features.session_tensor(frames)[:, :, 2].tolist()
+        return [dict(zip(_MODEL_JOINT_NAMES, row)) for row in z]
     results: List[Dict[str, float]] = [{} for _ in frames]
     for i, kp3d in enumerate(frames):
         kp_map = {kp["name"]: kp for kp in kp3d}
@@ -88,6 +151,13 @@ def _smooth_start_stop(predictions: List[int], gap_threshold: int = 10) -> List[
     return result
 
 
+def _count_segments(smoothed: List[int]) -> int:
+    """Number of continuous 1-runs (exercise segments)."""
+    return sum(
+        1 for i, v in enumerate(smoothed) if v == 1 and (i == 0 or smoothed[i - 1] == 0)
+    )
+
+
 class FrameResult:
     __slots__ = ("start_stop", "predicted_z", "good_bad_score", "squat_score")
 
@@ -105,27 +175,37 @@ class FrameResult:
 
 
 def analyze_session(
-    frames: List[List[Dict]],
-    norm_frames: Optional[List[List[Dict]]] = None,
+    frames: Frames,
+    norm_frames: Optional[Frames] = None,
+    deadline: deadline_mod.Deadline = deadline_mod.NO_DEADLINE,
+    progress: Optional[Progress] = None,
 ) -> Tuple[List[FrameResult], Dict[str, float]]:
     """Run the full pipeline on all frames.
 
     Returns (results, timings) where timings maps step name → elapsed ms.
     """
-    if not frames:
+    if len(frames) == 0:
         return [], {}
+    progress = progress or _no_progress
 
     timings: Dict[str, float] = {}
     t_total = perf_counter()
 
     feature_source = (
-        norm_frames if (norm_frames and len(norm_frames) == len(frames)) else frames
+        norm_frames
+        if (_has_frames(norm_frames) and len(norm_frames) == len(frames))
+        else frames
     )
 
     t = perf_counter()
-    features_batch = [_build_features(f) for f in feature_source]
+    features_batch = _feature_batch(feature_source)
     timings["feature_build_ms"] = round((perf_counter() - t) * 1000, 1)
 
+    if not deadline.check("start_stop"):
+        timings["total_ms"] = round((perf_counter() - t_total) * 1000, 1)
+        return [], timings
+
+    progress("start_stop", 0.0)
     t = perf_counter()
     try:
         raw_start_stop = start_stop_model_service.predict_batch(
@@ -159,29 +239,52 @@ def analyze_session(
     ]
 
     goodbad_ms, scoring_ms = _score_exercise_segments(
-        norm_frames or frames, smoothed, results, scoring_frames=frames
+        norm_frames if _has_frames(norm_frames) else frames,
+        smoothed,
+        results,
+        scoring_frames=frames,
+        deadline=deadline,
+        progress=progress,
     )
     timings["goodbad_ms"] = goodbad_ms
     timings["scoring_ms"] = scoring_ms
 
     timings["total_ms"] = round((perf_counter() - t_total) * 1000, 1)
 
+    metrics.observe_session(timings, len(frames), _count_segments(smoothed))
+
     return results, timings
 
 
 def _score_exercise_segments(
-    source_frames: List[List[Dict]],
+    source_frames: Frames,
     smoothed: List[int],
     results: List[FrameResult],
-    scoring_frames: Optional[List[List[Dict]]] = None,
+    scoring_frames: Optional[Frames] = None,
+    deadline: deadline_mod.Deadline = deadline_mod.NO_DEADLINE,
+    progress: Optional[Progress] = None,
 ) -> Tuple[float, float]:
     """Run GoodBad_ClassifierV2 and scoring model on each exercise segment.
 
     source_frames: keypoints for goodbad (image-normalised [0,1]).
     scoring_frames: world-space keypoints for scoring model (hip-centred, metres).
                     Falls back to source_frames if None.
+    deadline: checked before every segment; once it has passed the remaining
+              segments keep ``None`` scores.
     """
     sc_source = scoring_frames if scoring_frames is not None else source_frames
+    # Parse keypoints into (n_frames, 13, 3) once per session, not per model
+    # per segment.
+    gb_tensor = pose_features.session_tensor(source_frames)
+    sc_tensor = (
+        gb_tensor
+        if sc_source is source_frames
+        else pose_features.session_tensor(sc_source)
+    )
+    progress = progress or _no_progress
+    n_segments = _count_segments(smoothed)
+    done = 0
+    progress("segments", _SEGMENTS_START)
     n = len(smoothed)
     total_goodbad_ms = 0.0
     total_scoring_ms = 0.0
@@ -192,12 +295,24 @@ def _score_exercise_segments(
             while i < n and smoothed[i] == 1:
                 i += 1
             seg_end = i
+            if not deadline.check("segments"):
+                _log.warning(
+                    "Deadline exceeded: segment [%d:%d] and later left unscored",
+                    seg_start,
+                    seg_end,
+                )
+                break
 
-            seg_frames = source_frames[seg_start:seg_end]
+            gb_segment = pose_features.Segment(gb_tensor[seg_start:seg_end])
+            sc_segment = (
+                gb_segment
+                if sc_tensor is gb_tensor
+                else pose_features.Segment(sc_tensor[seg_start:seg_end])
+            )
             try:
                 t = perf_counter()
                 goodbad_score = goodbad_model_service.predict_session(
-                    seg_frames, "champion"
+                    gb_segment, "champion"
                 )
                 total_goodbad_ms += (perf_counter() - t) * 1000
             except Exception as exc:
@@ -212,7 +327,7 @@ def _score_exercise_segments(
             try:
                 t = perf_counter()
                 squat_score = scoring_model_service.predict_session(
-                    sc_source[seg_start:seg_end], "champion"
+                    sc_segment, "champion"
                 )
                 total_scoring_ms += (perf_counter() - t) * 1000
             except Exception as exc:
@@ -237,6 +352,167 @@ def _score_exercise_segments(
             for j in range(seg_start, seg_end):
                 results[j].good_bad_score = goodbad_score
                 results[j].squat_score = squat_score
+            done += 1
+            progress(
+                "segments",
+                _SEGMENTS_START
+                + (_SUMMARY_START - _SEGMENTS_START) * done / n_segments,
+            )
         else:
             i += 1
     return round(total_goodbad_ms, 1), round(total_scoring_ms, 1)
+
+
+# Per-rep kinematics
+DEFAULT_FPS = 30.0
+# Knee flexed below this (degrees, mean of both legs) counts as under tension.
+_TUT_KNEE_ANGLE = 160.0
+_SQUAT_JOINT_INDEX = {name: i for i, name in enumerate(squat_service.SQUAT_JOINTS)}
+# Columns of the SQUAT_JOINTS in an (n_frames, 13, 3) keypoint array.
+_SQUAT_COLUMNS = [
+    pose_features.CANONICAL_JOINTS.index(name) for name in squat_service.SQUAT_JOINTS
+]
+
+
+class RepSummary(NamedTuple):
+    rep: int
+    start_frame: int
+    end_frame: int  # exclusive
+    bottom_frame: Optional[int]
+    min_knee_angle: Optional[float]
+    min_left_knee_angle: Optional[float]
+    min_right_knee_angle: Optional[float]
+    descent_s: Optional[float]
+    ascent_s: Optional[float]
+    time_under_tension_s: float
+    mean_asymmetry: Optional[float]
+    max_asymmetry: Optional[float]
+    good_bad_score: Optional[float]
+    squat_score: Optional[float]
+
+
+def _knee_angles(frames: Frames) -> Tuple[np.ndarray, np.ndarray]:
+    """Left/right knee angle per frame (NaN where a leg joint is missing)."""
+    if isinstance(frames, np.ndarray):
+        points = np.asarray(frames[:, _SQUAT_COLUMNS], dtype=np.float64)
+    else:
+        points = np.full((len(frames), len(_SQUAT_JOINT_INDEX), 3), np.nan)
+        for i, kp3d in enumerate(frames):
+            for kp in kp3d:
+                j = _SQUAT_JOINT_INDEX.get(kp["name"])
+                if j is not None:
+                    points[i, j] = (kp["x"], kp["y"], kp.get("z", 0.0))
+    left = squat_service.knee_angles_batch(points[:, 0], points[:, 1], points[:, 2])
+    right = squat_service.knee_angles_batch(points[:, 3], points[:, 4], points[:, 5])
+    return left, right
+
+
+def _segment_bounds(start_stop: np.ndarray) -> List[Tuple[int, int]]:
+    """[start, end) of every continuous 1-run."""
+    padded = np.concatenate(([0], start_stop.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def _round(value, ndigits: int = 2) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), ndigits)
+
+
+def summarize_reps(
+    frames: Frames,
+    results: List[FrameResult],
+    fps: float = DEFAULT_FPS,
+) -> List[RepSummary]:
+    """One kinematics summary per exercise segment of ``results``.
+
+    ``frames`` are the 3-D keypoints the results were computed from. Durations
+    are in seconds at ``fps``; angles are in degrees.
+    """
+    if not results:
+        return []
+    start_stop = np.fromiter((r.start_stop for r in results), dtype=np.int8)
+    left, right = _knee_angles(frames)
+    mean = (left + right) / 2
+    asymmetry = np.abs(left - right)
+    tension = mean < _TUT_KNEE_ANGLE  # NaN compares False
+
+    reps: List[RepSummary] = []
+    for rep, (start, end) in enumerate(_segment_bounds(start_stop), start=1):
+        seg = mean[start:end]
+        measured = not np.isnan(seg).all()
+        bottom = start + int(np.nanargmin(seg)) if measured else None
+        reps.append(
+            RepSummary(
+                rep=rep,
+                start_frame=start,
+                end_frame=end,
+                bottom_frame=bottom,
+                min_knee_angle=_round(seg[bottom - start]) if measured else None,
+                min_left_knee_angle=(
+                    _round(np.nanmin(left[start:end])) if measured else None
+                ),
+                min_right_knee_angle=(
+                    _round(np.nanmin(right[start:end])) if measured else None
+                ),
+                descent_s=_round((bottom - start) / fps, 3) if measured else None,
+                ascent_s=_round((end - 1 - bottom) / fps, 3) if measured else None,
+                time_under_tension_s=round(int(tension[start:end].sum()) / fps, 3),
+                mean_asymmetry=(
+                    _round(np.nanmean(asymmetry[start:end])) if measured else None
+                ),
+                max_asymmetry=(
+                    _round(np.nanmax(asymmetry[start:end])) if measured else None
+                ),
+                good_bad_score=results[start].good_bad_score,
+                squat_score=results[start].squat_score,
+            )
+        )
+    return reps
+
+
+def _optional_float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def session_response(
+    frames: Frames,
+    norm_frames: Optional[Frames] = None,
+    fps: float = DEFAULT_FPS,
+    include_frames: bool = True,
+    deadline: deadline_mod.Deadline = deadline_mod.NO_DEADLINE,
+    progress: Optional[Progress] = None,
+) -> Dict:
+    """:func:`analyze_session` + :func:`summarize_reps` as a response dict.
+
+    The dict has the ``SessionAnalysisResponse`` shape but is built from plain
+    values: one pydantic model per frame costs more than encoding the whole
+    response (see :mod:`app.api.responses`).
+    """
+    frame_results, timings = analyze_session(
+        frames, norm_frames=norm_frames, deadline=deadline, progress=progress
+    )
+    (progress or _no_progress)("summary", _SUMMARY_START)
+    t = perf_counter()
+    reps = summarize_reps(frames, frame_results, fps=fps)
+    timings["kinematics_ms"] = round((perf_counter() - t) * 1000, 1)
+    results = (
+        [
+            {
+                "start_stop": int(fr.start_stop),
+                "predicted_z": fr.predicted_z,
+                "good_bad_score": _optional_float(fr.good_bad_score),
+                "squat_score": _optional_float(fr.squat_score),
+            }
+            for fr in frame_results
+        ]
+        if include_frames
+        else []
+    )
+    return {
+        "results": results,
+        "timings": timings,
+        "reps": [rep._asdict() for rep in reps],
+        "rep_count": len(reps),
+        "partial": deadline.exceeded,
+        "deadline_stage": deadline.exceeded_at,
+    }
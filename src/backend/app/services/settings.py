@@ -0,0 +1,67 @@
+"""app.services.settings
+
+Parsing of the on/off and numeric environment settings of the serving stack.
+
+Settings are read when they are used, not at import, so tests and the
+gunicorn master can change them. A value that is unset or empty gives the
+caller's default; a malformed or out-of-range value is logged and also gives
+the default, so a typo never stops a worker from starting::
+
+    if settings.env_flag("COMPRESSION_ENABLED"):
+        ...
+    workers = settings.env_int("JOBS_WORKERS", 1)
+"""
+
+import logging
+import os
+from typing import Optional
+
+_log = logging.getLogger(__name__)
+
+_ON = {"1", "true", "yes", "on"}
+_OFF = {"0", "false", "no", "off"}
+
+
+def env_flag(name: str, default: bool = True) -> bool:
+    """``1/true/yes/on`` → True, ``0/false/no/off`` → False, otherwise ``default``."""
+    raw = (os.getenv(name) or "").strip().lower()
+    if raw in _ON:
+        return True
+    if raw in _OFF:
+        return False
+    return default
+
+
+def env_int(name: str, default: Optional[int], minimum: int = 1) -> Optional[int]:
+    """Integer ``name`` if set and ``>= minimum``, otherwise ``default``."""
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        _log.warning("Ignoring non-integer %s=%r", name, raw)
+        return default
+    if value < minimum:
+        _log.warning("Ignoring %s=%r (must be >= %d)", name, raw, minimum)
+        return default
+    return value
+
+
+def env_float(
+    name: str, default: Optional[float], minimum: float = 0.0, inclusive: bool = False
+) -> Optional[float]:
+    """Number ``name`` if set and ``> minimum`` (``>=`` with ``inclusive``), else ``default``."""
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        _log.warning("Ignoring non-numeric %s=%r", name, raw)
+        return default
+    if not (value >= minimum if inclusive else value > minimum):
+        op = ">=" if inclusive else ">"
+        _log.warning("Ignoring %s=%r (must be %s %g)", name, raw, op, minimum)
+        return default
+    return value
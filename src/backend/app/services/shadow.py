@@ -0,0 +1,234 @@
+"""app.services.shadow
+
+Champion/challenger shadow inference.
+
+With ``SHADOW_SAMPLE_RATE`` > 0, a sampled fraction of champion requests is
+replayed against the ``latest`` (challenger) variant of the same model family
+*after* the champion response has been produced::
+
+    pred, uri, run_id = predict_one(features, "champion")
+    shadow.submit("predict", pred, lambda: predict_one(features, "latest")[0])
+
+``submit`` never blocks and never raises: the work goes to a bounded queue
+(``SHADOW_QUEUE_SIZE``, default 100) drained by one daemon thread, and is
+dropped when the queue is full. Families whose challenger URI is not
+configured are skipped.
+
+The worker compares challenger and champion outputs element-wise and keeps
+streaming statistics of ``challenger - champion`` per family (Welford
+mean/std, mean/max absolute delta, exact-agreement rate); categorical outputs
+such as the weakest-link class label only count towards the agreement rate.
+The statistics are served per worker by ``GET /api/v1/diagnostics/shadow`` and
+exported to Prometheus (aggregated across workers) as ``shadow_*`` series.
+"""
+
+import logging
+import math
+import os
+import queue
+import random
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from app.services import metrics, settings
+
+_log = logging.getLogger(__name__)
+
+_DEFAULT_QUEUE_SIZE = 100
+CHALLENGER_VARIANT = "latest"
+# numpy dtype kinds compared by delta: bool, signed/unsigned int, float.
+_NUMERIC = "biuf"
+
+
+def sample_rate() -> float:
+    rate = settings.env_float("SHADOW_SAMPLE_RATE", 0.0, inclusive=True)
+    return min(rate, 1.0)
+
+
+def queue_size() -> int:
+    return settings.env_int("SHADOW_QUEUE_SIZE", _DEFAULT_QUEUE_SIZE)
+
+
+def enabled() -> bool:
+    return sample_rate() > 0.0
+
+
+class DeltaStats:
+    """Streaming statistics of ``challenger - champion`` output deltas."""
+
+    def __init__(self):
+        self.comparisons = 0
+        self.values = 0
+        self.agreements = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.abs_sum = 0.0
+        self.max_abs = 0.0
+        self.errors = 0
+        self.dropped = 0
+
+    def update(self, champion, challenger) -> np.ndarray:
+        """Record one comparison; returns the deltas (empty for categorical outputs)."""
+        a = np.asarray(champion).ravel()
+        b = np.asarray(challenger).ravel()
+        if a.shape != b.shape:
+            raise ValueError(f"Output shapes differ: {a.shape} vs {b.shape}")
+        self.comparisons += 1
+        self.agreements += int(np.array_equal(a, b))
+        if a.dtype.kind not in _NUMERIC or b.dtype.kind not in _NUMERIC:
+            return np.empty(0)  # class labels: agreement only
+        delta = b.astype(np.float64) - a.astype(np.float64)
+        if delta.size:
+            # Chan et al. parallel update of the Welford accumulators.
+            n_a, n_b = self.values, delta.size
+            mean_b = float(delta.mean())
+            m2_b = float(((delta - mean_b) ** 2).sum())
+            n = n_a + n_b
+            d = mean_b - self.mean
+            self.mean += d * n_b / n
+            self._m2 += m2_b + d * d * n_a * n_b / n
+            self.values = n
+            abs_delta = np.abs(delta)
+            self.abs_sum += float(abs_delta.sum())
+            self.max_abs = max(self.max_abs, float(abs_delta.max()))
+        return delta
+
+    def as_dict(self) -> Dict:
+        std = math.sqrt(self._m2 / (self.values - 1)) if self.values > 1 else 0.0
+        return {
+            "comparisons": self.comparisons,
+            "values": self.values,
+            "agreement_rate": (
+                self.agreements / self.comparisons if self.comparisons else None
+            ),
+            "mean_delta": self.mean if self.values else None,
+            "std_delta": std if self.values else None,
+            "mean_abs_delta": self.abs_sum / self.values if self.values else None,
+            "max_abs_delta": self.max_abs if self.values else None,
+            "errors": self.errors,
+            "dropped": self.dropped,
+        }
+
+
+def _challenger_configured(family: str) -> bool:
+    from app.services.model_preload import MODEL_FAMILIES
+
+    service = MODEL_FAMILIES.get(family)
+    return bool(service and service._direct_uri_for_variant(CHALLENGER_VARIANT))
+
+
+class ShadowRunner:
+    """Bounded queue + one daemon worker comparing champion/challenger outputs."""
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._stats: Dict[str, DeltaStats] = {}
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _family_stats(self, family: str) -> DeltaStats:
+        # Called with self._lock held.
+        if family not in self._stats:
+            self._stats[family] = DeltaStats()
+        return self._stats[family]
+
+    def _ensure_worker(self) -> queue.Queue:
+        # Called with self._lock held.
+        if self._thread is None or not self._thread.is_alive():
+            self._queue = queue.Queue(maxsize=self._maxsize or queue_size())
+            self._thread = threading.Thread(
+                target=self._run, args=(self._queue,), name="shadow", daemon=True
+            )
+            self._thread.start()
+        return self._queue
+
+    def submit(
+        self,
+        family: str,
+        champion_output,
+        run_challenger: Callable[[], object],
+        rate: Optional[float] = None,
+    ) -> bool:
+        """Queue a challenger replay; returns False if sampled out or dropped."""
+        rate = sample_rate() if rate is None else rate
+        if rate <= 0.0 or (rate < 1.0 and random.random() >= rate):
+            return False
+        if not _challenger_configured(family):
+            return False
+        with self._lock:
+            q = self._ensure_worker()
+            try:
+                q.put_nowait((family, champion_output, run_challenger))
+            except queue.Full:
+                self._family_stats(family).dropped += 1
+                metrics.observe_shadow_outcome(family, "dropped")
+                return False
+        return True
+
+    def _run(self, q: queue.Queue) -> None:
+        while True:
+            family, champion_output, run_challenger = q.get()
+            try:
+                self._compare(family, champion_output, run_challenger)
+            finally:
+                q.task_done()
+
+    def _compare(self, family: str, champion_output, run_challenger) -> None:
+        try:
+            challenger_output = run_challenger()
+            with self._lock:
+                delta = self._family_stats(family).update(
+                    champion_output, challenger_output
+                )
+        except Exception as e:
+            _log.debug("Shadow %s challenger failed: %s", family, e)
+            with self._lock:
+                self._family_stats(family).errors += 1
+            metrics.observe_shadow_outcome(family, "error")
+            return
+        metrics.observe_shadow_delta(family, delta)
+
+    def join(self) -> None:
+        """Wait until every queued comparison has been processed."""
+        q = self._queue
+        if q is not None:
+            q.join()
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {family: s.as_dict() for family, s in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _reset_after_fork(self) -> None:
+        # The worker thread does not survive fork; start a fresh one on demand.
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._stats = {}
+
+
+_runner = ShadowRunner()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_runner._reset_after_fork)
+
+
+def submit(family: str, champion_output, run_challenger: Callable[[], object]) -> bool:
+    """Sample and queue a challenger replay for ``family`` (never blocks)."""
+    return _runner.submit(family, champion_output, run_challenger)
+
+
+def status() -> Dict:
+    return {
+        "enabled": enabled(),
+        "sample_rate": sample_rate(),
+        "queue_size": queue_size(),
+        "challenger_variant": CHALLENGER_VARIANT,
+        "pid": os.getpid(),
+        "families": _runner.stats(),
+    }
@@ -6,10 +6,33 @@ Pipeline:
 1. Use MediaPipe-provided 3-D keypoints directly.
 2. Calculate knee angles from 3-D keypoints.
 3. Classify squat depth using rule-based thresholds.
+
+``classify_squat`` handles one frame of keypoint dicts; ``classify_squat_batch``
+does the same for a whole ``(n_frames, joints, 3)`` array in one pass; batch knee
+angles come from :func:`app.services.pose_geometry.vertex_angles`.
 """
 
 import math
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services import pose_geometry
+
+# Joints the classifier needs, in the default axis-1 order of batch input.
+SQUAT_JOINTS: Tuple[str, ...] = (
+    "left_hip",
+    "left_knee",
+    "left_ankle",
+    "right_hip",
+    "right_knee",
+    "right_ankle",
+)
+
+# _rule_based thresholds (degrees).
+_MAX_ASYMMETRY = 25
+_DEEP_BELOW = 100
+_SHALLOW_BELOW = 140
 
 
 # Geometry helpers
@@ -22,6 +45,10 @@ def _dist3d(p1: Dict, p2: Dict) -> float:
 def calculate_knee_angle(hip: Dict, knee: Dict, ankle: Dict) -> float:
     """Calculate the knee angle using the law of cosines.
 
+    Scalar math on purpose: for one triple it is ~10x faster than building an
+    array for :func:`app.services.pose_geometry.vertex_angles`, which the batch
+    paths use.
+
     Parameters
     ----------
     hip, knee, ankle:
@@ -30,7 +57,7 @@ def calculate_knee_angle(hip: Dict, knee: Dict, ankle: Dict) -> float:
     Returns
     -------
     float
-        Angle in degrees (0–180).
+        Angle in degrees (0–180); 180 when two of the joints coincide.
     """
     a = _dist3d(hip, knee)  # hip → knee
     b = _dist3d(knee, ankle)  # knee → ankle
@@ -50,15 +77,27 @@ def _rule_based(left_angle: float, right_angle: float) -> Tuple[str, float]:
     avg = (left_angle + right_angle) / 2
     asymmetry = abs(left_angle - right_angle)
 
-    if asymmetry > 25:
+    if asymmetry > _MAX_ASYMMETRY:
         return "Invalid", 0.70
-    if avg < 100:
+    if avg < _DEEP_BELOW:
         return "Deep", 0.80
-    if avg < 140:
+    if avg < _SHALLOW_BELOW:
         return "Shallow", 0.80
     return "Invalid", 0.70
 
 
+def _rule_based_batch(left: np.ndarray, right: np.ndarray):
+    """Vectorized :func:`_rule_based`: (labels, confidences) arrays."""
+    avg = (left + right) / 2
+    asymmetry = np.abs(left - right)
+    deep = avg < _DEEP_BELOW
+    shallow = ~deep & (avg < _SHALLOW_BELOW)
+    valid = (asymmetry <= _MAX_ASYMMETRY) & (deep | shallow)
+    labels = np.where(valid, np.where(deep, "Deep", "Shallow"), "Invalid")
+    confidence = np.where(valid, 0.80, 0.70)
+    return labels, confidence
+
+
 def _with_default_z(kp: Dict) -> Dict:
     return {**kp, "z": float(kp.get("z", 0.0))}
 
@@ -105,3 +144,59 @@ def classify_squat(
 
     classification, confidence = _rule_based(left_angle, right_angle)
     return classification, left_angle, right_angle, confidence
+
+
+def knee_angles_batch(
+    hip: np.ndarray, knee: np.ndarray, ankle: np.ndarray
+) -> np.ndarray:
+    """Vectorized :func:`calculate_knee_angle` over ``(n, 3)`` point arrays."""
+    points = np.stack([hip, knee, ankle], axis=1)
+    return pose_geometry.vertex_angles(points, [0], [1], [2])[:, 0]
+
+
+def classify_squat_batch(
+    points, joint_names: Optional[Sequence[str]] = None
+) -> Tuple[List[str], np.ndarray, np.ndarray, List[Optional[float]]]:
+    """Classify every frame of a recording at once.
+
+    Parameters
+    ----------
+    points:
+        Array-like of shape ``(n_frames, joints, 3)`` with x, y, z per joint.
+    joint_names:
+        Names of the joints along axis 1 (default :data:`SQUAT_JOINTS`). Only
+        the :data:`SQUAT_JOINTS` are used; others are ignored.
+
+    Returns
+    -------
+    tuple
+        ``(classifications, left_knee_angles, right_knee_angles, confidences)``,
+        one entry per frame, matching :func:`classify_squat` frame by frame. A
+        frame with a non-finite coordinate in a required joint is
+        ``("Invalid", 0.0, 0.0, None)``, like a frame missing that joint.
+    """
+    names = list(joint_names) if joint_names is not None else list(SQUAT_JOINTS)
+    arr = np.asarray(points, dtype=np.float64)
+    if arr.ndim != 3 or arr.shape[1:] != (len(names), 3):
+        raise ValueError(
+            f"Expected points of shape (n_frames, {len(names)}, 3), got {arr.shape}"
+        )
+    missing = [j for j in SQUAT_JOINTS if j not in names]
+    if missing:
+        raise ValueError(f"Missing required joints: {missing}")
+
+    idx = [names.index(j) for j in SQUAT_JOINTS]
+    sub = arr[:, idx, :]  # (n, 6, 3) in SQUAT_JOINTS order
+    # Both knees in one pass: (hip, knee, ankle) = (0, 1, 2) and (3, 4, 5).
+    angles = pose_geometry.vertex_angles(sub, [0, 3], [1, 4], [2, 5])
+    left, right = angles[:, 0], angles[:, 1]
+    labels, confidence = _rule_based_batch(left, right)
+
+    complete = np.isfinite(sub).all(axis=(1, 2))
+    left = np.where(complete, left, 0.0)
+    right = np.where(complete, right, 0.0)
+    labels = np.where(complete, labels, "Invalid")
+    confidences: List[Optional[float]] = [
+        float(c) if ok else None for c, ok in zip(confidence, complete)
+    ]
+    return labels.tolist(), left, right, confidences
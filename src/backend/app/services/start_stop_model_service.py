@@ -17,20 +17,15 @@ import tempfile
 import threading
 from typing import Dict, List, Optional, Tuple
 
-import mlflow
 import numpy as np
-from mlflow.exceptions import RestException
-from mlflow.tracking import MlflowClient
+
+from app.services import metrics, mlflow_metadata, model_registry
+from app.services.lazy_imports import MlflowClient, mlflow
 
 _lock = threading.Lock()
 # cache: uri → (model, uri_used, run_id, seq_len, scaler_or_None)
 _cache: Dict[str, Tuple[object, str, Optional[str], int, Optional[object]]] = {}
 
-_initial_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-if _initial_tracking_uri:
-    mlflow.set_tracking_uri(_initial_tracking_uri)
-    mlflow.set_registry_uri(_initial_tracking_uri)
-
 _DEFAULT_SEQ_LEN = 5
 
 
@@ -70,31 +65,12 @@ def _parse_models_alias_uri(uri: str) -> Tuple[str, str]:
 
 
 def _resolve_alias_to_version_uri(model_name: str, alias: str) -> str:
-    client = MlflowClient()
-    versions = sorted(
-        client.search_model_versions(f"name='{model_name}'"),
-        key=lambda mv: int(mv.version),
-    )
-    if not versions:
-        raise RuntimeError(f"No versions found for model '{model_name}'")
-    latest = versions[-1]
-    second_latest = versions[-2] if len(versions) >= 2 else latest
-    a = alias.lower().strip()
-    if a in {"prod", "production"}:
-        prod = [
-            mv
-            for mv in versions
-            if (getattr(mv, "current_stage", "") or "").lower() == "production"
-        ]
-        chosen = prod[-1] if prod else latest
-    elif a in {"backup"}:
-        chosen = second_latest
-    else:
-        chosen = latest
-    return f"models:/{model_name}/{chosen.version}"
+    return model_registry.fallback_alias_uri(model_name, alias, MlflowClient)
 
 
 def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
+    from mlflow.exceptions import RestException
+
     try:
         return mlflow.pyfunc.load_model(uri), uri
     except RestException as e:
@@ -106,34 +82,7 @@ def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
 
 
 def _fetch_run_id(uri: str) -> Optional[str]:
-    if not uri:
-        return None
-    if uri.startswith("runs:/"):
-        tail = uri[len("runs:/") :]
-        return tail.split("/", 1)[0] if tail else None
-    client = MlflowClient()
-    if _is_models_alias_uri(uri):
-        name, alias = _parse_models_alias_uri(uri)
-        try:
-            mv = client.get_model_version_by_alias(name, alias)
-            return getattr(mv, "run_id", None)
-        except Exception:
-            resolved = _resolve_alias_to_version_uri(name, alias)
-            return _fetch_run_id(resolved)
-    if uri.startswith("models:/"):
-        tail = uri[len("models:/") :]
-        parts = tail.split("/", 2)
-        if len(parts) < 2:
-            return None
-        name = parts[0].strip()
-        selector = parts[1].strip()
-        if selector.isdigit():
-            mv = client.get_model_version(name, selector)
-            return getattr(mv, "run_id", None)
-        latest = client.get_latest_versions(name, stages=[selector])
-        if latest:
-            return getattr(max(latest, key=lambda mv: int(mv.version)), "run_id", None)
-    return None
+    return model_registry.run_id_for_uri(uri, MlflowClient)
 
 
 def _fetch_run_params(run_id: Optional[str]) -> Tuple[int, bool]:
@@ -141,9 +90,7 @@ def _fetch_run_params(run_id: Optional[str]) -> Tuple[int, bool]:
     if not run_id:
         return _DEFAULT_SEQ_LEN, False
     try:
-        client = MlflowClient()
-        run = client.get_run(run_id)
-        params = run.data.params
+        params = mlflow_metadata.run_params(run_id)
         seq_len = int(params.get("seq_length", _DEFAULT_SEQ_LEN))
         use_scaling = str(params.get("use_scaling", "False")).strip().lower() == "true"
         return seq_len, use_scaling
@@ -182,10 +129,12 @@ def get_model(
     with _lock:
         if cache_key in _cache:
             return _cache[cache_key]
-        model, uri_used = _load_model_with_alias_fallback(direct_uri)
-        run_id = _fetch_run_id(uri_used)
-        seq_len, use_scaling = _fetch_run_params(run_id)
-        scaler = _fetch_scaler(run_id) if use_scaling else None
+        with metrics.model_load_timer("start_stop") as load:
+            model, uri_used = _load_model_with_alias_fallback(direct_uri)
+            load["uri"] = uri_used
+            run_id = _fetch_run_id(uri_used)
+            seq_len, use_scaling = _fetch_run_params(run_id)
+            scaler = _fetch_scaler(run_id) if use_scaling else None
         _cache[cache_key] = (model, uri_used, run_id, seq_len, scaler)
         return model, uri_used, run_id, seq_len, scaler
 
@@ -202,7 +151,7 @@ def predict_batch(
     Parameters
     ----------
     features_list:
-        List of N feature vectors, each 39 floats
+        List of N feature vectors (or an ``(N, 39)`` array), each 39 floats
         [nose_x, nose_y, nose_z, left_shoulder_x, …] in training column order
         (nose, left_shoulder, left_elbow, right_shoulder, …; 13 joints × 3 = 39).
     variant:
@@ -214,7 +163,7 @@ def predict_batch(
     """
     model, _, _, seq_len, scaler = get_model(variant)
     n = len(features_list)
-    n_feats = len(features_list[0]) if features_list else 39
+    n_feats = len(features_list[0]) if len(features_list) else 39
     X = np.array(features_list, dtype=np.float32)  # (N, 39)
 
     if scaler is not None:
@@ -252,9 +201,7 @@ def get_mae_total_average(variant: str = "champion") -> Optional[float]:
         _, _, run_id, _, _ = get_model(variant)
         if not run_id:
             return None
-        client = MlflowClient()
-        run = client.get_run(run_id)
-        val = run.data.metrics.get("MAE_Total_Average")
+        val = mlflow_metadata.run_metrics(run_id).get("MAE_Total_Average")
         return float(val) if val is not None else None
     except Exception:
         return None
@@ -21,10 +21,10 @@ import re
 import threading
 from typing import Dict, Optional, Tuple
 
-import mlflow
 import numpy as np
-from mlflow.exceptions import RestException
-from mlflow.tracking import MlflowClient
+
+from app.services import metrics, model_registry
+from app.services.lazy_imports import MlflowClient, mlflow
 
 # Thread-safe, process-local model cache:
 # key = direct URI, value = (loaded_model, uri_used, run_id)
@@ -41,12 +41,6 @@ def _clean_uri(value: Optional[str]) -> Optional[str]:
     return value.strip().strip('"').strip("'")
 
 
-_initial_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-if _initial_tracking_uri:
-    mlflow.set_tracking_uri(_initial_tracking_uri)
-    mlflow.set_registry_uri(_initial_tracking_uri)
-
-
 def _direct_uri_for_variant(variant: str) -> Optional[str]:
     """Map a variant name to a direct weakest-link model URI from environment variables."""
     v = (variant or "").lower().strip()
@@ -88,32 +82,7 @@ def _parse_models_alias_uri(uri: str) -> Tuple[str, str]:
 
 def _resolve_alias_to_version_uri(model_name: str, alias: str) -> str:
     """Resolve an alias (prod/dev/backup) to a concrete `models:/Name/<version>` URI."""
-    client = MlflowClient()
-    versions = client.search_model_versions(f"name='{model_name}'")
-    if not versions:
-        raise RuntimeError(f"No versions found for model '{model_name}'")
-
-    versions_sorted = sorted(versions, key=lambda mv: int(mv.version))
-    latest = versions_sorted[-1]
-    second_latest = versions_sorted[-2] if len(versions_sorted) >= 2 else latest
-
-    a = alias.lower().strip()
-    if a in {"prod", "production"}:
-        prod_candidates = [
-            mv
-            for mv in versions_sorted
-            if (getattr(mv, "current_stage", "") or "").lower() == "production"
-        ]
-        chosen = prod_candidates[-1] if prod_candidates else latest
-        return f"models:/{model_name}/{chosen.version}"
-
-    if a in {"dev", "latest"}:
-        return f"models:/{model_name}/{latest.version}"
-
-    if a in {"backup"}:
-        return f"models:/{model_name}/{second_latest.version}"
-
-    return f"models:/{model_name}/{latest.version}"
+    return model_registry.fallback_alias_uri(model_name, alias, MlflowClient)
 
 
 def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
@@ -122,6 +91,8 @@ def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
     If the registry rejects `models:/Name@alias`, we resolve it to a concrete
     version URI and load that instead.
     """
+    from mlflow.exceptions import RestException
+
     try:
         model = mlflow.pyfunc.load_model(uri)
         return model, uri
@@ -137,47 +108,7 @@ def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
 
 def _fetch_run_id(uri: str) -> Optional[str]:
     """Best-effort extraction of MLflow run_id from `runs:/...` or `models:/...` URIs."""
-    if not uri:
-        return None
-
-    # runs:/<run_id>/...
-    if uri.startswith("runs:/"):
-        tail = uri[len("runs:/") :]
-        return tail.split("/", 1)[0] if tail else None
-
-    client = MlflowClient()
-
-    # models:/Name@alias
-    if _is_models_alias_uri(uri):
-        name, alias = _parse_models_alias_uri(uri)
-        try:
-            mv = client.get_model_version_by_alias(name, alias)
-            return getattr(mv, "run_id", None)
-        except Exception:
-            # Fall back to your manual resolver
-            resolved = _resolve_alias_to_version_uri(name, alias)
-            return _fetch_run_id(resolved)
-
-    # models:/Name/<version>[/...]
-    if uri.startswith("models:/"):
-        tail = uri[len("models:/") :]
-        parts = tail.split("/", 2)
-        if len(parts) < 2:
-            return None
-        name = parts[0].strip()
-        selector = parts[1].strip()
-
-        if selector.isdigit():
-            mv = client.get_model_version(name, selector)
-            return getattr(mv, "run_id", None)
-
-        # stage name case (optional)
-        latest = client.get_latest_versions(name, stages=[selector])
-        if latest:
-            chosen = max(latest, key=lambda mv: int(mv.version))
-            return getattr(chosen, "run_id", None)
-
-    return None
+    return model_registry.run_id_for_uri(uri, MlflowClient)
 
 
 def get_model(variant: str = "champion") -> Tuple[object, str, Optional[str]]:
@@ -192,8 +123,10 @@ def get_model(variant: str = "champion") -> Tuple[object, str, Optional[str]]:
         if cache_key in _cache:
             return _cache[cache_key]
 
-        model, uri_used = _load_model_with_alias_fallback(direct_uri)
-        run_id = _fetch_run_id(uri_used)
+        with metrics.model_load_timer("weakest_link") as load:
+            model, uri_used = _load_model_with_alias_fallback(direct_uri)
+            load["uri"] = uri_used
+            run_id = _fetch_run_id(uri_used)
 
         _cache[cache_key] = (model, uri_used, run_id)
         return model, uri_used, run_id
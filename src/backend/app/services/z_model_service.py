@@ -1,6 +1,11 @@
 """app.services.z_model_service
 
 Model loading + prediction utilities for the z-predictor model.
+
+``predict_recording`` reconstructs z for a whole ``(n_frames, 26)`` recording:
+the sliding windows are strided views of the (edge-padded) input and only
+``Z_SEQUENCE_BATCH_WINDOWS`` windows (default 256) are materialized and sent
+through the sequence model at a time.
 """
 
 import os
@@ -8,14 +13,21 @@ import re
 import threading
 from typing import Dict, Optional, Tuple
 
-import mlflow
 import numpy as np
-from mlflow.exceptions import RestException
-from mlflow.tracking import MlflowClient
+
+from app.services import metrics, model_registry, settings
+from app.services.lazy_imports import MlflowClient, mlflow
 
 _lock = threading.Lock()
 _cache: Dict[str, Tuple[object, str, Optional[str]]] = {}
 
+SEQUENCE_WINDOW = 30
+_DEFAULT_BATCH_WINDOWS = 256
+
+
+def sequence_batch_windows() -> int:
+    return settings.env_int("Z_SEQUENCE_BATCH_WINDOWS", _DEFAULT_BATCH_WINDOWS)
+
 
 def _clean_uri(value: Optional[str]) -> Optional[str]:
     if not value:
@@ -23,12 +35,6 @@ def _clean_uri(value: Optional[str]) -> Optional[str]:
     return value.strip().strip('"').strip("'")
 
 
-_initial_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-if _initial_tracking_uri:
-    mlflow.set_tracking_uri(_initial_tracking_uri)
-    mlflow.set_registry_uri(_initial_tracking_uri)
-
-
 def _direct_uri_for_variant(variant: str) -> Optional[str]:
     v = (variant or "").lower().strip()
     if v in {"champion", "best", "prod", "production"}:
@@ -65,35 +71,12 @@ def _parse_models_alias_uri(uri: str) -> tuple[str, str]:
 
 
 def _resolve_alias_to_version_uri(model_name: str, alias: str) -> str:
-    client = MlflowClient()
-    versions = client.search_model_versions(f"name='{model_name}'")
-    if not versions:
-        raise RuntimeError(f"No versions found for model '{model_name}'")
-
-    versions_sorted = sorted(versions, key=lambda mv: int(mv.version))
-    latest = versions_sorted[-1]
-    second_latest = versions_sorted[-2] if len(versions_sorted) >= 2 else latest
-
-    a = alias.lower().strip()
-    if a in {"prod", "production"}:
-        prod_candidates = [
-            mv
-            for mv in versions_sorted
-            if (getattr(mv, "current_stage", "") or "").lower() == "production"
-        ]
-        chosen = prod_candidates[-1] if prod_candidates else latest
-        return f"models:/{model_name}/{chosen.version}"
-
-    if a in {"dev", "latest"}:
-        return f"models:/{model_name}/{latest.version}"
-
-    if a in {"backup"}:
-        return f"models:/{model_name}/{second_latest.version}"
-
-    return f"models:/{model_name}/{latest.version}"
+    return model_registry.fallback_alias_uri(model_name, alias, MlflowClient)
 
 
 def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
+    from mlflow.exceptions import RestException
+
     try:
         model = mlflow.pyfunc.load_model(uri)
         return model, uri
@@ -107,42 +90,7 @@ def _load_model_with_alias_fallback(uri: str) -> Tuple[object, str]:
 
 
 def _fetch_run_id(uri: str) -> Optional[str]:
-    if not uri:
-        return None
-
-    if uri.startswith("runs:/"):
-        tail = uri[len("runs:/") :]
-        return tail.split("/", 1)[0] if tail else None
-
-    client = MlflowClient()
-
-    if _is_models_alias_uri(uri):
-        name, alias = _parse_models_alias_uri(uri)
-        try:
-            mv = client.get_model_version_by_alias(name, alias)
-            return getattr(mv, "run_id", None)
-        except Exception:
-            resolved = _resolve_alias_to_version_uri(name, alias)
-            return _fetch_run_id(resolved)
-
-    if uri.startswith("models:/"):
-        tail = uri[len("models:/") :]
-        parts = tail.split("/", 2)
-        if len(parts) < 2:
-            return None
-        name = parts[0].strip()
-        selector = parts[1].strip()
-
-        if selector.isdigit():
-            mv = client.get_model_version(name, selector)
-            return getattr(mv, "run_id", None)
-
-        latest = client.get_latest_versions(name, stages=[selector])
-        if latest:
-            chosen = max(latest, key=lambda mv: int(mv.version))
-            return getattr(chosen, "run_id", None)
-
-    return None
+    return model_registry.run_id_for_uri(uri, MlflowClient)
 
 
 def get_model(variant: str = "champion") -> Tuple[object, str, Optional[str]]:
@@ -156,8 +104,10 @@ def get_model(variant: str = "champion") -> Tuple[object, str, Optional[str]]:
         if cache_key in _cache:
             return _cache[cache_key]
 
-        model, uri_used = _load_model_with_alias_fallback(direct_uri)
-        run_id = _fetch_run_id(uri_used)
+        with metrics.model_load_timer("z_predictor") as load:
+            model, uri_used = _load_model_with_alias_fallback(direct_uri)
+            load["uri"] = uri_used
+            run_id = _fetch_run_id(uri_used)
 
         _cache[cache_key] = (model, uri_used, run_id)
         return model, uri_used, run_id
@@ -235,6 +185,70 @@ def predict_sequence(
     return [float(p) for p in preds], uri, run_id
 
 
+def _last_frame_batch(y: np.ndarray, n_windows: int) -> np.ndarray:
+    """Per-window z of the newest frame, shape ``(n_windows, n_joints)``."""
+    if y.ndim == 3:
+        return y[:, -1, :]
+    if y.ndim == 2 and y.shape[0] == n_windows:
+        return y
+    return y.reshape(n_windows, -1)
+
+
+def predict_recording(
+    frames: list,
+    variant: str = "champion",
+    window: int = SEQUENCE_WINDOW,
+    batch_windows: Optional[int] = None,
+) -> Tuple[np.ndarray, str, Optional[str]]:
+    """Predict z for every frame of a recording.
+
+    Frame ``i`` is predicted from the window of ``window`` frames ending at
+    ``i``, exactly as :func:`predict_sequence` would; the first frames, which
+    have less history, see the first frame repeated.
+
+    Parameters
+    ----------
+    frames:
+        2-D array-like of shape ``(n_frames, n_joints * 2)``.
+    variant:
+        Model variant alias (``"champion"``, ``"latest"``, …).
+    window:
+        Frames per window (the model's sequence length).
+    batch_windows:
+        Windows per model call (default: ``Z_SEQUENCE_BATCH_WINDOWS``).
+
+    Returns
+    -------
+    Tuple of ``(z, model_uri, run_id)`` where *z* has shape
+    ``(n_frames, n_joints)``.
+    """
+    X = np.asarray(frames, dtype=np.float32)
+    if X.ndim != 2 or X.shape[0] == 0 or X.shape[1] == 0:
+        raise ValueError(
+            f"Expected a non-empty (n_frames, n_features) recording, got shape {X.shape}"
+        )
+    if window < 1:
+        raise ValueError(f"window must be positive, got {window}")
+    batch_windows = batch_windows or sequence_batch_windows()
+
+    model, uri, run_id = get_model(variant)
+    padded = np.concatenate([np.repeat(X[:1], window - 1, axis=0), X])
+    # (n_frames, window, n_features) view; nothing is copied until a batch is sliced.
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+    windows = windows.transpose(0, 2, 1)
+
+    n_frames = X.shape[0]
+    out: Optional[np.ndarray] = None
+    for start in range(0, n_frames, batch_windows):
+        batch = np.ascontiguousarray(windows[start : start + batch_windows])
+        y = np.asarray(model.predict(batch), dtype=np.float32)
+        z = _last_frame_batch(y, len(batch))
+        if out is None:
+            out = np.empty((n_frames, z.shape[1]), dtype=np.float32)
+        out[start : start + len(batch)] = z
+    return out, uri, run_id
+
+
 def predict_one(
     features: list[float], variant: str = "champion"
 ) -> Tuple[float, str, Optional[str]]:
@@ -0,0 +1,20 @@
+"""benchmarks
+
+Reproducible benchmarks for the inference hot paths:
+
+- ``start_stop_model_service.predict_batch``
+- ``goodbad_model_service.predict_session``
+- ``scoring_model_service.predict_session``
+- ``session_analysis_service.analyze_session`` (end to end + its stage timings)
+
+Sessions are synthetic (:mod:`benchmarks.synthetic`) and the models are small
+stand-in torch networks with the production input shapes
+(:mod:`benchmarks.standin_models`), logged to a local file-based MLflow store
+so the real ``mlflow.pyfunc.load_model`` path is exercised without DagsHub.
+
+Run from ``src/backend``::
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks run --baseline baseline.json
+    python -m benchmarks compare results.json baseline.json
+"""
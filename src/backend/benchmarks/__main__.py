@@ -0,0 +1,249 @@
+"""Command line entry point: ``python -m benchmarks {run,compare,loadtest,geometry,encoding}``."""
+
+import argparse
+import sys
+from typing import List, Optional, Tuple
+
+from benchmarks import encoding, geometry, loadtest, runner
+
+
+def _parse_case(value: str) -> Tuple[int, int]:
+    try:
+        frames, reps = value.split(":", 1)
+        return int(frames), int(reps)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FRAMES:REPS, got {value!r}")
+
+
+def _parse_levels(value: str) -> List[int]:
+    try:
+        levels = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected e.g. 1,2,4,8, got {value!r}")
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError("concurrency levels must be >= 1")
+    return levels
+
+
+def _parse_sizes(value: str) -> List[int]:
+    try:
+        sizes = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected e.g. 1000,10000, got {value!r}")
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError("frame counts must be >= 1")
+    return sizes
+
+
+def _parse_mix(value: str):
+    try:
+        return loadtest.parse_mix(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="run the benchmark suite")
+    p_run.add_argument(
+        "--case",
+        dest="cases",
+        action="append",
+        type=_parse_case,
+        metavar="FRAMES:REPS",
+        help="session size to benchmark (repeatable; default: 100:1 … 10000:50)",
+    )
+    p_run.add_argument(
+        "--quick", action="store_true", help="small cases only (up to 2000 frames)"
+    )
+    p_run.add_argument("--repeat", type=int, default=5)
+    p_run.add_argument("--warmup", type=int, default=1)
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument(
+        "--store", help="MLflow file store directory (default: temporary directory)"
+    )
+    p_run.add_argument("--output", "-o", help="write JSON results to this path")
+    p_run.add_argument("--baseline", help="compare against this saved results file")
+    p_run.add_argument("--tolerance", type=float, default=runner.DEFAULT_TOLERANCE)
+
+    p_cmp = sub.add_parser("compare", help="compare two saved results files")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("--tolerance", type=float, default=runner.DEFAULT_TOLERANCE)
+
+    p_load = sub.add_parser("loadtest", help="HTTP load test with a concurrency ramp")
+    p_load.add_argument(
+        "--url", help="target an existing server instead of starting app.server"
+    )
+    p_load.add_argument(
+        "--workers", type=int, default=1, help="WEB_CONCURRENCY for the local server"
+    )
+    p_load.add_argument("--port", type=int, default=8799)
+    p_load.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=loadtest.parse_mix(loadtest.DEFAULT_MIX),
+        help=f"weighted scenarios (default: {loadtest.DEFAULT_MIX}; "
+        f"available: {', '.join(loadtest.SCENARIOS)})",
+    )
+    p_load.add_argument(
+        "--concurrency",
+        type=_parse_levels,
+        default=list(loadtest.DEFAULT_CONCURRENCY),
+        help="comma-separated ramp (default: 1,2,4,8,16,32)",
+    )
+    p_load.add_argument(
+        "--duration", type=float, default=10.0, help="seconds per concurrency step"
+    )
+    p_load.add_argument("--session-frames", type=int, default=600)
+    p_load.add_argument("--session-reps", type=int, default=3)
+    p_load.add_argument("--timeout", type=float, default=60.0)
+    p_load.add_argument("--min-gain", type=float, default=loadtest.DEFAULT_MIN_GAIN)
+    p_load.add_argument(
+        "--max-error-rate", type=float, default=loadtest.DEFAULT_MAX_ERROR_RATE
+    )
+    p_load.add_argument("--seed", type=int, default=0)
+    p_load.add_argument("--store", help="MLflow file store directory for the models")
+    p_load.add_argument("--server-log", help="write the local server's output here")
+    p_load.add_argument("--output", "-o", help="write the JSON report to this path")
+
+    p_geo = sub.add_parser(
+        "geometry", help="pose_geometry primitives per backend (numpy / numba jit)"
+    )
+    p_geo.add_argument(
+        "--frames",
+        type=_parse_sizes,
+        default=list(geometry.DEFAULT_FRAMES),
+        help="comma-separated array sizes (default: 1000,10000,100000)",
+    )
+    p_geo.add_argument(
+        "--backend",
+        dest="backends",
+        action="append",
+        choices=("numpy", "jit"),
+        help="backend to time (repeatable; default: every available one)",
+    )
+    p_geo.add_argument("--repeat", type=int, default=20)
+    p_geo.add_argument("--warmup", type=int, default=2)
+    p_geo.add_argument("--seed", type=int, default=0)
+    p_geo.add_argument("--output", "-o", help="write JSON results to this path")
+    p_geo.add_argument("--baseline", help="compare against this saved results file")
+    p_geo.add_argument("--tolerance", type=float, default=runner.DEFAULT_TOLERANCE)
+
+    p_enc = sub.add_parser(
+        "encoding", help="response JSON encoding and gzip/brotli size + time"
+    )
+    p_enc.add_argument(
+        "--frames",
+        type=_parse_sizes,
+        default=list(encoding.DEFAULT_FRAMES),
+        help="comma-separated session sizes (default: 1000,10000,50000)",
+    )
+    p_enc.add_argument("--repeat", type=int, default=10)
+    p_enc.add_argument("--warmup", type=int, default=1)
+    p_enc.add_argument("--seed", type=int, default=0)
+    p_enc.add_argument("--output", "-o", help="write JSON results to this path")
+    p_enc.add_argument("--baseline", help="compare against this saved results file")
+    p_enc.add_argument("--tolerance", type=float, default=runner.DEFAULT_TOLERANCE)
+    return parser
+
+
+def _report_comparison(current, baseline_path: str, tolerance: float) -> int:
+    rows = runner.compare(current, runner.load_results(baseline_path), tolerance)
+    print(runner.format_comparison(rows))
+    if runner.has_regressions(rows):
+        print(f"\nRegression: p50 more than {tolerance:.0%} slower than baseline.")
+        return 1
+    return 0
+
+
+def _run_loadtest(args) -> int:
+    def _print_step(step):
+        print(loadtest.format_step(step), flush=True)
+
+    def _ramp(base_url: str):
+        print(f"Target {base_url}, mix {args.mix}\n{loadtest.STEP_HEADER}", flush=True)
+        return loadtest.run(
+            base_url,
+            args.mix,
+            concurrency=args.concurrency,
+            duration_s=args.duration,
+            session_frames=args.session_frames,
+            session_reps=args.session_reps,
+            seed=args.seed,
+            timeout_s=args.timeout,
+            min_gain=args.min_gain,
+            max_error_rate=args.max_error_rate,
+            on_step=_print_step,
+        )
+
+    if args.url:
+        doc = _ramp(args.url.rstrip("/"))
+    else:
+        with loadtest.local_server(
+            args.workers,
+            args.port,
+            store_dir=args.store,
+            seed=args.seed,
+            log_path=args.server_log,
+        ) as base_url:
+            doc = _ramp(base_url)
+        doc["meta"]["workers"] = args.workers
+
+    print("\n" + loadtest.format_saturation(doc["saturation"]))
+    if args.output:
+        runner.save_results(doc, args.output)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "loadtest":
+        return _run_loadtest(args)
+
+    if args.command == "compare":
+        return _report_comparison(
+            runner.load_results(args.current), args.baseline, args.tolerance
+        )
+
+    if args.command == "geometry":
+        doc = geometry.run(
+            args.frames,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            seed=args.seed,
+            backends=args.backends,
+        )
+    elif args.command == "encoding":
+        doc = encoding.run(
+            args.frames, repeat=args.repeat, warmup=args.warmup, seed=args.seed
+        )
+    else:
+        cases = args.cases or (
+            runner.QUICK_CASES if args.quick else runner.DEFAULT_CASES
+        )
+        doc = runner.run(
+            cases,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            seed=args.seed,
+            store_dir=args.store,
+        )
+    print(runner.format_results(doc))
+    if args.command == "encoding":
+        print("\n" + encoding.format_sizes(doc))
+    if args.output:
+        runner.save_results(doc, args.output)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        print()
+        return _report_comparison(doc, args.baseline, args.tolerance)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""benchmarks.encoding
+
+Response encoding and compression for the per-frame endpoints.
+
+Two payloads are built from a synthetic session (:mod:`benchmarks.synthetic`,
+one rep per 200 frames):
+
+- ``session``: an ``/squat/analyze-session`` response (per-frame start/stop,
+  z per joint and scores, plus the rep summaries);
+- ``recording``: a ``/z-predictor/predict-recording`` response, an
+  ``(n_frames, 13)`` float32 z array.
+
+For each payload and size the stages are:
+
+- ``encode.<payload>[pydantic]``: the former path — response model per frame,
+  ``jsonable_encoder``, ``JSONResponse`` (``json.dumps``);
+- ``encode.<payload>[orjson]``: what the endpoints do now — plain dicts and
+  numpy arrays rendered by :class:`app.api.responses.FastJSONResponse`;
+- ``compress.<payload>[gzip|br]``: compressing the orjson body as
+  :class:`app.api.compression.CompressionMiddleware` does (``br`` only when
+  ``brotli`` is installed).
+
+Rows use the :mod:`benchmarks.runner` result format (case ``f<frames>``) plus
+``bytes``, the body size on the wire, so ``python -m benchmarks compare``
+works on saved files and :func:`format_sizes` prints the size savings.
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks import runner, synthetic
+
+DEFAULT_FRAMES: Tuple[int, ...] = (1_000, 10_000, 50_000)
+_FRAMES_PER_REP = 200
+
+
+def _frame_results(session: synthetic.SyntheticSession):
+    from app.services import session_analysis_service as sas
+
+    results = [
+        sas.FrameResult(start_stop=0, predicted_z=z)
+        for z in sas._collect_frame_z_values(session.frames)
+    ]
+    for rep, (start, end) in enumerate(session.rep_bounds):
+        for r in results[start:end]:
+            r.start_stop = 1
+            r.good_bad_score = 0.5 + 0.01 * rep
+            r.squat_score = 3.0
+    return results
+
+
+def _session_encoders(
+    session: synthetic.SyntheticSession,
+) -> Dict[str, Callable[[], bytes]]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.api import responses
+    from app.schemas import squat as schemas
+    from app.services import session_analysis_service as sas
+
+    results = _frame_results(session)
+    reps = sas.summarize_reps(session.frames, results)
+    timings = {"start_stop_ms": 1.0, "goodbad_ms": 1.0, "scoring_ms": 1.0}
+
+    def _pydantic() -> bytes:
+        model = schemas.SessionAnalysisResponse(
+            results=[
+                schemas.FrameAnalysisResult(
+                    start_stop=r.start_stop,
+                    predicted_z=r.predicted_z,
+                    good_bad_score=r.good_bad_score,
+                    squat_score=r.squat_score,
+                )
+                for r in results
+            ],
+            timings=timings,
+            reps=[schemas.RepSummary(**rep._asdict()) for rep in reps],
+            rep_count=len(reps),
+        )
+        return JSONResponse(jsonable_encoder(model)).body
+
+    def _orjson() -> bytes:
+        return responses.dumps(
+            {
+                "results": [
+                    {
+                        "start_stop": r.start_stop,
+                        "predicted_z": r.predicted_z,
+                        "good_bad_score": r.good_bad_score,
+                        "squat_score": r.squat_score,
+                    }
+                    for r in results
+                ],
+                "timings": timings,
+                "reps": [rep._asdict() for rep in reps],
+                "rep_count": len(reps),
+                "partial": False,
+                "deadline_stage": None,
+            }
+        )
+
+    return {"pydantic": _pydantic, "orjson": _orjson}
+
+
+def _recording_encoders(
+    session: synthetic.SyntheticSession,
+) -> Dict[str, Callable[[], bytes]]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.api import responses
+    from app.schemas.prediction import ZRecordingPredictResponse
+
+    z = np.array(
+        [[kp["z"] for kp in frame] for frame in session.frames], dtype=np.float32
+    )
+    meta = {"window": 30, "model_uri": "models:/z/1", "run_id": "bench"}
+
+    def _pydantic() -> bytes:
+        model = ZRecordingPredictResponse(
+            predictions=z.tolist(), n_frames=len(z), **meta
+        )
+        return JSONResponse(jsonable_encoder(model)).body
+
+    def _orjson() -> bytes:
+        return responses.dumps({"predictions": z, "n_frames": len(z), **meta})
+
+    return {"pydantic": _pydantic, "orjson": _orjson}
+
+
+def available_encodings() -> List[str]:
+    from app.api import compression
+
+    return ["gzip", "br"] if compression.brotli_available() else ["gzip"]
+
+
+def _row(stage: str, n: int, stats: Dict, size: int) -> Dict:
+    p50 = stats["latency_ms"]["p50"]
+    return {
+        "stage": stage,
+        "case": f"f{n}",
+        "frames": n,
+        **stats,
+        "throughput_fps": round(n / (p50 / 1000), 1) if p50 else None,
+        "bytes": size,
+    }
+
+
+def run(
+    frames: Sequence[int] = DEFAULT_FRAMES,
+    repeat: int = 10,
+    warmup: int = 1,
+    seed: int = 0,
+) -> Dict:
+    """Time encoding and compression of both payloads; return the result document."""
+    from app.api import compression
+
+    encodings = available_encodings()
+    results: List[Dict] = []
+    for n in frames:
+        session = synthetic.make_session(n, max(1, n // _FRAMES_PER_REP), seed=seed)
+        for payload, build in (
+            ("session", _session_encoders),
+            ("recording", _recording_encoders),
+        ):
+            body = b""
+            for method, encode in build(session).items():
+                stats = runner.measure(encode, repeat, warmup)
+                body = encode()
+                results.append(_row(f"encode.{payload}[{method}]", n, stats, len(body)))
+            for encoding in encodings:
+                stats = runner.measure(
+                    lambda: compression.compress(body, encoding), repeat, warmup
+                )
+                size = len(compression.compress(body, encoding))
+                results.append(_row(f"compress.{payload}[{encoding}]", n, stats, size))
+
+    meta = runner._meta(
+        {
+            "frames": list(frames),
+            "repeat": repeat,
+            "warmup": warmup,
+            "seed": seed,
+            "encodings": encodings,
+        }
+    )
+    meta["max_rss_mb"] = runner._max_rss_mb()
+    return {"meta": meta, "results": results}
+
+
+def format_sizes(doc: Dict) -> str:
+    """Bytes on the wire per stage, relative to the former (pydantic) JSON body."""
+    raw: Dict[Tuple[str, str], int] = {}
+    lines = [f"{'stage':<28} {'case':<12} {'bytes':>12} {'vs before':>10}"]
+    for r in doc["results"]:
+        payload = r["stage"].split(".", 1)[1].split("[", 1)[0]
+        if r["stage"].startswith("encode."):
+            raw.setdefault((payload, r["case"]), r["bytes"])
+        base = raw.get((payload, r["case"]))
+        ratio = f"{r['bytes'] / base:.1%}" if base else "-"
+        lines.append(f"{r['stage']:<28} {r['case']:<12} {r['bytes']:>12} {ratio:>10}")
+    return "\n".join(lines)
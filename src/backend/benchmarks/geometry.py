@@ -0,0 +1,99 @@
+"""benchmarks.geometry
+
+Micro-benchmarks for :mod:`app.services.pose_geometry`, per backend.
+
+Every primitive runs on a random ``(frames, 13, 3)`` float32 pose array with
+the index sets the services use (16 feature pairs, 6 feature triples, both
+knees). Rows use the :mod:`benchmarks.runner` result format, so saved files
+work with ``python -m benchmarks compare``; the stage is
+``geometry.<primitive>[<backend>]`` and the case ``f<frames>``. The ``jit``
+backend is skipped when numba is not installed (its first call, i.e. the
+compilation, is part of the warmup).
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks import runner
+
+DEFAULT_FRAMES: Tuple[int, ...] = (1_000, 10_000, 100_000)
+
+
+def _primitives(points: np.ndarray) -> Dict[str, Callable[[str], object]]:
+    from app.services import pose_features, pose_geometry
+
+    pair_a, pair_b = pose_features._PAIR_A, pose_features._PAIR_B
+    angle_a, angle_v, angle_b = (
+        pose_features._ANGLE_A,
+        pose_features._ANGLE_V,
+        pose_features._ANGLE_B,
+    )
+    index = {name: i for i, name in enumerate(pose_features.CANONICAL_JOINTS)}
+    knees = (
+        [index["left_hip"], index["right_hip"]],
+        [index["left_knee"], index["right_knee"]],
+        [index["left_ankle"], index["right_ankle"]],
+    )
+    shoulders = (index["left_shoulder"], index["right_shoulder"])
+    hips = (index["left_hip"], index["right_hip"])
+
+    return {
+        "pair_distances": lambda b: pose_geometry.pair_distances(
+            points, pair_a, pair_b, backend=b
+        ),
+        "vertex_cosines": lambda b: pose_geometry.vertex_cosines(
+            points, angle_a, angle_v, angle_b, backend=b
+        ),
+        "knee_angles": lambda b: pose_geometry.vertex_angles(points, *knees, backend=b),
+        "shoulder_scale": lambda b: pose_geometry.shoulder_width_scale(
+            points, *shoulders, backend=b
+        ),
+        "hip_center": lambda b: pose_geometry.hip_center(points, *hips, backend=b),
+    }
+
+
+def available_backends() -> List[str]:
+    from app.services import pose_geometry
+
+    return ["numpy", "jit"] if pose_geometry.numba_available() else ["numpy"]
+
+
+def run(
+    frames: Sequence[int] = DEFAULT_FRAMES,
+    repeat: int = 20,
+    warmup: int = 2,
+    seed: int = 0,
+    backends: Optional[Sequence[str]] = None,
+) -> Dict:
+    """Time every primitive for every backend and size; return the result document."""
+    backends = list(backends or available_backends())
+    rng = np.random.default_rng(seed)
+    results: List[Dict] = []
+    for n in frames:
+        points = rng.normal(size=(n, 13, 3)).astype(np.float32)
+        for name, fn in _primitives(points).items():
+            for backend in backends:
+                stats = runner.measure(lambda: fn(backend), repeat, warmup)
+                p50 = stats["latency_ms"]["p50"]
+                results.append(
+                    {
+                        "stage": f"geometry.{name}[{backend}]",
+                        "case": f"f{n}",
+                        "frames": n,
+                        **stats,
+                        "throughput_fps": round(n / (p50 / 1000), 1) if p50 else None,
+                    }
+                )
+
+    meta = runner._meta(
+        {
+            "frames": list(frames),
+            "repeat": repeat,
+            "warmup": warmup,
+            "seed": seed,
+            "backends": backends,
+        }
+    )
+    meta["max_rss_mb"] = runner._max_rss_mb()
+    return {"meta": meta, "results": results}
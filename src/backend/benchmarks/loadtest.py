@@ -0,0 +1,453 @@
+"""benchmarks.loadtest
+
+HTTP load test for the running API.
+
+Starts ``python -m app.server`` (the production launcher, so ``--workers``
+exercises the real prefork setup) against the stand-in models from
+:mod:`benchmarks.standin_models`, or targets an existing deployment with
+``--url``. Traffic is a weighted mix of scenarios replayed by a closed loop of
+``concurrency`` clients; each concurrency step runs for ``duration`` seconds.
+
+Per step the report has requests/s, p50/p95/p99 latency and error rate, overall
+and per scenario, plus the *saturation point*: the last concurrency level
+before throughput stopped growing by at least ``min_gain`` or the error rate
+exceeded ``max_error_rate``. Sizing rule of thumb: run once per candidate
+``--workers`` value on the target instance type and keep the cheapest setting
+whose saturation RPS covers peak traffic.
+"""
+
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from time import perf_counter, sleep
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from benchmarks import synthetic
+
+DEFAULT_MIX = "predict=8,z_sequence=4,session=1,classify_batch=1,z_recording=1"
+DEFAULT_CONCURRENCY = (1, 2, 4, 8, 16, 32)
+DEFAULT_MIN_GAIN = 0.10
+DEFAULT_MAX_ERROR_RATE = 0.01
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PAYLOAD_VARIANTS = 8
+
+
+class Scenario(NamedTuple):
+    path: str
+    build: Callable[[random.Random, Dict], Dict]
+
+
+def _predict_payload(rng: random.Random, opts: Dict) -> Dict:
+    return {
+        "features": [rng.uniform(-1.0, 1.0) for _ in range(synthetic.PREDICT_FEATURES)]
+    }
+
+
+def _z_rows(rng: random.Random, n_frames: int) -> List[List[float]]:
+    return [
+        [rng.uniform(-0.5, 0.5) for _ in range(synthetic.Z_SEQ_FEATURES)]
+        for _ in range(n_frames)
+    ]
+
+
+def _z_sequence_payload(rng: random.Random, opts: Dict) -> Dict:
+    return {"sequence": _z_rows(rng, synthetic.Z_SEQ_FRAMES)}
+
+
+def _z_recording_payload(rng: random.Random, opts: Dict) -> Dict:
+    return {"frames": _z_rows(rng, opts["session_frames"])}
+
+
+def _session_payload(rng: random.Random, opts: Dict) -> Dict:
+    session = synthetic.make_session(
+        opts["session_frames"], opts["session_reps"], seed=rng.randrange(1 << 30)
+    )
+    return {"frames": session.frames, "norm_frames": session.norm_frames}
+
+
+# Default joint order of SquatBatchRequest.frames.
+_BATCH_JOINTS = (
+    "left_hip",
+    "left_knee",
+    "left_ankle",
+    "right_hip",
+    "right_knee",
+    "right_ankle",
+)
+
+
+def _classify_batch_payload(rng: random.Random, opts: Dict) -> Dict:
+    session = synthetic.make_session(
+        opts["session_frames"], opts["session_reps"], seed=rng.randrange(1 << 30)
+    )
+    frames = []
+    for frame in session.frames:
+        by_name = {kp["name"]: kp for kp in frame}
+        frames.append(
+            [[by_name[j]["x"], by_name[j]["y"], by_name[j]["z"]] for j in _BATCH_JOINTS]
+        )
+    return {"frames": frames}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "predict": Scenario("/api/v1/predict/champion", _predict_payload),
+    "z_sequence": Scenario("/api/v1/z-predictor/predict-sequence", _z_sequence_payload),
+    "session": Scenario("/api/v1/squat/analyze-session", _session_payload),
+    # Whole-recording batch endpoints, sized by --session-frames.
+    "classify_batch": Scenario("/api/v1/squat/classify-batch", _classify_batch_payload),
+    "z_recording": Scenario(
+        "/api/v1/z-predictor/predict-recording", _z_recording_payload
+    ),
+}
+
+
+class Sample(NamedTuple):
+    scenario: str
+    latency_ms: float
+    status: int  # 0 = transport error / timeout
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """``"predict=8,session=1"`` → ``{"predict": 8.0, "session": 1.0}``."""
+    mix: Dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(
+                f"Unknown scenario {name!r} (available: {', '.join(SCENARIOS)})"
+            )
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"Weight for {name!r} must be >= 0")
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Traffic mix must contain at least one positive weight")
+    return mix
+
+
+def build_payloads(
+    mix: Dict[str, float], opts: Dict, seed: int = 0
+) -> Dict[str, List[bytes]]:
+    """Pre-encode a few request bodies per scenario so the client does no JSON work."""
+    rng = random.Random(seed)
+    return {
+        name: [
+            json.dumps(SCENARIOS[name].build(rng, opts)).encode()
+            for _ in range(_PAYLOAD_VARIANTS)
+        ]
+        for name in mix
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Statistics
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _latency_summary(latencies: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {"mean": None, "p50": None, "p95": None, "p99": None}
+    arr = np.asarray(latencies, dtype=np.float64)
+    return {
+        "mean": round(float(arr.mean()), 2),
+        "p50": round(float(np.percentile(arr, 50)), 2),
+        "p95": round(float(np.percentile(arr, 95)), 2),
+        "p99": round(float(np.percentile(arr, 99)), 2),
+    }
+
+
+def _is_error(sample: Sample) -> bool:
+    return sample.status == 0 or sample.status >= 400
+
+
+def _counts(samples: Sequence[Sample], elapsed_s: float) -> Dict:
+    errors = sum(1 for s in samples if _is_error(s))
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "rps": round(len(samples) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        # Latency of successful requests only; errors are usually fast and
+        # would make an overloaded server look quicker.
+        "latency_ms": _latency_summary(
+            [s.latency_ms for s in samples if not _is_error(s)]
+        ),
+    }
+
+
+def summarize_step(
+    samples: Sequence[Sample], elapsed_s: float, concurrency: int
+) -> Dict:
+    by_scenario = {
+        name: _counts([s for s in samples if s.scenario == name], elapsed_s)
+        for name in sorted({s.scenario for s in samples})
+    }
+    statuses: Dict[str, int] = {}
+    for s in samples:
+        statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed_s, 2),
+        **_counts(samples, elapsed_s),
+        "statuses": statuses,
+        "by_scenario": by_scenario,
+    }
+
+
+def find_saturation(
+    steps: Sequence[Dict],
+    min_gain: float = DEFAULT_MIN_GAIN,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+) -> Dict:
+    """Locate the knee of the throughput curve.
+
+    Returns the last healthy concurrency level before either the error rate
+    exceeded ``max_error_rate`` or RPS grew by less than ``min_gain`` over the
+    best level so far. ``concurrency`` is ``None`` when the ramp never
+    saturated (try higher concurrency).
+    """
+    best: Optional[Dict] = None
+    for step in steps:
+        if step["error_rate"] > max_error_rate:
+            return _saturation(best, step, "error_rate")
+        if best is not None and step["rps"] < best["rps"] * (1 + min_gain):
+            return _saturation(best, step, "throughput_plateau")
+        best = step
+    return {
+        "concurrency": None,
+        "rps": best["rps"] if best else None,
+        "p95_ms": best["latency_ms"]["p95"] if best else None,
+        "reason": "not_reached",
+    }
+
+
+def _saturation(best: Optional[Dict], step: Dict, reason: str) -> Dict:
+    return {
+        "concurrency": best["concurrency"] if best else None,
+        "rps": best["rps"] if best else None,
+        "p95_ms": best["latency_ms"]["p95"] if best else None,
+        "reason": reason,
+        "at_concurrency": step["concurrency"],
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Load generation
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    payloads: Dict[str, List[bytes]],
+    names: List[str],
+    weights: List[float],
+    deadline: float,
+    rng: random.Random,
+    out: List[Sample],
+) -> None:
+    headers = {"content-type": "application/json"}
+    while perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        body = rng.choice(payloads[name])
+        t = perf_counter()
+        try:
+            resp = await client.post(
+                SCENARIOS[name].path, content=body, headers=headers
+            )
+            status = resp.status_code
+        except httpx.HTTPError:
+            status = 0
+        out.append(Sample(name, (perf_counter() - t) * 1000, status))
+
+
+async def _run_step(
+    base_url: str,
+    payloads: Dict[str, List[bytes]],
+    mix: Dict[str, float],
+    concurrency: int,
+    duration_s: float,
+    seed: int,
+    timeout_s: float,
+) -> Dict:
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    samples: List[Sample] = []
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=timeout_s
+    ) as client:
+        start = perf_counter()
+        deadline = start + duration_s
+        await asyncio.gather(
+            *(
+                _client_loop(
+                    client,
+                    payloads,
+                    names,
+                    weights,
+                    deadline,
+                    random.Random(seed * 1000 + i),
+                    samples,
+                )
+                for i in range(concurrency)
+            )
+        )
+        elapsed = perf_counter() - start
+    return summarize_step(samples, elapsed, concurrency)
+
+
+def _warm_up(base_url: str, payloads: Dict[str, List[bytes]], timeout_s: float) -> None:
+    """One request per scenario so model loads are not counted in step 1."""
+    with httpx.Client(base_url=base_url, timeout=timeout_s) as client:
+        for name, bodies in payloads.items():
+            resp = client.post(
+                SCENARIOS[name].path,
+                content=bodies[0],
+                headers={"content-type": "application/json"},
+            )
+            if resp.status_code >= 400:
+                raise RuntimeError(
+                    f"Warm-up request for {name!r} failed: "
+                    f"{resp.status_code} {resp.text[:200]}"
+                )
+
+
+def _wait_healthy(base_url: str, proc: subprocess.Popen, timeout_s: float) -> None:
+    deadline = perf_counter() + timeout_s
+    while perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        sleep(0.25)
+    raise RuntimeError(f"Server did not become healthy within {timeout_s:.0f}s")
+
+
+@contextmanager
+def local_server(
+    workers: int,
+    port: int,
+    store_dir: Optional[str] = None,
+    seed: int = 0,
+    log_path: Optional[str] = None,
+    startup_timeout_s: float = 120.0,
+) -> Iterator[str]:
+    """Run ``app.server`` on the stand-in models; yields the base URL."""
+    from benchmarks import standin_models
+
+    with tempfile.TemporaryDirectory(prefix="load-mlruns-") as tmp:
+        models_env = standin_models.publish(store_dir or tmp, seed=seed)
+        env = {
+            **os.environ,
+            **models_env,
+            "PORT": str(port),
+            "WEB_CONCURRENCY": str(workers),
+        }
+        log = open(log_path, "w") if log_path else subprocess.DEVNULL
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "app.server"],
+            cwd=_BACKEND_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_healthy(base_url, proc, startup_timeout_s)
+            yield base_url
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+            if log_path:
+                log.close()
+
+
+def run(
+    base_url: str,
+    mix: Dict[str, float],
+    concurrency: Sequence[int] = DEFAULT_CONCURRENCY,
+    duration_s: float = 10.0,
+    session_frames: int = 600,
+    session_reps: int = 3,
+    seed: int = 0,
+    timeout_s: float = 60.0,
+    min_gain: float = DEFAULT_MIN_GAIN,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    on_step: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """Ramp through ``concurrency`` levels against ``base_url``; return the report."""
+    opts = {"session_frames": session_frames, "session_reps": session_reps}
+    payloads = build_payloads(mix, opts, seed=seed)
+    _warm_up(base_url, payloads, timeout_s)
+
+    steps: List[Dict] = []
+    for level in concurrency:
+        step = asyncio.run(
+            _run_step(base_url, payloads, mix, level, duration_s, seed, timeout_s)
+        )
+        steps.append(step)
+        if on_step:
+            on_step(step)
+
+    return {
+        "meta": {
+            "url": base_url,
+            "mix": mix,
+            "concurrency": list(concurrency),
+            "duration_s": duration_s,
+            "session_frames": session_frames,
+            "session_reps": session_reps,
+            "cpu_count": os.cpu_count(),
+        },
+        "steps": steps,
+        "saturation": find_saturation(steps, min_gain, max_error_rate),
+    }
+
+
+def format_step(step: Dict) -> str:
+    lat = step["latency_ms"]
+
+    def _ms(v: Optional[float]) -> str:
+        return f"{v:.1f}" if v is not None else "-"
+
+    return (
+        f"{step['concurrency']:>6} {step['rps']:>9.1f} {_ms(lat['p50']):>9} "
+        f"{_ms(lat['p95']):>9} {_ms(lat['p99']):>9} {step['error_rate']:>8.2%}"
+    )
+
+
+STEP_HEADER = (
+    f"{'conc':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}"
+)
+
+
+def format_saturation(sat: Dict) -> str:
+    if sat["concurrency"] is None:
+        if sat["reason"] == "not_reached":
+            return (
+                f"Saturation not reached (best {sat['rps']} req/s); "
+                "ramp to higher concurrency."
+            )
+        return f"Saturated at the first step ({sat['reason']})."
+    return (
+        f"Saturation at concurrency {sat['concurrency']}: {sat['rps']} req/s, "
+        f"p95 {sat['p95_ms']} ms ({sat['reason']} at {sat['at_concurrency']})."
+    )
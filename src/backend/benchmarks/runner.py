@@ -0,0 +1,352 @@
+"""benchmarks.runner
+
+Timing harness, result format and baseline comparison.
+
+Every measurement is a *stage* (the function being timed) on a *case* (one
+synthetic session, ``f<frames>_r<reps>``). Latency comes from ``repeat``
+untraced calls after ``warmup`` calls; peak memory from one extra call under
+``tracemalloc`` (Python and numpy allocations — torch's CPU allocator is not
+traced, so the process RSS high-water mark is reported alongside).
+
+Result JSON::
+
+    {
+      "meta": {...},
+      "results": [
+        {"stage": "analyze_session", "case": "f1000_r5", "frames": 1000,
+         "reps": 5, "segments": 5, "iterations": 5,
+         "latency_ms": {"mean": .., "p50": .., "p95": .., "min": .., "max": ..},
+         "throughput_fps": .., "peak_mem_mb": ..,
+         "pipeline_ms": {"feature_build_ms": .., ...}},   # analyze_session only
+        ...
+      ]
+    }
+"""
+
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks import synthetic
+
+DEFAULT_CASES: List[Tuple[int, int]] = [
+    (100, 1),
+    (500, 3),
+    (2000, 10),
+    (5000, 25),
+    (10000, 50),
+]
+QUICK_CASES: List[Tuple[int, int]] = [(100, 1), (500, 3), (2000, 10)]
+
+DEFAULT_TOLERANCE = 0.10
+
+_MODEL_FAMILIES = ("start_stop", "goodbad", "scoring")
+
+
+def _percentile(samples: Sequence[float], q: float) -> float:
+    return float(np.percentile(np.asarray(samples, dtype=np.float64), q))
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict:
+    """Time ``fn``: latency summary (ms) over ``repeat`` calls + tracemalloc peak (MB)."""
+    for _ in range(warmup):
+        fn()
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        t = perf_counter()
+        fn()
+        samples.append((perf_counter() - t) * 1000)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": repeat,
+        "latency_ms": {
+            "mean": round(float(np.mean(samples)), 3),
+            "p50": round(_percentile(samples, 50), 3),
+            "p95": round(_percentile(samples, 95), 3),
+            "min": round(min(samples), 3),
+            "max": round(max(samples), 3),
+        },
+        "peak_mem_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def _meta(config: Dict) -> Dict:
+    try:
+        import torch
+    except ImportError:  # the geometry and encoding benchmarks run without it
+        torch = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "torch": torch.__version__ if torch else None,
+        "torch_threads": torch.get_num_threads() if torch else None,
+        "config": config,
+    }
+
+
+def _configure_services(env: Dict[str, str]) -> None:
+    os.environ.update(env)
+    # Services log every call at INFO; that would dominate the timings.
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+
+def _clear_model_caches() -> None:
+    from app.services.model_preload import MODEL_FAMILIES
+
+    for family in _MODEL_FAMILIES:
+        MODEL_FAMILIES[family]._cache.clear()
+
+
+def _bench_model_loads(repeat: int) -> List[Dict]:
+    from app.services.model_preload import MODEL_FAMILIES
+
+    rows = []
+    for family in _MODEL_FAMILIES:
+        service = MODEL_FAMILIES[family]
+
+        def _cold_load(service=service):
+            service._cache.clear()
+            service.get_model("champion")
+
+        stats = measure(_cold_load, repeat=repeat, warmup=1)
+        rows.append({"stage": f"{family}.get_model", "case": "cold", **stats})
+    return rows
+
+
+def _bench_session(
+    name: str, session: synthetic.SyntheticSession, repeat: int, warmup: int
+) -> List[Dict]:
+    from app.services import (
+        goodbad_model_service,
+        scoring_model_service,
+        session_analysis_service,
+        start_stop_model_service,
+    )
+
+    n = session.n_frames
+    base = {"case": name, "frames": n, "reps": session.n_reps}
+    rows: List[Dict] = []
+
+    features = [
+        session_analysis_service._build_features(f) for f in session.norm_frames
+    ]
+    stats = measure(
+        lambda: start_stop_model_service.predict_batch(features, "champion"),
+        repeat,
+        warmup,
+    )
+    rows.append({"stage": "start_stop.predict_batch", **base, **stats})
+
+    # One representative rep (the first) for the per-segment models.
+    if session.rep_bounds:
+        start, end = session.rep_bounds[0]
+        rep_norm = session.norm_frames[start:end]
+        rep_world = session.frames[start:end]
+        for stage, fn in (
+            (
+                "goodbad.predict_session",
+                lambda: goodbad_model_service.predict_session(rep_norm, "champion"),
+            ),
+            (
+                "scoring.predict_session",
+                lambda: scoring_model_service.predict_session(rep_world, "champion"),
+            ),
+        ):
+            stats = measure(fn, repeat, warmup)
+            rows.append(
+                {"stage": stage, **base, "frames": end - start, "reps": 1, **stats}
+            )
+
+    pipeline: List[Dict[str, float]] = []
+    segments: List[int] = []
+
+    def _analyze():
+        results, timings = session_analysis_service.analyze_session(
+            session.frames, norm_frames=session.norm_frames
+        )
+        pipeline.append(timings)
+        segments.append(
+            session_analysis_service._count_segments([r.start_stop for r in results])
+        )
+
+    stats = measure(_analyze, repeat, warmup)
+    measured = pipeline[warmup : warmup + repeat]
+    pipeline_ms = {
+        key: round(float(np.median([t[key] for t in measured])), 3)
+        for key in measured[0]
+    }
+    rows.append(
+        {
+            "stage": "analyze_session",
+            **base,
+            "segments": segments[-1],
+            **stats,
+            "pipeline_ms": pipeline_ms,
+        }
+    )
+
+    for row in rows:
+        p50 = row["latency_ms"]["p50"]
+        row["throughput_fps"] = round(row["frames"] / (p50 / 1000), 1) if p50 else None
+    return rows
+
+
+def run(
+    cases: Sequence[Tuple[int, int]] = DEFAULT_CASES,
+    repeat: int = 5,
+    warmup: int = 1,
+    seed: int = 0,
+    store_dir: Optional[str] = None,
+) -> Dict:
+    """Publish the stand-in models, run every case and return the result document."""
+    from benchmarks import standin_models
+
+    config = {
+        "cases": [list(c) for c in cases],
+        "repeat": repeat,
+        "warmup": warmup,
+        "seed": seed,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench-mlruns-") as tmp:
+        env = standin_models.publish(store_dir or tmp, seed=seed)
+        _configure_services(env)
+        _clear_model_caches()
+
+        results = _bench_model_loads(repeat)
+        sessions = synthetic.make_sessions(cases, seed=seed)
+        for name, session in sessions.items():
+            results.extend(_bench_session(name, session, repeat, warmup))
+        _clear_model_caches()
+
+    meta = _meta(config)
+    meta["max_rss_mb"] = _max_rss_mb()
+    return {"meta": meta, "results": results}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Baseline comparison
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def compare(
+    current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE
+) -> List[Dict]:
+    """Compare p50 latency per (stage, case).
+
+    Status is ``regression`` / ``improvement`` when the ratio current/baseline
+    leaves ``1 ± tolerance``, ``ok`` otherwise, ``new`` / ``missing`` when a
+    row exists on one side only.
+    """
+    base_rows = {(r["stage"], r["case"]): r for r in baseline.get("results", [])}
+    cur_rows = {(r["stage"], r["case"]): r for r in current.get("results", [])}
+
+    rows: List[Dict] = []
+    for key in list(cur_rows) + [k for k in base_rows if k not in cur_rows]:
+        cur = cur_rows.get(key)
+        base = base_rows.get(key)
+        row = {
+            "stage": key[0],
+            "case": key[1],
+            "baseline_ms": base["latency_ms"]["p50"] if base else None,
+            "current_ms": cur["latency_ms"]["p50"] if cur else None,
+            "ratio": None,
+        }
+        if cur is None:
+            row["status"] = "missing"
+        elif base is None:
+            row["status"] = "new"
+        else:
+            ratio = (
+                row["current_ms"] / row["baseline_ms"] if row["baseline_ms"] else 1.0
+            )
+            row["ratio"] = round(ratio, 3)
+            if ratio > 1 + tolerance:
+                row["status"] = "regression"
+            elif ratio < 1 - tolerance:
+                row["status"] = "improvement"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def has_regressions(rows: Sequence[Dict]) -> bool:
+    return any(r["status"] == "regression" for r in rows)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# I/O + reporting
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def load_results(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(doc: Dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+        f.write("\n")
+
+
+def format_results(doc: Dict) -> str:
+    lines = [
+        f"{'stage':<28} {'case':<12} {'p50 ms':>10} {'p95 ms':>10} "
+        f"{'frames/s':>12} {'peak MB':>9}"
+    ]
+    for r in doc["results"]:
+        fps = r.get("throughput_fps")
+        lines.append(
+            f"{r['stage']:<28} {r['case']:<12} {r['latency_ms']['p50']:>10.2f} "
+            f"{r['latency_ms']['p95']:>10.2f} "
+            f"{(f'{fps:.0f}' if fps else '-'):>12} {r['peak_mem_mb']:>9.2f}"
+        )
+    lines.append(f"max RSS: {doc['meta'].get('max_rss_mb', '-')} MB")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: Sequence[Dict]) -> str:
+    def _ms(v: Optional[float]) -> str:
+        return f"{v:.2f}" if v is not None else "-"
+
+    lines = [
+        f"{'stage':<28} {'case':<12} {'baseline':>10} {'current':>10} "
+        f"{'ratio':>7}  status"
+    ]
+    for r in rows:
+        ratio = f"{r['ratio']:.2f}" if r["ratio"] is not None else "-"
+        lines.append(
+            f"{r['stage']:<28} {r['case']:<12} {_ms(r['baseline_ms']):>10} "
+            f"{_ms(r['current_ms']):>10} {ratio:>7}  {r['status']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,175 @@
+"""benchmarks.standin_models
+
+Small torch networks standing in for the production models, with the same
+input/output contracts the services rely on:
+
+===========  =========================  ====================================
+family       input                      output
+===========  =========================  ====================================
+start_stop   (N, seq_length=5, 39)      (N, 1) raw logit, > 0 → in exercise
+goodbad      (1, c_frames=10, 61)       (1, 1) raw logit (sigmoid → Good)
+scoring      (1, c_frames=10, 61)       (1, 1) score, clipped to [0, 4]
+predict      (1, PREDICT_FEATURES)      (1,) regression value
+z_predictor  (1, 30, 26)                (1, 13) z per joint
+===========  =========================  ====================================
+
+Weights are random (seeded) except for the start/stop head, which adds a
+fixed term on hip height so the segments it finds line up with the synthetic
+reps from :mod:`benchmarks.synthetic` — otherwise GoodBad/scoring would run a
+random number of times and the numbers would not be comparable.
+
+:func:`publish` logs every model as an ``mlflow.pyfunc`` run (with the params
+the services read: ``seq_length``, ``c_frames``, ``n_features``) into a local
+file store and returns the environment that points the services at them.
+"""
+
+import os
+from typing import Dict
+
+import mlflow
+import numpy as np
+import torch
+from torch import nn
+
+from benchmarks.synthetic import (
+    HIP_DROP,
+    JOINT_NAMES,
+    PREDICT_FEATURES,
+    Z_SEQ_FEATURES,
+    Z_SEQ_FRAMES,
+)
+
+SEQ_LENGTH = 5
+C_FRAMES = 10
+N_BASE_FEATURES = 39
+N_FEATURES = 61
+
+# Columns of left_hip_y / right_hip_y in the 39-float start/stop feature vector.
+_HIP_Y_COLS = [
+    JOINT_NAMES.index("left_hip") * 3 + 1,
+    JOINT_NAMES.index("right_hip") * 3 + 1,
+]
+# Standing hip height (image-normalised) + a quarter of the full drop.
+_HIP_THRESHOLD = 0.55 + 0.25 * HIP_DROP
+
+
+class StartStopNet(nn.Module):
+    """GRU over the window + a fixed hip-height gate on the last frame."""
+
+    def __init__(self, hidden: int = 64):
+        super().__init__()
+        self.gru = nn.GRU(N_BASE_FEATURES, hidden, batch_first=True)
+        self.head = nn.Linear(hidden, 1)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        out, _ = self.gru(x)
+        learned = self.head(out[:, -1])
+        hip_y = x[:, -1, _HIP_Y_COLS].mean(dim=1, keepdim=True)
+        return 0.01 * learned + 50.0 * (hip_y - _HIP_THRESHOLD)
+
+
+class ConvHead(nn.Module):
+    """ACNN-style 1-D conv over (batch, c_frames, n_features)."""
+
+    def __init__(self, channels: int = 32):
+        super().__init__()
+        self.body = nn.Sequential(
+            nn.Conv1d(N_FEATURES, channels, kernel_size=3, padding=1),
+            nn.ReLU(),
+            nn.Conv1d(channels, channels, kernel_size=3, padding=1),
+            nn.ReLU(),
+            nn.AdaptiveAvgPool1d(1),
+        )
+        self.head = nn.Linear(channels, 1)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.head(self.body(x.permute(0, 2, 1)).squeeze(-1))
+
+
+class PredictNet(nn.Module):
+    """Two-layer MLP for the primary (Assignment 2) regression model."""
+
+    def __init__(self, hidden: int = 32):
+        super().__init__()
+        self.body = nn.Sequential(
+            nn.Linear(PREDICT_FEATURES, hidden), nn.ReLU(), nn.Linear(hidden, 1)
+        )
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.body(x).squeeze(-1)
+
+
+class ZSequenceNet(nn.Module):
+    """GRU over a (30, 26) x/y window → z for the 13 joints."""
+
+    def __init__(self, hidden: int = 64):
+        super().__init__()
+        self.gru = nn.GRU(Z_SEQ_FEATURES, hidden, batch_first=True)
+        self.head = nn.Linear(hidden, Z_SEQ_FEATURES // 2)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        out, _ = self.gru(x)
+        return self.head(out[:, -1])
+
+
+class TorchPyfunc(mlflow.pyfunc.PythonModel):
+    """pyfunc wrapper: numpy in → torch forward (no grad) → numpy out."""
+
+    def __init__(self, net: nn.Module):
+        self.net = net.eval()
+
+    def predict(self, context, model_input, params=None):
+        x = torch.as_tensor(np.asarray(model_input, dtype=np.float32))
+        with torch.no_grad():
+            return self.net(x).numpy()
+
+
+# family → (env var prefix, network factory, run params)
+_FAMILIES = {
+    "start_stop": (
+        "START_STOP_MODEL_URI",
+        StartStopNet,
+        {"seq_length": SEQ_LENGTH, "use_scaling": False},
+    ),
+    "goodbad": (
+        "GOODBAD_MODEL_URI",
+        ConvHead,
+        {"c_frames": C_FRAMES, "n_features": N_FEATURES},
+    ),
+    "scoring": (
+        "SCORING_MODEL_URI",
+        ConvHead,
+        {"c_frames": C_FRAMES, "n_features": N_FEATURES},
+    ),
+    "predict": ("MODEL_URI", PredictNet, {"n_features": PREDICT_FEATURES}),
+    "z_predictor": ("Z_MODEL_URI", ZSequenceNet, {"seq_length": Z_SEQ_FRAMES}),
+}
+
+
+def publish(store_dir: str, seed: int = 0) -> Dict[str, str]:
+    """Log the stand-in models to ``store_dir`` and return the env to serve them.
+
+    The same model is registered for both the champion (``*_PROD``) and latest
+    (``*_DEV``) variants.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    tracking_uri = "file://" + os.path.abspath(store_dir)
+    # Newer MLflow refuses file stores unless explicitly allowed.
+    os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_registry_uri(tracking_uri)
+    mlflow.set_experiment("benchmarks")
+
+    env = {
+        "MLFLOW_TRACKING_URI": tracking_uri,
+        "MLFLOW_ALLOW_FILE_STORE": os.environ["MLFLOW_ALLOW_FILE_STORE"],
+    }
+    for i, (family, (prefix, factory, params)) in enumerate(_FAMILIES.items()):
+        torch.manual_seed(seed + i)
+        with mlflow.start_run(run_name=f"standin-{family}") as run:
+            mlflow.log_params(params)
+            mlflow.pyfunc.log_model(name="model", python_model=TorchPyfunc(factory()))
+        uri = f"runs:/{run.info.run_id}/model"
+        env[f"{prefix}_PROD"] = uri
+        env[f"{prefix}_DEV"] = uri
+    return env
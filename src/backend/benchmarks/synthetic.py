@@ -0,0 +1,177 @@
+"""benchmarks.synthetic
+
+Deterministic synthetic squat sessions.
+
+A session is ``n_frames`` MediaPipe-style frames containing ``n_reps`` squat
+repetitions separated by idle standing. Each frame is a list of keypoint dicts
+(``name``, ``x``, ``y``, ``z``) for the 13 model joints, in two coordinate
+systems, exactly as the frontend sends them to ``/squat/analyze-session``:
+
+- ``norm_frames``: image-normalised (x, y ∈ [0, 1], y down)
+- ``frames``:      world space (hip-centred, metres, y down)
+
+Squat depth follows a raised cosine per rep; the hips drop by
+``HIP_DROP`` at the bottom, which is what the stand-in start/stop model keys on
+(see :mod:`benchmarks.standin_models`).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+JOINT_NAMES: List[str] = [
+    "nose",
+    "left_shoulder",
+    "left_elbow",
+    "right_shoulder",
+    "right_elbow",
+    "left_wrist",
+    "right_wrist",
+    "left_hip",
+    "right_hip",
+    "left_knee",
+    "right_knee",
+    "left_ankle",
+    "right_ankle",
+]
+
+# Input shapes of the single-prediction models, shared by the stand-in models
+# and the load-test request bodies (which must not need torch).
+PREDICT_FEATURES = 41
+Z_SEQ_FRAMES = 30
+Z_SEQ_FEATURES = 26
+
+# Standing pose, image-normalised (x, y, z).
+_STANDING: Dict[str, Tuple[float, float, float]] = {
+    "nose": (0.50, 0.15, -0.30),
+    "left_shoulder": (0.56, 0.28, -0.20),
+    "right_shoulder": (0.44, 0.28, -0.20),
+    "left_elbow": (0.59, 0.40, -0.15),
+    "right_elbow": (0.41, 0.40, -0.15),
+    "left_wrist": (0.60, 0.50, -0.20),
+    "right_wrist": (0.40, 0.50, -0.20),
+    "left_hip": (0.54, 0.55, 0.00),
+    "right_hip": (0.46, 0.55, 0.00),
+    "left_knee": (0.55, 0.72, -0.05),
+    "right_knee": (0.45, 0.72, -0.05),
+    "left_ankle": (0.55, 0.90, 0.05),
+    "right_ankle": (0.45, 0.90, 0.05),
+}
+
+# Vertical drop (image units) of each joint at full squat depth.
+HIP_DROP = 0.20
+_DROP: Dict[str, float] = {
+    "nose": 0.18,
+    "left_shoulder": 0.18,
+    "right_shoulder": 0.18,
+    "left_elbow": 0.16,
+    "right_elbow": 0.16,
+    "left_wrist": 0.14,
+    "right_wrist": 0.14,
+    "left_hip": HIP_DROP,
+    "right_hip": HIP_DROP,
+    "left_knee": 0.04,
+    "right_knee": 0.04,
+    "left_ankle": 0.0,
+    "right_ankle": 0.0,
+}
+
+# Fraction of the session spent squatting; the rest is idle standing.
+_ACTIVE_FRACTION = 0.6
+_MIN_REP_FRAMES = 12
+# Image units → metres for the world-space copy.
+_WORLD_SCALE = 1.8
+
+
+@dataclass(frozen=True)
+class SyntheticSession:
+    frames: List[List[Dict]]
+    norm_frames: List[List[Dict]]
+    n_reps: int
+    rep_bounds: List[Tuple[int, int]]
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.frames)
+
+
+def depth_profile(
+    n_frames: int, n_reps: int
+) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """Per-frame squat depth in [0, 1] and the (start, end) frame range of each rep."""
+    if n_frames <= 0:
+        raise ValueError("n_frames must be positive")
+    if n_reps < 0:
+        raise ValueError("n_reps must be >= 0")
+
+    depth = np.zeros(n_frames, dtype=np.float64)
+    if n_reps == 0:
+        return depth, []
+
+    rep_len = max(_MIN_REP_FRAMES, int(_ACTIVE_FRACTION * n_frames / n_reps))
+    gap = (n_frames - n_reps * rep_len) / (n_reps + 1)
+    if gap < 1:
+        raise ValueError(
+            f"{n_reps} reps of {rep_len} frames do not fit in {n_frames} frames"
+        )
+
+    t = np.linspace(0.0, 1.0, rep_len)
+    rep_curve = 0.5 * (1.0 - np.cos(2.0 * np.pi * t))
+    bounds: List[Tuple[int, int]] = []
+    for r in range(n_reps):
+        start = int(round(gap * (r + 1) + rep_len * r))
+        depth[start : start + rep_len] = rep_curve
+        bounds.append((start, start + rep_len))
+    return depth, bounds
+
+
+def _to_keypoints(arr: np.ndarray) -> List[List[Dict]]:
+    """(n_frames, 13, 3) array → list of keypoint-dict frames."""
+    return [
+        [
+            {"name": name, "x": float(x), "y": float(y), "z": float(z)}
+            for name, (x, y, z) in zip(JOINT_NAMES, frame)
+        ]
+        for frame in arr.tolist()
+    ]
+
+
+def make_session(
+    n_frames: int, n_reps: int, seed: int = 0, noise: float = 0.003
+) -> SyntheticSession:
+    """Build one reproducible session (same arguments → identical frames)."""
+    rng = np.random.default_rng(seed)
+    depth, bounds = depth_profile(n_frames, n_reps)
+
+    standing = np.array([_STANDING[j] for j in JOINT_NAMES], dtype=np.float64)
+    drop = np.array([_DROP[j] for j in JOINT_NAMES], dtype=np.float64)
+
+    norm = np.repeat(standing[None], n_frames, axis=0)  # (n, 13, 3)
+    norm[:, :, 1] += depth[:, None] * drop[None, :]
+    norm += rng.normal(0.0, noise, size=norm.shape)
+
+    hips = [JOINT_NAMES.index("left_hip"), JOINT_NAMES.index("right_hip")]
+    hip_centre = norm[:, hips, :].mean(axis=1, keepdims=True)
+    world = (norm - hip_centre) * _WORLD_SCALE
+
+    return SyntheticSession(
+        frames=_to_keypoints(world),
+        norm_frames=_to_keypoints(norm),
+        n_reps=n_reps,
+        rep_bounds=bounds,
+    )
+
+
+def make_sessions(
+    cases: Sequence[Tuple[int, int]], seed: int = 0
+) -> Dict[str, SyntheticSession]:
+    """``{case_name: session}`` for (n_frames, n_reps) pairs, named ``f<frames>_r<reps>``."""
+    return {
+        case_name(n_frames, n_reps): make_session(n_frames, n_reps, seed=seed + i)
+        for i, (n_frames, n_reps) in enumerate(cases)
+    }
+
+
+def case_name(n_frames: int, n_reps: int) -> str:
+    return f"f{n_frames}_r{n_reps}"
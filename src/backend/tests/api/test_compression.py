@@ -0,0 +1,153 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api import compression
+from app.api.compression import CompressionMiddleware
+from app.api.responses import FastJSONResponse
+
+_BIG = {"values": list(range(500))}
+_CHUNKS = [b'{"frame":%d}\n' % i for i in range(200)]
+
+
+def create_test_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, min_bytes=100)
+
+    @app.get("/big")
+    def big():
+        return FastJSONResponse(_BIG)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter(_CHUNKS), media_type="application/x-ndjson")
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\0" * 1000, media_type="image/png")
+
+    @app.get("/encoded")
+    def encoded():
+        body = gzip.compress(b"x" * 1000)
+        return Response(
+            body, media_type="text/plain", headers={"Content-Encoding": "gzip"}
+        )
+
+    return app
+
+
+@pytest.mark.parametrize(
+    "header, brotli_ok, expected",
+    [
+        ("gzip, deflate, br", True, "br"),
+        ("gzip, deflate, br", False, "gzip"),
+        ("gzip;q=1.0, br;q=0.5", True, "gzip"),
+        ("br;q=0", True, None),
+        ("identity", True, None),
+        ("*", True, "br"),
+        ("*;q=0.5, gzip", False, "gzip"),
+        ("gzip;q=bad", True, None),
+        ("", True, None),
+        (None, True, None),
+    ],
+)
+def test_negotiate(header, brotli_ok, expected):
+    assert compression.negotiate(header, brotli_ok) == expected
+
+
+def test_gzip_response_gets_encoding_length_and_vary():
+    client = TestClient(create_test_app())
+
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == _BIG
+
+
+@pytest.mark.skipif(not compression.brotli_available(), reason="brotli not installed")
+def test_brotli_preferred_when_installed():
+    import brotli
+
+    client = TestClient(create_test_app())
+
+    with client.stream("GET", "/big", headers={"Accept-Encoding": "gzip, br"}) as r:
+        raw = b"".join(r.iter_raw())
+
+    assert r.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw) == FastJSONResponse(_BIG).body
+
+
+def test_no_accept_encoding_is_untouched():
+    client = TestClient(create_test_app())
+
+    response = client.get("/big", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == _BIG
+
+
+@pytest.mark.parametrize("path", ["/small", "/binary", "/encoded"])
+def test_small_binary_and_encoded_bodies_pass_through(path):
+    client = TestClient(create_test_app())
+
+    with client.stream("GET", path, headers={"Accept-Encoding": "gzip"}) as r:
+        raw = b"".join(r.iter_raw())
+
+    assert r.headers.get("content-encoding") == ("gzip" if path == "/encoded" else None)
+    assert "vary" not in r.headers
+    assert len(raw) == int(r.headers["content-length"])
+
+
+def test_streamed_body_is_compressed_per_chunk():
+    client = TestClient(create_test_app())
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as r:
+        raw = b"".join(r.iter_raw())
+
+    assert r.headers["content-encoding"] == "gzip"
+    assert "content-length" not in r.headers
+    assert gzip.decompress(raw) == b"".join(_CHUNKS)
+
+
+def test_streamed_chunks_are_flushed():
+    compressor = compression.GzipCompressor()
+    first = compressor.compress(_CHUNKS[0])
+    rest = compressor.finish()
+
+    # A sync flush makes the first chunk decodable before the stream ends.
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decoder.decompress(first) == _CHUNKS[0]
+    assert decoder.decompress(rest) == b""
+
+
+def test_disabled_by_env(monkeypatch):
+    monkeypatch.setenv("COMPRESSION_ENABLED", "0")
+    client = TestClient(create_test_app())
+
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_min_bytes_from_env(monkeypatch):
+    monkeypatch.setenv("COMPRESSION_MIN_BYTES", "bad")
+    assert compression.configured_min_bytes() == compression.DEFAULT_MIN_BYTES
+    monkeypatch.setenv("COMPRESSION_MIN_BYTES", "0")
+    assert compression.configured_min_bytes() == 0
+
+
+def test_main_app_compresses_large_responses(client):
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["paths"]
@@ -0,0 +1,43 @@
+def test_metrics_status_code(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+
+
+def test_metrics_content_type(client):
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+
+
+def test_metrics_records_route_template(client):
+    client.get("/health")
+    body = client.get("/metrics").text
+    assert (
+        'http_request_duration_seconds_count{method="GET",model_family="none",'
+        'model_version="none",route="/health",status="200"}'
+    ) in body
+
+
+def test_metrics_label_inference_requests_with_the_serving_model(client, monkeypatch):
+    from unittest.mock import patch
+
+    from app.services import metrics
+
+    monkeypatch.setattr(metrics, "loaded_model_version", lambda family, variant: "7")
+    with patch(
+        "app.api.v1.endpoints.predict.predict_one",
+        return_value=(0.5, "models:/Champion/7", "run_123"),
+    ):
+        client.post("/api/v1/predict/champion", json={"features": [1.0]})
+    body = client.get("/metrics").text
+    assert (
+        'http_request_duration_seconds_count{method="POST",model_family="predict",'
+        'model_version="7",route="/api/v1/predict/champion",status="200"}'
+    ) in body
+
+
+def test_metrics_unmatched_routes_share_one_label(client):
+    client.get("/does-not-exist-1")
+    client.get("/does-not-exist-2")
+    body = client.get("/metrics").text
+    assert 'route="unmatched"' in body
+    assert "does-not-exist" not in body
@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pytest
+from pydantic import BaseModel
+
+from app.api.responses import FastJSONResponse, dumps
+
+
+class _Point(BaseModel):
+    x: float
+    y: float
+
+
+def test_numpy_arrays_and_scalars_are_written_directly():
+    body = dumps(
+        {
+            "z": np.array([[0.5, 1.25], [2.0, -1.0]], dtype=np.float32),
+            "n": np.int64(3),
+            "score": np.float64(0.75),
+        }
+    )
+
+    assert json.loads(body) == {"z": [[0.5, 1.25], [2.0, -1.0]], "n": 3, "score": 0.75}
+
+
+def test_float32_values_keep_their_short_repr():
+    assert dumps(np.array([0.1], dtype=np.float32)) == b"[0.1]"
+
+
+def test_non_contiguous_and_object_arrays_fall_back_to_lists():
+    arr = np.arange(6, dtype=np.float64).reshape(2, 3)
+
+    assert json.loads(dumps(arr.T)) == arr.T.tolist()
+    assert json.loads(dumps(np.array(["a", None], dtype=object))) == ["a", None]
+
+
+def test_nan_becomes_null():
+    assert json.loads(dumps({"a": np.array([1.0, np.nan]), "b": float("nan")})) == {
+        "a": [1.0, None],
+        "b": None,
+    }
+
+
+def test_pydantic_models_are_dumped():
+    assert json.loads(dumps([_Point(x=1, y=2)])) == [{"x": 1.0, "y": 2.0}]
+
+
+def test_unknown_types_raise():
+    with pytest.raises(TypeError):
+        dumps({"a": object()})
+
+
+def test_response_renders_json():
+    response = FastJSONResponse({"values": np.arange(3)})
+
+    assert response.media_type == "application/json"
+    assert response.body == b'{"values":[0,1,2]}'
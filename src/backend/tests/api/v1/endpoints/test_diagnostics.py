@@ -0,0 +1,176 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.api.v1.endpoints.diagnostics import router as diagnostics_router
+
+
+def create_test_app():
+    app = FastAPI()
+    app.include_router(diagnostics_router, prefix="/api/v1")
+    return app
+
+
+def test_diagnostics_topology_status_code():
+    client = TestClient(create_test_app())
+    response = client.get("/api/v1/diagnostics/topology")
+    assert response.status_code == 200
+
+
+def test_diagnostics_topology_response():
+    client = TestClient(create_test_app())
+    settings = {"workers": 2, "torch_threads": 1, "executor_threads": 4}
+
+    with patch(
+        "app.api.v1.endpoints.diagnostics.serving_topology.effective_settings",
+        return_value=settings,
+    ):
+        response = client.get("/api/v1/diagnostics/topology")
+
+    assert response.json() == settings
+
+
+def test_diagnostics_models_response():
+    client = TestClient(create_test_app())
+    status = {"preloaded": True, "preload_pid": 1, "pid": 2, "resident": {}}
+
+    with patch(
+        "app.api.v1.endpoints.diagnostics.model_preload.status",
+        return_value=status,
+    ):
+        response = client.get("/api/v1/diagnostics/models")
+
+    assert response.json() == status
+
+
+def test_diagnostics_profiles_hidden_when_disabled(monkeypatch):
+    monkeypatch.delenv("PROFILING_TOKEN", raising=False)
+    client = TestClient(create_test_app())
+    response = client.get("/api/v1/diagnostics/profiles")
+    assert response.status_code == 404
+
+
+def test_diagnostics_profiles_require_token(monkeypatch):
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    client = TestClient(create_test_app())
+    response = client.get("/api/v1/diagnostics/profiles", headers={"X-Profile": "no"})
+    assert response.status_code == 403
+
+
+def test_profiled_predict_request_can_be_downloaded(monkeypatch, tmp_path):
+    from app.api.v1.endpoints.predict import router as predict_router
+
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    monkeypatch.setenv("PROFILING_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILING_INTERVAL_MS", "1")
+    app = create_test_app()
+    app.include_router(predict_router, prefix="/api/v1")
+    client = TestClient(app)
+
+    def _slow_predict(_features, _variant):
+        time.sleep(0.05)
+        return 0.5, "models:/Champion/3", "run_123"
+
+    with patch("app.api.v1.endpoints.predict.predict_one", _slow_predict):
+        response = client.post(
+            "/api/v1/predict/champion",
+            json={"features": [1.0]},
+            headers={"X-Profile": "s3cret"},
+        )
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    listing = client.get(
+        "/api/v1/diagnostics/profiles", headers={"X-Profile": "s3cret"}
+    ).json()
+    assert listing[0]["id"] == profile_id
+    assert listing[0]["route"] == "/api/v1/predict/champion"
+
+    collapsed = client.get(
+        f"/api/v1/diagnostics/profiles/{profile_id}", headers={"X-Profile": "s3cret"}
+    )
+    assert collapsed.status_code == 200
+    assert "_slow_predict" in collapsed.text
+
+
+def test_unprofiled_request_has_no_profile_header(monkeypatch):
+    from app.api.v1.endpoints.predict import router as predict_router
+
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    app = create_test_app()
+    app.include_router(predict_router, prefix="/api/v1")
+    client = TestClient(app)
+
+    with patch(
+        "app.api.v1.endpoints.predict.predict_one",
+        return_value=(0.5, "models:/Champion/3", "run_123"),
+    ):
+        response = client.post("/api/v1/predict/champion", json={"features": [1.0]})
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_wrong_profiling_token_is_rejected(monkeypatch):
+    from app.api.v1.endpoints.predict import router as predict_router
+
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    app = create_test_app()
+    app.include_router(predict_router, prefix="/api/v1")
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/predict/champion",
+        json={"features": [1.0]},
+        headers={"X-Profile": "wrong"},
+    )
+    assert response.status_code == 403
+
+
+def test_profiling_token_in_query_string_is_ignored(monkeypatch):
+    from app.api.v1.endpoints.predict import router as predict_router
+
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    app = create_test_app()
+    app.include_router(predict_router, prefix="/api/v1")
+    client = TestClient(app)
+
+    with patch(
+        "app.api.v1.endpoints.predict.predict_one",
+        return_value=(0.5, "models:/Champion/3", "run_123"),
+    ):
+        response = client.post(
+            "/api/v1/predict/champion",
+            json={"features": [1.0]},
+            params={"profile": "s3cret"},
+        )
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_diagnostics_shadow_response(monkeypatch):
+    monkeypatch.setenv("SHADOW_SAMPLE_RATE", "0.25")
+    client = TestClient(create_test_app())
+    body = client.get("/api/v1/diagnostics/shadow").json()
+    assert body["enabled"] is True
+    assert body["sample_rate"] == 0.25
+    assert body["challenger_variant"] == "latest"
+    assert isinstance(body["families"], dict)
+
+
+def test_diagnostics_scheduler_response(monkeypatch):
+    monkeypatch.setenv("SCHEDULER_SLOTS", "8")
+    monkeypatch.delenv("SCHEDULER_CLASSES", raising=False)
+    monkeypatch.setattr("app.services.scheduler._scheduler", None)
+    client = TestClient(create_test_app())
+
+    body = client.get("/api/v1/diagnostics/scheduler").json()
+
+    assert body["slots"] == 8
+    assert body["classes"]["interactive"]["limit"] == 6
+    assert body["classes"]["bulk"]["limit"] == 2
+    assert body["classes"]["bulk"]["waiting"] == 0
@@ -0,0 +1,154 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints.jobs import router as jobs_router
+from app.services import jobs
+
+
+def create_test_app():
+    app = FastAPI()
+    app.include_router(jobs_router, prefix="/api/v1")
+    return app
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    runner = jobs.JobRunner(
+        jobs.JobStore(str(tmp_path / "jobs.sqlite3")), max_pending=1
+    )
+    monkeypatch.setattr(jobs, "_runner", runner)
+    yield runner
+    runner.shutdown()
+
+
+@pytest.fixture
+def models():
+    gate = threading.Event()
+    gate.set()
+
+    def goodbad(_frames, _variant="champion"):
+        gate.wait(5)
+        return 0.9
+
+    with (
+        patch(
+            "app.services.session_analysis_service.start_stop_model_service"
+            ".predict_batch",
+            lambda features, _variant="champion": [1] * len(features),
+        ),
+        patch(
+            "app.services.session_analysis_service.goodbad_model_service"
+            ".predict_session",
+            goodbad,
+        ),
+        patch(
+            "app.services.session_analysis_service.scoring_model_service"
+            ".predict_session",
+            lambda _frames, _variant="champion": 2,
+        ),
+    ):
+        yield gate
+
+
+def _session(n=4):
+    frame = [
+        {"name": "left_hip", "x": 0.0, "y": 1.0, "z": 0.1},
+        {"name": "right_hip", "x": 0.2, "y": 1.0, "z": 0.2},
+    ]
+    return {"frames": [frame] * n, "fps": 2}
+
+
+def _wait_done(client, job_id, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        body = client.get(f"/api/v1/jobs/{job_id}").json()
+        if body["status"] not in jobs.ACTIVE:
+            return body
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_submit_poll_and_fetch_result(runner, models):
+    client = TestClient(create_test_app())
+
+    response = client.post("/api/v1/jobs/analyze-session", json=_session())
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued" and job["deduplicated"] is False
+    assert response.headers["location"] == f"/api/v1/jobs/{job['job_id']}"
+
+    done = _wait_done(client, job["job_id"])
+    assert done["status"] == "done" and done["progress"] == 1.0
+
+    result = client.get(f"/api/v1/jobs/{job['job_id']}/result")
+    assert result.status_code == 200
+    body = result.json()
+    assert body["rep_count"] == 1 and body["partial"] is False
+    frame = body["results"][0]
+    assert frame["start_stop"] == 1
+    assert frame["good_bad_score"] == 0.9 and frame["squat_score"] == 2.0
+    assert frame["predicted_z"]["left_hip"] == pytest.approx(0.1)
+
+
+def test_duplicate_submission_dedupes(runner, models):
+    models.clear()
+    client = TestClient(create_test_app())
+    first = client.post("/api/v1/jobs/analyze-session", json=_session()).json()
+
+    again = client.post("/api/v1/jobs/analyze-session", json=_session())
+    # A different payload needs a new job; max_pending=1 is already taken.
+    other = client.post("/api/v1/jobs/analyze-session", json=_session(n=5))
+    models.set()
+    _wait_done(client, first["job_id"])
+    after = client.post("/api/v1/jobs/analyze-session", json=_session())
+
+    assert again.status_code == 200
+    assert again.json()["job_id"] == first["job_id"]
+    assert again.json()["deduplicated"] is True
+    assert other.status_code == 503 and other.headers["retry-after"] == "5"
+    assert after.status_code == 200 and after.json()["status"] == "done"
+
+
+def test_result_is_409_until_done_and_cancel(runner, models):
+    models.clear()
+    client = TestClient(create_test_app())
+    job = client.post("/api/v1/jobs/analyze-session", json=_session()).json()
+
+    pending = client.get(f"/api/v1/jobs/{job['job_id']}/result")
+    cancelled = client.delete(f"/api/v1/jobs/{job['job_id']}")
+    models.set()
+
+    assert pending.status_code == 409
+    assert cancelled.status_code == 200 and cancelled.json()["status"] == "cancelled"
+    gone = client.get(f"/api/v1/jobs/{job['job_id']}/result")
+    assert gone.status_code == 409 and "cancelled" in gone.json()["detail"]
+
+
+def test_events_stream_until_finished(runner, models, monkeypatch):
+    monkeypatch.setattr("app.api.v1.endpoints.jobs.EVENTS_POLL_S", 0.01)
+    client = TestClient(create_test_app())
+    job = client.post("/api/v1/jobs/analyze-session", json=_session()).json()
+
+    response = client.get(f"/api/v1/jobs/{job['job_id']}/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events and '"status":"done"' in events[-1]
+
+
+def test_unknown_job_is_404(runner):
+    client = TestClient(create_test_app())
+
+    for method, path in (
+        ("get", "/api/v1/jobs/nope"),
+        ("get", "/api/v1/jobs/nope/result"),
+        ("get", "/api/v1/jobs/nope/events"),
+        ("delete", "/api/v1/jobs/nope"),
+    ):
+        assert getattr(client, method)(path).status_code == 404
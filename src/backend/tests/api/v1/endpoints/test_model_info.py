@@ -172,3 +172,56 @@ def test_model_info_weakest_link_champion_response():
             "expected_features": 6,
             "run_id": "run_987",
         }
+
+
+def test_model_info_etag_and_not_modified():
+    app = create_test_app()
+    client = TestClient(app)
+    with (
+        patch(
+            "app.api.v1.endpoints.model_info.get_model",
+            return_value=(MagicMock(), "models:/Latest/5", "run_123"),
+        ),
+        patch(
+            "app.api.v1.endpoints.model_info.expected_feature_count",
+            return_value=4,
+        ),
+    ):
+        first = client.get("/api/v1/model-info/latest")
+        etag = first.headers["etag"]
+        assert "max-age=" in first.headers["cache-control"]
+
+        again = client.get("/api/v1/model-info/latest", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+        stale = client.get(
+            "/api/v1/model-info/latest", headers={"If-None-Match": 'W/"old"'}
+        )
+        assert stale.status_code == 200
+
+
+def test_model_info_z_metrics_fetches_run_once():
+    app = create_test_app()
+    client = TestClient(app)
+    run = MagicMock()
+    run.data.params = {}
+    run.data.metrics = {"Mean_F1": 0.9, "MAE": 1.5}
+    fake_client = MagicMock()
+    fake_client.get_run.return_value = run
+    with (
+        patch(
+            "app.api.v1.endpoints.model_info.z_model_service.get_model",
+            return_value=(MagicMock(), "runs:/run_z/model", "run_z"),
+        ),
+        patch(
+            "app.services.mlflow_metadata.MlflowClient",
+            return_value=fake_client,
+        ),
+    ):
+        for _ in range(3):
+            response = client.get("/api/v1/model-info/z-metrics")
+            assert response.json() == {"run_id": "run_z", "mean_f1": 0.9, "mae": 1.5}
+
+    fake_client.get_run.assert_called_once_with("run_z")
@@ -108,3 +108,28 @@ def test_predict_latest_service_failure_response():
         )
 
     assert "RuntimeError" in response.json()["detail"]
+
+
+def test_predict_champion_is_shadowed_on_latest():
+    app = create_test_app()
+    client = TestClient(app)
+    calls = []
+
+    def fake_predict_one(features, variant):
+        calls.append(variant)
+        return 0.88, f"models:/M/{variant}", "run_123"
+
+    with (
+        patch("app.api.v1.endpoints.predict.predict_one", fake_predict_one),
+        patch("app.api.v1.endpoints.predict.shadow.submit") as submit,
+    ):
+        client.post("/api/v1/predict/champion", json={"features": [1.0]})
+        family, champion_pred, run_challenger = submit.call_args.args
+        assert (family, champion_pred) == ("predict", 0.88)
+        assert calls == ["champion"]
+        assert run_challenger() == 0.88
+        assert calls == ["champion", "latest"]
+
+        submit.reset_mock()
+        client.post("/api/v1/predict/latest", json={"features": [1.0]})
+        submit.assert_not_called()
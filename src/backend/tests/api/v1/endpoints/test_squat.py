@@ -0,0 +1,211 @@
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.api.v1.endpoints.squat import router as squat_router
+
+
+def create_test_app():
+    app = FastAPI()
+    app.include_router(squat_router, prefix="/api/v1")
+    return app
+
+
+def _deep_frame():
+    # Both knees at 90°: hip above knee, ankle in front of knee.
+    leg = [[0.0, 1.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+    return leg + leg
+
+
+def test_classify_batch_response():
+    client = TestClient(create_test_app())
+    straight = [[0.0, 2.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0]] * 2
+
+    response = client.post(
+        "/api/v1/squat/classify-batch",
+        json={"frames": [_deep_frame(), straight, _deep_frame()]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["classifications"] == ["Deep", "Invalid", "Deep"]
+    assert body["left_knee_angles"][0] == pytest.approx(90.0)
+    assert body["confidences"] == [0.8, 0.7, 0.8]
+    assert body["counts"] == {"Deep": 2, "Invalid": 1}
+
+
+def test_classify_batch_wrong_shape_is_422():
+    client = TestClient(create_test_app())
+    response = client.post(
+        "/api/v1/squat/classify-batch",
+        json={"frames": [[[0.0, 1.0, 0.0]]]},
+    )
+    assert response.status_code == 422
+
+
+def test_analyze_session_reps_only():
+    client = TestClient(create_test_app())
+    frame = [
+        {"name": name, "x": x, "y": y, "z": z}
+        for name, (x, y, z) in zip(
+            ("left_hip", "left_knee", "left_ankle"),
+            ([0.0, 1.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]),
+        )
+    ]
+    frame += [dict(kp, name=kp["name"].replace("left", "right")) for kp in frame]
+
+    with (
+        patch(
+            "app.services.session_analysis_service.start_stop_model_service"
+            ".predict_batch",
+            lambda _features, _variant="champion": [1, 1],
+        ),
+        patch(
+            "app.services.session_analysis_service.goodbad_model_service"
+            ".predict_session",
+            lambda _frames, _variant="champion": 0.9,
+        ),
+        patch(
+            "app.services.session_analysis_service.scoring_model_service"
+            ".predict_session",
+            lambda _frames, _variant="champion": 1,
+        ),
+    ):
+        response = client.post(
+            "/api/v1/squat/analyze-session",
+            json={"frames": [frame, frame], "include_frames": False, "fps": 2},
+        )
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["results"] == []
+    assert body["rep_count"] == 1
+    rep = body["reps"][0]
+    assert rep["min_knee_angle"] == pytest.approx(90.0)
+    assert rep["time_under_tension_s"] == 1.0
+    assert rep["squat_score"] == 1
+    assert "kinematics_ms" in body["timings"]
+
+
+def _session_frame():
+    return [
+        {"name": "left_hip", "x": 0.0, "y": 1.0, "z": 0.0},
+        {"name": "right_hip", "x": 0.2, "y": 1.0, "z": 0.0},
+    ]
+
+
+def test_analyze_session_expired_deadline_returns_partial():
+    client = TestClient(create_test_app())
+    with patch(
+        "app.services.session_analysis_service.start_stop_model_service"
+        ".predict_batch",
+        side_effect=AssertionError("start/stop must not run"),
+    ):
+        response = client.post(
+            "/api/v1/squat/analyze-session",
+            json={"frames": [_session_frame()]},
+            headers={"X-Request-Timeout": "0.000001"},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["partial"] is True
+    assert body["deadline_stage"] == "start_stop"
+    assert body["results"] == [] and body["rep_count"] == 0
+
+
+def test_analyze_session_bad_timeout_header_is_422():
+    client = TestClient(create_test_app())
+    response = client.post(
+        "/api/v1/squat/analyze-session",
+        json={"frames": [_session_frame()]},
+        headers={"X-Request-Timeout": "soon"},
+    )
+    assert response.status_code == 422
+
+
+def _ndjson(lines):
+    return b"".join(orjson.dumps(line) + b"\n" for line in lines)
+
+
+def test_analyze_session_stream_matches_json_upload():
+    client = TestClient(create_test_app())
+    frames = [_session_frame()] * 3
+    body = _ndjson(frames)
+
+    with (
+        patch(
+            "app.services.session_analysis_service.start_stop_model_service"
+            ".predict_batch",
+            lambda features, _variant="champion": [1] * len(features),
+        ),
+        patch(
+            "app.services.session_analysis_service.goodbad_model_service"
+            ".predict_session",
+            lambda _segment, _variant="champion": 0.9,
+        ),
+        patch(
+            "app.services.session_analysis_service.scoring_model_service"
+            ".predict_session",
+            lambda _segment, _variant="champion": 2,
+        ),
+    ):
+        streamed = client.post(
+            "/api/v1/squat/analyze-session/stream?fps=10",
+            content=(body[i : i + 50] for i in range(0, len(body), 50)),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        posted = client.post(
+            "/api/v1/squat/analyze-session", json={"frames": frames, "fps": 10}
+        )
+
+    assert streamed.status_code == 200
+    streamed, posted = streamed.json(), posted.json()
+    assert len(streamed["results"]) == 3
+    assert streamed["results"][0]["predicted_z"]["left_hip"] == 0.0
+    assert streamed["results"] == posted["results"]
+    assert streamed["reps"] == posted["reps"]
+
+
+def test_analyze_session_stream_rejects_bad_uploads(monkeypatch):
+    client = TestClient(create_test_app())
+    url = "/api/v1/squat/analyze-session/stream"
+
+    response = client.post(url, content=_ndjson([_session_frame()]) + b"[1, 2]\n")
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("line 2:")
+
+    monkeypatch.setenv("UPLOAD_MAX_FRAMES", "1")
+    response = client.post(url, content=_ndjson([_session_frame()] * 2))
+    assert response.status_code == 413
+
+
+def test_analyze_session_stream_takes_bulk_slot_after_upload(monkeypatch):
+    from app.services import scheduler
+
+    sched = scheduler.Scheduler(scheduler.parse_classes("interactive:3:4,bulk:1:0"), 4)
+    monkeypatch.setattr(scheduler, "_scheduler", sched)
+    app = create_test_app()
+    app.add_middleware(scheduler.SchedulerMiddleware)
+    client = TestClient(app)
+    url = "/api/v1/squat/analyze-session/stream?include_frames=false"
+    sched.lanes["bulk"].in_flight = sched.lanes["bulk"].limit  # bulk lane busy
+
+    # The upload is read and validated without a slot ...
+    assert client.post(url, content=b"[1]\n").status_code == 422
+    # ... and only a complete upload waits for one.
+    busy = client.post(url, content=_ndjson([_session_frame()]))
+    assert busy.status_code == 503
+    assert busy.headers["retry-after"] == "1"
+
+    sched.lanes["bulk"].in_flight = 0
+    with patch(
+        "app.services.session_analysis_service.start_stop_model_service"
+        ".predict_batch",
+        side_effect=RuntimeError("no model"),
+    ):
+        response = client.post(url, content=_ndjson([_session_frame()]))
+    assert response.status_code == 200
+    assert sched.lanes["bulk"].admitted == 1 and sched.lanes["bulk"].in_flight == 0
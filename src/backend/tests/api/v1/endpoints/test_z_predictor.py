@@ -1,3 +1,5 @@
+import numpy as np
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from unittest.mock import patch
@@ -77,3 +79,40 @@ def test_z_predictor_latest_service_failure_status_code():
         )
 
     assert response.status_code == 503
+
+
+def test_z_predictor_predict_recording_response():
+    app = create_test_app()
+    client = TestClient(app)
+    z = np.array([[0.1] * 13, [0.2] * 13], dtype=np.float32)
+
+    with patch(
+        "app.api.v1.endpoints.z_predictor.predict_recording",
+        return_value=(z, "models:/ZPredictor/3", "run_123"),
+    ) as predict:
+        response = client.post(
+            "/api/v1/z-predictor/predict-recording",
+            json={"frames": [[0.0] * 26, [0.0] * 26], "window": 5},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["n_frames"] == 2
+    assert body["window"] == 5
+    assert body["predictions"][1] == pytest.approx([0.2] * 13)
+    assert predict.call_args.kwargs["window"] == 5
+
+
+def test_z_predictor_predict_recording_validation_error_status_code():
+    app = create_test_app()
+    client = TestClient(app)
+
+    with patch(
+        "app.api.v1.endpoints.z_predictor.predict_recording",
+        side_effect=ValueError("Expected a non-empty recording"),
+    ):
+        response = client.post(
+            "/api/v1/z-predictor/predict-recording", json={"frames": []}
+        )
+
+    assert response.status_code == 422
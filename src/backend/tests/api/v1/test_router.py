@@ -45,3 +45,15 @@ def test_v1_router_registers_expected_paths_z_predictor_champion():
 
 def test_v1_router_registers_expected_paths_z_predictor_latest():
     assert "/api/v1/z-predictor/latest" in paths
+
+
+def test_v1_router_registers_expected_paths_z_predictor_predict_recording():
+    assert "/api/v1/z-predictor/predict-recording" in paths
+
+
+def test_v1_router_registers_expected_paths_diagnostics_topology():
+    assert "/api/v1/diagnostics/topology" in paths
+
+
+def test_v1_router_registers_expected_paths_diagnostics_models():
+    assert "/api/v1/diagnostics/models" in paths
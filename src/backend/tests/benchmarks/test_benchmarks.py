@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from benchmarks import encoding, geometry, runner, synthetic
+
+
+def test_make_session_is_reproducible():
+    a = synthetic.make_session(200, 2, seed=3)
+    b = synthetic.make_session(200, 2, seed=3)
+    assert a.frames == b.frames
+    assert a.norm_frames == b.norm_frames
+
+
+def test_make_session_shapes():
+    session = synthetic.make_session(300, 3)
+    assert session.n_frames == 300
+    assert len(session.norm_frames) == 300
+    assert len(session.rep_bounds) == 3
+    assert [kp["name"] for kp in session.frames[0]] == synthetic.JOINT_NAMES
+
+
+def test_depth_profile_rejects_too_many_reps():
+    with pytest.raises(ValueError):
+        synthetic.depth_profile(100, 50)
+
+
+def _doc(rows):
+    return {
+        "results": [
+            {"stage": stage, "case": case, "latency_ms": {"p50": p50}}
+            for stage, case, p50 in rows
+        ]
+    }
+
+
+def test_compare_classifies_rows():
+    baseline = _doc(
+        [("a", "c1", 10.0), ("b", "c1", 10.0), ("c", "c1", 10.0), ("gone", "c1", 1.0)]
+    )
+    current = _doc(
+        [("a", "c1", 12.0), ("b", "c1", 8.0), ("c", "c1", 10.5), ("new", "c1", 1.0)]
+    )
+
+    rows = {r["stage"]: r for r in runner.compare(current, baseline, tolerance=0.1)}
+
+    assert rows["a"]["status"] == "regression"
+    assert rows["a"]["ratio"] == 1.2
+    assert rows["b"]["status"] == "improvement"
+    assert rows["c"]["status"] == "ok"
+    assert rows["new"]["status"] == "new"
+    assert rows["gone"]["status"] == "missing"
+    assert runner.has_regressions(rows.values())
+
+
+def test_measure_reports_latency_and_memory():
+    stats = runner.measure(lambda: np.zeros(1000), repeat=3, warmup=0)
+    assert stats["iterations"] == 3
+    assert set(stats["latency_ms"]) == {"mean", "p50", "p95", "min", "max"}
+    assert stats["peak_mem_mb"] >= 0
+
+
+def test_geometry_benchmark_rows():
+    doc = geometry.run(frames=[50], repeat=1, warmup=0, backends=["numpy"])
+
+    stages = {r["stage"] for r in doc["results"]}
+    assert "geometry.pair_distances[numpy]" in stages
+    assert "geometry.hip_center[numpy]" in stages
+    assert {r["case"] for r in doc["results"]} == {"f50"}
+    assert all(r["throughput_fps"] for r in doc["results"])
+    assert doc["meta"]["config"]["backends"] == ["numpy"]
+
+
+def test_encoding_benchmark_rows():
+    doc = encoding.run(frames=[200], repeat=1, warmup=0)
+
+    rows = {r["stage"]: r for r in doc["results"]}
+    assert {"encode.session[pydantic]", "encode.session[orjson]"} <= set(rows)
+    assert "compress.recording[gzip]" in rows
+    assert (
+        rows["compress.session[gzip]"]["bytes"]
+        < rows["encode.session[orjson]"]["bytes"]
+    )
+    assert "encode.session[orjson]" in encoding.format_sizes(doc)
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from benchmarks import loadtest
+from benchmarks.loadtest import Sample
+
+
+def test_parse_mix():
+    assert loadtest.parse_mix("predict=8, session=1") == {
+        "predict": 8.0,
+        "session": 1.0,
+    }
+    assert loadtest.parse_mix("z_sequence") == {"z_sequence": 1.0}
+
+
+@pytest.mark.parametrize("value", ["", "unknown=1", "predict=0", "predict=-1"])
+def test_parse_mix_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        loadtest.parse_mix(value)
+
+
+def test_build_payloads_match_request_schemas():
+    payloads = loadtest.build_payloads(
+        {"predict": 1, "z_sequence": 1, "session": 1},
+        {"session_frames": 100, "session_reps": 1},
+    )
+    predict = json.loads(payloads["predict"][0])
+    z_seq = json.loads(payloads["z_sequence"][0])
+    session = json.loads(payloads["session"][0])
+
+    assert len(predict["features"]) == 41
+    assert len(z_seq["sequence"]) == 30 and len(z_seq["sequence"][0]) == 26
+    assert len(session["frames"]) == len(session["norm_frames"]) == 100
+
+
+def test_batch_payloads_validate_against_request_schemas():
+    from app.schemas.prediction import ZRecordingRequest
+    from app.schemas.squat import SquatBatchRequest
+
+    payloads = loadtest.build_payloads(
+        loadtest.parse_mix(loadtest.DEFAULT_MIX),
+        {"session_frames": 50, "session_reps": 1},
+    )
+    batch = SquatBatchRequest(**json.loads(payloads["classify_batch"][0]))
+    recording = ZRecordingRequest(**json.loads(payloads["z_recording"][0]))
+
+    assert len(batch.frames) == 50 and len(batch.frames[0]) == 6
+    assert len(batch.frames[0][0]) == 3
+    assert len(recording.frames) == 50 and len(recording.frames[0]) == 26
+
+
+def test_summarize_step_counts_errors_and_excludes_them_from_latency():
+    samples = [
+        Sample("predict", 10.0, 200),
+        Sample("predict", 20.0, 200),
+        Sample("session", 1.0, 503),
+        Sample("session", 1.0, 0),
+    ]
+    step = loadtest.summarize_step(samples, elapsed_s=2.0, concurrency=4)
+
+    assert step["requests"] == 4
+    assert step["errors"] == 2
+    assert step["error_rate"] == 0.5
+    assert step["rps"] == 2.0
+    assert step["latency_ms"]["p50"] == 15.0
+    assert step["statuses"] == {"200": 2, "503": 1, "0": 1}
+    assert step["by_scenario"]["session"]["latency_ms"]["p50"] is None
+
+
+def _step(concurrency, rps, error_rate=0.0):
+    return {
+        "concurrency": concurrency,
+        "rps": rps,
+        "error_rate": error_rate,
+        "latency_ms": {"p95": concurrency * 10.0},
+    }
+
+
+def test_find_saturation_on_plateau():
+    steps = [_step(1, 10), _step(2, 19), _step(4, 30), _step(8, 31)]
+    sat = loadtest.find_saturation(steps, min_gain=0.1)
+    assert sat["concurrency"] == 4
+    assert sat["rps"] == 30
+    assert sat["reason"] == "throughput_plateau"
+    assert sat["at_concurrency"] == 8
+
+
+def test_find_saturation_on_errors():
+    steps = [_step(1, 10), _step(2, 20, error_rate=0.05)]
+    sat = loadtest.find_saturation(steps, max_error_rate=0.01)
+    assert sat["concurrency"] == 1
+    assert sat["reason"] == "error_rate"
+
+
+def test_find_saturation_not_reached():
+    sat = loadtest.find_saturation([_step(1, 10), _step(2, 20)])
+    assert sat["concurrency"] is None
+    assert sat["rps"] == 20
+    assert sat["reason"] == "not_reached"
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.services import session_analysis_service  # noqa: E402
+from benchmarks import standin_models, synthetic  # noqa: E402
+
+
+def test_standin_start_stop_segments_match_reps():
+    session = synthetic.make_session(1000, 5, seed=1)
+    features = np.array(
+        [session_analysis_service._build_features(f) for f in session.norm_frames],
+        dtype=np.float32,
+    )
+    padded = np.vstack([np.zeros((4, 39), dtype=np.float32), features])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (5, 39))[:, 0]
+
+    torch.manual_seed(0)
+    net = standin_models.StartStopNet().eval()
+    with torch.no_grad():
+        logits = net(torch.as_tensor(windows)).numpy().flatten()
+
+    labels = session_analysis_service._smooth_start_stop([int(v > 0) for v in logits])
+    assert session_analysis_service._count_segments(labels) == 5
+
+
+def test_standin_conv_head_output_shape():
+    out = standin_models.ConvHead()(torch.zeros(1, standin_models.C_FRAMES, 61))
+    assert out.shape == (1, 1)
@@ -1,8 +1,17 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services import mlflow_metadata
 
 
 @pytest.fixture(scope="session")
 def client():
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _clear_mlflow_metadata():
+    # The run-metadata cache is process-wide; keep tests independent.
+    mlflow_metadata.clear()
+    yield
+    mlflow_metadata.clear()
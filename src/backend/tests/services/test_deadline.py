@@ -0,0 +1,67 @@
+import pytest
+
+from app.services import deadline
+from app.services.deadline import Deadline, RequestCancelled
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_deadline_expires_and_records_first_skipped_stage():
+    clock = _Clock()
+    d = Deadline(2.0, clock=clock)
+
+    assert d.check("start_stop")
+    assert d.remaining_s() == 2.0
+    clock.now += 2.5
+    assert not d.check("segments")
+    assert not d.check("later")
+    assert d.exceeded and d.exceeded_at == "segments"
+    assert d.remaining_s() == 0.0
+
+
+def test_no_deadline_never_expires():
+    assert deadline.NO_DEADLINE.check("anything")
+    assert deadline.NO_DEADLINE.remaining_s() is None
+    assert not deadline.NO_DEADLINE.exceeded
+
+
+def test_disconnect_raises_even_after_expiry():
+    disconnected = {"value": False}
+    d = Deadline(0.0, is_disconnected=lambda: disconnected["value"])
+
+    assert not d.check("start_stop")
+    disconnected["value"] = True
+    with pytest.raises(RequestCancelled):
+        d.check("segments")
+
+
+@pytest.mark.parametrize(
+    "header, env, expected",
+    [
+        (None, None, None),
+        (None, "30", 30.0),
+        ("5", None, 5.0),
+        ("5", "30", 5.0),
+        ("60", "30", 30.0),  # the configured value caps the header
+        ("", "0", None),  # <= 0 configured means no deadline
+    ],
+)
+def test_resolve_timeout_s(monkeypatch, header, env, expected):
+    if env is None:
+        monkeypatch.delenv("REQUEST_DEADLINE_S", raising=False)
+    else:
+        monkeypatch.setenv("REQUEST_DEADLINE_S", env)
+    assert deadline.resolve_timeout_s(header) == expected
+
+
+@pytest.mark.parametrize("header", ["soon", "0", "-1", "nan"])
+def test_resolve_timeout_s_rejects_bad_header(monkeypatch, header):
+    monkeypatch.delenv("REQUEST_DEADLINE_S", raising=False)
+    with pytest.raises(ValueError):
+        deadline.resolve_timeout_s(header)
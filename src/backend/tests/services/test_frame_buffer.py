@@ -0,0 +1,91 @@
+import numpy as np
+import orjson
+import pytest
+
+from app.services import frame_buffer
+from app.services.pose_features import CANONICAL_JOINTS
+
+
+def _frame(value):
+    return [
+        {"name": name, "x": value, "y": value + 0.5, "z": -value, "score": 0.9}
+        for name in CANONICAL_JOINTS
+    ]
+
+
+def _ndjson(lines):
+    return b"".join(orjson.dumps(line) + b"\n" for line in lines)
+
+
+def test_buffer_grows_and_marks_missing_joints():
+    buffer = frame_buffer.FrameBuffer(capacity=1)
+    for i in range(5):
+        buffer.append(_frame(float(i)))
+    buffer.append(
+        [
+            {"name": "nose", "x": 1, "y": 2, "z": 3},
+            {"name": "tail", "x": 0, "y": 0, "z": 0},
+        ]
+    )
+
+    points = buffer.points()
+    assert points.shape == (6, 13, 3) and points.dtype == np.float32
+    assert buffer.capacity == 8
+    assert points[4, 0].tolist() == [4.0, 4.5, -4.0]
+    assert points[5, 0].tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(points[5, 1:]).all()
+
+
+def test_buffer_rejects_malformed_keypoints():
+    buffer = frame_buffer.FrameBuffer()
+    with pytest.raises(ValueError, match="name, x, y and z"):
+        buffer.append([{"name": "nose", "x": 1, "y": 2}])
+    with pytest.raises(ValueError, match="array of keypoints"):
+        buffer.append({"name": "nose"})
+    assert len(buffer) == 0
+
+
+def test_parser_handles_lines_split_across_chunks():
+    body = _ndjson([_frame(float(i)) for i in range(3)])
+    parser = frame_buffer.NdjsonSessionParser()
+    for i in range(0, len(body), 7):
+        parser.feed(body[i : i + 7])
+    parser.feed(b"\n" + orjson.dumps(_frame(3.0)))  # blank line, no final newline
+    parser.close()
+
+    assert len(parser.frames) == 4
+    assert parser.norm_frames is None
+    assert parser.frames.points()[:, 0, 0].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_parser_reads_norm_frames_on_every_line_or_none():
+    parser = frame_buffer.NdjsonSessionParser()
+    parser.feed(_ndjson([{"frame": _frame(1.0), "norm_frame": _frame(0.5)}] * 2))
+    assert len(parser.norm_frames) == 2
+    assert parser.norm_frames.points()[1, 0, 0] == 0.5
+
+    with pytest.raises(ValueError, match="line 3: norm_frame"):
+        parser.feed(_ndjson([_frame(1.0)]))
+
+
+def test_parser_errors_name_the_line():
+    parser = frame_buffer.NdjsonSessionParser()
+    with pytest.raises(ValueError, match="line 2: invalid JSON"):
+        parser.feed(_ndjson([_frame(1.0)]) + b"{oops\n")
+
+
+def test_parser_enforces_limits(monkeypatch):
+    monkeypatch.setenv("UPLOAD_MAX_FRAMES", "2")
+    parser = frame_buffer.NdjsonSessionParser()
+    assert parser.max_frames == 2
+    with pytest.raises(frame_buffer.UploadTooLarge, match="more than 2 frames"):
+        parser.feed(_ndjson([_frame(1.0)] * 3))
+
+    monkeypatch.setattr(frame_buffer, "MAX_LINE_BYTES", 16)
+    with pytest.raises(frame_buffer.UploadTooLarge, match="line 1"):
+        frame_buffer.NdjsonSessionParser().feed(b"[" + b" " * 32)
+
+
+def test_configured_max_frames_falls_back_on_invalid(monkeypatch):
+    monkeypatch.setenv("UPLOAD_MAX_FRAMES", "lots")
+    assert frame_buffer.configured_max_frames() == frame_buffer.DEFAULT_MAX_FRAMES
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from app.services import jobs, scheduler
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = jobs.JobRunner(
+        jobs.JobStore(str(tmp_path / "jobs.sqlite3")), max_pending=2
+    )
+    yield runner
+    runner.shutdown()
+
+
+def _wait(store, job_id, statuses=jobs.FINISHED, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        job = store.get(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {store.get(job_id).status}")
+
+
+def _blocking_job(release: threading.Event, started: threading.Event):
+    def run(progress, deadline):
+        started.set()
+        while not release.wait(0.01):
+            deadline.check("segments")
+        return b"{}"
+
+    return run
+
+
+def test_request_key_ignores_key_order_but_not_values():
+    a = jobs.request_key("analyze-session", {"fps": 30, "frames": [[1, 2]]})
+    b = jobs.request_key("analyze-session", {"frames": [[1, 2]], "fps": 30})
+    c = jobs.request_key("analyze-session", {"frames": [[1, 3]], "fps": 30})
+
+    assert a == b != c
+    assert a.startswith("analyze-session:")
+    assert jobs.request_key("other", {"fps": 30, "frames": [[1, 2]]}) != a
+
+
+def test_job_runs_and_stores_result(runner):
+    def run(progress, deadline):
+        progress("segments", 0.5)
+        return b'{"ok":true}'
+
+    job, created = runner.submit("test", "k1", run)
+    done = _wait(runner.store, job.id)
+
+    assert created and job.status == "queued"
+    assert done.status == "done" and done.progress == 1.0 and done.stage is None
+    assert done.started_at is not None and done.finished_at >= done.started_at
+    assert runner.store.result(job.id) == b'{"ok":true}'
+    assert done.as_dict()["created_at"].endswith("Z")
+
+
+def test_job_runs_inside_a_bulk_scheduler_slot(runner, monkeypatch):
+    held = []
+
+    @contextmanager
+    def admitted_from_thread(route_class, stop):
+        held.append((route_class, stop()))
+        yield 0.0
+        held.append("released")
+
+    monkeypatch.setattr(scheduler, "admitted_from_thread", admitted_from_thread)
+
+    def run(progress, deadline):
+        assert held == [("bulk", False)]
+        return b"{}"
+
+    job, _ = runner.submit("test", "k1", run)
+
+    assert _wait(runner.store, job.id).status == "done"
+    assert held == [("bulk", False), "released"]
+
+
+def test_duplicate_submission_returns_existing_job(runner):
+    release, started = threading.Event(), threading.Event()
+    job, _ = runner.submit("test", "k1", _blocking_job(release, started))
+    started.wait(5)
+
+    again, created = runner.submit(
+        "test", "k1", lambda p, d: pytest.fail("must not run twice")
+    )
+    release.set()
+    _wait(runner.store, job.id)
+    done_again, created_done = runner.submit(
+        "test", "k1", lambda p, d: pytest.fail("must not run twice")
+    )
+
+    assert not created and again.id == job.id and again.status == "running"
+    assert not created_done and done_again.status == "done"
+
+
+def test_failed_job_reports_error_and_is_replaced(runner):
+    def boom(progress, deadline):
+        raise RuntimeError("model missing")
+
+    job, _ = runner.submit("test", "k1", boom)
+    failed = _wait(runner.store, job.id)
+    retry, created = runner.submit("test", "k1", lambda p, d: b"[]")
+
+    assert failed.status == "failed"
+    assert failed.error == "RuntimeError: model missing"
+    assert runner.store.result(job.id) is None
+    assert created and retry.id != job.id
+    assert runner.store.get(job.id) is None
+    assert _wait(runner.store, retry.id).status == "done"
+
+
+def test_cancel_stops_a_running_job(runner):
+    release, started = threading.Event(), threading.Event()
+    job, _ = runner.submit("test", "k1", _blocking_job(release, started))
+    started.wait(5)
+
+    cancelled = runner.cancel(job.id)
+    time.sleep(0.1)
+
+    assert cancelled.status == "cancelled"
+    assert runner.store.get(job.id).status == "cancelled"
+    assert runner.store.result(job.id) is None
+    assert runner.pending == 0
+    assert runner.cancel("unknown") is None
+
+
+def test_cancel_of_a_job_deleted_meanwhile_returns_none(runner, monkeypatch):
+    monkeypatch.setattr(runner.store, "update", lambda *args, **kwargs: True)
+    monkeypatch.setattr(runner.store, "get", lambda job_id: None)
+
+    assert runner.cancel("gone") is None
+
+
+def test_cancel_while_queued_never_runs(tmp_path):
+    runner = jobs.JobRunner(jobs.JobStore(str(tmp_path / "j.sqlite3")), workers=1)
+    release, started = threading.Event(), threading.Event()
+    first, _ = runner.submit("test", "k1", _blocking_job(release, started))
+    started.wait(5)
+    queued, _ = runner.submit("test", "k2", lambda p, d: pytest.fail("cancelled"))
+
+    assert runner.cancel(queued.id).status == "cancelled"
+    release.set()
+    runner.shutdown()
+    assert runner.store.get(queued.id).started_at is None
+    assert runner.store.get(first.id).status == "done"
+
+
+def test_queue_full_rejects_new_jobs_but_not_duplicates(runner):
+    release, started = threading.Event(), threading.Event()
+    job, _ = runner.submit("test", "k1", _blocking_job(release, started))
+    runner.submit("test", "k2", _blocking_job(release, threading.Event()))
+
+    with pytest.raises(jobs.QueueFull):
+        runner.submit("test", "k3", lambda p, d: b"{}")
+    assert runner.submit("test", "k1", lambda p, d: b"{}")[0].id == job.id
+    release.set()
+
+
+def test_job_of_exited_worker_is_failed(runner, monkeypatch):
+    job, _ = runner.store.create("test", "k1")
+    runner.store.update(job.id, ("queued",), owner="other-process", pid=999999)
+    monkeypatch.setattr(jobs, "_pid_alive", lambda pid: False)
+
+    orphan = runner.store.get(job.id)
+
+    assert orphan.status == "failed"
+    assert "exited" in orphan.error
+    assert runner.store.get(job.id).status == "failed"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_job_of_exited_forked_worker_is_failed(runner):
+    # Workers forked from a preloaded master must not share its owner id.
+    pid = os.fork()
+    if pid == 0:
+        try:
+            runner.store.create("test", "forked")
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+    orphan = runner.store.find("forked")
+
+    assert orphan.pid == pid
+    assert orphan.status == "failed"
+
+
+def test_prune_deletes_old_finished_jobs(runner):
+    job, _ = runner.submit("test", "k1", lambda p, d: b"{}")
+    _wait(runner.store, job.id)
+    active, _ = runner.store.create("test", "k2")
+
+    assert runner.store.prune(3600) == 0
+    assert runner.store.prune(-1) == 1
+    assert runner.store.get(job.id) is None
+    assert runner.store.get(active.id) is not None
+
+
+def test_configure_reads_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "_runner", None)
+    monkeypatch.setenv("JOBS_DIR", str(tmp_path))
+    monkeypatch.setenv("JOBS_WORKERS", "3")
+    monkeypatch.setenv("JOBS_MAX_PENDING", "bad")
+    monkeypatch.setenv("JOBS_TTL_S", "60")
+
+    runner = jobs.configure()
+
+    assert runner.store.path == str(tmp_path / "jobs.sqlite3")
+    assert runner.workers == 3
+    assert runner.max_pending == 16
+    assert runner.ttl_s == 60.0
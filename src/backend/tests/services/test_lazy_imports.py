@@ -0,0 +1,47 @@
+import types
+
+from app.services import lazy_imports
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    calls = []
+    proxy = lazy_imports.LazyModule("json", on_import=calls.append)
+
+    assert not lazy_imports.is_loaded(proxy)
+    assert proxy.dumps({"a": 1}) == '{"a": 1}'
+    assert lazy_imports.is_loaded(proxy)
+    assert len(calls) == 1 and isinstance(calls[0], types.ModuleType)
+
+    proxy.loads("1")
+    assert len(calls) == 1
+
+
+def test_lazy_module_attribute_can_be_monkeypatched(monkeypatch):
+    proxy = lazy_imports.LazyModule("json")
+    monkeypatch.setattr(proxy, "dumps", lambda _obj: "patched")
+    assert proxy.dumps({}) == "patched"
+
+
+def test_lazy_attr_calls_target():
+    proxy = lazy_imports.LazyAttr(lazy_imports.LazyModule("collections"), "Counter")
+    assert proxy("aab")["a"] == 2
+    assert proxy.__name__ == "Counter"
+
+
+def test_mlflow_import_configures_tracking_uri(monkeypatch):
+    calls = []
+
+    class _FakeMlflow:
+        def set_tracking_uri(self, uri):
+            calls.append(("tracking", uri))
+
+        def set_registry_uri(self, uri):
+            calls.append(("registry", uri))
+
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", "http://mlflow:5000")
+    lazy_imports._configure_mlflow(_FakeMlflow())
+
+    assert calls == [
+        ("tracking", "http://mlflow:5000"),
+        ("registry", "http://mlflow:5000"),
+    ]
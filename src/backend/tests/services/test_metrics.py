@@ -0,0 +1,99 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services import metrics
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_model_version_numbered_uri():
+    assert metrics.model_version("models:/GoodBad/7") == "7"
+
+
+def test_model_version_alias_uri():
+    assert metrics.model_version("models:/GoodBad@prod") == "prod"
+
+
+def test_model_version_runs_uri():
+    assert metrics.model_version("runs:/abcdef1234567890/model") == "run-abcdef12"
+
+
+def test_model_version_unknown():
+    assert metrics.model_version(None) == "unknown"
+    assert metrics.model_version("file:///tmp/model") == "unknown"
+
+
+def test_loaded_model_version_reads_cache_without_loading(monkeypatch):
+    from app.services import start_stop_model_service
+
+    monkeypatch.setenv("START_STOP_MODEL_URI_PROD", "models:/SS@prod")
+    monkeypatch.setitem(
+        start_stop_model_service._cache,
+        "models:/SS@prod",
+        (object(), "models:/SS/4", "run", 5, None),
+    )
+    assert metrics.loaded_model_version("start_stop") == "4"
+
+
+def test_loaded_model_version_not_loaded(monkeypatch):
+    monkeypatch.delenv("SCORING_MODEL_URI_PROD", raising=False)
+    assert metrics.loaded_model_version("scoring") == "unknown"
+
+
+def test_model_load_timer_observes_success():
+    labels = {"model_family": "test_family", "model_version": "9"}
+    before = _sample("model_load_duration_seconds_count", labels)
+
+    with metrics.model_load_timer("test_family") as load:
+        load["uri"] = "models:/Test/9"
+
+    assert _sample("model_load_duration_seconds_count", labels) == before + 1
+
+
+def test_alias_load_is_labelled_with_resolved_version(monkeypatch):
+    from app.services import model_registry
+
+    snapshot = model_registry.ModelSnapshot(
+        "Aliased", (), {"prod": model_registry.VersionInfo(5, "r5", "None", ())}
+    )
+    monkeypatch.setattr(model_registry, "snapshot", lambda name: snapshot)
+    monkeypatch.setattr(metrics, "_alias_versions", {})
+    labels = {"model_family": "test_alias", "model_version": "5"}
+    before = _sample("model_load_duration_seconds_count", labels)
+
+    with metrics.model_load_timer("test_alias") as load:
+        load["uri"] = "models:/Aliased@prod"
+
+    assert _sample("model_load_duration_seconds_count", labels) == before + 1
+    assert metrics.model_version("models:/Aliased@prod") == "5"
+    assert metrics.model_version("models:/Aliased@dev") == "dev"
+
+
+def test_model_load_timer_counts_failures():
+    labels = {"model_family": "test_failing"}
+    before = _sample("model_load_failures_total", labels)
+
+    with pytest.raises(RuntimeError):
+        with metrics.model_load_timer("test_failing"):
+            raise RuntimeError("boom")
+
+    assert _sample("model_load_failures_total", labels) == before + 1
+
+
+def test_observe_session_records_stages_frames_and_segments():
+    stage = {"stage": "goodbad", "model_family": "goodbad", "model_version": "unknown"}
+    pipeline = {"stage": "feature_build", "model_family": "pipeline", "model_version": "none"}
+    frames = {"model_family": "start_stop", "model_version": "unknown"}
+    before_stage = _sample("session_pipeline_stage_seconds_count", stage)
+    before_pipeline = _sample("session_pipeline_stage_seconds_count", pipeline)
+    before_frames = _sample("session_frames_per_request_sum", frames)
+    before_segments = _sample("session_segments_per_request_sum", frames)
+
+    metrics.observe_session({"goodbad_ms": 12.0, "feature_build_ms": 1.0}, 120, 3)
+
+    assert _sample("session_pipeline_stage_seconds_count", stage) == before_stage + 1
+    assert _sample("session_pipeline_stage_seconds_count", pipeline) == before_pipeline + 1
+    assert _sample("session_frames_per_request_sum", frames) == before_frames + 120
+    assert _sample("session_segments_per_request_sum", frames) == before_segments + 3
@@ -0,0 +1,95 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import mlflow_metadata
+
+
+def _counting_loader(values):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return values[min(len(calls), len(values)) - 1]
+
+    return loader, calls
+
+
+def test_fresh_entry_is_served_from_cache():
+    cache = mlflow_metadata.TTLCache(ttl=lambda: 60.0)
+    loader, calls = _counting_loader(["v1"])
+
+    assert cache.get("k", loader) == "v1"
+    assert cache.get("k", loader) == "v1"
+    assert len(calls) == 1
+
+
+def test_stale_entry_is_served_while_refreshing_in_background():
+    cache = mlflow_metadata.TTLCache(ttl=lambda: 0.0)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return f"v{len(calls)}"
+
+    assert cache.get("k", loader) == "v1"
+    # Stale: the old value comes back immediately, the refresh is blocked.
+    assert cache.get("k", loader) == "v1"
+    assert cache.get("k", loader) == "v1"
+    release.set()
+    cache.wait_for_refreshes()
+
+    assert len(calls) == 2  # one refresh in flight per key
+    assert cache.get("k", loader) == "v2"
+
+
+def test_failed_refresh_keeps_stale_value():
+    cache = mlflow_metadata.TTLCache(ttl=lambda: 0.0)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("registry down")
+        return "v1"
+
+    assert cache.get("k", loader) == "v1"
+    assert cache.get("k", loader) == "v1"
+    cache.wait_for_refreshes()
+    assert cache.get("k", loader) == "v1"
+
+
+def test_first_fetch_error_is_not_cached():
+    cache = mlflow_metadata.TTLCache(ttl=lambda: 60.0)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get("k", failing)
+    assert cache.get("k", lambda: "ok") == "ok"
+
+
+def test_run_data_fetches_each_run_once(monkeypatch):
+    run = SimpleNamespace(
+        data=SimpleNamespace(params={"seq_length": "7"}, metrics={"MAE": 0.5})
+    )
+    client = MagicMock()
+    client.get_run.return_value = run
+    monkeypatch.setattr(mlflow_metadata, "MlflowClient", lambda: client)
+
+    assert mlflow_metadata.run_params("r1") == {"seq_length": "7"}
+    assert mlflow_metadata.run_metrics("r1") == {"MAE": 0.5}
+    client.get_run.assert_called_once_with("r1")
+
+
+def test_ttl_env(monkeypatch):
+    monkeypatch.setenv("MLFLOW_METADATA_TTL_S", "12")
+    assert mlflow_metadata.ttl_s() == 12.0
+    monkeypatch.setenv("MLFLOW_METADATA_TTL_S", "nope")
+    assert mlflow_metadata.ttl_s() == 300.0
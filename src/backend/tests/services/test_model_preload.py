@@ -0,0 +1,73 @@
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import model_preload
+
+
+def _fake_service(uris, fail=()):
+    loaded = []
+
+    def get_model(variant="champion"):
+        if variant in fail:
+            raise RuntimeError("registry unavailable")
+        loaded.append(variant)
+        return object(), uris[variant], "run_1"
+
+    return SimpleNamespace(
+        _direct_uri_for_variant=lambda variant: uris.get(variant),
+        get_model=get_model,
+        _cache={},
+        loaded=loaded,
+    )
+
+
+@pytest.fixture
+def fake_families(monkeypatch):
+    families = {
+        "predict": _fake_service({"champion": "models:/A/1", "latest": "models:/A/2"}),
+        "goodbad": _fake_service({"champion": "models:/G/3"}, fail=("champion",)),
+        "scoring": _fake_service({}),
+    }
+    monkeypatch.setattr(model_preload, "MODEL_FAMILIES", families)
+    return families
+
+
+def test_preload_models_loads_every_configured_variant(fake_families):
+    model_preload.preload_models()
+    assert fake_families["predict"].loaded == ["champion", "latest"]
+
+
+def test_preload_models_skips_unconfigured_families(fake_families):
+    summary = model_preload.preload_models()
+    assert "scoring" not in summary
+    assert fake_families["scoring"].loaded == []
+
+
+def test_preload_models_records_load_time(fake_families):
+    summary = model_preload.preload_models()
+    assert summary["predict"]["champion"]["uri"] == "models:/A/1"
+    assert summary["predict"]["champion"]["load_ms"] >= 0
+
+
+def test_preload_models_isolates_failures(fake_families):
+    summary = model_preload.preload_models()
+    assert "RuntimeError" in summary["goodbad"]["champion"]["error"]
+    assert "latest" in summary["predict"]
+
+
+def test_status_reports_preload_pid(fake_families):
+    model_preload.preload_models()
+    status = model_preload.status()
+    assert status["preloaded"] is True
+    assert status["preload_pid"] == status["pid"]
+    assert status["resident"] == {"predict": False, "goodbad": False, "scoring": False}
+
+
+def test_freeze_heap_moves_objects_to_permanent_generation():
+    try:
+        model_preload.freeze_heap()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import model_registry
+
+
+def _mv(version, run_id, stage="None", aliases=()):
+    return SimpleNamespace(
+        version=str(version), run_id=run_id, current_stage=stage, aliases=list(aliases)
+    )
+
+
+_NO_ALIASES = Exception("INVALID_PARAMETER_VALUE: aliases are not supported")
+
+
+def _client(versions):
+    client = MagicMock()
+    client.search_model_versions.return_value = versions
+    client.get_model_version_by_alias.side_effect = _NO_ALIASES
+    return client
+
+
+def test_snapshot_is_one_search_per_model():
+    client = _client([_mv(2, "r2"), _mv(1, "r1"), _mv(3, "r3", aliases=["champion"])])
+
+    snap = model_registry.snapshot("M", lambda: client)
+    assert [v.version for v in snap.versions] == [1, 2, 3]
+    assert snap.by_alias["champion"].run_id == "r3"
+
+    for uri in (
+        "models:/M@champion",
+        "models:/M@dev",
+        "models:/M/1",
+        "models:/M@backup",
+    ):
+        model_registry.run_id_for_uri(uri, lambda: client)
+    model_registry.fallback_alias_uri("M", "prod", lambda: client)
+
+    model_registry.run_id_for_uri("models:/M@dev", lambda: client)
+
+    client.search_model_versions.assert_called_once_with("name='M'")
+    # Once per alias the search did not report (dev, backup), then cached.
+    assert client.get_model_version_by_alias.call_count == 2
+    client.get_model_version.assert_not_called()
+
+
+def test_alias_missing_from_search_asks_the_registry():
+    client = _client([_mv(1, "r1", stage="Production"), _mv(2, "r2")])
+    client.get_model_version_by_alias.side_effect = None
+    client.get_model_version_by_alias.return_value = _mv(1, "r1", aliases=["prod"])
+
+    assert model_registry.run_id_for_uri("models:/M@prod", lambda: client) == "r1"
+    assert model_registry.fallback_alias_uri("M", "prod", lambda: client) == (
+        "models:/M/1"
+    )
+    client.get_model_version_by_alias.assert_called_once_with("M", "prod")
+
+
+def test_alias_lookup_errors_fall_back_without_being_cached(caplog):
+    client = _client([_mv(1, "r1"), _mv(2, "r2")])
+    client.get_model_version_by_alias.side_effect = ConnectionError("registry down")
+
+    assert model_registry.run_id_for_uri("models:/M@champion", lambda: client) == "r2"
+    assert "registry down" in caplog.text
+    # Not a rejection: the next call asks the registry again.
+    model_registry.run_id_for_uri("models:/M@champion", lambda: client)
+    assert client.get_model_version_by_alias.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "alias, expected",
+    [
+        ("champion", "r1"),  # registry alias wins
+        ("prod", "r2"),  # newest Production stage
+        ("production", "r2"),
+        ("backup", "r2"),  # second newest
+        ("dev", "r3"),
+        ("latest", "r3"),
+        ("unknown", "r3"),
+    ],
+)
+def test_alias_resolution(alias, expected):
+    client = _client(
+        [
+            _mv(1, "r1", aliases=["champion"]),
+            _mv(2, "r2", stage="Production"),
+            _mv(3, "r3", stage="Staging"),
+        ]
+    )
+    assert model_registry.run_id_for_uri(f"models:/M@{alias}", lambda: client) == (
+        expected
+    )
+
+
+def test_stage_selector():
+    client = _client([_mv(1, "r1", stage="Production"), _mv(2, "r2")])
+
+    assert model_registry.run_id_for_uri("models:/M/Production", lambda: client) == "r1"
+    assert model_registry.run_id_for_uri("models:/M/Staging", lambda: client) is None
+    assert (
+        model_registry.run_id_for_uri(
+            "models:/M/Staging", lambda: client, latest_if_no_stage_match=True
+        )
+        == "r2"
+    )
+
+
+def test_unknown_version_refetches_that_model_once():
+    client = MagicMock()
+    client.search_model_versions.side_effect = [
+        [_mv(1, "r1")],
+        [_mv(1, "r1"), _mv(2, "r2")],
+    ]
+
+    assert model_registry.run_id_for_uri("models:/M/1", lambda: client) == "r1"
+    assert model_registry.run_id_for_uri("models:/M/2", lambda: client) == "r2"
+    assert model_registry.run_id_for_uri("models:/M/2", lambda: client) == "r2"
+    assert client.search_model_versions.call_count == 2
+
+
+def test_runs_uri_needs_no_registry():
+    client = MagicMock()
+    assert model_registry.run_id_for_uri("runs:/abc/model", lambda: client) == "abc"
+    assert model_registry.run_id_for_uri(None, lambda: client) is None
+    client.search_model_versions.assert_not_called()
+
+
+def test_no_versions():
+    client = _client([])
+    with pytest.raises(RuntimeError, match="No versions found"):
+        model_registry.fallback_alias_uri("M", "prod", lambda: client)
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from app.services import goodbad_model_service, pose_features, scoring_model_service
+
+
+# Frozen copies of the per-service feature code the kernel replaced (A13/A15
+# notebooks); the parity tests below pin the kernel to them.
+def _ref_goodbad_base(kp3d):
+    kp_map = {kp["name"]: kp for kp in kp3d}
+    feats = []
+    for name in goodbad_model_service._JOINT_NAMES:
+        kp = kp_map.get(name)
+        feats.append(float(kp["x"]) if kp else 0.0)
+        feats.append(float(kp["y"]) if kp else 0.0)
+        feats.append(float(kp["z"]) if kp else 0.0)
+    return feats
+
+
+def _ref_scoring_base(kp3d):
+    kp_map = {kp["name"]: kp for kp in kp3d}
+    feats = []
+    for name in scoring_model_service._A15_JOINTS:
+        kp = kp_map.get(name)
+        feats.append(-float(kp["x"]) if kp else 0.0)
+        feats.append(-float(kp["y"]) if kp else 0.0)
+        feats.append(0.0)
+    return feats
+
+
+def _ref_add_features(base_arr, joints):
+    cols = [f"{j}_3d_{ax}" for j in joints for ax in ["x", "y", "z"]]
+
+    def pos(joint):
+        return base_arr[:, [cols.index(f"{joint}_3d_{ax}") for ax in ["x", "y", "z"]]]
+
+    scale = (
+        float(
+            np.linalg.norm(pos("right_shoulder") - pos("left_shoulder"), axis=1).mean()
+        )
+        + 1e-8
+    )
+    extras = []
+    for j1, j2 in pose_features.DIST_PAIRS:
+        extras.append(np.linalg.norm(pos(j2) - pos(j1), axis=1, keepdims=True) / scale)
+    for ja, jv, jb in pose_features.ANGLE_TRIPLES:
+        va, vb = pos(ja) - pos(jv), pos(jb) - pos(jv)
+        cos = np.sum(va * vb, axis=1) / (
+            np.linalg.norm(va, axis=1) * np.linalg.norm(vb, axis=1) + 1e-8
+        )
+        extras.append(cos.reshape(-1, 1))
+    return np.hstack([base_arr] + extras).astype(np.float32)
+
+
+def _ref_resample(arr, target):
+    n = len(arr)
+    if n == target:
+        return arr
+    if n < target:
+        return np.vstack([arr, np.zeros((target - n, arr.shape[1]), dtype="float32")])
+    return arr[np.round(np.linspace(0, n - 1, target)).astype(int)]
+
+
+def _reference(frames, base_fn, joints, c_frames):
+    base = np.array([base_fn(f) for f in frames], dtype=np.float32)
+    return _ref_resample(_ref_add_features(base, joints), c_frames)
+
+
+def _frames(n, seed=0, drop=()):
+    rng = np.random.default_rng(seed)
+    return [
+        [
+            {"name": name, "x": float(x), "y": float(y), "z": float(z)}
+            for name, (x, y, z) in zip(
+                pose_features.CANONICAL_JOINTS, rng.normal(size=(13, 3))
+            )
+            if name not in drop
+        ]
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n_frames", [1, 7, 10, 37])
+@pytest.mark.parametrize("drop", [(), ("left_wrist", "nose")])
+def test_model_inputs_match_per_service_features(n_frames, drop):
+    frames = _frames(n_frames, seed=n_frames, drop=drop)
+    segment = pose_features.Segment.from_frames(frames)
+
+    goodbad = segment.model_input(goodbad_model_service._LAYOUT, 10)
+    scoring = segment.model_input(scoring_model_service._LAYOUT, 10)
+
+    expected_goodbad = _reference(
+        frames, _ref_goodbad_base, goodbad_model_service._JOINT_NAMES, 10
+    )
+    expected_scoring = _reference(
+        frames, _ref_scoring_base, scoring_model_service._A15_JOINTS, 10
+    )
+    assert goodbad.shape == scoring.shape == (10, pose_features.N_FEATURES)
+    np.testing.assert_allclose(goodbad, expected_goodbad, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(scoring, expected_scoring, rtol=1e-5, atol=1e-6)
+
+
+def test_rows_are_sampled_once_per_segment():
+    segment = pose_features.Segment.from_frames(_frames(40))
+
+    segment.model_input(goodbad_model_service._LAYOUT, 10)
+    segment.model_input(scoring_model_service._LAYOUT, 10)
+    assert len(segment._geometry) == 1
+    assert len(next(iter(segment._geometry))) == 10
+
+
+def test_session_tensor_canonical_order_and_missing_joints():
+    tensor = pose_features.session_tensor(
+        [
+            [
+                {"name": "right_ankle", "x": 1, "y": 2, "z": 3},
+                {"name": "foo", "x": 9, "y": 9},
+            ]
+        ]
+    )
+    assert tensor.shape == (1, 13, 3)
+    assert tensor[0, -1].tolist() == [1.0, 2.0, 3.0]
+    assert not tensor[0, :-1].any()
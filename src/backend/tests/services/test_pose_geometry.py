@@ -0,0 +1,157 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.services import pose_geometry
+
+# Without numba, backend="jit" runs the loop kernels as plain Python, so the
+# parity tests below check the kernel logic either way.
+BACKENDS = pose_geometry.BACKENDS
+
+
+def _points(n=25, joints=6, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, joints, 3)).astype(np.float32)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pair_distances_match_linalg_norm(backend):
+    pts = _points()
+    first, second = [0, 1, 2], [3, 4, 0]
+
+    got = pose_geometry.pair_distances(pts, first, second, backend=backend)
+
+    expected = np.linalg.norm(pts[:, second] - pts[:, first], axis=2)
+    assert got.shape == (25, 3)
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_axis_weights_drop_an_axis(backend):
+    pts = _points()
+    flat = pts.copy()
+    flat[..., 2] = 0.0
+
+    got = pose_geometry.pair_distances(pts, [0], [1], [1, 1, 0], backend=backend)
+    cos = pose_geometry.vertex_cosines(pts, [0], [1], [2], [1, 1, 0], backend=backend)
+
+    np.testing.assert_allclose(
+        got, pose_geometry.pair_distances(flat, [0], [1], backend="numpy"), rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        cos,
+        pose_geometry.vertex_cosines(flat, [0], [1], [2], backend="numpy"),
+        rtol=1e-5,
+        atol=1e-6,
+    )
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_vertex_angles_known_values_and_degenerate(backend):
+    pts = np.array(
+        [
+            [[0, 1, 0], [0, 0, 0], [0, -1, 0]],  # straight → 180
+            [[0, 1, 0], [0, 0, 0], [1, 0, 0]],  # right angle → 90
+            [[0, 0, 0], [0, 0, 0], [1, 0, 0]],  # coincident joints → 180
+        ],
+        dtype=np.float64,
+    )
+
+    got = pose_geometry.vertex_angles(pts, [0], [1], [2], backend=backend)[:, 0]
+
+    np.testing.assert_allclose(got, [180.0, 90.0, 180.0], atol=1e-6)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_vertex_cosines_feature_definition(backend):
+    pts = _points(seed=1)
+    u = pts[:, [0, 3]] - pts[:, [1, 4]]
+    v = pts[:, [2, 5]] - pts[:, [1, 4]]
+    expected = (u * v).sum(axis=2) / (
+        np.linalg.norm(u, axis=2) * np.linalg.norm(v, axis=2) + 1e-8
+    )
+
+    got = pose_geometry.vertex_cosines(pts, [0, 3], [1, 4], [2, 5], backend=backend)
+
+    np.testing.assert_allclose(got, expected, rtol=1e-5, atol=1e-6)
+    # Zero-length vectors give 0 (not NaN) in the feature definition.
+    zero = np.zeros((1, 3, 3), dtype=np.float32)
+    assert pose_geometry.vertex_cosines(zero, [0], [1], [2], backend=backend)[0, 0] == 0
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_nan_coordinates_propagate(backend):
+    pts = _points(n=3)
+    pts[1, 0, 0] = np.nan
+
+    dist = pose_geometry.pair_distances(pts, [0], [1], backend=backend)
+    angle = pose_geometry.vertex_angles(pts, [0], [1], [2], backend=backend)
+
+    assert np.isnan(dist[1, 0]) and np.isnan(angle[1, 0])
+    assert np.isfinite(dist[[0, 2]]).all() and np.isfinite(angle[[0, 2]]).all()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_hip_center_and_shoulder_scale(backend):
+    pts = _points(seed=2).astype(np.float64)
+
+    centered = pose_geometry.hip_center(pts, 2, 3, backend=backend)
+    scale = pose_geometry.shoulder_width_scale(pts, 0, 1, backend=backend)
+
+    np.testing.assert_allclose(centered[:, 2] + centered[:, 3], 0.0, atol=1e-12)
+    np.testing.assert_allclose(
+        centered - pts, np.broadcast_to(centered[:, :1] - pts[:, :1], pts.shape)
+    )
+    expected = np.linalg.norm(pts[:, 1] - pts[:, 0], axis=1).mean() + 1e-8
+    assert math.isclose(scale, expected, rel_tol=1e-9)
+
+
+def test_hip_center_any_number_of_axes():
+    pts = np.arange(12, dtype=np.float64).reshape(3, 4, 1)
+
+    got = pose_geometry.hip_center(pts, 0, 1)
+
+    assert got.shape == (3, 4, 1)
+    np.testing.assert_allclose(got[:, :, 0], [[-0.5, 0.5, 1.5, 2.5]] * 3)
+
+
+def test_default_backend_honours_env(monkeypatch):
+    monkeypatch.setenv("POSE_GEOMETRY_JIT", "0")
+    assert pose_geometry.default_backend() == "numpy"
+
+    monkeypatch.delenv("POSE_GEOMETRY_JIT")
+    expected = "jit" if pose_geometry.numba_available() else "numpy"
+    assert pose_geometry.default_backend() == expected
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        pose_geometry.pair_distances(np.zeros((4, 3)), [0], [1])
+    with pytest.raises(ValueError):
+        pose_geometry.pair_distances(np.zeros((4, 2, 3)), [0], [1], backend="gpu")
+
+
+def test_scripts_copy_matches_backend_kernels():
+    # src/scripts/pose_geometry.py is a deliberate standalone copy of the numpy
+    # path (the scripts do not import the backend package); keep them in step.
+    import importlib.util
+    from pathlib import Path
+
+    path = Path(__file__).resolve().parents[3] / "scripts" / "pose_geometry.py"
+    if not path.is_file():
+        pytest.skip("src/scripts is not part of this checkout")
+    spec = importlib.util.spec_from_file_location("scripts_pose_geometry", path)
+    scripts = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(scripts)
+
+    pts = _points().astype(np.float64)
+    pts[3, 2, 1] = np.nan
+    np.testing.assert_allclose(
+        scripts.pair_distances(pts, [0, 1], [3, 4]),
+        pose_geometry.pair_distances(pts, [0, 1], [3, 4], backend="numpy"),
+    )
+    np.testing.assert_allclose(
+        scripts.hip_center(pts, 0, 1),
+        pose_geometry.hip_center(pts, 0, 1, backend="numpy"),
+    )
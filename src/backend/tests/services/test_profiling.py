@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+
+from app.services import profiling
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def test_disabled_without_token(monkeypatch):
+    monkeypatch.delenv("PROFILING_TOKEN", raising=False)
+    assert not profiling.enabled()
+    assert not profiling.is_authorized("anything")
+
+
+def test_is_authorized(monkeypatch):
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    assert profiling.enabled()
+    assert profiling.is_authorized("s3cret")
+    assert not profiling.is_authorized("wrong")
+    assert not profiling.is_authorized(None)
+
+
+def test_stack_sampler_samples_only_target_thread():
+    sampler = profiling.StackSampler(threading.get_ident(), 0.001).start()
+    _busy(0.1)
+    stacks = sampler.stop()
+
+    assert sum(stacks.values()) > 0
+    assert any("_busy" in stack for stack in stacks)
+    assert all("samples_only_target_thread" in stack for stack in stacks)
+
+
+def test_to_collapsed_format():
+    text = profiling.to_collapsed({"a;b": 3, "a": 1})
+    assert text == "a 1\na;b 3\n"
+
+
+def test_request_profile_writes_collapsed_and_meta(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILING_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILING_INTERVAL_MS", "1")
+
+    with profiling.RequestProfile(route="/api/v1/test") as profile:
+        _busy(0.05)
+
+    collapsed = profiling.read_profile(profile.id)
+    assert collapsed and "_busy" in collapsed
+    [meta] = profiling.list_profiles()
+    assert meta["id"] == profile.id
+    assert meta["route"] == "/api/v1/test"
+    assert meta["samples"] > 0
+    assert meta["error"] is None
+
+
+def test_request_profile_records_exception(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILING_DIR", str(tmp_path))
+
+    try:
+        with profiling.RequestProfile(route="/x"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert profiling.list_profiles()[0]["error"] == "RuntimeError"
+
+
+def test_profiles_are_pruned(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILING_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILING_KEEP", "2")
+
+    for _ in range(4):
+        with profiling.RequestProfile(route="/x"):
+            pass
+
+    assert len(profiling.list_profiles()) == 2
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_read_profile_rejects_bad_ids(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILING_DIR", str(tmp_path))
+    assert profiling.read_profile("../../etc/passwd") is None
+    assert profiling.read_profile("0123456789abcdef") is None
@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.services import scheduler
+from app.services.deadline import RequestCancelled
+from app.services.scheduler import Lane, PriorityClass, QueueFull, Scheduler
+
+
+def test_parse_classes():
+    classes = scheduler.parse_classes("interactive:3:128, bulk:1:0")
+    assert classes == [
+        PriorityClass("interactive", 3.0, 128),
+        PriorityClass("bulk", 1.0, 0),
+    ]
+    for bad in ("", "bulk:1", "bulk:0:4", "bulk:x:4", ":1:1"):
+        with pytest.raises(ValueError):
+            scheduler.parse_classes(bad)
+
+
+def test_bad_env_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("SCHEDULER_CLASSES", "nonsense")
+    assert [c.name for c in scheduler.configured_classes()] == ["interactive", "bulk"]
+
+
+def test_weighted_limits():
+    classes = scheduler.parse_classes(scheduler.DEFAULT_CLASSES)
+    assert scheduler.weighted_limits(classes, 8) == {"interactive": 6, "bulk": 2}
+    # Every class keeps at least one slot.
+    assert scheduler.weighted_limits(classes, 1) == {"interactive": 1, "bulk": 1}
+
+
+def test_classify_by_route_and_header():
+    sched = Scheduler(scheduler.parse_classes(scheduler.DEFAULT_CLASSES), 4)
+
+    assert sched.classify("/api/v1/predict/champion", None) == "interactive"
+    assert sched.classify("/api/v1/z-predictor/latest", None) == "interactive"
+    assert sched.classify("/api/v1/z-predictor/predict-recording", None) == "bulk"
+    assert sched.classify("/api/v1/squat/analyze-session", None) == "bulk"
+    assert sched.classify("/api/v1/squat/analyze-session", "Interactive") == (
+        "interactive"
+    )
+    assert sched.classify("/api/v1/predict/latest", "unknown") == "interactive"
+    assert sched.classify("/health", "bulk") is None
+    # Admitted by the handler after the upload, not by the middleware.
+    assert sched.classify("/api/v1/squat/analyze-session/stream", "bulk") is None
+    assert sched.classify("/api/v1/diagnostics/topology", None) is None
+
+
+def test_lane_limits_queues_fifo_and_rejects_when_full():
+    async def scenario():
+        lane = Lane(PriorityClass("bulk", 1.0, 2), limit=1)
+        order = []
+
+        async def job(name):
+            await lane.acquire()
+            order.append(name)
+            await asyncio.sleep(0)
+            lane.release()
+
+        await lane.acquire()  # the only slot
+        tasks = [asyncio.ensure_future(job(n)) for n in ("a", "b")]
+        await asyncio.sleep(0)
+        assert (lane.in_flight, lane.waiting) == (1, 2)
+        with pytest.raises(QueueFull):
+            await lane.acquire()
+
+        lane.release()
+        await asyncio.gather(*tasks)
+        return lane, order
+
+    lane, order = asyncio.run(scenario())
+    assert order == ["a", "b"]
+    assert (lane.in_flight, lane.waiting) == (0, 0)
+    assert lane.stats()["rejected"] == 1
+    assert lane.stats()["admitted"] == 3
+
+
+def test_lane_cancelled_waiter_leaves_queue():
+    async def scenario():
+        lane = Lane(PriorityClass("bulk", 1.0, 4), limit=1)
+        await lane.acquire()
+        waiter = asyncio.ensure_future(lane.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert lane.waiting == 0
+        lane.release()
+        return lane
+
+    lane = asyncio.run(scenario())
+    assert lane.in_flight == 0
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(scheduler.SchedulerMiddleware)
+
+    @app.post("/api/v1/squat/analyze-session")
+    def analyze(request: Request):
+        return {"wait": request.state.scheduler_wait_s}
+
+    @app.get("/health")
+    def health():
+        return {"ok": True}
+
+    return app
+
+
+def test_middleware_admits_and_rejects(monkeypatch):
+    sched = Scheduler(scheduler.parse_classes("interactive:3:4,bulk:1:0"), 4)
+    monkeypatch.setattr(scheduler, "_scheduler", sched)
+    client = TestClient(_app())
+
+    response = client.post("/api/v1/squat/analyze-session")
+    assert response.status_code == 200
+    assert response.json()["wait"] >= 0
+    assert sched.lanes["bulk"].in_flight == 0
+
+    sched.lanes["bulk"].in_flight = sched.lanes["bulk"].limit  # bulk lane busy
+    rejected = client.post("/api/v1/squat/analyze-session")
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "1"
+    # Interactive priority and unscheduled routes are unaffected.
+    assert (
+        client.post(
+            "/api/v1/squat/analyze-session", headers={"X-Priority": "interactive"}
+        ).status_code
+        == 200
+    )
+    assert client.get("/health").status_code == 200
+
+
+def test_middleware_disabled_passes_through(monkeypatch):
+    sched = Scheduler(scheduler.parse_classes("bulk:1:0"), 1)
+    sched.lanes["bulk"].in_flight = 1
+    monkeypatch.setattr(scheduler, "_scheduler", sched)
+    monkeypatch.setenv("SCHEDULER_ENABLED", "0")
+
+    response = TestClient(_app()).get("/health")
+    assert response.status_code == 200
+
+
+@pytest.fixture
+def serving_loop(monkeypatch):
+    """A scheduler whose event loop runs in a background thread."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    sched = Scheduler(scheduler.parse_classes("interactive:3:4,bulk:1:1"), 4)
+    sched.loop = loop
+    monkeypatch.setattr(scheduler, "_scheduler", sched)
+    monkeypatch.setattr(scheduler, "THREAD_POLL_S", 0.01)
+    yield sched
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def _on_loop(sched, fn):
+    return asyncio.run_coroutine_threadsafe(_call(fn), sched.loop).result(5)
+
+
+async def _call(fn):
+    return fn()
+
+
+def test_thread_waits_for_a_slot_and_releases_it(serving_loop):
+    lane = serving_loop.lanes["bulk"]
+    held, release, admitted = threading.Event(), threading.Event(), threading.Event()
+
+    def holder():
+        with scheduler.admitted_from_thread("bulk"):
+            held.set()
+            release.wait(5)
+
+    def second():
+        with scheduler.admitted_from_thread("bulk"):
+            admitted.set()
+
+    first_thread = threading.Thread(target=holder)
+    first_thread.start()
+    assert held.wait(5)
+    second_thread = threading.Thread(target=second)
+    second_thread.start()
+    deadline = time.monotonic() + 5
+    while _on_loop(serving_loop, lambda: lane.waiting) == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert not admitted.is_set()
+
+    release.set()
+    first_thread.join(5)
+    second_thread.join(5)
+
+    assert admitted.is_set()
+    assert _on_loop(serving_loop, lambda: (lane.in_flight, lane.waiting)) == (0, 0)
+    assert lane.admitted == 2
+
+
+def test_thread_stops_waiting_when_cancelled(serving_loop):
+    lane = serving_loop.lanes["bulk"]
+    _on_loop(serving_loop, lambda: setattr(lane, "in_flight", lane.limit))
+    stop = threading.Event()
+    threading.Timer(0.05, stop.set).start()
+
+    with pytest.raises(RequestCancelled):
+        with scheduler.admitted_from_thread("bulk", stop=stop.is_set):
+            pytest.fail("must not be admitted")
+
+    assert _on_loop(serving_loop, lambda: lane.waiting) == 0
+
+
+def test_thread_admission_is_noop_without_a_serving_loop(monkeypatch):
+    sched = Scheduler(scheduler.parse_classes("bulk:1:0"), 1)
+    sched.lanes["bulk"].in_flight = 1
+    monkeypatch.setattr(scheduler, "_scheduler", sched)
+
+    with scheduler.admitted_from_thread("bulk") as waited:
+        assert waited == 0.0
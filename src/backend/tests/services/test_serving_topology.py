@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.services import serving_topology
+
+_BACKEND_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def _clear_env(monkeypatch):
+    for name in (
+        "WEB_CONCURRENCY",
+        "TORCH_NUM_THREADS",
+        "TORCH_INTEROP_THREADS",
+        "INFERENCE_EXECUTOR_THREADS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_cgroup_v2_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("200000 100000\n")
+    assert serving_topology._cgroup_cpu_quota(tmp_path) == 2.0
+
+
+def test_cgroup_v2_unlimited(tmp_path):
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert serving_topology._cgroup_cpu_quota(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("150000")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000")
+    assert serving_topology._cgroup_cpu_quota(tmp_path) == 1.5
+
+
+def test_cgroup_v1_unlimited(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000")
+    assert serving_topology._cgroup_cpu_quota(tmp_path) is None
+
+
+def test_cgroup_missing_files(tmp_path):
+    assert serving_topology._cgroup_cpu_quota(tmp_path) is None
+
+
+def test_detect_cpu_budget_caps_quota_at_host_cpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(serving_topology, "_affinity_cpu_count", lambda: 2)
+    (tmp_path / "cpu.max").write_text("800000 100000")
+    assert serving_topology.detect_cpu_budget(tmp_path) == (2.0, "cgroup")
+
+
+def test_resolve_topology_defaults_split_cores_across_workers(tmp_path, monkeypatch):
+    _clear_env(monkeypatch)
+    monkeypatch.setattr(serving_topology, "_affinity_cpu_count", lambda: 16)
+    (tmp_path / "cpu.max").write_text("800000 100000")
+
+    topology = serving_topology.resolve_topology(tmp_path)
+
+    assert topology.cpu_budget == 8.0
+    assert topology.workers == 4
+    assert topology.torch_threads == 2
+    assert topology.torch_interop_threads == 1
+    assert topology.executor_threads == 4
+
+
+def test_resolve_topology_fractional_quota_gets_one_worker(tmp_path, monkeypatch):
+    _clear_env(monkeypatch)
+    monkeypatch.setattr(serving_topology, "_affinity_cpu_count", lambda: 8)
+    (tmp_path / "cpu.max").write_text("50000 100000")
+
+    topology = serving_topology.resolve_topology(tmp_path)
+
+    assert topology.workers == 1
+    assert topology.torch_threads == 1
+
+
+def test_resolve_topology_env_overrides(tmp_path, monkeypatch):
+    _clear_env(monkeypatch)
+    monkeypatch.setattr(serving_topology, "_affinity_cpu_count", lambda: 8)
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    monkeypatch.setenv("TORCH_NUM_THREADS", "3")
+    monkeypatch.setenv("TORCH_INTEROP_THREADS", "2")
+    monkeypatch.setenv("INFERENCE_EXECUTOR_THREADS", "10")
+
+    topology = serving_topology.resolve_topology(tmp_path)
+
+    assert topology.workers == 2
+    assert topology.torch_threads == 3
+    assert topology.torch_interop_threads == 2
+    assert topology.executor_threads == 10
+
+
+def test_resolve_topology_ignores_invalid_env(tmp_path, monkeypatch):
+    _clear_env(monkeypatch)
+    monkeypatch.setattr(serving_topology, "_affinity_cpu_count", lambda: 2)
+    monkeypatch.setenv("WEB_CONCURRENCY", "many")
+    monkeypatch.setenv("TORCH_NUM_THREADS", "0")
+
+    topology = serving_topology.resolve_topology(tmp_path)
+
+    assert topology.workers == 2
+    assert topology.torch_threads == 1
+
+
+def test_effective_settings_reports_pid_and_topology(monkeypatch):
+    _clear_env(monkeypatch)
+    settings = serving_topology.effective_settings()
+    assert settings["pid"] > 0
+    assert settings["workers"] >= 1
+    assert "executor_threads" in settings
+    assert "applied" in settings
+
+
+def test_deferred_torch_threads_wait_for_torch_not_mlflow():
+    pytest.importorskip("torch")
+    pytest.importorskip("mlflow")
+    code = """
+import asyncio, json, os, sys
+os.environ.update(TORCH_NUM_THREADS="3", TORCH_INTEROP_THREADS="2")
+from app.services import serving_topology
+from app.services.lazy_imports import mlflow
+
+async def main():
+    serving_topology.apply_topology()
+
+asyncio.run(main())
+mlflow.get_tracking_uri()
+after_mlflow = "torch" in sys.modules
+import torch
+print(json.dumps([after_mlflow, torch.get_num_threads(), torch.get_num_interop_threads()]))
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=_BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert json.loads(out.strip().splitlines()[-1]) == [False, 3, 2]
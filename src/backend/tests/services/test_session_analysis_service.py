@@ -1,4 +1,10 @@
+import math
+
+import numpy as np
+import pytest
+
 from app.services import session_analysis_service
+from app.services.deadline import Deadline, RequestCancelled
 
 
 def _make_frame(z_by_name):
@@ -61,3 +67,201 @@ def test_analyze_session_fills_missing_joint_z_with_zero(monkeypatch):
     assert results[0].predicted_z["right_hip"] == 0.0
     assert results[0].predicted_z["nose"] == 0.0
     assert results[0].squat_score == 1
+
+
+def test_count_segments():
+    assert session_analysis_service._count_segments([]) == 0
+    assert session_analysis_service._count_segments([0, 0]) == 0
+    assert session_analysis_service._count_segments([1, 1, 0, 1, 0, 0, 1]) == 3
+
+
+def _leg_frame(left_deg, right_deg):
+    frame = []
+    for side, deg in (("left", left_deg), ("right", right_deg)):
+        a = math.radians(deg)
+        frame += [
+            {"name": f"{side}_hip", "x": 0.0, "y": 1.0, "z": 0.0},
+            {"name": f"{side}_knee", "x": 0.0, "y": 0.0, "z": 0.0},
+            {"name": f"{side}_ankle", "x": math.sin(a), "y": math.cos(a), "z": 0.0},
+        ]
+    return frame
+
+
+def test_summarize_reps():
+    angles = [180, 180, 170, 150, 120, 90, 120, 150, 170, 180, 175, 100, 175]
+    frames = [_leg_frame(a, a + (10 if i == 5 else 0)) for i, a in enumerate(angles)]
+    start_stop = [0, 0, 1, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1]
+    results = [
+        session_analysis_service.FrameResult(
+            start_stop=ss, predicted_z={}, good_bad_score=0.5 if ss else None
+        )
+        for ss in start_stop
+    ]
+
+    reps = session_analysis_service.summarize_reps(frames, results, fps=10.0)
+
+    assert [(r.start_frame, r.end_frame) for r in reps] == [(2, 9), (10, 13)]
+    first = reps[0]
+    assert first.bottom_frame == 5
+    assert first.min_left_knee_angle == pytest.approx(90.0)
+    assert first.min_knee_angle == pytest.approx(95.0)
+    assert first.descent_s == pytest.approx(0.3)
+    assert first.ascent_s == pytest.approx(0.3)
+    # Frames below 160°: 150, 120, 90, 120, 150.
+    assert first.time_under_tension_s == pytest.approx(0.5)
+    assert first.max_asymmetry == pytest.approx(10.0)
+    assert first.good_bad_score == 0.5
+    assert reps[1].rep == 2 and reps[1].bottom_frame == 11
+
+
+def test_summarize_reps_without_leg_joints():
+    results = [session_analysis_service.FrameResult(start_stop=1, predicted_z={})]
+    frames = [[{"name": "nose", "x": 0.0, "y": 0.0, "z": 0.0}]]
+
+    (rep,) = session_analysis_service.summarize_reps(frames, results)
+
+    assert rep.min_knee_angle is None
+    assert rep.bottom_frame is None
+    assert rep.time_under_tension_s == 0.0
+
+
+class _ScriptedDeadline(Deadline):
+    """Deadline that passes on the ``n``-th check of ``stage``."""
+
+    def __init__(self, stage="", n=1, is_disconnected=None):
+        super().__init__(is_disconnected=is_disconnected)
+        self._stage = stage
+        self._n = n
+
+    def check(self, stage):
+        if stage == self._stage:
+            self._n -= 1
+            if self._n == 0:
+                self.exceeded_at = stage
+        return super().check(stage)
+
+
+def _patch_models(monkeypatch, start_stop, calls):
+    monkeypatch.setattr(
+        "app.services.session_analysis_service.start_stop_model_service.predict_batch",
+        lambda _features, _variant="champion": list(start_stop),
+    )
+    monkeypatch.setattr(
+        "app.services.session_analysis_service.goodbad_model_service.predict_session",
+        lambda _frames, _variant="champion": calls.append("goodbad") or 0.5,
+    )
+    monkeypatch.setattr(
+        "app.services.session_analysis_service.scoring_model_service.predict_session",
+        lambda _frames, _variant="champion": calls.append("scoring") or 3,
+    )
+
+
+def test_analyze_session_deadline_before_start_stop_returns_nothing(monkeypatch):
+    calls = []
+    _patch_models(monkeypatch, [1, 1], calls)
+    deadline = Deadline(timeout_s=0.0)
+
+    results, timings = session_analysis_service.analyze_session(
+        [_make_frame({})] * 2, deadline=deadline
+    )
+
+    assert results == []
+    assert deadline.exceeded_at == "start_stop"
+    assert calls == []
+    assert "feature_build_ms" in timings and "start_stop_ms" not in timings
+
+
+def test_analyze_session_deadline_between_segments_returns_partial(monkeypatch):
+    calls = []
+    # Two segments separated by a gap longer than the smoothing threshold.
+    start_stop = [1] * 3 + [0] * 12 + [1] * 3
+    _patch_models(monkeypatch, start_stop, calls)
+
+    deadline = _ScriptedDeadline("segments", n=2)
+    results, _timings = session_analysis_service.analyze_session(
+        [_make_frame({})] * len(start_stop), deadline=deadline
+    )
+
+    assert calls == ["goodbad", "scoring"]
+    assert deadline.exceeded_at == "segments"
+    assert [r.squat_score for r in results[:3]] == [3, 3, 3]
+    assert [r.squat_score for r in results[-3:]] == [None, None, None]
+    assert [r.start_stop for r in results] == start_stop
+
+
+def test_analyze_session_disconnect_abandons_work(monkeypatch):
+    calls = []
+    _patch_models(monkeypatch, [1, 1], calls)
+    deadline = _ScriptedDeadline(is_disconnected=lambda: True)
+
+    with pytest.raises(RequestCancelled):
+        session_analysis_service.analyze_session(
+            [_make_frame({})] * 2, deadline=deadline
+        )
+    assert calls == []
+
+
+def test_session_response_reports_progress(monkeypatch):
+    calls = []
+    start_stop = [1] * 3 + [0] * 12 + [1] * 3
+    _patch_models(monkeypatch, start_stop, calls)
+    seen = []
+
+    payload = session_analysis_service.session_response(
+        [_make_frame({})] * len(start_stop),
+        include_frames=False,
+        progress=lambda stage, fraction: seen.append((stage, round(fraction, 3))),
+    )
+
+    assert seen == [
+        ("start_stop", 0.0),
+        ("segments", 0.1),
+        ("segments", 0.525),
+        ("segments", 0.95),
+        ("summary", 0.95),
+    ]
+    assert payload["results"] == [] and payload["rep_count"] == 2
+    assert payload["reps"][0]["squat_score"] == 3
+    assert payload["partial"] is False
+
+
+def test_session_response_same_for_keypoint_arrays(monkeypatch):
+    from app.services.frame_buffer import FrameBuffer
+
+    angles = [180, 150, 120, 90, 120, 150, 180]
+    frames = [_leg_frame(a, a + 5) for a in angles]
+    frames[3] = [kp for kp in frames[3] if kp["name"] != "right_knee"]
+    buffer = FrameBuffer(capacity=2)
+    for frame in frames:
+        buffer.append(frame)
+    features = []
+    monkeypatch.setattr(
+        "app.services.session_analysis_service.start_stop_model_service.predict_batch",
+        lambda batch, _variant="champion": features.append(
+            np.asarray(batch, dtype=np.float32)
+        )
+        or [1] * len(batch),
+    )
+    monkeypatch.setattr(
+        "app.services.session_analysis_service.goodbad_model_service.predict_session",
+        lambda segment, _variant="champion": float(segment.tensor.sum()),
+    )
+    monkeypatch.setattr(
+        "app.services.session_analysis_service.scoring_model_service.predict_session",
+        lambda _segment, _variant="champion": 3,
+    )
+
+    from_dicts = session_analysis_service.session_response(frames, fps=10.0)
+    from_array = session_analysis_service.session_response(buffer.points(), fps=10.0)
+
+    np.testing.assert_array_equal(features[0], features[1])
+    assert from_array["results"][3]["predicted_z"]["right_knee"] == 0.0
+    assert from_array["results"][0]["good_bad_score"] == pytest.approx(
+        from_dicts["results"][0]["good_bad_score"]
+    )
+    assert from_array["reps"] == [
+        {k: pytest.approx(v) if isinstance(v, float) else v for k, v in rep.items()}
+        for rep in from_dicts["reps"]
+    ]
+    # Frame 3 has no right knee, so the bottom is the first 120° frame.
+    assert from_array["reps"][0]["bottom_frame"] == 2
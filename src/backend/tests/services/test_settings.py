@@ -0,0 +1,55 @@
+import pytest
+
+from app.services import settings
+
+
+@pytest.mark.parametrize(
+    "raw, default, expected",
+    [
+        (None, True, True),
+        ("", False, False),
+        (" Off ", True, False),
+        ("no", True, False),
+        ("YES", False, True),
+        ("1", False, True),
+        ("maybe", True, True),
+        ("maybe", False, False),
+    ],
+)
+def test_env_flag(monkeypatch, raw, default, expected):
+    if raw is None:
+        monkeypatch.delenv("TEST_FLAG", raising=False)
+    else:
+        monkeypatch.setenv("TEST_FLAG", raw)
+    assert settings.env_flag("TEST_FLAG", default) is expected
+
+
+@pytest.mark.parametrize(
+    "raw, minimum, expected",
+    [("", 1, 7), (" 3 ", 1, 3), ("0", 1, 7), ("0", 0, 0), ("-2", 0, 7), ("x", 1, 7)],
+)
+def test_env_int(monkeypatch, raw, minimum, expected):
+    monkeypatch.setenv("TEST_INT", raw)
+    assert settings.env_int("TEST_INT", 7, minimum=minimum) == expected
+
+
+def test_env_int_logs_ignored_values(monkeypatch, caplog):
+    monkeypatch.setenv("TEST_INT", "lots")
+    assert settings.env_int("TEST_INT", None) is None
+    assert "TEST_INT='lots'" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "raw, expected", [("", None), ("2.5", 2.5), ("0", None), ("-1", None), ("x", None)]
+)
+def test_env_float(monkeypatch, raw, expected):
+    monkeypatch.setenv("TEST_FLOAT", raw)
+    assert settings.env_float("TEST_FLOAT", None) == expected
+
+
+def test_env_float_inclusive_minimum(monkeypatch):
+    monkeypatch.setenv("TEST_FLOAT", "0")
+    assert settings.env_float("TEST_FLOAT", 5.0, inclusive=True) == 0.0
+    assert settings.env_float("TEST_FLOAT", 5.0) == 5.0
+    monkeypatch.setenv("TEST_FLOAT", "0.4")
+    assert settings.env_float("TEST_FLOAT", 5.0, minimum=0.5) == 5.0
@@ -0,0 +1,108 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import shadow
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    monkeypatch.setattr(shadow, "_challenger_configured", lambda family: True)
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("SHADOW_SAMPLE_RATE", raising=False)
+    assert not shadow.enabled()
+    assert not shadow.submit("predict", 1.0, lambda: 1.0)
+
+
+def test_sample_rate_is_clamped(monkeypatch):
+    monkeypatch.setenv("SHADOW_SAMPLE_RATE", "7")
+    assert shadow.sample_rate() == 1.0
+    monkeypatch.setenv("SHADOW_SAMPLE_RATE", "bad")
+    assert shadow.sample_rate() == 0.0
+
+
+def test_delta_stats_match_numpy():
+    stats = shadow.DeltaStats()
+    rng = np.random.default_rng(0)
+    champions = [rng.normal(size=4) for _ in range(25)]
+    challengers = [c + rng.normal(scale=0.1, size=4) for c in champions]
+    for a, b in zip(champions, challengers):
+        stats.update(a, b)
+
+    deltas = np.concatenate([b - a for a, b in zip(champions, challengers)])
+    out = stats.as_dict()
+    assert out["comparisons"] == 25
+    assert out["values"] == 100
+    assert out["mean_delta"] == pytest.approx(deltas.mean())
+    assert out["std_delta"] == pytest.approx(deltas.std(ddof=1))
+    assert out["mean_abs_delta"] == pytest.approx(np.abs(deltas).mean())
+    assert out["max_abs_delta"] == pytest.approx(np.abs(deltas).max())
+    assert out["agreement_rate"] == 0.0
+
+
+def test_runner_compares_in_background(configured):
+    runner = shadow.ShadowRunner(maxsize=10)
+    assert runner.submit("predict", 1, lambda: 1, rate=1.0)
+    assert runner.submit("predict", [0.5, 1.0], lambda: [0.75, 1.0], rate=1.0)
+    runner.join()
+
+    stats = runner.stats()["predict"]
+    assert stats["comparisons"] == 2
+    assert stats["agreement_rate"] == 0.5
+    assert stats["max_abs_delta"] == pytest.approx(0.25)
+
+
+def test_categorical_outputs_count_agreement_only(configured):
+    runner = shadow.ShadowRunner(maxsize=10)
+    assert runner.submit("weakest_link", "hip", lambda: "hip", rate=1.0)
+    assert runner.submit("weakest_link", "hip", lambda: "knee", rate=1.0)
+    runner.join()
+
+    stats = runner.stats()["weakest_link"]
+    assert stats["comparisons"] == 2
+    assert stats["agreement_rate"] == 0.5
+    assert stats["errors"] == 0
+    assert stats["values"] == 0 and stats["mean_delta"] is None
+
+
+def test_full_queue_drops_instead_of_blocking(configured):
+    runner = shadow.ShadowRunner(maxsize=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 0
+
+    assert runner.submit("predict", 0, slow, rate=1.0)
+    started.wait(5)  # worker is busy; the queue has room for one more
+    assert runner.submit("predict", 0, lambda: 0, rate=1.0)
+    assert not runner.submit("predict", 0, lambda: 0, rate=1.0)
+    release.set()
+    runner.join()
+
+    stats = runner.stats()["predict"]
+    assert stats["dropped"] == 1
+    assert stats["comparisons"] == 2
+
+
+def test_challenger_errors_are_counted(configured):
+    runner = shadow.ShadowRunner(maxsize=10)
+
+    def fail():
+        raise RuntimeError("challenger not loadable")
+
+    runner.submit("z_predictor", 1.0, fail, rate=1.0)
+    runner.submit("z_predictor", [1.0, 2.0], lambda: [1.0], rate=1.0)
+    runner.join()
+    assert runner.stats()["z_predictor"]["errors"] == 2
+
+
+def test_unconfigured_challenger_is_skipped(monkeypatch):
+    monkeypatch.delenv("MODEL_URI_DEV", raising=False)
+    runner = shadow.ShadowRunner(maxsize=10)
+    assert not runner.submit("predict", 1.0, lambda: 1.0, rate=1.0)
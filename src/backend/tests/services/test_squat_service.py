@@ -2,7 +2,15 @@
 
 import math
 
-from app.services.squat_service import calculate_knee_angle, classify_squat
+import numpy as np
+import pytest
+
+from app.services.squat_service import (
+    SQUAT_JOINTS,
+    calculate_knee_angle,
+    classify_squat,
+    classify_squat_batch,
+)
 
 
 # calculate_knee_angle
@@ -114,3 +122,49 @@ def test_classify_squat_uses_input_z_values():
     _, left, right, _ = classify_squat(kp3)
     assert left < 180.0
     assert right < 180.0
+
+
+# classify_squat_batch
+def _random_frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = rng.normal(size=(n, len(SQUAT_JOINTS), 3))
+    frames[0, 1] = frames[0, 0]  # zero-length thigh → 180°
+    frames[1, :3] = [[0, 2, 0], [0, 1, 0], [0, 0, 0]]  # straight left leg
+    return frames
+
+
+def test_classify_squat_batch_matches_single_frame():
+    frames = _random_frames(200)
+    labels, left, right, conf = classify_squat_batch(frames)
+
+    for i, frame in enumerate(frames):
+        kp3 = [
+            {"name": name, "x": x, "y": y, "z": z}
+            for name, (x, y, z) in zip(SQUAT_JOINTS, frame)
+        ]
+        expected = classify_squat(kp3)
+        assert labels[i] == expected[0]
+        assert left[i] == pytest.approx(expected[1])
+        assert right[i] == pytest.approx(expected[2])
+        assert conf[i] == expected[3]
+    assert {"Deep", "Shallow", "Invalid"} <= set(labels)
+
+
+def test_classify_squat_batch_joint_order_and_missing_values():
+    frames = _random_frames(5)
+    names = list(reversed(SQUAT_JOINTS)) + ["nose"]
+    reordered = np.concatenate([frames[:, ::-1], np.zeros((5, 1, 3))], axis=1)
+    reordered[3, 0, 2] = np.nan  # right_ankle missing in frame 3
+
+    labels, left, right, conf = classify_squat_batch(reordered, names)
+    expected = classify_squat_batch(frames)
+    assert labels[:3] == expected[0][:3]
+    assert np.allclose(left[:3], expected[1][:3])
+    assert (labels[3], left[3], right[3], conf[3]) == ("Invalid", 0.0, 0.0, None)
+
+
+def test_classify_squat_batch_rejects_bad_input():
+    with pytest.raises(ValueError, match="shape"):
+        classify_squat_batch(np.zeros((4, 5, 3)))
+    with pytest.raises(ValueError, match="Missing required joints"):
+        classify_squat_batch(np.zeros((4, 2, 3)), ["left_hip", "left_knee"])
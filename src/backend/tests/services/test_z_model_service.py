@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from unittest.mock import MagicMock
 
 from app.services import z_model_service
@@ -43,3 +44,53 @@ def test_predict_one_success(monkeypatch):
     assert pred == 0.42
     assert uri == "models:/ZModel/1"
     assert run_id == "run_1"
+
+
+class _WindowModel:
+    """Fake GRU: z of joint j = sum over the window of its x column; (b, w, 13)."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, X):
+        X = np.asarray(X)
+        self.batch_sizes.append(len(X))
+        z = np.cumsum(X[:, :, 0::2], axis=1)
+        return z
+
+
+@pytest.mark.parametrize("batch_windows", [1, 4, 256])
+def test_predict_recording_matches_per_window_predict_sequence(
+    monkeypatch, batch_windows
+):
+    model = _WindowModel()
+    monkeypatch.setattr(
+        z_model_service,
+        "get_model",
+        lambda variant="champion": (model, "models:/ZModel/1", "run_1"),
+    )
+    frames = np.random.default_rng(0).normal(size=(10, 26)).astype(np.float32)
+
+    z, uri, run_id = z_model_service.predict_recording(
+        frames.tolist(), window=3, batch_windows=batch_windows
+    )
+
+    assert z.shape == (10, 13)
+    assert (uri, run_id) == ("models:/ZModel/1", "run_1")
+    assert max(model.batch_sizes) <= batch_windows
+    padded = np.vstack([frames[:1], frames[:1], frames])
+    for i in range(10):
+        expected, _, _ = z_model_service.predict_sequence(padded[i : i + 3].tolist())
+        np.testing.assert_allclose(z[i], expected, rtol=1e-6)
+
+
+def test_predict_recording_rejects_non_2d_input(monkeypatch):
+    monkeypatch.setattr(
+        z_model_service,
+        "get_model",
+        lambda variant="champion": (_WindowModel(), "uri", None),
+    )
+    with pytest.raises(ValueError, match="recording"):
+        z_model_service.predict_recording([1.0, 2.0])
+    with pytest.raises(ValueError, match="recording"):
+        z_model_service.predict_recording([])
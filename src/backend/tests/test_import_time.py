@@ -0,0 +1,51 @@
+"""Import-time budget for ``app.main``.
+
+Cold start (Render/Vercel scale-from-zero, test collection) pays for every
+module ``app.main`` imports. mlflow, torch and pandas must stay deferred until
+the first model access (see app/services/lazy_imports.py).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_HEAVY_MODULES = ("mlflow", "torch", "pandas", "pyarrow", "sklearn", "numba")
+# Cumulative ``import app.main`` time measured with ``-X importtime``.
+# Currently ~0.6 s locally; importing mlflow alone adds over a second.
+_DEFAULT_BUDGET_MS = 1500
+
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=_BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_app_main_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, json, app.main; "
+        f"print(json.dumps([m for m in {_HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    loaded = json.loads(_run("-c", code).stdout.strip().splitlines()[-1])
+    assert loaded == []
+
+
+def test_import_app_main_within_budget():
+    budget_ms = float(os.getenv("IMPORT_TIME_BUDGET_MS", _DEFAULT_BUDGET_MS))
+    stderr = _run("-X", "importtime", "-c", "import app.main").stderr
+
+    line = next(
+        line for line in stderr.splitlines() if line.rstrip().endswith("| app.main")
+    )
+    cumulative_ms = int(line.split("|")[1]) / 1000
+
+    assert cumulative_ms <= budget_ms, (
+        f"import app.main took {cumulative_ms:.0f} ms (budget {budget_ms:.0f} ms); "
+        "defer the new heavy import via app.services.lazy_imports"
+    )
@@ -28,6 +28,16 @@ Compare the hip-to-knee and knee-to-ankle segment lengths:
 
 The --pair flag can be repeated as many times as needed.
 
+Several sessions can be analyzed at once — pass files and/or directories
+(every ``*.csv`` inside is used). Files are processed in parallel over a
+process pool (``--jobs``, default: CPU count) and read in chunks of
+``--chunksize`` rows (default 100,000) with running statistics, so
+multi-GB exports are handled in bounded memory:
+
+    python mediapipe_accuracy.py recordings/ extra.csv \\
+        --ground-truth-json ground_truth.json --jobs 4 \\
+        --report-json report.json --report-csv report.csv
+
 You can also provide ground-truth distances via a JSON file::
 
     python mediapipe_accuracy.py session.csv \\
@@ -49,19 +59,33 @@ The script prints a table of per-pair statistics (in centimetres):
     left_knee → left_ankle          38.50        37.90         -0.60         0.35        -1.20         0.05
 
 A negative error means MediaPipe underestimates the distance; positive means
-it overestimates.
+it overestimates. With several files the table is computed over all of their
+frames; ``--report-json`` / ``--report-csv`` additionally write the per-file
+rows (``file`` = path) followed by the combined rows (``file`` = ``ALL``).
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
 import json
 import math
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
+
+import numpy as np
 import pandas as pd
 
+import pose_geometry
+
+
+DEFAULT_CHUNKSIZE = 100_000
+ALL_FILES = "ALL"
+_AXES = ("3d_x", "3d_y", "3d_z")
+
 
 class GroundTruthPair(NamedTuple):
     kp1: str
@@ -81,37 +105,116 @@ class PairStats(NamedTuple):
     n_frames: int
 
 
-def euclidean_3d_cm(row: "pd.Series", kp1: str, kp2: str) -> float | None:
-    """Return the 3-D Euclidean distance between *kp1* and *kp2* in centimetres.
+class RunningStats:
+    """Streaming count/mean/variance/min/max (Welford, merged chunk-wise).
+
+    Each chunk is reduced with numpy and folded into the accumulators with
+    Chan et al.'s parallel update, so the result does not depend on how the
+    data was chunked or split across files.
+    """
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        mean = float(values.mean())
+        self._merge(
+            values.size,
+            mean,
+            float(((values - mean) ** 2).sum()),
+            float(values.min()),
+            float(values.max()),
+        )
+
+    def merge(self, other: RunningStats) -> None:
+        if other.n:
+            self._merge(other.n, other.mean, other.m2, other.min, other.max)
+
+    def _merge(self, n_b: int, mean_b: float, m2_b: float, min_b: float, max_b: float):
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, min_b)
+        self.max = max(self.max, max_b)
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (``ddof=0``)."""
+        return math.sqrt(self.m2 / self.n) if self.n else 0.0
+
 
-    Expects the row to have columns ``{kp}_3d_x``, ``{kp}_3d_y``,
-    ``{kp}_3d_z`` for each keypoint.  Returns ``None`` if any required column
-    is absent or contains NaN.
+def _pair_columns(pair: GroundTruthPair) -> list[str]:
+    return [f"{kp}_{ax}" for kp in (pair.kp1, pair.kp2) for ax in _AXES]
+
+
+def pair_distances_cm(df: pd.DataFrame, pairs: list[GroundTruthPair]) -> np.ndarray:
+    """Return the per-frame 3-D distance of every pair in centimetres.
+
+    All pairs are computed in one pass over the coordinate block
+    (:func:`pose_geometry.pair_distances`).
 
     Parameters
     ----------
-    row:
-        A single row from the keypoints DataFrame.
-    kp1:
-        Name of the first keypoint (e.g. ``"left_hip"``).
-    kp2:
-        Name of the second keypoint (e.g. ``"left_knee"``).
+    df:
+        Frames with ``{kp}_3d_x``, ``{kp}_3d_y``, ``{kp}_3d_z`` columns for
+        every keypoint of *pairs*.
+    pairs:
+        Keypoint pairs to measure.
 
     Returns
     -------
-    float | None
-        Distance in centimetres, or ``None`` if data is unavailable.
+    numpy.ndarray
+        Array of shape ``(n_frames, n_pairs)``; NaN where a coordinate is
+        missing.
     """
-    cols_needed = [f"{kp}_{ax}" for kp in (kp1, kp2) for ax in ("3d_x", "3d_y", "3d_z")]
-    if any(c not in row.index for c in cols_needed):
+    keypoints = list(dict.fromkeys(kp for p in pairs for kp in (p.kp1, p.kp2)))
+    index = {kp: i for i, kp in enumerate(keypoints)}
+    columns = [f"{kp}_{ax}" for kp in keypoints for ax in _AXES]
+    xyz = df[columns].to_numpy(dtype=np.float64).reshape(len(df), len(keypoints), 3)
+    first = [index[p.kp1] for p in pairs]
+    second = [index[p.kp2] for p in pairs]
+    return pose_geometry.pair_distances(xyz, first, second) * 100.0
+
+
+def _accumulate(
+    chunks: Iterable[pd.DataFrame], pairs: list[GroundTruthPair]
+) -> tuple[int, list[RunningStats]]:
+    """Fold the estimated distances of *pairs* over *chunks* into running stats."""
+    stats = [RunningStats() for _ in pairs]
+    n_rows = 0
+    for chunk in chunks:
+        n_rows += len(chunk)
+        distances = pair_distances_cm(chunk, pairs)
+        for j, s in enumerate(stats):
+            column = distances[:, j]
+            s.update(column[~np.isnan(column)])
+    return n_rows, stats
+
+
+def _to_pair_stats(pair: GroundTruthPair, s: RunningStats) -> PairStats | None:
+    # error = estimate - ground truth: same spread, shifted location.
+    if s.n == 0:
         return None
-    values = [row[c] for c in cols_needed]
-    if any(pd.isna(v) for v in values):
-        return None
-    x1, y1, z1 = values[0], values[1], values[2]
-    x2, y2, z2 = values[3], values[4], values[5]
-    dist_m = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2)
-    return dist_m * 100.0  # metres → centimetres
+    return PairStats(
+        kp1=pair.kp1,
+        kp2=pair.kp2,
+        ground_truth_cm=pair.distance_cm,
+        mean_estimated_cm=s.mean,
+        mean_error_cm=s.mean - pair.distance_cm,
+        std_error_cm=s.std,
+        min_error_cm=s.min - pair.distance_cm,
+        max_error_cm=s.max - pair.distance_cm,
+        n_frames=s.n,
+    )
 
 
 def compute_pair_stats(
@@ -132,36 +235,124 @@ def compute_pair_stats(
     PairStats | None
         Populated statistics object, or ``None`` if no valid frames were found.
     """
-    cols_needed = [
-        f"{kp}_{ax}" for kp in (pair.kp1, pair.kp2) for ax in ("3d_x", "3d_y", "3d_z")
-    ]
-    if any(col not in df.columns for col in cols_needed):
+    if any(col not in df.columns for col in _pair_columns(pair)):
         return None
+    _, (stats,) = _accumulate([df], [pair])
+    return _to_pair_stats(pair, stats)
 
-    valid = df[cols_needed].dropna()
-    if valid.empty:
-        return None
 
-    dx = valid[f"{pair.kp2}_3d_x"] - valid[f"{pair.kp1}_3d_x"]
-    dy = valid[f"{pair.kp2}_3d_y"] - valid[f"{pair.kp1}_3d_y"]
-    dz = valid[f"{pair.kp2}_3d_z"] - valid[f"{pair.kp1}_3d_z"]
-    distances = ((dx**2 + dy**2 + dz**2) ** 0.5) * 100.0
+class FileResult(NamedTuple):
+    path: Path
+    n_rows: int
+    stats: dict[GroundTruthPair, RunningStats]  # pairs whose columns exist
+    error: str | None = None
 
-    errors = distances - pair.distance_cm
-    mean_est = float(distances.mean())
-    mean_err = float(errors.mean())
-    std_err = float(errors.std(ddof=0))
-    return PairStats(
-        kp1=pair.kp1,
-        kp2=pair.kp2,
-        ground_truth_cm=pair.distance_cm,
-        mean_estimated_cm=mean_est,
-        mean_error_cm=mean_err,
-        std_error_cm=std_err,
-        min_error_cm=min(errors),
-        max_error_cm=max(errors),
-        n_frames=len(distances),
-    )
+
+def analyze_file(
+    path: Path,
+    pairs: list[GroundTruthPair],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> FileResult:
+    """Stream *path* in chunks and accumulate distance statistics per pair.
+
+    Only the coordinate columns of *pairs* are parsed. Pairs whose columns are
+    absent from the file are left out of ``stats``. Read errors are returned
+    in ``error`` instead of raised, so one bad file does not stop a batch.
+    """
+    try:
+        header = pd.read_csv(path, nrows=0).columns
+        present = [p for p in pairs if all(c in header for c in _pair_columns(p))]
+        if not present:
+            return FileResult(path, 0, {})
+        usecols = list(dict.fromkeys(c for p in present for c in _pair_columns(p)))
+        chunks = pd.read_csv(path, usecols=usecols, chunksize=chunksize)
+        n_rows, stats = _accumulate(chunks, present)
+    except Exception as exc:
+        return FileResult(path, 0, {}, error=str(exc))
+    return FileResult(path, n_rows, dict(zip(present, stats)))
+
+
+def _analyze_file_job(args: tuple) -> FileResult:
+    return analyze_file(*args)
+
+
+def analyze_files(
+    paths: list[Path],
+    pairs: list[GroundTruthPair],
+    jobs: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> list[FileResult]:
+    """Run :func:`analyze_file` for every path, over a process pool if *jobs* > 1."""
+    job_args = [(path, pairs, chunksize) for path in paths]
+    if jobs <= 1 or len(paths) <= 1:
+        return [_analyze_file_job(a) for a in job_args]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return list(pool.map(_analyze_file_job, job_args))
+
+
+def combine_results(
+    results: list[FileResult], pairs: list[GroundTruthPair]
+) -> list[PairStats | None]:
+    """Merge per-file statistics into one :class:`PairStats` per pair (or None)."""
+    combined = []
+    for pair in pairs:
+        total = RunningStats()
+        for result in results:
+            if pair in result.stats:
+                total.merge(result.stats[pair])
+        combined.append(_to_pair_stats(pair, total))
+    return combined
+
+
+def collect_csv_files(inputs: list[Path]) -> list[Path]:
+    """Expand directories to their ``*.csv`` files (sorted); keep files as given."""
+    files: list[Path] = []
+    for path in inputs:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.csv")))
+        else:
+            files.append(path)
+    return files
+
+
+def report_rows(
+    results: list[FileResult],
+    pairs: list[GroundTruthPair],
+    combined: list[PairStats | None],
+) -> list[dict]:
+    """Flat report rows: per file and pair, then the combined ``ALL`` rows."""
+    rows = []
+    for result in results:
+        for pair in pairs:
+            stats = result.stats.get(pair)
+            pair_stats = _to_pair_stats(pair, stats) if stats is not None else None
+            if pair_stats is not None:
+                rows.append({"file": str(result.path), **pair_stats._asdict()})
+    for pair_stats in combined:
+        if pair_stats is not None:
+            rows.append({"file": ALL_FILES, **pair_stats._asdict()})
+    return rows
+
+
+def write_report_json(
+    path: Path, results: list[FileResult], rows: list[dict], n_rows: int
+) -> None:
+    report = {
+        "files": [
+            {"path": str(r.path), "frames": r.n_rows, "error": r.error} for r in results
+        ],
+        "frames_analyzed": n_rows,
+        "pairs": rows,
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+
+def write_report_csv(path: Path, rows: list[dict]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=["file", *PairStats._fields])
+        writer.writeheader()
+        writer.writerows(rows)
 
 
 def load_ground_truth_json(path: Path) -> list[GroundTruthPair]:
@@ -264,8 +455,12 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "csv",
         type=Path,
+        nargs="+",
         metavar="CSV_FILE",
-        help="Path to the keypoints CSV exported from the SquatAnalyzer.",
+        help=(
+            "Keypoints CSV(s) exported from the SquatAnalyzer, or directories "
+            "of them (every *.csv inside is analyzed)."
+        ),
     )
 
     gt_group = parser.add_mutually_exclusive_group(required=True)
@@ -290,6 +485,30 @@ def _build_parser() -> argparse.ArgumentParser:
             'Format: [{"kp1": "...", "kp2": "...", "distance_cm": 42.0}, ...]'
         ),
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes across files (default: CPU count; 1 = serial).",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help="Rows read per chunk (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        metavar="JSON_FILE",
+        help="Write per-file and combined statistics as JSON.",
+    )
+    parser.add_argument(
+        "--report-csv",
+        type=Path,
+        metavar="CSV_FILE",
+        help="Write per-file and combined statistics as CSV.",
+    )
     return parser
 
 
@@ -309,19 +528,16 @@ def main(argv: list[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
 
-    csv_path: Path = args.csv
-    if not csv_path.is_file():
-        print(f"ERROR: CSV file not found: {csv_path}", file=sys.stderr)
+    csv_paths = collect_csv_files(args.csv)
+    missing = [p for p in csv_paths if not p.is_file()]
+    if missing:
+        print(f"ERROR: CSV file not found: {missing[0]}", file=sys.stderr)
         return 1
-
-    try:
-        df = pd.read_csv(csv_path)
-    except Exception as exc:
-        print(f"ERROR: Could not read CSV file: {exc}", file=sys.stderr)
+    if not csv_paths:
+        print("ERROR: No CSV files found.", file=sys.stderr)
         return 1
-
-    if df.empty:
-        print("ERROR: CSV file contains no data rows.", file=sys.stderr)
+    if args.chunksize <= 0:
+        print("ERROR: --chunksize must be positive.", file=sys.stderr)
         return 1
 
     ground_truth: list[GroundTruthPair]
@@ -354,10 +570,26 @@ def main(argv: list[str] | None = None) -> int:
         print("ERROR: No ground-truth pairs provided.", file=sys.stderr)
         return 1
 
-    results: list[PairStats] = []
+    file_results = analyze_files(
+        csv_paths, ground_truth, jobs=max(1, args.jobs), chunksize=args.chunksize
+    )
     has_error = False
-    for pair in ground_truth:
-        stats = compute_pair_stats(df, pair)
+    for file_result in file_results:
+        if file_result.error is not None:
+            print(
+                f"ERROR: Could not read CSV file {file_result.path}: "
+                f"{file_result.error}",
+                file=sys.stderr,
+            )
+            has_error = True
+    n_rows = sum(r.n_rows for r in file_results)
+    if n_rows == 0:
+        print("ERROR: CSV file(s) contain no data rows.", file=sys.stderr)
+        return 1
+
+    combined = combine_results(file_results, ground_truth)
+    results: list[PairStats] = []
+    for pair, stats in zip(ground_truth, combined):
         if stats is None:
             print(
                 f"WARNING: No valid frames found for pair "
@@ -374,10 +606,20 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     print("\nMediaPipe Accuracy Report")
-    print(f"CSV: {csv_path.resolve()}")
-    print(f"Frames analyzed: {len(df)}\n")
+    if len(csv_paths) == 1:
+        print(f"CSV: {csv_paths[0].resolve()}")
+    else:
+        print(f"CSV files: {len(csv_paths)}")
+    print(f"Frames analyzed: {n_rows}\n")
     print_results(results)
 
+    if args.report_json is not None or args.report_csv is not None:
+        rows = report_rows(file_results, ground_truth, combined)
+        if args.report_json is not None:
+            write_report_json(args.report_json, file_results, rows, n_rows)
+        if args.report_csv is not None:
+            write_report_csv(args.report_csv, rows)
+
     return 1 if has_error else 0
 
 
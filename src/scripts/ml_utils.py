@@ -1,3 +1,11 @@
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import mlflow
 from mlflow.tracking import MlflowClient
 import numpy as np
@@ -8,6 +16,157 @@ from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.model_selection import KFold, StratifiedKFold, cross_val_score
 import torch
 
+ALIASES = ["prod", "dev", "backup"]
+
+# Registered model versions are immutable, so a downloaded version can be
+# reused for as long as it exists. Override the location with MLUTILS_CACHE_DIR.
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "4dt907" / "mlutils"
+
+
+def cache_dir():
+    return Path(os.getenv("MLUTILS_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _cache_path(model_name, version, tracking_uri):
+    server = hashlib.sha256(str(tracking_uri).encode()).hexdigest()[:12]
+    return cache_dir() / server / model_name / str(version)
+
+
+def cached_model_path(model_name, version, tracking_uri=None):
+    """
+    Local copy of models:/<model_name>/<version>, downloaded on first use.
+    Keyed by tracking server, model name and version.
+    """
+    tracking_uri = tracking_uri or mlflow.get_tracking_uri()
+    dst = _cache_path(model_name, version, tracking_uri)
+    if dst.is_dir():
+        return dst
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=dst.parent))
+    try:
+        local = mlflow.artifacts.download_artifacts(
+            artifact_uri=f"models:/{model_name}/{version}",
+            dst_path=str(tmp),
+            tracking_uri=tracking_uri,
+        )
+        os.replace(local, dst)
+    except OSError:
+        # Another process finished the same download first.
+        if not dst.is_dir():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return dst
+
+
+def cached_run_artifact(client, run_id, artifact_path, tracking_uri=None):
+    """
+    Local copy of a run artifact (e.g. cv_fold_scores.csv), downloaded once into
+    the cache instead of the working directory.
+    """
+    tracking_uri = tracking_uri or mlflow.get_tracking_uri()
+    server = hashlib.sha256(str(tracking_uri).encode()).hexdigest()[:12]
+    run_dir = cache_dir() / server / "_runs" / run_id
+    dst = run_dir / artifact_path
+    if dst.exists():
+        return dst
+
+    run_dir.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=".download-", dir=run_dir))
+    try:
+        local = client.download_artifacts(run_id, artifact_path, str(tmp))
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(local, dst)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return dst
+
+
+def dataset_fingerprint(X, y):
+    """Content hash of a dataset (values, dtypes and column names; not the index)."""
+    h = hashlib.sha256()
+    for part in (X, y):
+        if not isinstance(part, (pd.DataFrame, pd.Series)):
+            arr = np.asarray(part)
+            part = pd.DataFrame(arr.reshape(len(arr), -1))
+        if isinstance(part, pd.DataFrame):
+            h.update(repr([(c, str(t)) for c, t in part.dtypes.items()]).encode())
+        else:
+            h.update(str(part.dtype).encode())
+        h.update(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+def _fold_cache_path(model_name, version, tracking_uri, fold_key):
+    server = hashlib.sha256(str(tracking_uri).encode()).hexdigest()[:12]
+    return cache_dir() / server / model_name / "_cv" / str(version) / f"{fold_key}.npy"
+
+
+def load_fold_scores(model_name, version, fold_key, tracking_uri=None):
+    """Cached fold scores of a model version for fold_key, or None."""
+    tracking_uri = tracking_uri or mlflow.get_tracking_uri()
+    path = _fold_cache_path(model_name, version, tracking_uri, fold_key)
+    return np.load(path) if path.exists() else None
+
+
+def save_fold_scores(model_name, version, fold_key, scores, tracking_uri=None):
+    tracking_uri = tracking_uri or mlflow.get_tracking_uri()
+    path = _fold_cache_path(model_name, version, tracking_uri, fold_key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp.npy")
+    np.save(tmp, np.asarray(scores))
+    os.replace(tmp, path)
+
+
+def _load_cached(flavor, model_name, version, tracking_uri):
+    path = str(cached_model_path(model_name, version, tracking_uri))
+    if flavor == "pytorch":
+        return mlflow.pytorch.load_model(path)
+    return mlflow.sklearn.load_model(path)
+
+
+def _cv_scores_job(model_name, version, tracking_uri, X, y, cv, scoring, n_jobs):
+    mlflow.set_tracking_uri(tracking_uri)
+    model = _load_cached("sklearn", model_name, version, tracking_uri)
+    return cross_val_score(model, X, y, cv=cv, scoring=scoring, n_jobs=n_jobs)
+
+
+def _torch_errors_job(model_name, version, tracking_uri, inputs, targets, batch_sizes):
+    mlflow.set_tracking_uri(tracking_uri)
+    model = _load_cached("pytorch", model_name, version, tracking_uri)
+    model.eval()
+    with torch.inference_mode():
+        abs_err = torch.abs(model(inputs) - targets) * 100
+    # One MAE per original test_loader batch, as before.
+    return np.array([chunk.mean().item() for chunk in abs_err.split(batch_sizes)])
+
+
+def _run_jobs(job, args_by_alias, jobs):
+    """
+    Run job(*args) for every alias, over a process pool when jobs > 1.
+    Returns {alias: result or exception}.
+    """
+    results = {}
+    if jobs <= 1 or len(args_by_alias) <= 1:
+        for alias, args in args_by_alias.items():
+            try:
+                results[alias] = job(*args)
+            except Exception as e:
+                results[alias] = e
+        return results
+
+    # spawn: forking a process that already runs MLflow/torch threads is unsafe.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as pool:
+        futures = {alias: pool.submit(job, *args) for alias, args in args_by_alias.items()}
+        for alias, future in futures.items():
+            try:
+                results[alias] = future.result()
+            except Exception as e:
+                results[alias] = e
+    return results
+
 
 class mlutils:
     def __init__(self, model_name="Project_Model"):
@@ -154,8 +313,8 @@ class mlutils:
             for label, alias in aliases:
                 try:
                     ver = self.client.get_model_version_by_alias(self.model_name, alias)
-                    path = self.client.download_artifacts(
-                        ver.run_id, "cv_fold_scores.csv", "."
+                    path = cached_run_artifact(
+                        self.client, ver.run_id, "cv_fold_scores.csv"
                     )
                     results[label] = pd.read_csv(path)[metric].values
                 except Exception as e:
@@ -240,47 +399,123 @@ class mlutils:
             print(f"Error: {e}")
             return True, 1.0
 
-    def compare_all_registry_aliases(self, X, y, n_splits=5):
+    def _resolve_alias_versions(self, aliases):
+        """Resolve every alias to its version once ({alias: version or None})."""
+        versions = {}
+        for alias in aliases:
+            try:
+                versions[alias] = self.client.get_model_version_by_alias(
+                    self.model_name, alias
+                ).version
+            except Exception as e:
+                print(f"Note: Could not resolve alias '@{alias}'. Error: {e}")
+                versions[alias] = None
+        return versions
+
+    def _compare_aliases(self, job, make_args, aliases, jobs, fold_key=None):
         """
-        Pulls exactly the version tied to each alias and runs a 5-Fold CV.
-        Matches the backend's preference for concrete version loading.
+        Resolve aliases, then run job for each resolved version. Models load from
+        the local version cache (cached_model_path); by default versions that still
+        need downloading are fanned out over a process pool, one per download.
+        make_args(pooled) returns the job's extra arguments; inside a pool each
+        job should stay single-threaded.
+        With fold_key, results are cached per (version, fold_key) and versions
+        with cached results are not evaluated again.
         """
+        versions = self._resolve_alias_versions(aliases)
+        tracking_uri = mlflow.get_tracking_uri()
+        outcomes = {}
+        pending = {}
+        for alias, version in versions.items():
+            if version is None:
+                continue
+            cached = None
+            if fold_key is not None:
+                cached = load_fold_scores(self.model_name, version, fold_key, tracking_uri)
+            if cached is not None:
+                print(f"@{alias} (Version {version}): using cached fold scores")
+                outcomes[alias] = cached
+            else:
+                pending[alias] = version
+
+        if jobs is None:
+            # Worker start-up (spawn + imports) only pays off while downloading.
+            jobs = sum(
+                not _cache_path(self.model_name, v, tracking_uri).is_dir()
+                for v in pending.values()
+            )
+        pooled = jobs > 1 and len(pending) > 1
+        args_by_alias = {
+            alias: (self.model_name, version, tracking_uri, *make_args(pooled))
+            for alias, version in pending.items()
+        }
+        for alias, outcome in _run_jobs(job, args_by_alias, jobs).items():
+            if fold_key is not None and not isinstance(outcome, Exception):
+                save_fold_scores(
+                    self.model_name, pending[alias], fold_key, outcome, tracking_uri
+                )
+            outcomes[alias] = outcome
 
-        
         results = {}
-        aliases = ["prod", "dev", "backup"]
-        kf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        for alias in aliases:
+            outcome = outcomes.get(alias)
+            if isinstance(outcome, Exception):
+                print(f"Note: Could not evaluate alias '@{alias}'. Error: {outcome}")
+                outcome = None
+            results[alias] = outcome
+        return results, versions
+
+    def _compare_cv(self, X, y, cv, scoring, jobs, challenger):
+        """
+        CV scores of every alias (fold-cached per version, dataset fingerprint,
+        splitter, seed and scoring) plus, if given, a fresh challenger run.
+        Shuffled splits without an integer seed differ on every call, so their
+        scores are not cached.
+        """
+        fold_key = None
+        if getattr(cv, "shuffle", False) and not isinstance(
+            cv.random_state, (int, np.integer)
+        ):
+            print("Note: shuffled CV without an integer random_state; fold scores not cached.")
+        else:
+            fold_key = "-".join(
+                [
+                    type(cv).__name__,
+                    str(cv.get_n_splits()),
+                    str(cv.random_state),
+                    scoring,
+                    dataset_fingerprint(X, y),
+                ]
+            )
+        results, versions = self._compare_aliases(
+            _cv_scores_job,
+            lambda pooled: (X, y, cv, scoring, 1 if pooled else -1),
+            ALIASES,
+            jobs,
+            fold_key=fold_key,
+        )
+        if challenger is not None:
+            print("Testing challenger...")
+            results["challenger"] = cross_val_score(
+                challenger, X, y, cv=cv, scoring=scoring, n_jobs=-1
+            )
+            versions["challenger"] = "new"
+        return results, versions
 
-        print(f"\n--- Registry Validation: Comparing Aliases {aliases} ---")
+    def compare_all_registry_aliases(
+        self, X, y, n_splits=5, jobs=None, random_state=42, challenger=None
+    ):
+        """
+        Pulls exactly the version tied to each alias and runs a 5-Fold CV.
+        Matches the backend's preference for concrete version loading.
+        Aliases are evaluated in parallel over jobs processes (see _compare_aliases)
+        and their fold scores are cached (for an integer random_state), so only an
+        (optional) unregistered challenger estimator is re-evaluated on repeated calls.
+        """
+        kf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
 
-        for alias in aliases:
-            try:
-                # 1. Ask the client: "What version is currently tagged as this alias?"
-                # This call works even if the models:/ URI syntax doesn't.
-                print("getting version for ", alias)
-                model_version_entity = self.client.get_model_version_by_alias(self.model_name, alias)
-                print("Loaded model", model_version_entity)
-                version = model_version_entity.version
-
-                print("Loaded model version", version)
-                
-                # 2. Build the concrete URI: models:/Name/Version
-                # DagsHub supports this format perfectly.
-                model_uri = f"models:/{self.model_name}/{version}"
-                
-                print(f"Testing @{alias} (Resolved to Version {version})...")
-                
-                # 3. Load the native sklearn model
-                loaded_model = mlflow.sklearn.load_model(model_uri)
-                
-                # 4. Run CV
-                scores = cross_val_score(loaded_model, X, y, cv=kf, scoring='f1_weighted', n_jobs=-1)
-                results[alias] = scores
-                
-            except Exception as e:
-                # If the alias simply doesn't exist yet, we catch it here
-                print(f"Note: Could not load alias '@{alias}'. Error: {e}")
-                results[alias] = None
+        print(f"\n--- Registry Validation: Comparing Aliases {ALIASES} ---")
+        results, versions = self._compare_cv(X, y, kf, "f1_weighted", jobs, challenger)
 
         # Print Comparison Table
         print("\n" + "="*50)
@@ -288,49 +523,29 @@ class mlutils:
         print("-" * 50)
         for alias, scores in results.items():
             if scores is not None:
-                # Get the version again for the table display
-                v = self.client.get_model_version_by_alias(self.model_name, alias).version
+                v = versions[alias]
                 print(f"{alias:<10} | {v:<8} | {scores.mean():.4f}     | {scores.std():.4f}")
             else:
                 print(f"{alias:<10} | {'N/A':<8} | {'N/A':<10}     | {'N/A':<10}")
         print("="*50 + "\n")
 
         return results
-    
-    def compare_all_registry_aliases_r2(self, X, y, n_splits=5):
+
+    def compare_all_registry_aliases_r2(
+        self, X, y, n_splits=5, jobs=None, random_state=42, challenger=None
+    ):
         """
         Pulls @prod, @dev, and @backup models and runs 5-Fold CV for R2.
         Bypasses DagsHub URI errors by resolving aliases to version numbers.
+        Aliases are evaluated in parallel over jobs processes (see _compare_aliases)
+        and their fold scores are cached (for an integer random_state), so only an
+        (optional) unregistered challenger estimator is re-evaluated on repeated calls.
         """
-        results = {}
-        aliases = ["prod", "dev", "backup"]
-        
         # Use KFold for Regression (A2)
-        kf = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+        kf = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
 
-        print(f"\n--- Registry Validation: Comparing {aliases} (5-Fold R2) ---")
-
-        for alias in aliases:
-            try:
-                # 1. Resolve alias to version (Stable DagsHub handshake)
-                ver_entity = self.client.get_model_version_by_alias(self.model_name, alias)
-                version = ver_entity.version
-                
-                # 2. Build concrete URI
-                model_uri = f"models:/{self.model_name}/{version}"
-                
-                # 3. Load native sklearn model
-                loaded_model = mlflow.sklearn.load_model(model_uri)
-
-                print(f"Testing @{alias} (Version {version})...")
-                
-                # 4. Run CV using R2
-                scores = cross_val_score(loaded_model, X, y, cv=kf, scoring='r2', n_jobs=-1)
-                results[alias] = scores
-                
-            except Exception as e:
-                print(f"Note: Alias '@{alias}' not found or could not be loaded.")
-                results[alias] = None
+        print(f"\n--- Registry Validation: Comparing {ALIASES} (5-Fold R2) ---")
+        results, _ = self._compare_cv(X, y, kf, "r2", jobs, challenger)
 
         # Print Comparison Table
         print("\n" + "="*50)
@@ -344,33 +559,18 @@ class mlutils:
         print("="*50 + "\n")
 
         return results
-    
 
-    def compare_pytorch_aliases(self, test_loader, joint_names):
-        """Pulls @prod, @dev, @backup PyTorch models and runs evaluation."""
-        results = {}
-        aliases = ["prod", "dev", "backup"]
+    def compare_pytorch_aliases(self, test_loader, joint_names, jobs=None):
+        """
+        Pulls @prod, @dev, @backup PyTorch models and runs evaluation.
+        The whole test_loader is evaluated in one batch under inference_mode;
+        the result is still one MAE (cm) per test_loader batch.
+        """
+        inputs, targets = zip(*test_loader)
+        batch_sizes = [len(t) for t in targets]
+        inputs, targets = torch.cat(inputs), torch.cat(targets)
 
-        for alias in aliases:
-            try:
-                # 1. Resolve alias to version
-                ver_entity = self.client.get_model_version_by_alias(self.model_name, alias)
-                model_uri = f"models:/{self.model_name}/{ver_entity.version}"
-
-                # 2. LOAD AS PYTORCH (Crucial Change!)
-                loaded_model = mlflow.pytorch.load_model(model_uri)
-                loaded_model.eval()
-
-                # 3. Run your 10-sequence evaluation loop
-                errors = []
-                with torch.no_grad():
-                    for inputs, targets in test_loader:
-                        preds = loaded_model(inputs)
-                        errors.append(torch.mean(torch.abs(preds - targets) * 100).item())
-                
-                results[alias] = np.array(errors)
-            except Exception as e:
-                results[alias] = None
-    
-        # Print your table (same logic as your sklearn version)
-        return results
\ No newline at end of file
+        results, _ = self._compare_aliases(
+            _torch_errors_job, lambda _: (inputs, targets, batch_sizes), ALIASES, jobs
+        )
+        return results
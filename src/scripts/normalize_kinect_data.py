@@ -43,19 +43,47 @@ Usage
 -----
     python normalize_kinect_data.py                        # auto-detects src/data
     python normalize_kinect_data.py --data-dir /path/data  # explicit data dir
+    python normalize_kinect_data.py --jobs 8               # 8 worker processes
+    python normalize_kinect_data.py --dirs labeled_files   # other source dirs
+    python normalize_kinect_data.py --force                # ignore the manifest
+    python normalize_kinect_data.py --parquet ../data/pose_parquet  # + Parquet
 
 Normalized files are written to new directories named
 ``<original_dir>_mediapipe`` next to the source directories, e.g.
 ``kinect_good_preprocessed_A9`` → ``kinect_good_preprocessed_A9_mediapipe``.
+
+Incremental runs
+----------------
+Each output directory holds a ``.normalize_manifest.json`` recording, per
+source file, its size, mtime and SHA-256 plus the normalizer version. A file
+is reprocessed only if its output is missing, the normalizer changed, or the
+source content changed (a touched-but-identical file is detected by hash and
+skipped). Files are normalized in parallel over a process pool (``--jobs``,
+default: CPU count).
+
+Parquet dataset
+---------------
+With ``--parquet DIR`` every output directory is also stored as one partition
+(``DIR/source=<output dir>/part-0.parquet``) of the columnar dataset described
+in ``pose_dataset.py``. A partition is rebuilt only when files of its
+directory were (re)normalized or it does not exist yet. Requires ``pyarrow``.
 """
 
 import argparse
+import hashlib
+import json
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
+import pose_geometry
+
 logger = logging.getLogger(__name__)
 
 # Kinect joint name → MediaPipe landmark name.
@@ -129,15 +157,28 @@ def hip_center_normalize(df: pd.DataFrame) -> pd.DataFrame:
         ``FrameNo``) are left unchanged.
     """
     df = df.copy()
-    for axis in ("x", "y", "z"):
-        left_col = f"left_hip_{axis}"
-        right_col = f"right_hip_{axis}"
-        if left_col not in df.columns or right_col not in df.columns:
-            continue
-        hip_mid = (df[left_col] + df[right_col]) / 2.0
-        axis_cols = [c for c in df.columns if c.endswith(f"_{axis}")]
-        for col in axis_cols:
-            df[col] = df[col] - hip_mid
+    axes = [
+        a
+        for a in ("x", "y", "z")
+        if f"left_hip_{a}" in df.columns and f"right_hip_{a}" in df.columns
+    ]
+    if not axes:
+        return df
+    suffixes = tuple(f"_{a}" for a in axes)
+    joints = list(dict.fromkeys(c[:-2] for c in df.columns if c.endswith(suffixes)))
+    cols = [f"{joint}_{a}" for joint in joints for a in axes]
+    present = np.array([c in df.columns for c in cols])
+    # One (frames, joints, axes) block, centred in one call; a joint missing
+    # an axis gets a NaN column that is dropped again below.
+    block = df.reindex(columns=cols).to_numpy(dtype=np.float64)
+    centered = pose_geometry.hip_center(
+        block.reshape(len(df), len(joints), len(axes)),
+        joints.index("left_hip"),
+        joints.index("right_hip"),
+    )
+    df[[c for c, p in zip(cols, present) if p]] = centered.reshape(len(df), -1)[
+        :, present
+    ]
     return df
 
 
@@ -207,8 +248,112 @@ def normalize_file(src: Path, dst: Path) -> None:
     logger.debug("Normalized %s → %s", src.name, dst)
 
 
-def normalize_directory(src_dir: Path, dst_dir: Path) -> int:
-    """Normalize all CSV files in *src_dir* and write results to *dst_dir*.
+MANIFEST_NAME = ".normalize_manifest.json"
+# Bump whenever normalize_file's output changes so existing outputs are redone.
+NORMALIZER_VERSION = 2
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_entry(path: Path) -> Dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": _sha256(path)}
+
+
+def load_manifest(dst_dir: Path) -> Dict[str, Dict]:
+    """Per-file entries of *dst_dir*'s manifest ({} if missing or outdated)."""
+    try:
+        data = json.loads((dst_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != NORMALIZER_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(dst_dir: Path, files: Dict[str, Dict]) -> None:
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    tmp = dst_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(
+        json.dumps({"version": NORMALIZER_VERSION, "files": files}, indent=1)
+    )
+    os.replace(tmp, dst_dir / MANIFEST_NAME)
+
+
+def plan_directory(
+    src_dir: Path, dst_dir: Path, force: bool = False
+) -> Tuple[List[Path], Dict[str, Dict]]:
+    """Split *src_dir*'s CSVs into (files to normalize, up-to-date manifest entries)."""
+    previous = {} if force else load_manifest(dst_dir)
+    todo: List[Path] = []
+    current: Dict[str, Dict] = {}
+    for csv_file in sorted(src_dir.glob("*.csv")):
+        entry = previous.get(csv_file.name)
+        if entry is None or not (dst_dir / csv_file.name).exists():
+            todo.append(csv_file)
+            continue
+        st = csv_file.stat()
+        if entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            current[csv_file.name] = entry
+        elif entry["size"] == st.st_size and _sha256(csv_file) == entry["sha256"]:
+            # Touched but unchanged: keep the output, remember the new mtime.
+            current[csv_file.name] = {**entry, "mtime_ns": st.st_mtime_ns}
+        else:
+            todo.append(csv_file)
+    return todo, current
+
+
+def _normalize_job(src: Path, dst: Path) -> Tuple[str, Dict]:
+    entry = _file_entry(src)
+    normalize_file(src, dst)
+    return src.name, entry
+
+
+def normalize_directories(
+    pairs: List[Tuple[Path, Path]], jobs: int = 1, force: bool = False
+) -> List[Tuple[int, int]]:
+    """Normalize changed CSVs of every (src_dir, dst_dir) pair.
+
+    All pending files share one process pool of *jobs* workers (inline when
+    *jobs* is 1). Returns ``(normalized, skipped)`` per pair.
+    """
+    plans = [plan_directory(src, dst, force) for src, dst in pairs]
+    tasks = [
+        (k, src, dst_dir / src.name)
+        for k, ((_, dst_dir), (todo, _)) in enumerate(zip(pairs, plans))
+        for src in todo
+    ]
+
+    done: List[Tuple[int, str, Dict]] = []
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            futures = [
+                (k, pool.submit(_normalize_job, src, dst)) for k, src, dst in tasks
+            ]
+            done = [(k, *future.result()) for k, future in futures]
+    else:
+        done = [(k, *_normalize_job(src, dst)) for k, src, dst in tasks]
+
+    counts: List[Tuple[int, int]] = []
+    for k, ((_, dst_dir), (todo, current)) in enumerate(zip(pairs, plans)):
+        skipped = len(current)
+        current.update({name: entry for j, name, entry in done if j == k})
+        if todo or current:
+            save_manifest(dst_dir, current)
+        counts.append((len(todo), skipped))
+    return counts
+
+
+def normalize_directory(
+    src_dir: Path, dst_dir: Path, jobs: int = 1, force: bool = False
+) -> int:
+    """Normalize all changed CSV files in *src_dir* and write results to *dst_dir*.
 
     Parameters
     ----------
@@ -216,17 +361,18 @@ def normalize_directory(src_dir: Path, dst_dir: Path) -> int:
         Directory containing raw Kinect CSV files.
     dst_dir:
         Directory where normalized files are written.
+    jobs:
+        Worker processes (1 = run in this process).
+    force:
+        Ignore the manifest and renormalize every file.
 
     Returns
     -------
     int
-        Number of files normalized.
+        Number of files normalized (unchanged files are skipped).
     """
-    count = 0
-    for csv_file in sorted(src_dir.glob("*.csv")):
-        normalize_file(csv_file, dst_dir / csv_file.name)
-        count += 1
-    return count
+    ((normalized, _),) = normalize_directories([(src_dir, dst_dir)], jobs, force)
+    return normalized
 
 
 def main() -> None:
@@ -243,27 +389,67 @@ def main() -> None:
         default=data_default,
         help="Path to the src/data directory (default: auto-detected relative to this script)",
     )
+    parser.add_argument(
+        "--dirs",
+        nargs="+",
+        default=KINECT_DIRS,
+        help="Source directory names under --data-dir (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count; 1 = serial)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Renormalize every file, ignoring the manifest",
+    )
+    parser.add_argument(
+        "--parquet",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Also write the normalized data as a partitioned Parquet dataset",
+    )
     args = parser.parse_args()
 
     data_dir: Path = args.data_dir.resolve()
     if not data_dir.is_dir():
         parser.error(f"Data directory not found: {data_dir}")
 
-    total = 0
-    for kinect_dir_name in KINECT_DIRS:
+    pairs: List[Tuple[Path, Path]] = []
+    for kinect_dir_name in args.dirs:
         src_dir = data_dir / kinect_dir_name
         if not src_dir.is_dir():
             logger.warning("Source directory not found, skipping: %s", src_dir)
             continue
-        dst_dir_name = kinect_dir_name + "_mediapipe"
-        dst_dir = data_dir / dst_dir_name
-        count = normalize_directory(src_dir, dst_dir)
+        pairs.append((src_dir, data_dir / (kinect_dir_name + "_mediapipe")))
+
+    counts = normalize_directories(pairs, jobs=max(1, args.jobs), force=args.force)
+    for (src_dir, dst_dir), (count, skipped) in zip(pairs, counts):
         logger.info(
-            "Normalized %d file(s): %s → %s", count, kinect_dir_name, dst_dir_name
+            "Normalized %d file(s), %d unchanged: %s → %s",
+            count,
+            skipped,
+            src_dir.name,
+            dst_dir.name,
         )
-        total += count
 
-    logger.info("Total files normalized: %d", total)
+    logger.info("Total files normalized: %d", sum(c for c, _ in counts))
+
+    if args.parquet is not None:
+        import pose_dataset
+
+        for (_, dst_dir), (count, _) in zip(pairs, counts):
+            partition = pose_dataset.partition_path(args.parquet, dst_dir.name)
+            if count == 0 and partition.exists():
+                continue
+            rows = pose_dataset.write_partition_from_csv_dir(
+                args.parquet, dst_dir.name, dst_dir
+            )
+            logger.info("Wrote %d row(s) to %s", rows, partition)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+"""pose_geometry.py
+
+Pose geometry kernels shared by the data scripts.
+
+A deliberate copy of the numpy path of the backend's
+``app.services.pose_geometry`` for the two operations the scripts need, kept
+here so standalone scripts do not import the backend package (or put it on
+``sys.path``). The backend test suite checks that both give the same results;
+change them together. Arrays are
+``(n_frames, n_joints, n_axes)``; joints are addressed by index along axis 1.
+
+    from pose_geometry import hip_center, pair_distances
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+
+def pair_distances(
+    points: np.ndarray, first: Sequence[int], second: Sequence[int]
+) -> np.ndarray:
+    """``(n_frames, n_pairs)`` distance between joints ``first[p]`` and ``second[p]``.
+
+    NaN coordinates give NaN distances.
+    """
+    pts = np.asarray(points, dtype=np.float64)
+    diff = pts[:, list(second)] - pts[:, list(first)]
+    return np.sqrt((diff * diff).sum(axis=2))
+
+
+def hip_center(points: np.ndarray, left_hip: int, right_hip: int) -> np.ndarray:
+    """Copy of *points* shifted so the hip midpoint is the origin of every frame."""
+    pts = np.asarray(points, dtype=np.float64)
+    mid = (pts[:, left_hip] + pts[:, right_hip]) / 2.0
+    return pts - mid[:, None, :]